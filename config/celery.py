@@ -50,6 +50,12 @@ app.conf.beat_schedule = {
         'schedule': crontab(minute=15),  # Every hour at :15
     },
 
+    # Drain the shared audit queue (web processes only RPUSH to it)
+    'flush-audit-log-buffer': {
+        'task': 'referensi.tasks.flush_audit_log_buffer_task',
+        'schedule': 15.0,  # Every 15 seconds
+    },
+    
     # Cache warmup every 6 hours
     'cache-warmup-periodic': {
         'task': 'referensi.tasks.cache_warmup_task',
@@ -62,6 +68,14 @@ app.conf.beat_schedule = {
         'schedule': crontab(hour=2, minute=0),
     },
 
+    # ========== EXPORT TASKS ==========
+
+    # Remove expired async export files and trim the export artifact cache
+    'cleanup-old-exports-hourly': {
+        'task': 'detail_project.tasks.cleanup_old_exports',
+        'schedule': crontab(minute=15),  # Every hour at :15
+    },
+
     # ========== SUBSCRIPTION TASKS ==========
     
     # Check and expire subscriptions daily at midnight
@@ -0,0 +1,58 @@
+"""
+Sampling Profiler Middleware (opt-in, aman untuk production).
+
+Setiap request disampling oleh ``config.sampling_profiler``; stack hanya
+disimpan bila request lebih lambat dari ``SAMPLING_PROFILER_THRESHOLD_MS``
+atau user staff mengirim header ``SAMPLING_PROFILER_HEADER`` (default
+``X-Profile: 1``). Hasil dibaca lewat endpoint monitoring
+``api/monitoring/profiler/``.
+
+Dimatikan secara default (``SAMPLING_PROFILER_ENABLED``); saat mati
+middleware dilepas dari chain lewat ``MiddlewareNotUsed``.
+"""
+
+import logging
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from config import sampling_profiler
+
+logger = logging.getLogger(__name__)
+
+
+class SamplingProfilerMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, "SAMPLING_PROFILER_ENABLED", False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.interval_ms = float(getattr(settings, "SAMPLING_PROFILER_INTERVAL_MS", 10))
+        self.threshold_ms = float(getattr(settings, "SAMPLING_PROFILER_THRESHOLD_MS", 1000))
+        header = getattr(settings, "SAMPLING_PROFILER_HEADER", "X-Profile")
+        self.header_key = "HTTP_" + header.upper().replace("-", "_")
+
+    def __call__(self, request):
+        start = time.monotonic()
+        with sampling_profiler.profiling(self.interval_ms) as samples:
+            response = self.get_response(request)
+        duration_ms = (time.monotonic() - start) * 1000.0
+
+        if duration_ms >= self.threshold_ms or self._is_flagged(request):
+            endpoint = self._endpoint(request)
+            if not sampling_profiler.record_profile(endpoint, samples, duration_ms=duration_ms):
+                logger.warning("Sampling profiler store penuh, profil %s dibuang", endpoint)
+        return response
+
+    def _is_flagged(self, request):
+        if request.META.get(self.header_key, "").lower() not in ("1", "true", "yes"):
+            return False
+        user = getattr(request, "user", None)
+        return bool(user and user.is_authenticated and (user.is_staff or user.is_superuser))
+
+    @staticmethod
+    def _endpoint(request):
+        match = getattr(request, "resolver_match", None)
+        if match is not None:
+            return match.view_name or match.route or request.path
+        return "(unresolved)"
@@ -6,6 +6,8 @@ from django.conf import settings
 from django.db import connection, reset_queries
 from django.utils.deprecation import MiddlewareMixin
 
+from config.query_budget import QueryRecorder
+
 
 class SQLTraceMiddleware(MiddlewareMixin):
     def __init__(self, get_response=None):
@@ -14,6 +16,10 @@ class SQLTraceMiddleware(MiddlewareMixin):
         self.min_ms = float(os.getenv("SQL_TRACE_MIN_MS", "50"))
         self.logger = logging.getLogger("sql_trace")
 
+    def _log_slow(self, sql, duration_ms):
+        compact_sql = (sql or "").replace("\n", " ")
+        self.logger.info("db_ms=%.2f sql=%s", duration_ms, compact_sql)
+
     def process_request(self, request):
         if not self.enabled:
             return None
@@ -21,21 +27,8 @@ class SQLTraceMiddleware(MiddlewareMixin):
         if settings.DEBUG:
             reset_queries()
         request._sql_trace_start_ts = time.monotonic()
-        request._sql_trace_state = {"count": 0, "db_ms": 0.0}
-
-        def _wrap(execute, sql, params, many, context):
-            start = time.monotonic()
-            try:
-                return execute(sql, params, many, context)
-            finally:
-                duration_ms = (time.monotonic() - start) * 1000.0
-                request._sql_trace_state["count"] += 1
-                request._sql_trace_state["db_ms"] += duration_ms
-                if self.min_ms and duration_ms >= self.min_ms:
-                    compact_sql = (sql or "").replace("\n", " ")
-                    self.logger.info("db_ms=%.2f sql=%s", duration_ms, compact_sql)
-
-        request._sql_trace_wrapper = connection.execute_wrapper(_wrap)
+        request._sql_trace_recorder = QueryRecorder(slow_ms=self.min_ms, on_slow=self._log_slow)
+        request._sql_trace_wrapper = connection.execute_wrapper(request._sql_trace_recorder)
         request._sql_trace_wrapper.__enter__()
         return None
 
@@ -51,17 +44,19 @@ class SQLTraceMiddleware(MiddlewareMixin):
         if start_ts is not None:
             duration_ms = (time.monotonic() - start_ts) * 1000.0
 
-        state = getattr(request, "_sql_trace_state", {})
-        queries_count = int(state.get("count", 0) or 0)
-        total_db_ms = float(state.get("db_ms", 0.0) or 0.0)
+        recorder = getattr(request, "_sql_trace_recorder", None) or QueryRecorder()
+        top = recorder.top(1)
+        max_repeat, repeated_fp = top[0][1] if top else 0, top[0][0] if top else ""
 
         self.logger.info(
-            "path=%s status=%s queries=%s db_ms=%.2f total_ms=%.2f",
+            "path=%s status=%s queries=%s db_ms=%.2f total_ms=%.2f max_repeat=%s fp=%s",
             request.path,
             response.status_code,
-            queries_count,
-            total_db_ms,
+            recorder.total,
+            recorder.db_ms,
             duration_ms or 0.0,
+            max_repeat,
+            repeated_fp[:200] if max_repeat > 1 else "-",
         )
 
         return response
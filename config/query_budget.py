@@ -0,0 +1,174 @@
+"""
+Query budget + fingerprint SQL.
+
+``QueryRecorder`` adalah execute-wrapper (ide yang sama dengan
+``SQLTraceMiddleware``) yang menghitung query per fingerprint: SQL yang
+literal, placeholder dan daftar ``IN (...)``-nya dinormalisasi, sehingga
+pola N+1 terlihat sebagai satu fingerprint dengan hitungan besar.
+
+``query_budget`` membungkus view/service (decorator) atau blok kode
+(context manager)::
+
+    @query_budget(25, max_repeats=3)
+    def api_get_rekap(request, project_id): ...
+
+    with query_budget(10, label="load_project_tree"):
+        load_project_tree(project)
+
+Pelanggaran budget melempar ``QueryBudgetExceeded`` bila
+``QUERY_BUDGET_STRICT`` aktif (settings test), selain itu hanya dicatat
+sebagai warning.
+"""
+
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ContextDecorator
+from typing import Callable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger("query_budget")
+
+# Query instrumentasi (silk, EXPLAIN, savepoint atomic) bukan query aplikasi
+IGNORED_PREFIXES = ("EXPLAIN", "SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+IGNORED_TABLE_PREFIXES = ('"silk_', "`silk_", "silk_")
+
+_COMMENT_RE = re.compile(r"/\*.*?\*/|--[^\n]*", re.S)
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_RE = re.compile(r"%s|%\(\w+\)s|\?")
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.I)
+_VALUES_RE = re.compile(r"\bVALUES\s*(\([^()]*\))(?:\s*,\s*\([^()]*\))+", re.I)
+_WS_RE = re.compile(r"\s+")
+
+
+def fingerprint(sql: str) -> str:
+    """Bentuk SQL tanpa nilai: ``WHERE id = 5`` dan ``WHERE id = 7`` sama."""
+    sql = _COMMENT_RE.sub(" ", sql or "")
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _PLACEHOLDER_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("IN (...)", sql)
+    sql = _VALUES_RE.sub(r"VALUES \1, ...", sql)
+    return _WS_RE.sub(" ", sql).strip()
+
+
+def _is_ignored(sql: str) -> bool:
+    head = sql.lstrip().upper()
+    if head.startswith(IGNORED_PREFIXES):
+        return True
+    return any(prefix in sql for prefix in IGNORED_TABLE_PREFIXES)
+
+
+class QueryRecorder:
+    """
+    Execute-wrapper: hitung query, durasi DB dan jumlah per fingerprint.
+
+    ``slow_ms`` + ``on_slow(sql, duration_ms)`` opsional untuk log query lambat.
+    """
+
+    def __init__(self, *, slow_ms: Optional[float] = None, on_slow: Optional[Callable] = None):
+        self.total = 0
+        self.db_ms = 0.0
+        self.counts: Counter = Counter()
+        self.samples = {}
+        self.slow_ms = slow_ms
+        self.on_slow = on_slow
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.monotonic()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.monotonic() - start) * 1000.0
+            if not _is_ignored(sql or ""):
+                fp = fingerprint(sql)
+                self.total += 1
+                self.db_ms += duration_ms
+                self.counts[fp] += 1
+                self.samples.setdefault(fp, sql)
+                if self.on_slow and self.slow_ms and duration_ms >= self.slow_ms:
+                    self.on_slow(sql, duration_ms)
+
+    def top(self, n: int = 10) -> List[Tuple[str, int]]:
+        return self.counts.most_common(n)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Fingerprint yang muncul lebih dari ``threshold`` kali."""
+        return [(fp, count) for fp, count in self.counts.most_common() if count > threshold]
+
+    def summary(self, n: int = 5) -> str:
+        lines = [f"{self.total} queries, {len(self.counts)} fingerprints, {self.db_ms:.1f} ms"]
+        lines += [f"  {count}x {fp[:200]}" for fp, count in self.top(n)]
+        return "\n".join(lines)
+
+
+class QueryBudgetExceeded(AssertionError):
+    def __init__(self, message, recorder):
+        super().__init__(message)
+        self.recorder = recorder
+
+
+class query_budget(ContextDecorator):
+    """
+    Batas jumlah query (``max_queries``) dan pengulangan fingerprint
+    (``max_repeats``) untuk satu blok / fungsi. ``strict=None`` mengikuti
+    ``settings.QUERY_BUDGET_STRICT``.
+    """
+
+    def __init__(self, max_queries: Optional[int] = None, *, max_repeats: Optional[int] = None,
+                 label: Optional[str] = None, using: str = "default", strict: Optional[bool] = None):
+        self.max_queries = max_queries
+        self.max_repeats = max_repeats
+        self.label = label
+        self.using = using
+        self.strict = strict
+        self._recorder = None
+        self._wrapper = None
+
+    def __call__(self, func):
+        if self.label is None:
+            self.label = f"{func.__module__}.{func.__qualname__}"
+        return super().__call__(func)
+
+    def _recreate_cm(self):
+        # Instance baru per pemanggilan: aman untuk view yang dipanggil paralel/rekursif
+        return type(self)(
+            self.max_queries, max_repeats=self.max_repeats, label=self.label,
+            using=self.using, strict=self.strict,
+        )
+
+    def __enter__(self):
+        self._recorder = QueryRecorder()
+        self._wrapper = connections[self.using].execute_wrapper(self._recorder)
+        self._wrapper.__enter__()
+        return self._recorder
+
+    def __exit__(self, exc_type, exc, tb):
+        self._wrapper.__exit__(exc_type, exc, tb)
+        if exc_type is None:
+            self.check(self._recorder)
+        return False
+
+    def violations(self, recorder: QueryRecorder) -> List[str]:
+        problems = []
+        if self.max_queries is not None and recorder.total > self.max_queries:
+            problems.append(f"{recorder.total} queries > budget {self.max_queries}")
+        if self.max_repeats is not None:
+            for fp, count in recorder.repeated(self.max_repeats):
+                problems.append(f"fingerprint repeated {count}x > {self.max_repeats}: {fp[:200]}")
+        return problems
+
+    def check(self, recorder: QueryRecorder) -> None:
+        problems = self.violations(recorder)
+        if not problems:
+            return
+        message = f"Query budget exceeded in {self.label or 'block'}: " + "; ".join(problems)
+        strict = self.strict if self.strict is not None else getattr(settings, "QUERY_BUDGET_STRICT", False)
+        if strict:
+            raise QueryBudgetExceeded(f"{message}\n{recorder.summary()}", recorder)
+        logger.warning(message)
+
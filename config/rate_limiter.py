@@ -0,0 +1,238 @@
+"""
+Shared rate limiter.
+
+Satu implementasi untuk ``detail_project.api_helpers.rate_limit``,
+``referensi.middleware.ImportRateLimitMiddleware`` dan endpoint client
+metrics. Window tetap yang dimulai pada hit pertama (perilaku lama
+middleware import), dihitung dengan increment atomik:
+
+- Redis (django-redis atau RedisCache bawaan Django): satu ``EVALSHA`` per
+  pengecekan (INCR + PEXPIRE + PTTL + counter kategori dalam satu skrip Lua).
+- Backend bersama lain (db, memcached): ``cache.add(key, 0)`` lalu
+  ``cache.incr(key)``; awal window disimpan di key ``<key>:reset``.
+  ``incr`` atomik di memcached; DatabaseCache Django mengimplementasikannya
+  sebagai get + set, jadi di sana hit yang benar-benar bersamaan masih bisa
+  terhitung satu.
+- locmem (dev/test): counter diproses di bawah lock proses. Atomik per
+  proses, sama dengan cakupan locmem sendiri.
+
+Counter hit/deny per kategori dibaca lewat ``get_rate_limit_metrics()``.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.db import DatabaseError
+
+from config.redis_client import get_cache_redis_client, is_process_local_cache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "rl"
+METRICS_KEY = "rl:metrics"
+
+_LUA_HIT = """
+local count = redis.call('INCR', KEYS[1])
+local ttl = redis.call('PTTL', KEYS[1])
+if ttl < 0 then
+    redis.call('PEXPIRE', KEYS[1], ARGV[1])
+    ttl = tonumber(ARGV[1])
+end
+local outcome = 'allowed'
+if count > tonumber(ARGV[2]) then outcome = 'denied' end
+redis.call('HINCRBY', KEYS[2], ARGV[3] .. ':' .. outcome, 1)
+return {count, ttl}
+"""
+
+METRICS_FIELDS_KEY = "rl:metrics:fields"
+
+_local_lock = threading.Lock()
+_script = None
+
+
+def _backend_errors() -> tuple[type[BaseException], ...]:
+    """Error cache/koneksi yang membuat limiter fail open."""
+    errors: list[type[BaseException]] = [OSError, DatabaseError]
+    try:
+        from redis.exceptions import RedisError
+
+        errors.append(RedisError)
+    except ModuleNotFoundError:  # pragma: no cover - redis optional
+        pass
+    try:
+        from django_redis.exceptions import ConnectionInterrupted
+
+        errors.append(ConnectionInterrupted)
+    except ModuleNotFoundError:  # pragma: no cover - django-redis optional
+        pass
+    return tuple(errors)
+
+
+BACKEND_ERRORS = _backend_errors()
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    count: int
+    limit: int
+    window: int
+    reset_at: float
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.limit - self.count)
+
+    @property
+    def retry_after(self) -> int:
+        return max(0, int(self.reset_at - time.time()) + 1)
+
+
+def _redis_connection():
+    return get_cache_redis_client(cache)
+
+
+def _redis_hit(conn, key: str, limit: int, window: int, category: str):
+    global _script
+    if _script is None:
+        _script = conn.register_script(_LUA_HIT)
+    # RedisCache bawaan membuat client baru per panggilan: client dioper eksplisit
+    count, ttl_ms = _script(
+        keys=[cache.make_key(key), cache.make_key(METRICS_KEY)],
+        args=[window * 1000, limit, category],
+        client=conn,
+    )
+    return int(count), time.time() + int(ttl_ms) / 1000.0
+
+
+def _incr(key: str, timeout: int | None) -> tuple[int, bool]:
+    """``add`` + ``incr``; kembalikan (nilai baru, key baru dibuat)."""
+    created = cache.add(key, 0, timeout=timeout)
+    try:
+        return cache.incr(key), created
+    except ValueError:
+        # Key kedaluwarsa di antara add dan incr: mulai ulang
+        created = cache.add(key, 0, timeout=timeout)
+        return cache.incr(key), created
+
+
+def _record_metric(category: str, denied: bool) -> None:
+    field = f"{category}:{'denied' if denied else 'allowed'}"
+    _, created = _incr(f"{METRICS_KEY}:{field}", None)
+    if created:
+        # Daftar field hanya berubah saat kategori/outcome pertama kali muncul
+        fields = cache.get(METRICS_FIELDS_KEY) or []
+        if field not in fields:
+            cache.set(METRICS_FIELDS_KEY, [*fields, field], timeout=None)
+
+
+def _counter_hit(key: str, limit: int, window: int, category: str):
+    reset_key = f"{key}:reset"
+    count, created = _incr(key, window)
+    if created:
+        reset_at = time.time() + window
+        cache.set(reset_key, reset_at, timeout=window + 1)
+    else:
+        reset_at = cache.get(reset_key) or time.time() + window
+    _record_metric(category, count > limit)
+    return count, reset_at
+
+
+def _local_hit(key: str, limit: int, window: int, category: str):
+    now = time.time()
+    with _local_lock:
+        count, reset_at = cache.get(key) or (0, 0.0)
+        if reset_at <= now:
+            count, reset_at = 0, now + window
+        count += 1
+        cache.set(key, (count, reset_at), timeout=max(1, int(reset_at - now) + 1))
+
+        metrics = cache.get(METRICS_KEY) or {}
+        field = f"{category}:{'denied' if count > limit else 'allowed'}"
+        metrics[field] = metrics.get(field, 0) + 1
+        cache.set(METRICS_KEY, metrics, timeout=None)
+    return count, reset_at
+
+
+def hit(identity: str, limit: int, window: int, *, category: str = "default") -> RateLimitResult:
+    """
+    Catat satu request untuk ``identity`` dan kembalikan hasil pengecekan.
+
+    Request yang ditolak tetap dihitung. Jika cache/Redis tidak terjangkau,
+    request diizinkan (fail open) supaya limiter tidak ikut menjatuhkan API;
+    error lain (bug) tetap diteruskan.
+    """
+    key = f"{KEY_PREFIX}:{identity}"
+    try:
+        conn = _redis_connection()
+        if conn is not None:
+            count, reset_at = _redis_hit(conn, key, limit, window, category)
+        elif is_process_local_cache(cache):
+            count, reset_at = _local_hit(key, limit, window, category)
+        else:
+            count, reset_at = _counter_hit(key, limit, window, category)
+    except BACKEND_ERRORS as exc:
+        logger.warning("Rate limiter unavailable for %s: %s", identity, exc)
+        return RateLimitResult(True, 0, limit, window, time.time() + window)
+    return RateLimitResult(count <= limit, count, limit, window, reset_at)
+
+
+def peek(identity: str, limit: int, window: int) -> RateLimitResult:
+    """Status ``identity`` tanpa mencatat request."""
+    key = f"{KEY_PREFIX}:{identity}"
+    now = time.time()
+    conn = _redis_connection()
+    if conn is not None:
+        raw_key = cache.make_key(key)
+        pipe = conn.pipeline()
+        pipe.get(raw_key)
+        pipe.pttl(raw_key)
+        raw_count, ttl_ms = pipe.execute()
+        count = int(raw_count or 0)
+        reset_at = now + max(0, int(ttl_ms)) / 1000.0
+    elif is_process_local_cache(cache):
+        count, reset_at = cache.get(key) or (0, now)
+        if reset_at <= now:
+            count, reset_at = 0, now
+    else:
+        values = cache.get_many([key, f"{key}:reset"])
+        count = int(values.get(key) or 0)
+        reset_at = values.get(f"{key}:reset") or now
+    return RateLimitResult(count < limit, count, limit, window, reset_at)
+
+
+def reset(identity: str) -> None:
+    key = f"{KEY_PREFIX}:{identity}"
+    cache.delete_many([key, f"{key}:reset"])
+
+
+def get_rate_limit_metrics() -> dict:
+    """``{kategori: {"allowed": n, "denied": n}}``"""
+    conn = _redis_connection()
+    if conn is not None:
+        raw = {
+            k.decode() if isinstance(k, bytes) else k: int(v)
+            for k, v in conn.hgetall(cache.make_key(METRICS_KEY)).items()
+        }
+    elif is_process_local_cache(cache):
+        raw = cache.get(METRICS_KEY) or {}
+    else:
+        fields = cache.get(METRICS_FIELDS_KEY) or []
+        values = cache.get_many([f"{METRICS_KEY}:{field}" for field in fields])
+        raw = {field: int(values.get(f"{METRICS_KEY}:{field}") or 0) for field in fields}
+
+    metrics = {}
+    for field, value in raw.items():
+        category, _, outcome = field.rpartition(":")
+        metrics.setdefault(category, {"allowed": 0, "denied": 0})[outcome] = value
+    return metrics
+
+
+def reset_rate_limit_metrics() -> None:
+    fields = cache.get(METRICS_FIELDS_KEY) or []
+    cache.delete_many([METRICS_KEY, METRICS_FIELDS_KEY, *(f"{METRICS_KEY}:{field}" for field in fields)])
@@ -0,0 +1,41 @@
+"""
+Raw Redis client di balik cache Django.
+
+Dipakai untuk operasi yang tidak tersedia di API cache (Lua, list, hash):
+rate limiter dan antrean audit bersama. Mendukung django-redis dan backend
+bawaan Django (``django.core.cache.backends.redis.RedisCache``); backend
+lain (db, locmem, memcached) mengembalikan ``None``.
+"""
+
+from __future__ import annotations
+
+from django.core.cache import caches
+from django.utils.connection import ConnectionProxy
+
+
+def _resolve(cache_backend):
+    # ``django.core.cache.cache`` adalah ConnectionProxy: type() harus dicek
+    # pada backend aslinya
+    if cache_backend is None:
+        return caches["default"]
+    if isinstance(cache_backend, ConnectionProxy):
+        return caches[cache_backend._alias]
+    return cache_backend
+
+
+def get_cache_redis_client(cache_backend=None):
+    """redis.Redis untuk ``cache_backend`` (default: cache default), atau None."""
+    backend = _resolve(cache_backend)
+    module = type(backend).__module__
+    if module.startswith("django_redis"):
+        # Pakai pool milik backend itu sendiri (bukan alias "default")
+        return backend.client.get_client(write=True)
+    if module.startswith("django.core.cache.backends.redis"):
+        return backend._cache.get_client(write=True)
+    return None
+
+
+def is_process_local_cache(cache_backend=None) -> bool:
+    """True untuk locmem: cache (dan lock-nya) hanya berlaku dalam satu proses."""
+    backend = _resolve(cache_backend)
+    return type(backend).__module__.startswith("django.core.cache.backends.locmem")
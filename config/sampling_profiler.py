@@ -0,0 +1,172 @@
+"""
+Sampling profiler untuk request lambat di production.
+
+Satu thread sampler (daemon) mengambil stack thread request yang sedang
+diprofil lewat ``sys._current_frames()`` setiap ``interval_ms``. Tidak ada
+``sys.setprofile``/tracing, jadi overhead per request hanya registrasi +
+sampling berkala, dan nol bila fitur dimatikan.
+
+Sample disimpan per request; baru digabung ke store per endpoint bila
+request melewati threshold latensi atau di-flag (header, staff). Output
+berupa *collapsed stacks* (``frame;frame;frame count``) yang langsung bisa
+dibaca flamegraph.pl, speedscope atau inferno::
+
+    with profiling() as samples:
+        export_jadwal(...)
+    record_profile("detail_project:export_jadwal", samples)
+    print(collapsed_stacks("detail_project:export_jadwal"))
+"""
+
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+MAX_STACK_DEPTH = 128
+# Batas memori store: endpoint dan stack unik per endpoint
+MAX_ENDPOINTS = 100
+MAX_STACKS_PER_ENDPOINT = 5000
+OVERFLOW_STACK = "(other)"
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__") or code.co_filename
+    return f"{module}:{code.co_name}"
+
+
+def collapse_stack(frame, limit: int = MAX_STACK_DEPTH) -> str:
+    """Stack ``frame`` sebagai ``root;...;leaf`` (format collapsed flame graph)."""
+    labels = []
+    while frame is not None and len(labels) < limit:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    # ';' adalah separator frame, spasi adalah separator count
+    return ";".join(label.replace(";", ":").replace(" ", "_") for label in labels)
+
+
+class _Sampler:
+    """Thread sampler bersama untuk semua request yang sedang diprofil."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._active: Dict[int, Counter] = {}
+        self._thread: Optional[threading.Thread] = None
+        self.interval = 0.01
+
+    def register(self, thread_id: int, interval_ms: float) -> Counter:
+        samples = Counter()
+        with self._lock:
+            self.interval = max(0.001, interval_ms / 1000.0)
+            self._active[thread_id] = samples
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+        return samples
+
+    def unregister(self, thread_id: int) -> None:
+        with self._lock:
+            self._active.pop(thread_id, None)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                active = dict(self._active)
+                if not active:
+                    self._wake.clear()
+            if not active:
+                # Tidur sampai ada request yang diprofil lagi
+                self._wake.wait()
+                continue
+            frames = sys._current_frames()
+            for thread_id, samples in active.items():
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    samples[collapse_stack(frame)] += 1
+            del frames
+            time.sleep(self.interval)
+
+
+_sampler = _Sampler()
+
+
+@contextmanager
+def profiling(interval_ms: float = 10.0):
+    """Sampling stack thread saat ini selama blok berjalan; yield ``Counter`` sample."""
+    thread_id = threading.get_ident()
+    samples = _sampler.register(thread_id, interval_ms)
+    try:
+        yield samples
+    finally:
+        _sampler.unregister(thread_id)
+
+
+# Store per endpoint (in-memory, per proses; sama seperti utils.performance.METRICS)
+_store_lock = threading.Lock()
+_PROFILES: Dict[str, dict] = {}
+
+
+def record_profile(endpoint: str, samples: Counter, *, duration_ms: float = 0.0) -> bool:
+    """Gabungkan sample satu request ke profil endpoint. False bila store penuh."""
+    with _store_lock:
+        profile = _PROFILES.get(endpoint)
+        if profile is None:
+            if len(_PROFILES) >= MAX_ENDPOINTS:
+                return False
+            profile = _PROFILES[endpoint] = {
+                "requests": 0, "samples": 0, "max_ms": 0.0, "total_ms": 0.0, "stacks": Counter(),
+            }
+        profile["requests"] += 1
+        profile["total_ms"] += duration_ms
+        profile["max_ms"] = max(profile["max_ms"], duration_ms)
+        stacks = profile["stacks"]
+        for stack, count in samples.items():
+            profile["samples"] += count
+            if stack in stacks or len(stacks) < MAX_STACKS_PER_ENDPOINT:
+                stacks[stack] += count
+            else:
+                stacks[OVERFLOW_STACK] += count
+    return True
+
+
+def collapsed_stacks(endpoint: Optional[str] = None) -> str:
+    """Collapsed stacks (``stack count`` per baris) untuk satu atau semua endpoint."""
+    with _store_lock:
+        selected = [endpoint] if endpoint is not None else sorted(_PROFILES)
+        merged = Counter()
+        for name in selected:
+            profile = _PROFILES.get(name)
+            if profile is None:
+                continue
+            prefix = f"{name.replace(' ', '_')};" if endpoint is None else ""
+            for stack, count in profile["stacks"].items():
+                merged[prefix + stack] += count
+    return "".join(f"{stack} {count}\n" for stack, count in sorted(merged.items()))
+
+
+def get_profile_summary(top: int = 5) -> Dict[str, dict]:
+    """Ringkasan per endpoint: jumlah request/sample, latensi dan leaf frame terbanyak."""
+    summary = {}
+    with _store_lock:
+        for name, profile in _PROFILES.items():
+            leaves = Counter()
+            for stack, count in profile["stacks"].items():
+                leaves[stack.rsplit(";", 1)[-1]] += count
+            summary[name] = {
+                "requests": profile["requests"],
+                "samples": profile["samples"],
+                "avg_ms": round(profile["total_ms"] / profile["requests"], 1) if profile["requests"] else 0.0,
+                "max_ms": round(profile["max_ms"], 1),
+                "top_frames": leaves.most_common(top),
+            }
+    return summary
+
+
+def reset_profiles() -> None:
+    with _store_lock:
+        _PROFILES.clear()
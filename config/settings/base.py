@@ -77,6 +77,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "config.middleware.sampling_profiler.SamplingProfilerMiddleware",  # Opt-in (SAMPLING_PROFILER_ENABLED)
     "accounts.middleware.SubscriptionMiddleware",  # Subscription access control
     "simple_history.middleware.HistoryRequestMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
@@ -319,6 +320,20 @@ else:
     }
 
 PERFORMANCE_LOG_THRESHOLD = float(os.getenv("DJANGO_PERF_THRESHOLD", "1.0"))
+# config.query_budget: True = budget query yang terlampaui melempar error (test/CI),
+# False = hanya warning di log "query_budget"
+QUERY_BUDGET_STRICT = os.getenv("QUERY_BUDGET_STRICT", "False").lower() in ("true", "1", "yes")
+
+# ---------------------------------------------------------------------------
+# Sampling Profiler (config.sampling_profiler)
+# ---------------------------------------------------------------------------
+
+# Stack sampling per request; hanya request lambat atau yang di-flag staff via
+# header yang disimpan. Hasil: api/monitoring/profiler/ (collapsed stacks)
+SAMPLING_PROFILER_ENABLED = os.getenv("SAMPLING_PROFILER_ENABLED", "False").lower() in ("true", "1", "yes")
+SAMPLING_PROFILER_INTERVAL_MS = float(os.getenv("SAMPLING_PROFILER_INTERVAL_MS", "10"))
+SAMPLING_PROFILER_THRESHOLD_MS = float(os.getenv("SAMPLING_PROFILER_THRESHOLD_MS", "2000"))
+SAMPLING_PROFILER_HEADER = os.getenv("SAMPLING_PROFILER_HEADER", "X-Profile")
 
 # ---------------------------------------------------------------------------
 # Rate Limiting (Phase 1 Security)
@@ -348,6 +363,36 @@ FTS_ENABLE_SUGGESTIONS = os.getenv("FTS_ENABLE_SUGGESTIONS", "True").lower() ==
 FTS_CACHE_RESULTS = os.getenv("FTS_CACHE_RESULTS", "True").lower() == "true"
 FTS_CACHE_TTL = int(os.getenv("FTS_CACHE_TTL", "300"))  # 5 minutes
 
+# ---------------------------------------------------------------------------
+# Export Artifact Cache
+# ---------------------------------------------------------------------------
+
+# Generated PDF/Word/XLSX files are reused while the project data is unchanged
+EXPORT_ARTIFACT_CACHE_ENABLED = os.getenv("EXPORT_ARTIFACT_CACHE_ENABLED", "True").lower() == "true"
+EXPORT_ARTIFACT_CACHE_DIR = os.getenv("EXPORT_ARTIFACT_CACHE_DIR", str(MEDIA_ROOT / "exports" / "cache"))
+EXPORT_ARTIFACT_CACHE_MAX_BYTES = int(os.getenv("EXPORT_ARTIFACT_CACHE_MAX_MB", "512")) * 1024 * 1024
+EXPORT_ARTIFACT_CACHE_MAX_AGE = int(os.getenv("EXPORT_ARTIFACT_CACHE_MAX_AGE", str(7 * 24 * 3600)))  # seconds
+
+# Files generated by async exports stay downloadable this long (ExportSession.expires_at)
+EXPORT_ASYNC_RETENTION_HOURS = int(os.getenv("EXPORT_ASYNC_RETENTION_HOURS", "24"))
+
+# ---------------------------------------------------------------------------
+# Detail AHSP Audit
+# ---------------------------------------------------------------------------
+
+# Audit entries store row deltas; every Nth entry per pekerjaan is a full checkpoint
+DETAIL_AUDIT_CHECKPOINT_INTERVAL = int(os.getenv("DETAIL_AUDIT_CHECKPOINT_INTERVAL", "20"))
+
+# ---------------------------------------------------------------------------
+# Rekap Cache (stale-while-revalidate)
+# ---------------------------------------------------------------------------
+
+# Read endpoints may serve the last good rekap while one worker recomputes
+REKAP_SWR_ASYNC = os.getenv("REKAP_SWR_ASYNC", "False").lower() == "true"  # recompute via Celery
+REKAP_SWR_LOCK_TIMEOUT = int(os.getenv("REKAP_SWR_LOCK_TIMEOUT", "120"))  # seconds
+REKAP_SWR_LOCK_WAIT = float(os.getenv("REKAP_SWR_LOCK_WAIT", "10"))  # seconds, strict callers
+REKAP_SWR_STALE_TTL = int(os.getenv("REKAP_SWR_STALE_TTL", str(24 * 3600)))  # seconds
+
 # ---------------------------------------------------------------------------
 # Celery Configuration (Phase 5: Async Tasks)
 # ---------------------------------------------------------------------------
@@ -449,12 +494,27 @@ REFERENSI_CONFIG = {
         "max_size_mb": 10,
         "allowed_extensions": [".xlsx", ".xls"],
     },
+    "parser": {
+        # Parse every sheet of uploaded workbooks (one worker process per sheet)
+        "all_sheets": os.getenv("REFERENSI_PARSE_ALL_SHEETS", "False").lower() == "true",
+        "max_workers": int(os.getenv("REFERENSI_PARSER_WORKERS", "4")),
+    },
     "api": {
         "search_limit": 30,
     },
     "cache": {
         "timeout": 3600,
     },
+    "audit": {
+        # Queue SecurityAuditLog events and write them with bulk_create.
+        # "true": shared Redis list drained by Celery (web processes without
+        # Redis write directly); "process": per-process buffer everywhere;
+        # "false": never. See referensi.services.audit_buffer
+        "buffered": os.getenv("REFERENSI_AUDIT_BUFFERED", "true").lower(),
+        "max_queue": int(os.getenv("REFERENSI_AUDIT_MAX_QUEUE", "10000")),
+        "flush_size": int(os.getenv("REFERENSI_AUDIT_FLUSH_SIZE", "200")),
+        "flush_interval": float(os.getenv("REFERENSI_AUDIT_FLUSH_INTERVAL", "2.0")),
+    },
 }
 
 # ---------------------------------------------------------------------------
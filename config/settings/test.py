@@ -52,6 +52,12 @@ CACHES = {
     }
 }
 
+# Query budgets (config.query_budget) fail the test instead of logging
+QUERY_BUDGET_STRICT = True
+
+# Export artifact cache writes to MEDIA_ROOT; tests opt in with a temp dir
+EXPORT_ARTIFACT_CACHE_ENABLED = False
+
 # Cookie/session security flags
 # NOTE: Set to False in tests because Django Test Client uses HTTP (not HTTPS)
 # Production uses HTTPS and these should be True in production settings
@@ -100,3 +106,9 @@ LOGGING = {
         'level': 'WARNING',
     },
 }
+
+# Audit events are written synchronously so tests can assert on them
+REFERENSI_CONFIG = {  # noqa: F405
+    **REFERENSI_CONFIG,  # noqa: F405
+    "audit": {**REFERENSI_CONFIG["audit"], "buffered": False},  # noqa: F405
+}
@@ -0,0 +1,107 @@
+"""
+Streaming Excel writer untuk export daftar project.
+
+Memakai workbook openpyxl write-only sehingga memori tidak tumbuh per sel.
+Lebar kolom dihitung dari pelacak panjang maksimum selama satu kali
+penulisan baris. Karena mode write-only menulis ``<cols>`` sebelum baris
+pertama, baris di-spool dulu ke file sementara (pickle per baris) lalu
+diputar ulang ke worksheet setelah lebar kolom diketahui.
+"""
+
+import pickle
+import tempfile
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+class StreamingSheetWriter:
+    """
+    Tulis satu sheet secara streaming.
+
+    ``column_styles`` memetakan index kolom (1-based) ke dict atribut style
+    (``font``, ``fill``, ``alignment``, ``border``, ``number_format``) yang
+    diterapkan ke setiap sel data kolom tersebut. ``cell_style`` opsional
+    menerima ``(col_num, value)`` dan mengembalikan style tambahan per sel.
+    """
+
+    def __init__(self, title, headers, *, header_style=None, column_styles=None,
+                 cell_style=None, count_empty=True, max_width=50, padding=2):
+        self.title = title
+        self.headers = list(headers)
+        self.header_style = header_style or {}
+        self.column_styles = column_styles or {}
+        self.cell_style = cell_style
+        self.count_empty = count_empty
+        self.max_width = max_width
+        self.padding = padding
+        self.widths = [len(str(header)) for header in self.headers]
+        self.row_count = 0
+        self._spool = tempfile.TemporaryFile()
+
+    def _track(self, values):
+        for idx, value in enumerate(values):
+            if value is None or (not self.count_empty and not value):
+                continue
+            length = len(str(value))
+            if idx >= len(self.widths):
+                self.widths.append(length)
+            elif length > self.widths[idx]:
+                self.widths[idx] = length
+
+    def append(self, values):
+        values = list(values)
+        self._track(values)
+        pickle.dump(values, self._spool, protocol=pickle.HIGHEST_PROTOCOL)
+        self.row_count += 1
+
+    def _iter_spooled(self):
+        self._spool.seek(0)
+        while True:
+            try:
+                yield pickle.load(self._spool)
+            except EOFError:
+                return
+
+    @staticmethod
+    def _styled(ws, value, style):
+        cell = WriteOnlyCell(ws, value=value)
+        for attr, attr_value in style.items():
+            setattr(cell, attr, attr_value)
+        return cell
+
+    def _data_cell(self, ws, col_num, value):
+        style = self.column_styles.get(col_num)
+        extra = self.cell_style(col_num, value) if self.cell_style else None
+        if extra:
+            style = {**(style or {}), **extra}
+        if not style:
+            return value
+        return self._styled(ws, value, style)
+
+    def save(self, target):
+        """Bangun workbook write-only dan simpan ke ``target`` (file/response)."""
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet(self.title)
+        for col_num, width in enumerate(self.widths, 1):
+            ws.column_dimensions[get_column_letter(col_num)].width = min(
+                width + self.padding, self.max_width
+            )
+
+        ws.append([self._styled(ws, header, self.header_style) for header in self.headers])
+        try:
+            for values in self._iter_spooled():
+                ws.append([
+                    self._data_cell(ws, col_num, value)
+                    for col_num, value in enumerate(values, 1)
+                ])
+            wb.save(target)
+        finally:
+            self.close()
+
+    def close(self):
+        if not self._spool.closed:
+            self._spool.close()
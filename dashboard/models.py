@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from decimal import Decimal
 from django.contrib.auth import get_user_model
 from django.urls import reverse
@@ -156,16 +156,22 @@ class Project(models.Model):
                 created_at__date=now.date()
             ).count()
 
-            # loop sampai unik (safety terhadap race)
+            # Loop sampai unik. exists() tidak melihat baris transaksi lain yang
+            # belum commit (mis. batch copy paralel), jadi simpan di savepoint
+            # dan coba kandidat berikutnya bila constraint unik menolak.
             while True:
                 count_today += 1
                 suffix = str(count_today).zfill(4)
                 candidate = f"{prefix}-{suffix}"
-                if not Project.objects.filter(index_project=candidate).exists():
-                    self.index_project = candidate
+                if Project.objects.filter(index_project=candidate).exists():
+                    continue
+                self.index_project = candidate
+                try:
+                    with transaction.atomic():
+                        super().save(update_fields=["index_project"])
                     break
-
-            super().save(update_fields=["index_project"])
+                except IntegrityError:
+                    self.index_project = None
 
     def get_absolute_url(self):
         return reverse('dashboard:project_detail', kwargs={'pk': self.pk})
@@ -0,0 +1,72 @@
+from datetime import date, timedelta
+from io import BytesIO
+
+import openpyxl
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from dashboard.models import Project
+
+
+User = get_user_model()
+TEST_MIDDLEWARE = [
+    middleware
+    for middleware in settings.MIDDLEWARE
+    if middleware != "config.middleware.timeout.TimeoutMiddleware"
+]
+
+
+@override_settings(MIDDLEWARE=TEST_MIDDLEWARE)
+class StreamingExcelExportTests(TestCase):
+    def setUp(self):
+        self.password = "StrongPass123!@#"
+        self.owner = User.objects.create_user(
+            username="owner_export",
+            email="owner_export@example.com",
+            password=self.password,
+            subscription_status=User.SubscriptionStatus.PRO,
+            subscription_end_date=timezone.now() + timedelta(days=30),
+        )
+        self.projects = [
+            Project.objects.create(
+                owner=self.owner,
+                nama=f"Project {idx}" + (" dengan nama yang cukup panjang" if idx == 2 else ""),
+                sumber_dana="APBD",
+                lokasi_project="Bandung",
+                nama_client="Client",
+                anggaran_owner=1_500_000 * (idx + 1),
+                tanggal_mulai=date(2025, 1, 1),
+            )
+            for idx in range(3)
+        ]
+        self.client.login(username=self.owner.username, password=self.password)
+
+    def _load(self, response):
+        self.assertEqual(response.status_code, 200)
+        return openpyxl.load_workbook(BytesIO(response.content)).active
+
+    def test_dashboard_export_streams_rows_and_sizes_columns(self):
+        ws = self._load(self.client.get(reverse("dashboard:export_excel")))
+
+        self.assertEqual(ws.title, "Daftar Project")
+        self.assertEqual(ws.max_row, 4)
+        self.assertEqual(ws["A1"].value, "Index")
+        self.assertTrue(ws["A1"].font.bold)
+        self.assertEqual(ws["F2"].number_format, "#,##0.00")
+        self.assertEqual(ws["R2"].number_format, "DD/MM/YYYY")
+        longest = max(len(project.nama) for project in self.projects)
+        self.assertEqual(ws.column_dimensions["B"].width, longest + 2)
+
+    def test_bulk_export_only_selected_projects(self):
+        ids = [self.projects[0].pk, self.projects[2].pk]
+        ws = self._load(self.client.get(reverse("dashboard:bulk_export_excel"), {"ids": ids}))
+
+        self.assertEqual(ws.title, "Selected Projects")
+        self.assertEqual(ws.max_row, 3)
+        self.assertEqual([ws["A2"].value, ws["A3"].value], [1, 2])
+        self.assertEqual(ws["H2"].number_format, "#,##0")
+        self.assertEqual(ws["H2"].alignment.horizontal, "right")
+        self.assertEqual(ws.column_dimensions["C"].width, len(self.projects[2].nama) + 2)
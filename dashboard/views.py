@@ -13,14 +13,16 @@ from django.utils.safestring import mark_safe
 from datetime import date, timedelta
 import json
 import decimal
+import logging
 
 from .forms import ProjectForm, ProjectFilterForm, UploadProjectForm
 from .models import Project
 from detail_project.progress_utils import reset_project_progress
-from detail_project.models import PekerjaanProgressWeekly, Pekerjaan
 
 import openpyxl
 
+logger = logging.getLogger(__name__)
+
 
 # Custom JSON Encoder for Decimal types
 class DecimalEncoder(json.JSONEncoder):
@@ -234,107 +236,20 @@ def dashboard_view(request):
 
     # === Calculate progress realization (Weighted by Cost - S-Curve Logic) ===
     # Progress = Sum(Worker Item Cost * Actual %) / Total Project Cost
-    from collections import defaultdict
-    from detail_project.services import compute_rekap_for_project
-    from django.db.models import Sum, Value, DecimalField
-    from django.db.models.functions import Coalesce
-    from decimal import Decimal
-
-    # Cache progress calculation to avoid recomputing rekap for every page load if possible
-    # But for now, we'll do it per-project on the current page to ensure accuracy
-    
-    project_ids = [p.id for p in page_obj.object_list]
-    # Get actual progress sums per pekerjaan once for all projects in this page
-    # Output: {pekerjaan_id: total_actual_proportion}
-    pekerjaan_actual_aggregates = {}
-    
-    weekly_aggregates = PekerjaanProgressWeekly.objects.filter(
-        project_id__in=project_ids
-    ).values('pekerjaan_id').annotate(
-        total_actual=Coalesce(
-            Sum('actual_proportion'),
-            Value(Decimal('0')),
-            output_field=DecimalField()
-        )
-    )
-    
-    for agg in weekly_aggregates:
-        pekerjaan_actual_aggregates[agg['pekerjaan_id']] = float(agg['total_actual'])
-
-    # Batch-load pekerjaan cost basis once to avoid per-project queries (N+1).
-    pekerjaan_by_project = defaultdict(list)
-    projects_needing_rekap = set()
-    if project_ids:
-        pekerjaan_rows = Pekerjaan.objects.filter(project_id__in=project_ids).values(
-            'id', 'project_id', 'budgeted_cost'
-        )
-        for row in pekerjaan_rows:
-            pekerjaan_by_project[row['project_id']].append(row)
-            if not row['budgeted_cost'] or row['budgeted_cost'] <= 0:
-                projects_needing_rekap.add(row['project_id'])
+    # Read from the precomputed per-project rollup; only projects whose
+    # progress/volume/price inputs changed since the last read are recomputed.
+    from detail_project.progress_utils import get_progress_summaries, get_stored_progress_summaries
 
-    # Only compute fallback rekap for projects that really need it.
-    rekap_total_by_project = {}
-    for project in page_obj.object_list:
-        if project.id not in projects_needing_rekap:
-            continue
-        try:
-            rekap_rows = compute_rekap_for_project(project)
-            rekap_total_by_project[project.id] = {
-                row['pekerjaan_id']: Decimal(str(row.get('total', 0)))
-                for row in rekap_rows
-            }
-        except Exception:
-            rekap_total_by_project[project.id] = {}
+    try:
+        progress_summaries = get_progress_summaries(page_obj.object_list)
+    except Exception:
+        # Jangan tampilkan 0%: pakai rollup terakhir yang tersimpan
+        logger.exception("Refresh progress rollup gagal untuk dashboard user %s", request.user.id)
+        progress_summaries = get_stored_progress_summaries(page_obj.object_list)
 
     for project in page_obj.object_list:
-        try:
-            pekerjaan_rows = pekerjaan_by_project.get(project.id, [])
-            fallback_lookup = rekap_total_by_project.get(project.id, {})
-            total_project_cost = Decimal('0.00')
-            total_realization_cost = Decimal('0.00')
-
-            for pkj in pekerjaan_rows:
-                pekerjaan_id = pkj['id']
-                budgeted_cost = pkj['budgeted_cost']
-                # Prioritize budgeted_cost (like S-Curve logic), fallback to computed rekap total.
-                if budgeted_cost and budgeted_cost > 0:
-                    item_cost = budgeted_cost
-                else:
-                    item_cost = fallback_lookup.get(pekerjaan_id, Decimal('0'))
-
-                if item_cost > 0:
-                    total_project_cost += item_cost
-                    # Get actual progress % for this item
-                    # Actual is 0-100 scale, so divide by 100
-                    actual_percent = pekerjaan_actual_aggregates.get(pekerjaan_id, 0.0)
-                    # Cap at 100% just in case
-                    actual_percent = min(actual_percent, 100.0)
-                    
-                    realization = item_cost * Decimal(str(actual_percent / 100.0))
-                    total_realization_cost += realization
-            
-            # 2. Calculate Weighted Progress
-            if total_project_cost > 0:
-                weighted_progress = float((total_realization_cost / total_project_cost) * 100)
-            else:
-                # Fallback to unweighted average if no cost data available (e.g. awal project)
-                # or 0 if no progress
-                if pekerjaan_rows:
-                    sum_progress = sum(
-                        pekerjaan_actual_aggregates.get(p['id'], 0.0) for p in pekerjaan_rows
-                    )
-                    weighted_progress = sum_progress / len(pekerjaan_rows)
-                else:
-                    weighted_progress = 0.0
-                    
-            project.progress_realisasi = weighted_progress
-            
-        except Exception as e:
-            # Fallback gracefully on error
-            project.progress_realisasi = 0.0
-            # Log error ideally
-            pass
+        summary = progress_summaries.get(project.id)
+        project.progress_realisasi = float(summary.actual_percent) if summary else 0.0
 
     # === FASE 2.1: Analytics & Statistics ===
     all_active_projects = Project.objects.filter(owner=request.user, is_active=True)
@@ -16,9 +16,8 @@ from django.db import transaction
 from django.shortcuts import get_object_or_404
 
 from .models import Project
-import openpyxl
+from .excel_stream import StreamingSheetWriter, XLSX_CONTENT_TYPE
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
 from datetime import date
 
 
@@ -202,11 +201,6 @@ def bulk_export_excel(request):
         if not queryset.exists():
             return HttpResponse('No valid projects found', status=404)
 
-        # Create workbook and worksheet
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Selected Projects"
-
         # Define headers
         headers = [
             'No',
@@ -225,29 +219,41 @@ def bulk_export_excel(request):
             'Created',
         ]
 
-        # Style for header
-        header_font = Font(bold=True, color="FFFFFF", size=11)
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        header_alignment = Alignment(horizontal="center", vertical="center")
+        # Style for header and data cells
         border = Border(
             left=Side(style='thin'),
             right=Side(style='thin'),
             top=Side(style='thin'),
             bottom=Side(style='thin')
         )
-
-        # Write headers
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col_num)
-            cell.value = header
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-            cell.border = border
+        column_styles = {col_num: {'border': border} for col_num in range(1, len(headers) + 1)}
+        column_styles[1]['alignment'] = Alignment(horizontal="center")  # No
+        column_styles[8]['alignment'] = Alignment(horizontal="right")   # Anggaran
+
+        def _anggaran_format(col_num, value):
+            # Format as currency
+            if col_num == 8 and isinstance(value, (int, float)):
+                return {'number_format': '#,##0'}
+            return None
+
+        # Write-only workbook; column widths are tracked while rows are written
+        writer = StreamingSheetWriter(
+            "Selected Projects",
+            headers,
+            header_style={
+                'font': Font(bold=True, color="FFFFFF", size=11),
+                'fill': PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid"),
+                'alignment': Alignment(horizontal="center", vertical="center"),
+                'border': border,
+            },
+            column_styles=column_styles,
+            cell_style=_anggaran_format,
+            count_empty=False,
+        )
 
         # Write data
         today = date.today()
-        for row_num, project in enumerate(queryset, 2):
+        for row_num, project in enumerate(queryset.iterator(chunk_size=500), 2):
             # Determine status
             if not project.is_active:
                 status = "Archived"
@@ -260,7 +266,7 @@ def bulk_export_excel(request):
             else:
                 status = "Berjalan"
 
-            row_data = [
+            writer.append([
                 row_num - 1,  # No
                 project.index_project or 'N/A',
                 project.nama,
@@ -275,44 +281,12 @@ def bulk_export_excel(request):
                 status,
                 project.kategori or '',
                 project.created_at.strftime('%Y-%m-%d %H:%M') if project.created_at else '',
-            ]
-
-            for col_num, value in enumerate(row_data, 1):
-                cell = ws.cell(row=row_num, column=col_num)
-                cell.value = value
-                cell.border = border
-
-                # Alignment
-                if col_num == 1:  # No
-                    cell.alignment = Alignment(horizontal="center")
-                elif col_num == 8:  # Anggaran
-                    cell.alignment = Alignment(horizontal="right")
-                    # Format as currency
-                    if isinstance(value, (int, float)):
-                        cell.number_format = '#,##0'
-
-        # Auto-adjust column widths
-        for col_num in range(1, len(headers) + 1):
-            column_letter = get_column_letter(col_num)
-            max_length = 0
-
-            for row in ws.iter_rows(min_col=col_num, max_col=col_num):
-                for cell in row:
-                    try:
-                        if cell.value:
-                            max_length = max(max_length, len(str(cell.value)))
-                    except:
-                        pass
-
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
+            ])
 
         # Create response
-        response = HttpResponse(
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
+        response = HttpResponse(content_type=XLSX_CONTENT_TYPE)
         response['Content-Disposition'] = f'attachment; filename="selected_projects_{date.today()}.xlsx"'
-        wb.save(response)
+        writer.save(response)
 
         return response
 
@@ -1,19 +1,28 @@
 from django.http import HttpResponse
 from django.contrib.auth.decorators import login_required
-from django.db.models import Sum, Value, DecimalField, Q, CharField
-from django.db.models.functions import Coalesce, Cast
-from decimal import Decimal
-from collections import defaultdict
-import openpyxl
-from openpyxl.styles import Font, Alignment, Border, Side
+from django.db.models import Q, CharField
+from django.db.models.functions import Cast
+from openpyxl.styles import Font, Alignment, PatternFill
 from datetime import date, timedelta
+from itertools import islice
 
 from .models import Project
 from .forms import ProjectFilterForm
-from detail_project.services import compute_rekap_for_project
-from detail_project.models import PekerjaanProgressWeekly, Pekerjaan
+from .excel_stream import StreamingSheetWriter, XLSX_CONTENT_TYPE
+from detail_project.progress_utils import get_progress_summaries
 from accounts.mixins import api_export_excel_word_required, api_pdf_export_allowed
 
+EXPORT_CHUNK_SIZE = 500
+
+
+def _iter_chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
 
 def _apply_dashboard_filters(request, queryset):
     """
@@ -157,60 +166,8 @@ def export_dashboard_xlsx(request):
 
     # 2. Apply filters (kept in sync with dashboard_view)
     queryset = _apply_dashboard_filters(request, queryset)
-    projects = list(queryset)
-
-    # 3. Calculate Progress for all filtered projects (Batch optimization)
-    # We do this logic manually to match dashboard_view's new weighted logic
-    
-    # Pre-fetch actual sums
-    project_ids = [project.id for project in projects]
-    pekerjaan_actual_aggregates = {}
-    
-    weekly_aggregates = PekerjaanProgressWeekly.objects.filter(
-        project_id__in=project_ids
-    ).values('pekerjaan_id').annotate(
-        total_actual=Coalesce(
-            Sum('actual_proportion'),
-            Value(Decimal('0')),
-            output_field=DecimalField()
-        )
-    )
-    
-    for agg in weekly_aggregates:
-        pekerjaan_actual_aggregates[agg['pekerjaan_id']] = float(agg['total_actual'])
 
-    # Batch-load pekerjaan cost basis once to avoid per-project queries (N+1).
-    pekerjaan_by_project = defaultdict(list)
-    projects_needing_rekap = set()
-    if project_ids:
-        pekerjaan_rows = Pekerjaan.objects.filter(project_id__in=project_ids).values(
-            'id', 'project_id', 'budgeted_cost'
-        )
-        for row in pekerjaan_rows:
-            pekerjaan_by_project[row['project_id']].append(row)
-            if not row['budgeted_cost'] or row['budgeted_cost'] <= 0:
-                projects_needing_rekap.add(row['project_id'])
-
-    # Compute fallback rekap only when needed.
-    rekap_total_by_project = {}
-    for project in projects:
-        if project.id not in projects_needing_rekap:
-            continue
-        try:
-            rekap_rows = compute_rekap_for_project(project)
-            rekap_total_by_project[project.id] = {
-                row['pekerjaan_id']: Decimal(str(row.get('total', 0)))
-                for row in rekap_rows
-            }
-        except Exception:
-            rekap_total_by_project[project.id] = {}
-
-    # 4. Prepare Excel
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Daftar Project"
-
-    # Headers
+    # 3. Prepare streaming Excel (write-only, widths tracked while writing)
     headers = [
         "Index", "Nama Project", "Tahun", "Sumber Dana", "Lokasi", 
         "Nilai Anggaran (Rp)", "Progress (%)", "Status",
@@ -225,121 +182,73 @@ def export_dashboard_xlsx(request):
         "Tanggal Mulai", "Tanggal Selesai", "Durasi (Hari)",
         "Ket 1", "Ket 2", "Kategori"
     ]
-    
-    # Styling headers
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = openpyxl.styles.PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
-    center_align = Alignment(horizontal="center", vertical="center", wrap_text=True)
-
-    for col_num, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_num, value=header)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = center_align
 
-    # Rows
-    for row_num, project in enumerate(projects, 2):
-        # Calculate Weighted Progress per project
-        weighted_progress = 0.0
-        try:
-            pekerjaan_rows = pekerjaan_by_project.get(project.id, [])
-            fallback_lookup = rekap_total_by_project.get(project.id, {})
-            total_project_cost = Decimal('0.00')
-            total_realization_cost = Decimal('0.00')
-
-            for pkj in pekerjaan_rows:
-                pekerjaan_id = pkj['id']
-                budgeted_cost = pkj['budgeted_cost']
-                if budgeted_cost and budgeted_cost > 0:
-                    item_cost = budgeted_cost
-                else:
-                    item_cost = fallback_lookup.get(pekerjaan_id, Decimal('0'))
-
-                if item_cost > 0:
-                    total_project_cost += item_cost
-                    actual_percent = pekerjaan_actual_aggregates.get(pekerjaan_id, 0.0)
-                    actual_percent = min(actual_percent, 100.0)
-                    realization = item_cost * Decimal(str(actual_percent / 100.0))
-                    total_realization_cost += realization
-            
-            if total_project_cost > 0:
-                weighted_progress = float((total_realization_cost / total_project_cost) * 100)
-            else:
-                # Fallback unweighted
-                if pekerjaan_rows:
-                    sum_progress = sum(
-                        pekerjaan_actual_aggregates.get(p['id'], 0.0) for p in pekerjaan_rows
-                    )
-                    weighted_progress = sum_progress / len(pekerjaan_rows)
-                else:
-                    weighted_progress = 0.0
-        except Exception:
-            weighted_progress = 0.0
-
-        # Status text
-        status_text = "Aktif" if project.is_active else "Non-Aktif"
-
-        # Populate row
-        row_data = [
-            project.index_project,
-            project.nama,
-            project.tahun_project,
-            project.sumber_dana,
-            project.lokasi_project,
-            float(project.anggaran_owner), # Nilai Anggaran
-            weighted_progress,             # Progress
-            status_text,
-            # Client
-            project.nama_client,
-            project.jabatan_client,
-            project.instansi_client,
-            # Kontraktor
-            project.nama_kontraktor,
-            project.instansi_kontraktor,
-            # Konsultan
-            project.nama_konsultan_perencana,
-            project.instansi_konsultan_perencana,
-            project.nama_konsultan_pengawas,
-            project.instansi_konsultan_pengawas,
-            # Dates
-            project.tanggal_mulai,
-            project.tanggal_selesai,
-            project.durasi_hari,
-            project.ket_project1,
-            project.ket_project2,
-            project.kategori
-        ]
-        
-        for col_num, cell_value in enumerate(row_data, 1):
-            cell = ws.cell(row=row_num, column=col_num, value=cell_value)
-            
-            # Formatting
-            if col_num == 6: # Anggaran
-                cell.number_format = '#,##0.00'
-            elif col_num == 7: # Progress
-                cell.number_format = '0.00'
-            elif isinstance(cell_value, date):
-                cell.number_format = 'DD/MM/YYYY'
-
-    # Auto-adjust column width (simple adj)
-    for col in ws.columns:
-        max_length = 0
-        column = col[0].column_letter # Get the column name
-        for cell in col:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = (max_length + 2)
-        ws.column_dimensions[column].width = min(adjusted_width, 50) # Cap at 50
-
-    response = HttpResponse(
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    def _date_format(col_num, value):
+        if isinstance(value, date):
+            return {'number_format': 'DD/MM/YYYY'}
+        return None
+
+    writer = StreamingSheetWriter(
+        "Daftar Project",
+        headers,
+        header_style={
+            'font': Font(bold=True, color="FFFFFF"),
+            'fill': PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid"),
+            'alignment': Alignment(horizontal="center", vertical="center", wrap_text=True),
+        },
+        column_styles={
+            6: {'number_format': '#,##0.00'},  # Anggaran
+            7: {'number_format': '0.00'},      # Progress
+        },
+        cell_style=_date_format,
     )
+
+    # 4. Rows, iterated in chunks so memory stays flat for thousands of projects.
+    # Progress comes from the precomputed rollup (same weighted logic as
+    # dashboard_view; stale rollups are refreshed once per chunk).
+    for chunk in _iter_chunks(queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE), EXPORT_CHUNK_SIZE):
+        progress_summaries = get_progress_summaries(chunk)
+        for project in chunk:
+            summary = progress_summaries.get(project.id)
+            weighted_progress = float(summary.actual_percent) if summary else 0.0
+
+            # Status text
+            status_text = "Aktif" if project.is_active else "Non-Aktif"
+
+            writer.append([
+                project.index_project,
+                project.nama,
+                project.tahun_project,
+                project.sumber_dana,
+                project.lokasi_project,
+                float(project.anggaran_owner), # Nilai Anggaran
+                weighted_progress,             # Progress
+                status_text,
+                # Client
+                project.nama_client,
+                project.jabatan_client,
+                project.instansi_client,
+                # Kontraktor
+                project.nama_kontraktor,
+                project.instansi_kontraktor,
+                # Konsultan
+                project.nama_konsultan_perencana,
+                project.instansi_konsultan_perencana,
+                project.nama_konsultan_pengawas,
+                project.instansi_konsultan_pengawas,
+                # Dates
+                project.tanggal_mulai,
+                project.tanggal_selesai,
+                project.durasi_hari,
+                project.ket_project1,
+                project.ket_project2,
+                project.kategori
+            ])
+
+    response = HttpResponse(content_type=XLSX_CONTENT_TYPE)
     response['Content-Disposition'] = f'attachment; filename=Project_Export_{date.today().isoformat()}.xlsx'
-    
-    wb.save(response)
+
+    writer.save(response)
     return response
 
 # === Aliases & Stubs for Compatibility with dashboard/urls.py ===
@@ -5,15 +5,30 @@ API Helper Utilities for detail_project app
 Provides:
 - Rate limiting decorators
 - Standardized API responses
+- Compact (columnar) JSON with gzip/Brotli negotiation
+- Conditional GET (ETag from project data version)
 - Common validation helpers
 """
 
 import functools
+import hashlib
 import logging
+import re
 from typing import Any, Dict, Optional, List
 from django.http import JsonResponse, QueryDict
-from django.core.cache import cache
 from django.contrib.auth.decorators import login_required
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.text import compress_string
+
+from config import rate_limiter as shared_rate_limiter
+
+# Optional: Brotli encoding for large chart payloads (install: pip install brotli)
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
@@ -54,7 +69,7 @@ def rate_limit(max_requests: int = 100, window: int = 60, key_prefix: str = None
     Args:
         max_requests: Maximum number of requests allowed in the time window
         window: Time window in seconds (default: 60 seconds)
-        key_prefix: Custom prefix for cache key (default: use view name)
+        key_prefix: Custom prefix for limiter key (default: use view name)
         category: Rate limit category ('bulk', 'write', 'read', 'export')
                  If provided, overrides max_requests and window with category defaults
 
@@ -107,30 +122,29 @@ def rate_limit(max_requests: int = 100, window: int = 60, key_prefix: str = None
     def decorator(view_func):
         @functools.wraps(view_func)
         def wrapped_view(request, *args, **kwargs):
-            # Generate cache key based on user and endpoint
+            # Limiter key based on user and endpoint
             user_id = getattr(request.user, 'id', 'anonymous')
             view_name = view_func.__name__
             endpoint = key_prefix or view_name
 
-            # Include category in cache key to separate limits
-            cache_suffix = f":{category}" if category else ""
-            cache_key = f"rate_limit:{user_id}:{endpoint}{cache_suffix}"
-            alias_key = None
-            if key_prefix and key_prefix != view_name:
-                alias_key = f"rate_limit:{user_id}:{view_name}{cache_suffix}"
-
-            # Get current request count
-            current_count = cache.get(cache_key, 0)
+            # Include category in limiter key to separate limits
+            suffix = f":{category}" if category else ""
+            result = shared_rate_limiter.hit(
+                f"api:{user_id}:{endpoint}{suffix}",
+                max_requests,
+                window,
+                category=category or 'default',
+            )
 
             # Check if limit exceeded
-            if current_count >= max_requests:
+            if not result.allowed:
                 logger.warning(
                     f"Rate limit exceeded for user {user_id} on {endpoint}",
                     extra={
                         'user_id': user_id,
                         'endpoint': endpoint,
                         'category': category,
-                        'count': current_count,
+                        'count': result.count,
                         'limit': max_requests,
                         'window': window
                     }
@@ -142,26 +156,22 @@ def rate_limit(max_requests: int = 100, window: int = 60, key_prefix: str = None
                 else:
                     time_msg = f"{window} detik"
 
-                return APIResponse.error(
+                response = APIResponse.error(
                     message=f"Terlalu banyak permintaan. Silakan coba lagi dalam {time_msg}.",
                     code='RATE_LIMIT_EXCEEDED',
                     status=429,
                     details={
                         'max_requests': max_requests,
                         'window_seconds': window,
-                        'current_count': current_count,
+                        'current_count': result.count,
                         'category': category or 'default'
                     },
                     extra={
-                        'retry_after': window
+                        'retry_after': result.retry_after
                     }
                 )
-
-            # Increment counter
-            new_count = current_count + 1
-            cache.set(cache_key, new_count, window)
-            if alias_key:
-                cache.set(alias_key, new_count, window)
+                response['Retry-After'] = str(result.retry_after)
+                return response
 
             # Call the actual view
             return view_func(request, *args, **kwargs)
@@ -567,3 +577,118 @@ def parse_kebutuhan_query_params(query: QueryDict) -> Dict[str, Any]:
         'search': search,
         'time_scope': time_scope,
     }
+
+
+# ============================================================================
+# COMPACT RESPONSES
+# ============================================================================
+
+# Bodies smaller than this are not worth compressing
+COMPRESS_MIN_BYTES = 1024
+
+_ACCEPT_ENCODING_RE = re.compile(r'\bbr\b')
+
+
+def wants_columnar(request) -> bool:
+    """True when the client asked for the dense ``?format=columnar`` shape."""
+    return (request.GET.get('format') or '').strip().lower() == 'columnar'
+
+
+def compact_json_response(request, data: Any, status: int = 200) -> JsonResponse:
+    """
+    JsonResponse without whitespace, compressed per Accept-Encoding.
+
+    Brotli is preferred when the client accepts ``br`` and the ``brotli``
+    package is installed, gzip otherwise. Responses below
+    ``COMPRESS_MIN_BYTES`` or that do not shrink are sent as-is.
+    """
+    response = JsonResponse(data, status=status, json_dumps_params={'separators': (',', ':')})
+    patch_vary_headers(response, ('Accept-Encoding',))
+
+    body = response.content
+    if len(body) < COMPRESS_MIN_BYTES:
+        return response
+
+    accept = request.META.get('HTTP_ACCEPT_ENCODING', '')
+    if BROTLI_AVAILABLE and _ACCEPT_ENCODING_RE.search(accept):
+        encoded, encoding = brotli.compress(body, quality=5), 'br'
+    elif 'gzip' in accept:
+        encoded, encoding = compress_string(body), 'gzip'
+    else:
+        return response
+
+    if len(encoded) >= len(body):
+        return response
+    response.content = encoded
+    response['Content-Length'] = str(len(encoded))
+    response['Content-Encoding'] = encoding
+    return response
+
+
+# ============================================================================
+# CONDITIONAL GET
+# ============================================================================
+
+STALE_DATA_HEADER = 'X-Data-Stale'
+
+
+def mark_stale_response(response, stale: bool):
+    """Flag a response built from a last-good (stale) cache value."""
+    if stale:
+        response[STALE_DATA_HEADER] = '1'
+        response['Cache-Control'] = 'no-store'
+    return response
+
+
+def project_etag(scope: str):
+    """
+    Strong ETag from the project data version, honoring If-None-Match.
+
+    The tag covers the data version, user, full path (query string) and the
+    current date (some charts depend on "today"). An unchanged project is
+    answered with 304 after one ownership lookup and one cache read, before
+    the view body runs. Non-owners fall through to the view, which 404s.
+    Responses flagged with ``X-Data-Stale`` get no ETag.
+
+    Usage:
+        @login_required
+        @require_GET
+        @project_etag('rekap-rab')
+        def api_get_rekap_rab(request, project_id): ...
+    """
+    def decorator(view_func):
+        @functools.wraps(view_func)
+        def wrapper(request, project_id, *args, **kwargs):
+            if request.method != 'GET':
+                return view_func(request, project_id, *args, **kwargs)
+
+            from dashboard.models import Project
+
+            # Ownership check and data version (ProjectDataVersion) in one query.
+            # Read the version before computing so a concurrent write can only
+            # make the tag older than the body, never newer
+            owned = list(
+                Project.objects.filter(id=project_id, owner=request.user)
+                .values_list('data_version__version', flat=True)[:1]
+            )
+            if not owned:
+                return view_func(request, project_id, *args, **kwargs)
+            version = owned[0] or 0
+            raw = f"{scope}:{project_id}:{version}:{request.user.pk}:{timezone.localdate()}:{request.get_full_path()}"
+            etag = '"%s"' % hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+            not_modified = get_conditional_response(request, etag=etag)
+            if not_modified is not None:
+                not_modified['ETag'] = etag
+                return not_modified
+
+            response = view_func(request, project_id, *args, **kwargs)
+            # Stale (stale-while-revalidate) bodies must not be cached under the new version
+            if response.status_code == 200 and not response.has_header('ETag') \
+                    and not response.has_header(STALE_DATA_HEADER):
+                response['ETag'] = etag
+                response['Cache-Control'] = 'private, no-cache'
+            return response
+
+        return wrapper
+    return decorator
@@ -0,0 +1,204 @@
+"""
+Delta encoding untuk DetailAHSPAudit.
+
+Snapshot detail (``services.snapshot_pekerjaan_details``) disimpan sebagai
+delta per ``kode`` terhadap snapshot sebelumnya:
+
+    {"added": [row, ...], "removed": [row, ...],
+     "changed": [{"kode": k, "old": {field: v}, "new": {field: v}}, ...]}
+
+Delta menyimpan nilai lama dan baru, jadi bisa diterapkan maju (old -> new)
+maupun mundur (new -> old). Setiap pekerjaan punya satu rantai entry
+(``chain_pekerjaan_id``); entry pertama, setiap entry ke-N
+(``DETAIL_AUDIT_CHECKPOINT_INTERVAL``) dan entry yang snapshot lamanya tidak
+cocok dengan ``state_hash`` entry sebelumnya (detail diubah tanpa audit)
+menjadi checkpoint yang menyimpan ``new_data`` penuh.
+
+Entry format lama (``state_hash`` kosong, old_data/new_data penuh) tetap
+terbaca; ``manage.py compact_detail_audit`` mengubahnya ke format delta.
+"""
+
+import hashlib
+import json
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+
+from .models import DetailAHSPAudit
+
+Rows = List[dict]
+
+
+def _row_key(row: dict):
+    return row.get("kode")
+
+
+def _sorted_rows(by_kode: Dict[str, dict]) -> Rows:
+    # Urutan snapshot asli: DetailAHSPProject.id
+    return sorted(by_kode.values(), key=lambda r: (r.get("id") is None, r.get("id") or 0, str(r.get("kode"))))
+
+
+def state_hash(rows: Optional[Rows]) -> str:
+    payload = json.dumps(rows or [], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def compute_delta(old_rows: Optional[Rows], new_rows: Optional[Rows]) -> dict:
+    old_map = {_row_key(r): r for r in (old_rows or [])}
+    new_map = {_row_key(r): r for r in (new_rows or [])}
+    delta = {
+        "added": [new_map[k] for k in new_map if k not in old_map],
+        "removed": [old_map[k] for k in old_map if k not in new_map],
+        "changed": [],
+    }
+    for kode, new_row in new_map.items():
+        old_row = old_map.get(kode)
+        if old_row is None or old_row == new_row:
+            continue
+        fields = sorted(set(old_row) | set(new_row))
+        diff_fields = [f for f in fields if old_row.get(f) != new_row.get(f)]
+        delta["changed"].append({
+            "kode": kode,
+            "old": {f: old_row.get(f) for f in diff_fields},
+            "new": {f: new_row.get(f) for f in diff_fields},
+        })
+    return delta
+
+
+def apply_delta(rows: Optional[Rows], delta: Optional[dict], *, reverse: bool = False) -> Rows:
+    """Terapkan delta ke snapshot (``reverse=True``: new -> old)."""
+    if not delta:
+        return list(rows or [])
+    by_kode = {_row_key(r): dict(r) for r in (rows or [])}
+    drop, add, side = ("removed", "added", "new") if not reverse else ("added", "removed", "old")
+    for row in delta.get(drop, []):
+        by_kode.pop(_row_key(row), None)
+    for row in delta.get(add, []):
+        by_kode[_row_key(row)] = dict(row)
+    for change in delta.get("changed", []):
+        row = by_kode.setdefault(change["kode"], {"kode": change["kode"]})
+        row.update(change[side])
+    return _sorted_rows(by_kode)
+
+
+def encode_fields(pekerjaan_id, old_rows: Optional[Rows], new_rows: Optional[Rows], *, previous=None,
+                  interval: Optional[int] = None) -> dict:
+    """
+    Field model untuk entry baru.
+
+    ``previous``: ``(state_hash, chain_length)`` entry berstate terakhir pada
+    rantai yang sama, atau ``None``.
+    """
+    if old_rows is None and new_rows is None:
+        # Entry tanpa state (perubahan sumber, cascade): tidak masuk rantai
+        return {"chain_pekerjaan_id": pekerjaan_id}
+
+    interval = interval or settings.DETAIL_AUDIT_CHECKPOINT_INTERVAL
+    delta = compute_delta(old_rows, new_rows)
+    checkpoint = (
+        previous is None
+        or previous[0] != state_hash(old_rows)
+        or previous[1] + 1 >= interval
+    )
+    return {
+        "chain_pekerjaan_id": pekerjaan_id,
+        "delta": delta,
+        "is_checkpoint": checkpoint,
+        "chain_length": 0 if checkpoint else previous[1] + 1,
+        "state_hash": state_hash(new_rows),
+        "old_data": None,
+        "new_data": list(new_rows or []) if checkpoint else None,
+    }
+
+
+def previous_chain_state(pekerjaan_id) -> Optional[Tuple[str, int]]:
+    if pekerjaan_id is None:
+        return None
+    return (
+        DetailAHSPAudit.objects
+        .filter(chain_pekerjaan_id=pekerjaan_id)
+        .exclude(state_hash="")
+        .order_by("-id")
+        .values_list("state_hash", "chain_length")
+        .first()
+    )
+
+
+def _is_legacy(entry) -> bool:
+    return not entry.state_hash and (entry.old_data is not None or entry.new_data is not None)
+
+
+def reconstruct_entries(entries: Iterable[DetailAHSPAudit]) -> Dict[int, Tuple[Optional[Rows], Optional[Rows]]]:
+    """
+    Snapshot (old_rows, new_rows) untuk setiap entry.
+
+    Satu query per rantai pekerjaan: dari checkpoint terdekat sebelum entry
+    paling awal sampai entry paling akhir yang diminta.
+    """
+    result = {}
+    chains: Dict[int, List[DetailAHSPAudit]] = {}
+    for entry in entries:
+        if _is_legacy(entry) or not entry.state_hash:
+            result[entry.id] = (entry.old_data, entry.new_data)
+        else:
+            chains.setdefault(entry.chain_pekerjaan_id, []).append(entry)
+
+    for chain_id, wanted in chains.items():
+        first_id = min(e.id for e in wanted)
+        last_id = max(e.id for e in wanted)
+        base = DetailAHSPAudit.objects.filter(chain_pekerjaan_id=chain_id).exclude(state_hash="")
+        checkpoint_id = (
+            base.filter(is_checkpoint=True, id__lte=first_id)
+            .order_by("-id")
+            .values_list("id", flat=True)
+            .first()
+        )
+        chain = base.filter(id__gte=checkpoint_id or 0, id__lte=last_id).order_by("id").only(
+            "id", "delta", "is_checkpoint", "new_data"
+        )
+        wanted_ids = {e.id for e in wanted}
+        state: Rows = []
+        for link in chain:
+            if link.is_checkpoint:
+                new_rows = list(link.new_data or [])
+                old_rows = apply_delta(new_rows, link.delta, reverse=True)
+            else:
+                old_rows = state
+                new_rows = apply_delta(state, link.delta)
+            state = new_rows
+            if link.id in wanted_ids:
+                result[link.id] = (old_rows, new_rows)
+    return result
+
+
+def reconstruct_entry(entry: DetailAHSPAudit) -> Tuple[Optional[Rows], Optional[Rows]]:
+    return reconstruct_entries([entry]).get(entry.id, (None, None))
+
+
+def compact_chain(entries: List[DetailAHSPAudit], *, interval: Optional[int] = None) -> List[DetailAHSPAudit]:
+    """
+    Ubah entry format lama satu pekerjaan (urut id naik) ke format delta.
+
+    Mengembalikan entry yang diubah (belum disimpan). Entry yang sudah
+    berformat delta ikut menjadi ``previous`` untuk entry sesudahnya.
+    """
+    changed = []
+    previous = None
+    for entry in entries:
+        if entry.state_hash:
+            previous = (entry.state_hash, entry.chain_length)
+            continue
+        if not _is_legacy(entry):
+            if entry.chain_pekerjaan_id is None and entry.pekerjaan_id is not None:
+                entry.chain_pekerjaan_id = entry.pekerjaan_id
+                changed.append(entry)
+            continue
+        chain_id = entry.chain_pekerjaan_id or entry.pekerjaan_id
+        if chain_id is None:
+            continue  # pekerjaan sudah dihapus sebelum rantai ada; biarkan format lama
+        fields = encode_fields(chain_id, entry.old_data, entry.new_data, previous=previous, interval=interval)
+        for name, value in fields.items():
+            setattr(entry, name, value)
+        previous = (entry.state_hash, entry.chain_length)
+        changed.append(entry)
+    return changed
@@ -0,0 +1,14 @@
+"""
+Benchmark suite detail_project.
+
+- ``generator``: project sintetis deterministik ukuran S/M/L/XL.
+- ``suite``: pengukuran waktu + jumlah query untuk jalur berat (rekap,
+  kebutuhan, progress mingguan, deep copy, JSON export/import, exporter).
+
+Dijalankan lewat ``python manage.py run_benchmarks``.
+"""
+
+from .generator import SIZES, BenchmarkSize, generate_project
+from .suite import BENCHMARKS, run_suite
+
+__all__ = ["SIZES", "BenchmarkSize", "generate_project", "BENCHMARKS", "run_suite"]
@@ -0,0 +1,208 @@
+"""
+Generator project sintetis untuk benchmark.
+
+Semua nilai berasal dari ``random.Random(seed)``, jadi ukuran + seed yang
+sama selalu menghasilkan struktur, kode, harga dan progress yang sama;
+hasil benchmark antar commit bisa dibandingkan langsung.
+"""
+
+import random
+from dataclasses import asdict, dataclass
+from datetime import date
+from decimal import Decimal
+
+from dashboard.models import Project
+
+from ..models import (
+    DetailAHSPProject,
+    HargaItemProject,
+    Klasifikasi,
+    Pekerjaan,
+    PekerjaanProgressWeekly,
+    SubKlasifikasi,
+    VolumePekerjaan,
+)
+from ..progress_utils import get_week_date_range
+from ..services import _populate_expanded_from_raw
+
+PROJECT_START = date(2025, 1, 6)  # Senin
+
+
+@dataclass(frozen=True)
+class BenchmarkSize:
+    name: str
+    pekerjaan: int
+    details_per_pekerjaan: int
+    bundle_depth: int
+    weeks: int
+    pekerjaan_per_sub: int = 10
+    sub_per_klasifikasi: int = 5
+    bundle_share: float = 0.2  # porsi pekerjaan yang ikut rantai bundle
+
+    def as_dict(self):
+        return asdict(self)
+
+
+SIZES = {
+    "S": BenchmarkSize("S", pekerjaan=20, details_per_pekerjaan=6, bundle_depth=1, weeks=8),
+    "M": BenchmarkSize("M", pekerjaan=150, details_per_pekerjaan=10, bundle_depth=2, weeks=26),
+    "L": BenchmarkSize("L", pekerjaan=600, details_per_pekerjaan=15, bundle_depth=3, weeks=52),
+    "XL": BenchmarkSize("XL", pekerjaan=2000, details_per_pekerjaan=20, bundle_depth=4, weeks=104),
+}
+
+# (kategori, prefix kode, satuan, jumlah item di katalog, rentang harga)
+_CATALOGUE = (
+    ("TK", "L", "OH", 12, (90_000, 250_000)),
+    ("BHN", "B", "kg", 60, (1_000, 1_500_000)),
+    ("ALT", "E", "jam", 20, (50_000, 900_000)),
+)
+
+
+def _split_percent(rng, parts):
+    """``parts`` proporsi (2 desimal) yang totalnya tepat 100."""
+    weights = [rng.randint(1, 100) for _ in range(parts)]
+    total = sum(weights)
+    values = [Decimal(w * 100) / total for w in weights]
+    values = [v.quantize(Decimal("0.01")) for v in values]
+    values[0] += Decimal("100") - sum(values)
+    return values
+
+
+def generate_project(owner, size, *, seed=0, name=None):
+    """
+    Buat satu project benchmark lengkap dan kembalikan instance-nya.
+
+    Isi: klasifikasi/sub/pekerjaan custom, katalog harga, detail AHSP
+    (TK/BHN/ALT + bundle LAIN berantai sedalam ``bundle_depth``), volume,
+    DetailAHSPExpanded hasil service asli, dan progress mingguan
+    planned (seluruh minggu) + actual (paruh pertama).
+    """
+    rng = random.Random(f"{size.name}:{seed}")
+
+    project = Project.objects.create(
+        owner=owner,
+        nama=name or f"[BENCH] {size.name} seed={seed}",
+        sumber_dana="APBN",
+        lokasi_project="Benchmark",
+        nama_client="Benchmark",
+        anggaran_owner=Decimal("1000000000"),
+        tanggal_mulai=PROJECT_START,
+        tanggal_selesai=get_week_date_range(size.weeks, PROJECT_START)[1],
+    )
+
+    # --- Katalog harga ---
+    catalogue = {}
+    harga_items = []
+    for kategori, prefix, satuan, count, (low, high) in _CATALOGUE:
+        for idx in range(1, count + 1):
+            kode = f"{prefix}.{idx:03d}"
+            harga_items.append(HargaItemProject(
+                project=project, kode_item=kode, kategori=kategori, satuan=satuan,
+                uraian=f"{kategori} benchmark {idx}",
+                harga_satuan=Decimal(rng.randrange(low, high, 500)),
+            ))
+    HargaItemProject.objects.bulk_create(harga_items)
+    for item in HargaItemProject.objects.filter(project=project):
+        catalogue.setdefault(item.kategori, []).append(item)
+
+    # --- Struktur pekerjaan ---
+    pekerjaan = []
+    per_klas = size.pekerjaan_per_sub * size.sub_per_klasifikasi
+    for idx in range(size.pekerjaan):
+        if idx % per_klas == 0:
+            klas = Klasifikasi.objects.create(
+                project=project, name=f"Klasifikasi {idx // per_klas + 1}", ordering_index=idx // per_klas,
+            )
+        if idx % size.pekerjaan_per_sub == 0:
+            sub = SubKlasifikasi.objects.create(
+                project=project, klasifikasi=klas,
+                name=f"Sub {idx // size.pekerjaan_per_sub + 1}", ordering_index=idx // size.pekerjaan_per_sub,
+            )
+        pekerjaan.append(Pekerjaan(
+            project=project, sub_klasifikasi=sub, source_type=Pekerjaan.SOURCE_CUSTOM,
+            snapshot_kode=f"BENCH-{idx + 1:05d}", snapshot_uraian=f"Pekerjaan benchmark {idx + 1}",
+            snapshot_satuan=rng.choice(("m2", "m3", "m'", "kg", "bh", "ls")), ordering_index=idx + 1,
+        ))
+    Pekerjaan.objects.bulk_create(pekerjaan)
+    pekerjaan = list(Pekerjaan.objects.filter(project=project).order_by("ordering_index"))
+
+    VolumePekerjaan.objects.bulk_create([
+        VolumePekerjaan(project=project, pekerjaan=pkj, quantity=Decimal(rng.randint(1, 500_000)) / 100)
+        for pkj in pekerjaan
+    ])
+
+    # --- Detail AHSP ---
+    details = []
+    kategori_weights = (("TK", 3), ("BHN", 5), ("ALT", 2))
+    for pkj in pekerjaan:
+        used = set()
+        for _ in range(size.details_per_pekerjaan):
+            kategori = rng.choices([k for k, _ in kategori_weights], [w for _, w in kategori_weights])[0]
+            item = rng.choice(catalogue[kategori])
+            if item.kode_item in used:
+                continue
+            used.add(item.kode_item)
+            details.append(DetailAHSPProject(
+                project=project, pekerjaan=pkj, harga_item=item, kategori=kategori,
+                kode=item.kode_item, uraian=item.uraian, satuan=item.satuan,
+                koefisien=Decimal(rng.randint(1, 500_000)) / 10_000,
+            ))
+
+    # Rantai bundle: pekerjaan ke-p dalam rantai memuat pekerjaan ke-(p-1)
+    chain_len = size.bundle_depth + 1
+    bundled = int(len(pekerjaan) * size.bundle_share) // chain_len * chain_len
+    bundle_items = []
+    for idx in range(bundled):
+        if idx % chain_len == 0:
+            continue
+        target = pekerjaan[idx - 1]
+        bundle_items.append((pekerjaan[idx], target, HargaItemProject(
+            project=project, kode_item=f"LAIN.{idx:05d}", kategori="LAIN", satuan="ls",
+            uraian=f"Bundle {target.snapshot_kode}", harga_satuan=Decimal("0"),
+        )))
+    HargaItemProject.objects.bulk_create([hip for _, _, hip in bundle_items])
+    lain_items = {
+        hip.kode_item: hip for hip in HargaItemProject.objects.filter(project=project, kategori="LAIN")
+    }
+    for pkj, target, hip in bundle_items:
+        details.append(DetailAHSPProject(
+            project=project, pekerjaan=pkj, harga_item=lain_items[hip.kode_item], kategori="LAIN",
+            kode=hip.kode_item, uraian=hip.uraian, satuan="ls",
+            koefisien=Decimal(rng.randint(1, 30)) / 10, ref_pekerjaan=target,
+        ))
+    DetailAHSPProject.objects.bulk_create(details, batch_size=2000)
+
+    for pkj in pekerjaan:
+        _populate_expanded_from_raw(project, pkj)
+
+    # --- Progress mingguan ---
+    progress = []
+    actual_until = size.weeks // 2
+    for pkj in pekerjaan:
+        span = min(size.weeks, rng.randint(2, max(2, size.weeks // 3)))
+        first = rng.randint(1, size.weeks - span + 1)
+        for offset, percent in enumerate(_split_percent(rng, span)):
+            week = first + offset
+            start, end = get_week_date_range(week, PROJECT_START)
+            progress.append(PekerjaanProgressWeekly(
+                project=project, pekerjaan=pkj, week_number=week,
+                week_start_date=start, week_end_date=end,
+                planned_proportion=percent,
+                actual_proportion=percent if week <= actual_until else Decimal("0"),
+            ))
+    PekerjaanProgressWeekly.objects.bulk_create(progress, batch_size=2000)
+
+    return project
+
+
+def dataset_counts(project):
+    """Jumlah baris per tabel utama; dicatat di hasil benchmark."""
+    from ..models import DetailAHSPExpanded
+
+    return {
+        "pekerjaan": Pekerjaan.objects.filter(project=project).count(),
+        "detail_ahsp": DetailAHSPProject.objects.filter(project=project).count(),
+        "detail_expanded": DetailAHSPExpanded.objects.filter(project=project).count(),
+        "harga_items": HargaItemProject.objects.filter(project=project).count(),
+        "weekly_progress": PekerjaanProgressWeekly.objects.filter(project=project).count(),
+    }
@@ -0,0 +1,246 @@
+"""
+Benchmark runner: waktu (ms) + jumlah query per skenario.
+
+Setiap run dijalankan di savepoint yang di-rollback, jadi skenario yang
+menulis (progress mingguan, deep copy, import) mengukur kondisi awal yang
+sama di setiap pengulangan. Hasil berupa dict JSON-serializable.
+"""
+
+import fnmatch
+import json
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from ..models import PekerjaanProgressWeekly
+from ..services import compute_kebutuhan_items, compute_kebutuhan_timeline, compute_rekap_for_project
+
+DEFAULT_EXPORT_FORMATS = ("csv", "xlsx", "pdf", "word", "json")
+
+
+@dataclass
+class BenchmarkContext:
+    project: Any
+    owner: Any
+    export_formats: tuple = DEFAULT_EXPORT_FORMATS
+    scratch: Dict[str, Any] = field(default_factory=dict)
+    factory: RequestFactory = field(default_factory=RequestFactory)
+
+    def request(self, method, path="/bench/", **kwargs):
+        request = getattr(self.factory, method)(path, **kwargs)
+        request.user = self.owner
+        return request
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    run: Callable[[BenchmarkContext], Any]
+    prepare: Optional[Callable[[BenchmarkContext], None]] = None
+
+
+def _drop_project_caches(ctx):
+    pid = ctx.project.id
+    keys = [f"rekap:{pid}:v1", f"rekap:{pid}:v2", f"rekap:{pid}:last_good",
+            f"rekap_kebutuhan:{pid}", f"rekap_kebutuhan_timeline:{pid}"]
+    cache.delete_many(keys)
+
+
+def _warm_rekap(ctx):
+    _drop_project_caches(ctx)
+    compute_rekap_for_project(ctx.project)
+
+
+def _check_response(response):
+    if response.status_code >= 400:
+        raise RuntimeError(f"HTTP {response.status_code}: {response.content[:200]!r}")
+    return response
+
+
+def _weekly_payload(ctx):
+    if "weekly_payload" not in ctx.scratch:
+        first_weeks = {}
+        rows = (
+            PekerjaanProgressWeekly.objects.filter(project=ctx.project)
+            .order_by("pekerjaan_id", "week_number")
+            .values_list("pekerjaan_id", "week_number", "planned_proportion")
+        )
+        for pekerjaan_id, week, planned in rows:
+            first_weeks.setdefault(pekerjaan_id, (week, planned))
+        ctx.scratch["weekly_payload"] = json.dumps({
+            "mode": "actual",
+            "assignments": [
+                {"pekerjaan_id": pid, "week_number": week, "proportion": str(planned)}
+                for pid, (week, planned) in first_weeks.items()
+            ],
+        })
+    return ctx.scratch["weekly_payload"]
+
+
+def _save_weekly_progress(ctx):
+    from ..views_api_tahapan_v2 import api_assign_pekerjaan_weekly
+
+    request = ctx.request("post", data=_weekly_payload(ctx), content_type="application/json")
+    return _check_response(api_assign_pekerjaan_weekly(request, ctx.project.id))
+
+
+def _deep_copy(ctx):
+    from ..services import DeepCopyService
+
+    return DeepCopyService(ctx.project).copy(ctx.owner, f"{ctx.project.nama} (copy)", copy_jadwal=True)
+
+
+def _export_json(ctx):
+    from ..views_api import export_project_full_json
+
+    request = ctx.request("get", data={"include_progress": "1"})
+    return _check_response(export_project_full_json(request, ctx.project.id))
+
+
+def _prepare_import(ctx):
+    if "export_json" not in ctx.scratch:
+        ctx.scratch["export_json"] = _export_json(ctx).content
+
+
+def _import_json(ctx):
+    from ..views_api import import_project_from_json
+
+    request = ctx.request("post", data=ctx.scratch["export_json"], content_type="application/json")
+    return _check_response(import_project_from_json(request))
+
+
+def _exporter(export_type, format_type):
+    def run(ctx):
+        from ..exports.export_manager import ExportManager
+
+        with override_settings(EXPORT_ARTIFACT_CACHE_ENABLED=False):
+            return _check_response(ExportManager(ctx.project, ctx.owner).export(export_type, format_type))
+    return run
+
+
+def _core_benchmarks():
+    return [
+        Benchmark("rekap.cold", lambda ctx: compute_rekap_for_project(ctx.project), _drop_project_caches),
+        Benchmark("rekap.warm", lambda ctx: compute_rekap_for_project(ctx.project), _warm_rekap),
+        Benchmark("kebutuhan.items", lambda ctx: compute_kebutuhan_items(ctx.project), _drop_project_caches),
+        Benchmark("kebutuhan.timeline", lambda ctx: compute_kebutuhan_timeline(ctx.project), _drop_project_caches),
+        Benchmark("progress.weekly_save", _save_weekly_progress, _weekly_payload),
+        Benchmark("deep_copy", _deep_copy),
+        Benchmark("json.export", _export_json),
+        Benchmark("json.import", _import_json, _prepare_import),
+    ]
+
+
+def _export_benchmarks(formats):
+    from ..exports.export_manager import ExportManager
+
+    return [
+        Benchmark(f"export.{export_type}.{format_type}", _exporter(export_type, format_type))
+        for export_type in ExportManager.EXPORT_METHODS
+        for format_type in formats
+    ]
+
+
+BENCHMARKS = [b.name for b in _core_benchmarks()] + ["export.<type>.<format>"]
+
+
+def _measure(bench, ctx, repeat):
+    timings, queries, sql_ms = [], [], []
+    for _ in range(repeat):
+        if bench.prepare:
+            bench.prepare(ctx)
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                bench.run(ctx)
+                timings.append((time.perf_counter() - start) * 1000)
+            transaction.set_rollback(True)
+        # Hook SQL trace di settings test menambah EXPLAIN; bukan query aplikasi
+        app_queries = [q for q in captured.captured_queries if not q["sql"].startswith("EXPLAIN")]
+        queries.append(len(app_queries))
+        sql_ms.append(sum(float(q.get("time") or 0) for q in app_queries) * 1000)
+
+    return {
+        "name": bench.name,
+        "runs": repeat,
+        "ms": {
+            "min": round(min(timings), 3),
+            "median": round(statistics.median(timings), 3),
+            "max": round(max(timings), 3),
+        },
+        "queries": max(queries),
+        "sql_ms": round(statistics.median(sql_ms), 3),
+    }
+
+
+def run_suite(project, owner, *, repeat=3, only=None, export_formats=DEFAULT_EXPORT_FORMATS, progress=None):
+    """
+    Jalankan benchmark terhadap ``project``; ``only`` = daftar pola fnmatch
+    atas nama benchmark. Error satu skenario dicatat, tidak menghentikan suite.
+    """
+    ctx = BenchmarkContext(project=project, owner=owner, export_formats=tuple(export_formats))
+    benches = _core_benchmarks() + _export_benchmarks(ctx.export_formats)
+    if only:
+        benches = [b for b in benches if any(fnmatch.fnmatch(b.name, pattern) for pattern in only)]
+
+    results = []
+    for bench in benches:
+        if progress:
+            progress(bench.name)
+        try:
+            results.append(_measure(bench, ctx, repeat))
+        except Exception as exc:
+            results.append({"name": bench.name, "error": f"{type(exc).__name__}: {exc}"})
+    return results
+
+
+def environment_info():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=str(settings.BASE_DIR),
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "db_vendor": connection.vendor,
+        "cache_backend": settings.CACHES["default"]["BACKEND"],
+    }
+
+
+def compare_results(baseline: dict, current: dict, *, threshold: float = 0.2) -> List[dict]:
+    """
+    Bandingkan dua file hasil: median ms naik > ``threshold`` (relatif) atau
+    jumlah query bertambah dianggap regresi.
+    """
+    before = {r["name"]: r for r in baseline.get("results", []) if "error" not in r}
+    rows = []
+    for result in current.get("results", []):
+        old = before.get(result["name"])
+        if old is None or "error" in result:
+            continue
+        old_ms, new_ms = old["ms"]["median"], result["ms"]["median"]
+        ratio = (new_ms / old_ms) if old_ms else None
+        rows.append({
+            "name": result["name"],
+            "median_ms": (old_ms, new_ms),
+            "queries": (old["queries"], result["queries"]),
+            "ratio": round(ratio, 3) if ratio is not None else None,
+            "regression": bool(
+                (ratio is not None and ratio > 1 + threshold) or result["queries"] > old["queries"]
+            ),
+        })
+    return rows
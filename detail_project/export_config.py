@@ -16,6 +16,7 @@ Created: 2025
 from decimal import Decimal
 from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Callable, Optional
 
 
 # ============================================================================
@@ -437,6 +438,11 @@ class ExportConfig:
     page_orientation: str = 'landscape'  # 'portrait' or 'landscape'
     page_size: str = ExportLayout.PAGE_SIZE  # 'A4', 'A3', etc.
 
+    # Optional progress hook: callback(current, total, message); used by async exports
+    progress_callback: Optional[Callable[[int, int, str], None]] = field(
+        default=None, compare=False, repr=False
+    )
+
 
 # ============================================================================
 # IDENTITY RENDER HELPERS (single source of truth)
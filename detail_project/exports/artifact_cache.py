@@ -0,0 +1,237 @@
+# =====================================================================
+# FILE: detail_project/exports/artifact_cache.py
+# Content-addressed cache for generated export files
+# =====================================================================
+"""
+On-disk cache for generated export files (PDF/Word/XLSX).
+
+An artifact is addressed by a SHA-256 over everything that determines its
+bytes: project id + data version (``get_project_data_version``), export type,
+format, orientation, parameters, watermark flag, requesting user (printed as
+"export by"), export date (printed in header/filename) and a hash of the
+exporter source code. Any edit to the project bumps the data version, so a
+stale file is never served; it simply stops being addressed and ages out.
+
+Layout (``settings.EXPORT_ARTIFACT_CACHE_DIR``)::
+
+    <root>/<key[:2]>/<key>.bin   # file bytes
+    <root>/<key[:2]>/<key>.json  # {"filename", "content_type", "size"}
+
+A hit refreshes the file mtime; ``evict()`` removes least-recently-used
+entries until the total size fits ``EXPORT_ARTIFACT_CACHE_MAX_BYTES`` and is
+run after every store and from ``cleanup_old_exports``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+CACHEABLE_FORMATS = ('pdf', 'word', 'xlsx')
+_FILENAME_RE = re.compile(r'filename="?([^";]+)"?')
+
+
+def response_filename(response) -> Optional[str]:
+    """Filename from an exporter response's Content-Disposition header."""
+    match = _FILENAME_RE.search(response.get('Content-Disposition', ''))
+    return match.group(1) if match else None
+
+
+@lru_cache(maxsize=1)
+def exporter_code_version() -> str:
+    """Hash of the exporter sources; a deploy that changes rendering changes every key."""
+    package_dir = Path(__file__).resolve().parent
+    sources = sorted(package_dir.glob('*.py')) + [package_dir.parent / 'export_config.py']
+    digest = hashlib.sha256()
+    for path in sources:
+        if path.exists():
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+@dataclass
+class CachedArtifact:
+    key: str
+    path: Path
+    filename: str
+    content_type: str
+    size: int
+
+    def as_response(self) -> FileResponse:
+        response = FileResponse(
+            open(self.path, 'rb'),
+            as_attachment=True,
+            filename=self.filename,
+            content_type=self.content_type,
+        )
+        response['X-Export-Cache'] = 'HIT'
+        return response
+
+
+class ExportArtifactCache:
+    """Content-addressed export file store with LRU-by-size eviction."""
+
+    def __init__(self, root: str | os.PathLike | None = None, max_bytes: int | None = None):
+        self.root = Path(root or settings.EXPORT_ARTIFACT_CACHE_DIR)
+        self.max_bytes = max_bytes if max_bytes is not None else settings.EXPORT_ARTIFACT_CACHE_MAX_BYTES
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+    @staticmethod
+    def make_key(
+        project,
+        export_type: str,
+        format_type: str,
+        *,
+        orientation: Optional[str] = None,
+        parameters: Optional[Dict[str, Any]] = None,
+        watermark: bool = False,
+        user_id: Optional[int] = None,
+    ) -> str:
+        from detail_project.services import get_project_data_version
+
+        payload = {
+            'project': project.id,
+            'data_version': get_project_data_version(project),
+            'export_type': export_type,
+            'format': format_type,
+            'orientation': orientation or '',
+            'parameters': parameters or {},
+            'watermark': bool(watermark),
+            'user': user_id,
+            'date': timezone.localdate().isoformat(),
+            'code': exporter_code_version(),
+        }
+        raw = json.dumps(payload, sort_keys=True, default=str, separators=(',', ':'))
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _paths(self, key: str):
+        directory = self.root / key[:2]
+        return directory / f'{key}.bin', directory / f'{key}.json'
+
+    # ------------------------------------------------------------------
+    # Lookup / store
+    # ------------------------------------------------------------------
+    def get(self, key: str) -> Optional[CachedArtifact]:
+        data_path, meta_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text())
+            size = data_path.stat().st_size
+        except (OSError, ValueError):
+            return None
+        now = time.time()
+        try:
+            os.utime(data_path, (now, now))  # LRU: hit refreshes recency
+        except OSError:
+            pass
+        return CachedArtifact(key, data_path, meta['filename'], meta['content_type'], size)
+
+    def put(self, key: str, content: bytes, filename: str, content_type: str) -> CachedArtifact:
+        data_path, meta_path = self._paths(key)
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write-then-rename so concurrent readers never see a partial file
+        tmp_path = data_path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, data_path)
+        meta_tmp = meta_path.with_suffix(f'.{os.getpid()}.tmp')
+        meta_tmp.write_text(json.dumps({
+            'filename': filename,
+            'content_type': content_type,
+            'size': len(content),
+        }))
+        os.replace(meta_tmp, meta_path)
+
+        self.evict()
+        return CachedArtifact(key, data_path, filename, content_type, len(content))
+
+    def store_response(self, key: str, response: HttpResponse) -> Optional[CachedArtifact]:
+        """Cache a successful exporter response; other responses are ignored."""
+        if response.status_code != 200 or getattr(response, 'streaming', False):
+            return None
+        filename = response_filename(response)
+        if not filename:
+            return None
+        try:
+            return self.put(key, response.content, filename, response['Content-Type'])
+        except OSError as exc:
+            logger.warning(f"Export artifact cache write failed for {key}: {exc}")
+            return None
+
+    # ------------------------------------------------------------------
+    # Eviction
+    # ------------------------------------------------------------------
+    def _entries(self):
+        if not self.root.exists():
+            return []
+        entries = []
+        for data_path in self.root.glob('*/*.bin'):
+            try:
+                stat = data_path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, data_path))
+        return entries
+
+    def _remove(self, data_path: Path) -> None:
+        data_path.unlink(missing_ok=True)
+        data_path.with_suffix('.json').unlink(missing_ok=True)
+
+    def evict(self, max_bytes: Optional[int] = None, max_age: Optional[float] = None) -> Dict[str, int]:
+        """
+        Drop least-recently-used artifacts until the cache fits ``max_bytes``;
+        with ``max_age`` also drop anything not used for that many seconds.
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = sorted(self._entries())  # oldest mtime first
+        total = sum(size for _, size, _ in entries)
+        cutoff = time.time() - max_age if max_age else None
+
+        deleted_count = 0
+        freed_bytes = 0
+        for mtime, size, data_path in entries:
+            if total <= limit and (cutoff is None or mtime >= cutoff):
+                break
+            try:
+                self._remove(data_path)
+            except OSError as exc:
+                logger.error(f"Failed to evict export artifact {data_path}: {exc}")
+                continue
+            total -= size
+            deleted_count += 1
+            freed_bytes += size
+
+        return {'deleted_count': deleted_count, 'freed_bytes': freed_bytes, 'total_bytes': total}
+
+    def stats(self) -> Dict[str, int]:
+        entries = self._entries()
+        return {
+            'entries': len(entries),
+            'total_bytes': sum(size for _, size, _ in entries),
+            'max_bytes': self.max_bytes,
+        }
+
+
+def is_artifact_cache_enabled() -> bool:
+    return bool(getattr(settings, 'EXPORT_ARTIFACT_CACHE_ENABLED', False))
+
+
+def get_artifact_cache() -> ExportArtifactCache:
+    # Built per call so settings overrides (tests, env) are honoured
+    return ExportArtifactCache()
@@ -20,6 +20,7 @@ Created: 2025
 """
 
 import csv
+import logging
 from io import BytesIO
 from decimal import Decimal
 from datetime import datetime
@@ -63,6 +64,8 @@ except ImportError:
     DOCX_AVAILABLE = False
     Document = None
 
+logger = logging.getLogger(__name__)
+
 
 # ============================================================================
 # BASE EXPORTER CLASS
@@ -560,6 +563,18 @@ except Exception:  # pragma: no cover
     ExportConfig = None  # type: ignore
 
 
+def report_progress(config, current: int, total: int, message: str = '') -> None:
+    """Forward exporter progress to ``config.progress_callback`` (best-effort)."""
+    callback = getattr(config, 'progress_callback', None)
+    if callback is None:
+        return
+    try:
+        callback(current, max(total, 1), message)
+    except Exception:
+        # Progress reporting must never fail an export
+        logger.debug("Export progress callback failed", exc_info=True)
+
+
 class ConfigExporterBase:
     """
     Base class for V2 exporters that operate with a single ExportConfig.
@@ -568,12 +583,16 @@ class ConfigExporterBase:
     Provides:
     - self.config: immutable export configuration
     - _create_response(): unified HTTP response builder
+    - _report_progress(): forwards progress to config.progress_callback (if set)
     """
 
     def __init__(self, config):
         # duck-typed; prefer ExportConfig but avoid hard dependency at import time
         self.config = config
 
+    def _report_progress(self, current: int, total: int, message: str = '') -> None:
+        report_progress(self.config, current, total, message)
+
     def _create_response(self, content: bytes | bytearray | str, filename: str, content_type: str) -> HttpResponse:
         if isinstance(content, str):
             payload = content.encode('utf-8')
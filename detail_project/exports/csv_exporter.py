@@ -125,6 +125,7 @@ class CSVExporter(ConfigExporterBase):
             if 'pages' in data:
                 pages = data['pages']
                 for i, section in enumerate(pages):
+                    self._report_progress(i, len(pages), f"Menulis bagian {i + 1}/{len(pages)}")
                     yield from iter_section(section)
                     if i < len(pages) - 1:
                         yield writer.writerow([])
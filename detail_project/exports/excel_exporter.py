@@ -239,6 +239,7 @@ class ExcelExporter(ConfigExporterBase):
         pages = data.get('pages')
         if pages:
             for idx, page in enumerate(pages):
+                self._report_progress(idx, len(pages), f"Menulis sheet {idx + 1}/{len(pages)}")
                 write_section_to_sheet(page, is_first=(idx == 0))
         else:
             write_section_to_sheet(data, is_first=True)
@@ -4,6 +4,10 @@
 # =====================================================================
 
 from typing import Dict, Any
+from functools import wraps
+import base64
+import hashlib
+import inspect
 import json
 from django.http import HttpResponse, JsonResponse
 from ..export_config import ExportConfig, SignatureConfig, format_currency, JadwalExportLayout
@@ -19,6 +23,88 @@ from .volume_pekerjaan_adapter import VolumePekerjaanAdapter
 from .harga_items_adapter import HargaItemsAdapter
 from .rincian_ahsp_adapter import RincianAHSPAdapter
 from .jadwal_pekerjaan_adapter import JadwalPekerjaanExportAdapter
+from .project_tree import ProjectTree, load_project_tree
+from .artifact_cache import CACHEABLE_FORMATS, get_artifact_cache, is_artifact_cache_enabled
+from .base import report_progress
+
+
+def _decode_attachments(raw) -> list:
+    """Decode base64 chart attachments from a JSON payload into {"title", "bytes"}."""
+    attachments = []
+    for att in raw or []:
+        if not isinstance(att, dict):
+            continue
+        title = att.get('title') or 'Lampiran'
+        blob = att.get('bytes')
+        if isinstance(blob, (bytes, bytearray)):
+            attachments.append({'title': title, 'bytes': bytes(blob)})
+            continue
+        if not isinstance(blob, str):
+            data_url = att.get('data_url') or att.get('dataUrl') or ''
+            if 'base64,' not in data_url:
+                continue
+            blob = data_url.split('base64,', 1)[1]
+        try:
+            attachments.append({'title': title, 'bytes': base64.b64decode(blob)})
+        except (ValueError, TypeError):
+            continue
+    return attachments
+
+
+def _attachments_digest(attachments) -> str:
+    digest = hashlib.sha256()
+    for item in attachments or []:
+        digest.update(str(item.get('title', '')).encode('utf-8'))
+        digest.update(item.get('bytes') or b'')
+    return digest.hexdigest()
+
+
+def artifact_cached(export_type: str):
+    """
+    Serve an export method from the artifact cache (PDF/Word/XLSX).
+
+    Every argument besides ``format_type`` is part of the key; chart
+    attachments are reduced to a digest of their bytes.
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @wraps(method)
+        def wrapper(self, format_type, *args, **kwargs):
+            if format_type not in CACHEABLE_FORMATS or not is_artifact_cache_enabled():
+                return method(self, format_type, *args, **kwargs)
+
+            bound = signature.bind(self, format_type, *args, **kwargs)
+            bound.apply_defaults()
+            params = {
+                name: value for name, value in bound.arguments.items()
+                if name not in ('self', 'format_type')
+            }
+            if params.get('attachments'):
+                params['attachments'] = _attachments_digest(params['attachments'])
+            orientation = params.pop('orientation', None)
+
+            store = get_artifact_cache()
+            key = store.make_key(
+                self.project,
+                export_type,
+                format_type,
+                orientation=orientation,
+                parameters=params,
+                watermark=self.watermark,
+                user_id=getattr(self.user, 'id', None),
+            )
+            hit = store.get(key)
+            if hit is not None:
+                return hit.as_response()
+
+            response = method(self, format_type, *args, **kwargs)
+            store.store_response(key, response)
+            response['X-Export-Cache'] = 'MISS'
+            return response
+
+        return wrapper
+    return decorator
 
 
 class ExportManager:
@@ -32,9 +118,63 @@ class ExportManager:
         'json': JSONExporter,
     }
     
-    def __init__(self, project, user=None):
+    def __init__(self, project, user=None, progress_callback=None):
         self.project = project
         self.user = user
+        # Set from options['add_watermark'] by export(); part of the artifact cache key
+        self.watermark = False
+        # Optional callback(current, total, message), passed to exporters via ExportConfig
+        self.progress_callback = progress_callback
+        self._tree = None
+
+    @property
+    def tree(self) -> ProjectTree:
+        """Project hierarchy shared by every adapter of this export run."""
+        if self._tree is None:
+            self._tree = load_project_tree(self.project)
+        return self._tree
+
+    # =========================================================================
+    # GENERIC DISPATCH (async exports)
+    # =========================================================================
+
+    # export_type (URL slug) -> export method
+    EXPORT_METHODS = {
+        'rekap-rab': 'export_rekap_rab',
+        'rekap-kebutuhan': 'export_rekap_kebutuhan',
+        'volume-pekerjaan': 'export_volume_pekerjaan',
+        'harga-items': 'export_harga_items',
+        'rincian-ahsp': 'export_rincian_ahsp',
+        'jadwal-pekerjaan': 'export_jadwal_pekerjaan',
+        'jadwal-professional': 'export_jadwal_professional',
+    }
+
+    def export(self, export_type: str, format_type: str, options: dict | None = None) -> HttpResponse:
+        """
+        Run any export by type with JSON-serializable options (as sent to Celery).
+
+        Only options matching the export method's keyword arguments are passed on;
+        ``attachments`` may be given base64 encoded ({"title", "bytes"} or
+        {"title", "data_url"}) and are decoded here.
+        """
+        method_name = self.EXPORT_METHODS.get(export_type)
+        if not method_name:
+            raise ValueError(f"Invalid export_type: {export_type}. Must be one of {list(self.EXPORT_METHODS)}")
+        if format_type not in self.EXPORTER_MAP:
+            raise ValueError(f"Unsupported format: {format_type}")
+
+        method = getattr(self, method_name)
+        accepted = inspect.signature(method).parameters
+        kwargs = {
+            key: value for key, value in (options or {}).items()
+            if key in accepted and key != 'format_type'
+        }
+        if 'attachments' in kwargs:
+            kwargs['attachments'] = _decode_attachments(kwargs['attachments'])
+        # Tier policy (views_export._enforce_async_tier_policy) requests a watermark
+        # for the result; watermarked and clean artifacts must not share a cache entry
+        self.watermark = bool((options or {}).get('add_watermark'))
+        return method(format_type, **kwargs)
     
     # =========================================================================
     # SSOT METHODS - Centralized configuration
@@ -120,6 +260,7 @@ class ExportManager:
         )
     
 
+    @artifact_cached('rekap-rab')
     def export_rekap_rab(self, format_type: str) -> HttpResponse:
         """
         Export Rekap RAB
@@ -134,7 +275,7 @@ class ExportManager:
         config = self._create_config()
         
         # Get data
-        adapter = RekapRABAdapter(self.project)
+        adapter = RekapRABAdapter(self.project, tree=self.tree)
         data_raw = adapter.get_export_data()
 
         # Convert hierarchy_levels to row_types for PDF cell merging
@@ -228,8 +369,10 @@ class ExportManager:
             font_size_title=ED.FONT_SIZE_TITLE,
             font_size_header=ED.FONT_SIZE_HEADER,
             font_size_normal=ED.FONT_SIZE_NORMAL,
+            progress_callback=self.progress_callback,
         )
 
+    @artifact_cached('rekap-kebutuhan')
     def export_rekap_kebutuhan(
         self,
         format_type: str,
@@ -466,6 +609,7 @@ class ExportManager:
         return exporter.export(data)
 
 
+    @artifact_cached('volume-pekerjaan')
     def export_volume_pekerjaan(self, format_type: str, parameters: dict = None) -> HttpResponse:
         """
         Export Volume Pekerjaan with 2 segments:
@@ -483,7 +627,9 @@ class ExportManager:
         config = self._create_config_simple('VOLUME PEKERJAAN', page_orientation='portrait')
 
         # Get data with parameters
-        adapter = VolumePekerjaanAdapter(self.project, include_signatures=True, parameters=parameters)
+        adapter = VolumePekerjaanAdapter(
+            self.project, include_signatures=True, parameters=parameters, tree=self.tree
+        )
         data = adapter.get_export_data()
 
         # Get exporter
@@ -500,6 +646,7 @@ class ExportManager:
         # Standard export for other formats
         return exporter.export(data)
 
+    @artifact_cached('harga-items')
     def export_harga_items(self, format_type: str) -> HttpResponse:
         """
         Export Harga Items
@@ -527,6 +674,7 @@ class ExportManager:
         # Export!
         return exporter.export(data)
 
+    @artifact_cached('rincian-ahsp')
     def export_rincian_ahsp(self, format_type: str, orientation: str | None = None) -> HttpResponse:
         """
         Export Rincian AHSP (Detail AHSP for all pekerjaan)
@@ -542,7 +690,7 @@ class ExportManager:
         config = self._create_config_simple('RINCIAN ANALISA HARGA SATUAN PEKERJAAN', page_orientation=page_orientation)
 
         # Get data
-        adapter = RincianAHSPAdapter(self.project)
+        adapter = RincianAHSPAdapter(self.project, tree=self.tree)
         data = adapter.get_export_data()
 
         # Get exporter
@@ -555,6 +703,7 @@ class ExportManager:
         # Export!
         return exporter.export(data)
 
+    @artifact_cached('jadwal-pekerjaan')
     def export_jadwal_pekerjaan(
         self,
         format_type: str,
@@ -619,6 +768,7 @@ class ExportManager:
             auto_compact_weeks=use_monthly_mode,  # Enable monthly if mode='monthly'
             weekly_threshold=weeks_per_month,     # Use weeks_per_month for aggregation
             max_rows_per_page=JadwalExportLayout.ROWS_PER_PAGE,
+            tree=self.tree,
         )
 
         data = adapter.get_export_data()
@@ -688,8 +838,10 @@ class ExportManager:
             font_size_title=ED.FONT_SIZE_TITLE,
             font_size_header=ED.FONT_SIZE_HEADER,
             font_size_normal=ED.FONT_SIZE_NORMAL,
+            progress_callback=self.progress_callback,
         )
 
+    @artifact_cached('jadwal-professional')
     def export_jadwal_professional(
         self,
         format_type: str,
@@ -699,6 +851,7 @@ class ExportManager:
         weeks: list[int] | None = None,   # NEW: support multi-week export
         attachments: list | None = None,
         gantt_data: dict | None = None,
+        chart_mode: str = 'server',
     ) -> HttpResponse:
         """
         Export Jadwal Pekerjaan with professional "Laporan Tertulis" format.
@@ -717,6 +870,10 @@ class ExportManager:
             period: Month number (1-based) for monthly, Week number for weekly (backward compat)
             months: List of month numbers for multi-month export (NEW)
             attachments: Chart attachments [{"title": str, "bytes": bytes}]
+            gantt_data: Structured Gantt data from the client (chart_mode='client')
+            chart_mode: 'server' draws Gantt and Kurva S as vector graphics from
+                adapter data and ignores uploaded chart images; 'client' keeps
+                the legacy attachments/gantt_data payload
             
         Returns:
             HttpResponse with exported file
@@ -755,6 +912,7 @@ class ExportManager:
             margin_right=config.margin_right,
             layout_spec=JadwalExportLayout,
             max_rows_per_page=JadwalExportLayout.ROWS_PER_PAGE,
+            tree=self.tree,
         )
 
         # Get data based on report type
@@ -1047,10 +1205,20 @@ class ExportManager:
                 data['actual_map'] = report_data.get('actual_map', {})
                 data['week'] = report_data.get('week', period)
 
+        if chart_mode == 'server':
+            # Charts come from the adapter, so no browser rendering is needed
+            attachments = None
+            if report_type == 'rekap':
+                gantt_data = report_data.get('gantt_data')
+            elif report_type == 'monthly' and format_type == 'pdf':
+                gantt_data = adapter.get_gantt_data()
+            else:
+                gantt_data = None
+
         if attachments:
             data['attachments'] = attachments
         
-        # Include structured Gantt data from frontend for backend rendering
+        # Include structured Gantt data for backend rendering
         if gantt_data:
             data['gantt_data'] = gantt_data
 
@@ -1059,6 +1227,7 @@ class ExportManager:
             raise ValueError(f"Unsupported format: {format_type}")
 
         print(f"[ExportManager] [TIME] Data prepared in {time.time() - start_time:.2f}s, {len(attachments or [])} attachments")
+        report_progress(config, 1, 2, "Data laporan siap, merender dokumen")
         
         # Word format is disabled due to performance issues
         if format_type == 'word':
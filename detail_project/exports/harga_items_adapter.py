@@ -5,6 +5,8 @@
 from decimal import Decimal, ROUND_HALF_UP
 from typing import Dict, Any, List
 
+from config.query_budget import query_budget
+
 
 class HargaItemsAdapter:
     """Data adapter for Harga Items export"""
@@ -12,6 +14,7 @@ class HargaItemsAdapter:
     def __init__(self, project):
         self.project = project
 
+    @query_budget(2, max_repeats=1)
     def get_export_data(self) -> Dict[str, Any]:
         """
         Transform Harga Items data for export.
@@ -17,19 +17,16 @@ from datetime import date
 from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 from typing import Any, Dict, List, Sequence, Set, Tuple
 
-from django.db.models import Max, Min, Prefetch, Sum
+from django.db.models import Max, Min, Sum
 
+from config.query_budget import query_budget
 from detail_project.models import (
-    Klasifikasi,
-    Pekerjaan,
     PekerjaanProgressWeekly,
-    SubKlasifikasi,
     TahapPelaksanaan,
-    VolumePekerjaan,
 )
 from detail_project.progress_utils import calculate_week_number, get_week_date_range
-from detail_project.services import compute_rekap_for_project
 from ..export_config import get_page_size_mm, JadwalExportLayout
+from .project_tree import ProjectTree, load_project_tree
 from .table_styles import SectionHeaderFormatter as SHF
 
 
@@ -48,8 +45,11 @@ class JadwalPekerjaanExportAdapter:
         auto_compact_weeks: bool = False,
         weekly_threshold: int | None = None,
         max_rows_per_page: int | None = None,
+        tree: ProjectTree | None = None,
     ):
         self.project = project
+        self._tree = tree
+        self._base_rows_cache: Tuple[List[Dict[str, Any]], Dict[int, int]] | None = None
         self.include_monthly = include_monthly
         self._rekap_harga_cache: Dict[int, Decimal] | None = None  # Lazy cache for harga lookup
         self._bobot_cache: Tuple[Dict[int, Decimal], Decimal, Dict[int, Decimal]] | None = None
@@ -96,9 +96,16 @@ class JadwalPekerjaanExportAdapter:
             self.min_monthly_col_width_mm, hard_limit=getattr(self.layout_spec, "MONTHLY_HARD_LIMIT", 8)
         )
 
+    @property
+    def tree(self) -> ProjectTree:
+        if self._tree is None:
+            self._tree = load_project_tree(self.project)
+        return self._tree
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
+    @query_budget(7, max_repeats=1)
     def get_export_data(self) -> Dict[str, Any]:
         weekly_tahapan = self._fetch_weekly_tahapan()
         progress_map, progress_meta = self._build_progress_map()
@@ -401,36 +408,21 @@ class JadwalPekerjaanExportAdapter:
         return project_start, project_end
 
     def _load_volume_map(self) -> Dict[int, Decimal]:
-        volume_map: Dict[int, Decimal] = {}
-        volume_qs = VolumePekerjaan.objects.filter(project=self.project).values("pekerjaan_id", "quantity")
-        for row in volume_qs:
-            volume_map[row["pekerjaan_id"]] = self._to_decimal(row["quantity"])
-        return volume_map
+        return self.tree.volumes
 
     def _build_base_rows(self) -> Tuple[List[Dict[str, Any]], Dict[int, int]]:
+        # Several report sections (and ExportManager) ask for the same rows
+        if self._base_rows_cache is not None:
+            rows, hierarchy = self._base_rows_cache
+            return [dict(row) for row in rows], dict(hierarchy)
+
         rows: List[Dict[str, Any]] = []
         hierarchy: Dict[int, int] = {}
         row_index = 0
-        volume_map = self._load_volume_map()
-
-        pekerjaan_prefetch = Prefetch(
-            "pekerjaan_list",
-            queryset=Pekerjaan.objects.filter(project=self.project).order_by("ordering_index", "id"),
-        )
-        sub_prefetch = Prefetch(
-            "sub_list",
-            queryset=SubKlasifikasi.objects.filter(project=self.project)
-            .order_by("ordering_index", "id")
-            .prefetch_related(pekerjaan_prefetch),
-        )
+        tree = self.tree
+        volume_map = tree.volumes
 
-        klasifikasi_list = (
-            Klasifikasi.objects.filter(project=self.project)
-            .order_by("ordering_index", "id")
-            .prefetch_related(sub_prefetch)
-        )
-
-        for klas in klasifikasi_list:
+        for klas in tree.klasifikasi:
             rows.append(
                 {
                     "type": "klasifikasi",
@@ -443,7 +435,7 @@ class JadwalPekerjaanExportAdapter:
             hierarchy[row_index] = 1
             row_index += 1
 
-            for sub in klas.sub_list.all():
+            for sub in tree.subs_of(klas):
                 rows.append(
                     {
                         "type": "sub_klasifikasi",
@@ -456,7 +448,7 @@ class JadwalPekerjaanExportAdapter:
                 hierarchy[row_index] = 2
                 row_index += 1
 
-                for pek in sub.pekerjaan_list.all():
+                for pek in tree.pekerjaan_of(sub):
                     volume = volume_map.get(pek.id, Decimal("0"))
                     rows.append(
                         {
@@ -471,7 +463,8 @@ class JadwalPekerjaanExportAdapter:
                     hierarchy[row_index] = 3
                     row_index += 1
 
-        return rows, hierarchy
+        self._base_rows_cache = (rows, hierarchy)
+        return [dict(row) for row in rows], dict(hierarchy)
 
     def _materialize_rows(
         self,
@@ -716,6 +709,9 @@ class JadwalPekerjaanExportAdapter:
             "summary": summary,
             "project_info": self._get_project_info(),
             "weekly_columns": weekly_columns,  # Added for Gantt week headers with dates
+            "gantt_data": self._build_gantt_data(
+                base_rows, hierarchy, weekly_columns, progress_map, actual_map
+            ),
             "meta": {
                 "total_weeks": len(weekly_columns),
                 "total_months": len(monthly_columns),
@@ -723,6 +719,63 @@ class JadwalPekerjaanExportAdapter:
             }
         }
 
+    def get_gantt_data(self) -> Dict[str, Any]:
+        """
+        Generate structured Gantt data for server-side (vector) rendering.
+
+        Same shape as the ``gantt_data`` payload the Jadwal page used to send:
+        {'rows', 'time_columns', 'planned', 'actual'}.
+        """
+        weekly_tahapan = self._fetch_weekly_tahapan()
+        progress_map, progress_meta = self._build_progress_map()
+        actual_map = self._build_actual_progress_map()
+
+        self.project_start, self.project_end = self._resolve_project_dates(
+            weekly_tahapan,
+            progress_meta.get("earliest_start"),
+            progress_meta.get("latest_end"),
+        )
+        weekly_columns = self._build_weekly_columns(
+            weekly_tahapan, progress_meta.get("max_week_number", 0)
+        )
+        base_rows, hierarchy = self._build_base_rows()
+        return self._build_gantt_data(base_rows, hierarchy, weekly_columns, progress_map, actual_map)
+
+    def _build_gantt_data(
+        self,
+        base_rows: Sequence[Dict[str, Any]],
+        hierarchy: Dict[int, int],
+        weekly_columns: Sequence[Dict[str, Any]],
+        progress_map: Dict[Tuple[int, int], Decimal],
+        actual_map: Dict[Tuple[int, int], Decimal],
+    ) -> Dict[str, Any]:
+        rows: List[Dict[str, Any]] = []
+        for idx, row in enumerate(base_rows):
+            rows.append(
+                {
+                    "id": row.get("pekerjaan_id", ""),
+                    "name": row.get("uraian", ""),
+                    "type": row.get("type", "pekerjaan"),
+                    "level": hierarchy.get(idx, 3),
+                    "volume_display": row.get("volume_display", ""),
+                    "unit": row.get("unit", ""),
+                }
+            )
+
+        def by_pekerjaan(source: Dict[Tuple[int, int], Decimal]) -> Dict[str, Dict[int, float]]:
+            result: Dict[str, Dict[int, float]] = {}
+            for (pekerjaan_id, week_number), value in source.items():
+                if value:
+                    result.setdefault(str(pekerjaan_id), {})[week_number] = float(value)
+            return result
+
+        return {
+            "rows": rows,
+            "time_columns": list(weekly_columns),
+            "planned": by_pekerjaan(progress_map),
+            "actual": by_pekerjaan(actual_map),
+        }
+
     def get_monthly_comparison_data(self, month: int) -> Dict[str, Any]:
         """
         Generate data for Laporan Bulanan with comparison to previous month.
@@ -1139,14 +1192,8 @@ class JadwalPekerjaanExportAdapter:
             if row_type == "pekerjaan":
                 pek_id = row.get("pekerjaan_id")
                 
-                # Get volume and harga_satuan
-                from detail_project.models import VolumePekerjaan
-                volume = Decimal("0")
-                try:
-                    vol = VolumePekerjaan.objects.get(pekerjaan_id=pek_id)
-                    volume = self._to_decimal(vol.quantity)
-                except VolumePekerjaan.DoesNotExist:
-                    volume = Decimal("1")
+                # Get volume and harga_satuan (no volume row -> 1)
+                volume = volume_map.get(pek_id, Decimal("1"))
                 
                 harga_dengan_markup = self._get_pekerjaan_harga(pek_id) if pek_id else Decimal("0")
                 # Harga satuan = total / volume
@@ -1246,14 +1293,8 @@ class JadwalPekerjaanExportAdapter:
             if row_type == "pekerjaan":
                 pek_id = row.get("pekerjaan_id")
                 
-                # Get volume
-                from detail_project.models import VolumePekerjaan
-                volume = Decimal("0")
-                try:
-                    vol = VolumePekerjaan.objects.get(pekerjaan_id=pek_id)
-                    volume = self._to_decimal(vol.quantity)
-                except VolumePekerjaan.DoesNotExist:
-                    volume = Decimal("1")
+                # Get volume (no volume row -> 1)
+                volume = volume_map.get(pek_id, Decimal("1"))
                 
                 harga_dengan_markup = self._get_pekerjaan_harga(pek_id) if pek_id else Decimal("0")
                 # Harga satuan = total / volume
@@ -1592,12 +1633,8 @@ class JadwalPekerjaanExportAdapter:
         """
         cache: Dict[int, Decimal] = {}
         try:
-            rekap_rows = compute_rekap_for_project(self.project)
-            for row in rekap_rows:
-                pek_id = row.get('pekerjaan_id')
-                if pek_id:
-                    total = Decimal(str(row.get('total', 0)))
-                    cache[int(pek_id)] = total
+            for pek_id, row in self.tree.rekap_map.items():
+                cache[pek_id] = Decimal(str(row.get('total', 0)))
         except Exception:
             pass  # Return empty cache on error
         return cache
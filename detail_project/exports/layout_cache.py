@@ -0,0 +1,150 @@
+# =====================================================================
+# FILE: detail_project/exports/layout_cache.py
+# Per-export memoization of ReportLab layout work
+# =====================================================================
+"""
+Layout cache for PDFExporter.
+
+Large exports repeat the same uraian strings, headers, number formats and
+table styles across hundreds of pages, and ReportLab re-parses and re-wraps
+every one of them. One ``LayoutCache`` lives for one ``PDFExporter`` (i.e.
+one export) and memoizes:
+
+- ``style``      : ParagraphStyle objects per (name, font, size, ...) key
+- ``paragraph``  : parsed paragraph fragments per (text, style)
+- ``wrap``       : broken lines + height per (paragraph, available width)
+- ``formatted``  : formatted rupiah/percent strings
+- ``table_style``: base TableStyle command lists
+- ``memo``       : any other pure layout computation (line splits, pagination)
+
+``stats()`` returns hit/miss counters per namespace; ``report()`` formats
+them as one log line.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable
+
+from reportlab.platypus import Paragraph
+
+logger = logging.getLogger(__name__)
+
+
+class MemoParagraph(Paragraph):
+    """Paragraph whose line breaking is shared through a LayoutCache."""
+
+    _layout_cache = None
+    _layout_key = None
+
+    def wrap(self, availWidth, availHeight):
+        cache = self._layout_cache
+        if cache is None:
+            return super().wrap(availWidth, availHeight)
+        key = (self._layout_key, availWidth)
+        entry = cache._get('wrap', key)
+        if entry is None:
+            result = super().wrap(availWidth, availHeight)
+            # Only keep normal wraps (the "cannot fit" path sets no lines)
+            if hasattr(self, 'blPara') and self.width == availWidth:
+                cache._put('wrap', key, (self.width, self.height, self.blPara, self._wrapWidths))
+            return result
+        self.width, self.height, self.blPara, self._wrapWidths = entry
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        # Splitting rewrites line fragments in place; never let it touch shared lines
+        Paragraph.wrap(self, availWidth, availHeight)
+        return super().split(availWidth, availHeight)
+
+
+class LayoutCache:
+    """Memoization layer shared by all tables/pages of one PDF export."""
+
+    def __init__(self):
+        self._store: Dict[str, Dict[Hashable, Any]] = defaultdict(dict)
+        self._hits: Dict[str, int] = defaultdict(int)
+        self._misses: Dict[str, int] = defaultdict(int)
+
+    # ------------------------------------------------------------------
+    # Core lookup
+    # ------------------------------------------------------------------
+    def _get(self, namespace: str, key: Hashable):
+        entry = self._store[namespace].get(key)
+        if entry is None:
+            self._misses[namespace] += 1
+        else:
+            self._hits[namespace] += 1
+        return entry
+
+    def _put(self, namespace: str, key: Hashable, value: Any) -> None:
+        self._store[namespace][key] = value
+
+    def memo(self, namespace: str, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the cached value for key, computing it with factory() on a miss."""
+        value = self._get(namespace, key)
+        if value is None:
+            value = factory()
+            self._put(namespace, key, value)
+        return value
+
+    # ------------------------------------------------------------------
+    # Typed helpers
+    # ------------------------------------------------------------------
+    def style(self, key: Hashable, factory: Callable[[], Any]):
+        """ParagraphStyle built once per key (styles are never mutated after creation)."""
+        return self.memo('style', key, factory)
+
+    def paragraph(self, text: str, style) -> Paragraph:
+        """
+        New Paragraph for text/style; the markup is parsed once per export.
+
+        ``style`` should come from ``style()`` (or another long-lived object)
+        because entries are keyed by its identity.
+        """
+        text = str(text or '')
+        key = (text, id(style))
+        entry = self._get('paragraph', key)
+        if entry is None:
+            para = MemoParagraph(text, style)
+            # Hold a reference to the style so its id() is never reused
+            entry = (para.style, para.frags, para.bulletText, style)
+            self._put('paragraph', key, entry)
+        else:
+            parsed_style, frags, bullet_text, _ = entry
+            para = MemoParagraph(text, parsed_style, bulletText=bullet_text, frags=frags)
+        para._layout_cache = self
+        para._layout_key = key
+        return para
+
+    def formatted(self, formatter: Callable[..., str], *args) -> str:
+        """Formatted number string (rupiah, percent, ...) per formatter and arguments."""
+        return self.memo('formatted', (formatter.__name__, args), lambda: formatter(*args))
+
+    def table_style(self, key: Hashable, factory: Callable[[], list]) -> list:
+        """Copy of a cached TableStyle command list; callers may extend the copy."""
+        return list(self.memo('table_style', key, factory))
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        result = {}
+        for namespace in sorted(set(self._hits) | set(self._misses)):
+            hits = self._hits[namespace]
+            misses = self._misses[namespace]
+            total = hits + misses
+            result[namespace] = {
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': round(hits / total * 100, 1) if total else 0.0,
+            }
+        return result
+
+    def report(self) -> str:
+        parts = [
+            f"{ns} {s['hits']}/{s['hits'] + s['misses']} ({s['hit_rate']}%)"
+            for ns, s in self.stats().items()
+        ]
+        return "layout cache hits: " + (", ".join(parts) if parts else "none")
@@ -21,6 +21,7 @@ from reportlab.graphics.widgets.markers import makeMarker
 from io import BytesIO
 from typing import Dict, Any, List
 from .base import ConfigExporterBase
+from .layout_cache import LayoutCache
 from ..export_config import get_page_size_mm
 from .table_styles import (
     UnifiedTableStyles as UTS,
@@ -217,11 +218,30 @@ class PDFExporter(ConfigExporterBase):
     
     def __init__(self, config):
         super().__init__(config)
+        # Per-export memo for styles, paragraphs, wraps and formatted numbers
+        self.layout = LayoutCache()
         self.styles = self._create_styles()
+
+    @property
+    def _sample_styles(self):
+        """getSampleStyleSheet() built once per export"""
+        return self.layout.memo('style', 'sample-stylesheet', getSampleStyleSheet)
+
+    def _cached_style(self, name: str, parent=None, **attrs) -> ParagraphStyle:
+        """
+        ParagraphStyle shared across this export for identical attributes.
+
+        ``parent`` is a sample stylesheet name ('Normal', ...) or a long-lived
+        ParagraphStyle (``self.styles`` or another cached style).
+        """
+        if isinstance(parent, str):
+            parent = self._sample_styles[parent]
+        key = (name, id(parent), tuple(sorted(attrs.items())))
+        return self.layout.style(key, lambda: ParagraphStyle(name, parent=parent, **attrs))
     
     def _create_styles(self) -> Dict[str, ParagraphStyle]:
         """Create paragraph styles"""
-        styles = getSampleStyleSheet()
+        styles = self._sample_styles
         
         return {
             'title': ParagraphStyle(
@@ -313,6 +333,34 @@ class PDFExporter(ConfigExporterBase):
             padding_left: Left padding in points (default 4)
             padding_right: Right padding in points (default 6)
         """
+        lines = self.layout.memo(
+            'uraian_lines',
+            (raw_name, level, uraian_width, char_width, padding_left, padding_right),
+            lambda: self._split_uraian_lines(raw_name, level, uraian_width, char_width, padding_left, padding_right),
+        )
+        
+        if len(lines) == 2:
+            # 2-line rendering - both lines get same indent
+            line1, line2 = lines
+            drawing.add(String(x + padding_left, row_y + row_height * 0.65, line1, 
+                              fontSize=font_size, fontName=font_weight))
+            drawing.add(String(x + padding_left, row_y + row_height * 0.25, line2, 
+                              fontSize=font_size, fontName=font_weight))
+        else:
+            # Single line - vertically centered
+            drawing.add(String(x + padding_left, row_y + row_height * 0.35, lines[0], 
+                              fontSize=font_size, fontName=font_weight))
+
+    @staticmethod
+    def _split_uraian_lines(
+        raw_name: str,
+        level: int,
+        uraian_width: float,
+        char_width: float,
+        padding_left: float,
+        padding_right: float,
+    ) -> tuple:
+        """Indented uraian text as 1 or 2 lines (estimated char widths)."""
         # Calculate indent
         indent_chars = ' ' * (level * 2) if level > 0 else ''
         
@@ -324,23 +372,14 @@ class PDFExporter(ConfigExporterBase):
         text_chars = chars_per_line - len(indent_chars)
         
         if len(raw_name) > text_chars:
-            # 2-line rendering - both lines get same indent
             line1 = indent_chars + raw_name[:text_chars]
             remaining = raw_name[text_chars:]
             if len(remaining) > text_chars - 2:
                 line2 = indent_chars + remaining[:text_chars-2] + '..'
             else:
                 line2 = indent_chars + remaining
-            
-            drawing.add(String(x + padding_left, row_y + row_height * 0.65, line1, 
-                              fontSize=font_size, fontName=font_weight))
-            drawing.add(String(x + padding_left, row_y + row_height * 0.25, line2, 
-                              fontSize=font_size, fontName=font_weight))
-        else:
-            # Single line - vertically centered
-            full_name = indent_chars + raw_name
-            drawing.add(String(x + padding_left, row_y + row_height * 0.35, full_name, 
-                              fontSize=font_size, fontName=font_weight))
+            return (line1, line2)
+        return (indent_chars + raw_name,)
     
     def _calculate_pagination(
         self,
@@ -369,6 +408,15 @@ class PDFExporter(ConfigExporterBase):
         Returns:
             Dict with pagination info: rows_per_first, rows_per_middle, rows_per_last, num_pages
         """
+        args = (total_rows, row_height, max_height, header_height, chart_height,
+                legend_height, signature_height, extra_padding)
+        return dict(self.layout.memo('pagination', args, lambda: self._compute_pagination(*args)))
+
+    @staticmethod
+    def _compute_pagination(
+        total_rows, row_height, max_height, header_height, chart_height,
+        legend_height, signature_height, extra_padding
+    ) -> dict:
         # Calculate available space for each page type
         first_page_space = max_height - header_height - chart_height - legend_height - extra_padding
         middle_page_space = max_height - header_height - chart_height - extra_padding
@@ -523,7 +571,13 @@ class PDFExporter(ConfigExporterBase):
             header_bg = UTS.PRIMARY_LIGHT
         if grid_color is None:
             grid_color = UTS.LIGHT_BORDER
-        
+        return self.layout.table_style(
+            ('base', with_header, header_bg, grid_color),
+            lambda: self._build_base_table_style(with_header, header_bg, grid_color),
+        )
+
+    @staticmethod
+    def _build_base_table_style(with_header: bool, header_bg: str, grid_color: str) -> list:
         style_cmds = [
             ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
             ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor(grid_color)),
@@ -653,6 +707,7 @@ class PDFExporter(ConfigExporterBase):
         pages = data.get('pages')
         if pages:
             for idx, section in enumerate(pages):
+                self._report_progress(idx, len(pages) + 1, f"Menyusun halaman {idx + 1}/{len(pages)}")
                 is_pengesahan = section.get('include_signatures', False)
                 build_page(section, is_pengesahan=is_pengesahan)
 
@@ -675,7 +730,7 @@ class PDFExporter(ConfigExporterBase):
             sections = data.get('sections', [])
             
             # Create compact header style (matching group title size ~9pt)
-            compact_header_style = ParagraphStyle(
+            compact_header_style = self._cached_style(
                 'CompactHeader',
                 parent=self.styles['normal'],
                 fontSize=9,
@@ -692,7 +747,7 @@ class PDFExporter(ConfigExporterBase):
             rekap_headers = ['No', 'Kode', 'Uraian Pekerjaan', 'E — Jumlah', 'F — Profit/Margin', 'G — Harga Satuan']
             
             # Create wrap style for long text
-            rekap_wrap_style = ParagraphStyle(
+            rekap_wrap_style = self._cached_style(
                 'RekapWrap',
                 parent=self.styles['normal'],
                 fontSize=8,
@@ -709,7 +764,7 @@ class PDFExporter(ConfigExporterBase):
                 rekap_rows.append([
                     str(idx + 1),
                     pekerjaan.get('kode', ''),
-                    Paragraph(uraian_text, rekap_wrap_style) if uraian_text else '',
+                    self.layout.paragraph(uraian_text, rekap_wrap_style) if uraian_text else '',
                     totals.get('E', '0'),
                     totals.get('F', '0'),
                     totals.get('G', '0'),
@@ -732,7 +787,7 @@ class PDFExporter(ConfigExporterBase):
             story.append(Spacer(1, 3*mm))
             
             # Style for pekerjaan title (slightly smaller)
-            pek_title_style = ParagraphStyle(
+            pek_title_style = self._cached_style(
                 'PekTitle',
                 parent=self.styles['normal'],
                 fontSize=8,
@@ -757,19 +812,19 @@ class PDFExporter(ConfigExporterBase):
                 detail_rows = []
                 
                 # Create a paragraph style for wrapping text
-                wrap_style = ParagraphStyle(
+                wrap_style = self._cached_style(
                     'WrapText',
                     parent=self.styles['normal'],
                     fontSize=7,
                     leading=9,
                     wordWrap='CJK'
                 )
-                wrap_style_bold = ParagraphStyle(
+                wrap_style_bold = self._cached_style(
                     'WrapTextBold',
                     parent=wrap_style,
                     fontName='Helvetica-Bold'
                 )
-                wrap_style_italic = ParagraphStyle(
+                wrap_style_italic = self._cached_style(
                     'WrapTextItalic',
                     parent=wrap_style,
                     fontName='Helvetica-BoldOblique'
@@ -784,25 +839,25 @@ class PDFExporter(ConfigExporterBase):
                         continue
                     
                     # Group title row - span across first 6 columns
-                    detail_rows.append(('group_title', [Paragraph(group_title, wrap_style_italic), '', '', '', '', '', '']))
+                    detail_rows.append(('group_title', [self.layout.paragraph(group_title, wrap_style_italic), '', '', '', '', '', '']))
                     
                     # Group detail rows - wrap uraian column
                     for row_data in group_rows:
                         row_list = list(row_data)
                         # Wrap column 1 (Uraian) with Paragraph
                         if len(row_list) > 1 and row_list[1]:
-                            row_list[1] = Paragraph(str(row_list[1]), wrap_style)
+                            row_list[1] = self.layout.paragraph(row_list[1], wrap_style)
                         detail_rows.append(('detail', row_list))
                     
                     # Subtotal row - span across first 6 columns
                     subtotal_text = f"Subtotal {group.get('short_title', '')}"
-                    detail_rows.append(('subtotal', [Paragraph(subtotal_text, wrap_style_bold), '', '', '', '', '', str(group_subtotal)]))
+                    detail_rows.append(('subtotal', [self.layout.paragraph(subtotal_text, wrap_style_bold), '', '', '', '', '', str(group_subtotal)]))
                 
                 # E, F, G totals - span across first 6 columns
-                detail_rows.append(('total_e', [Paragraph('Jumlah (E)', wrap_style_bold), '', '', '', '', '', totals.get('E', '0')]))
+                detail_rows.append(('total_e', [self.layout.paragraph('Jumlah (E)', wrap_style_bold), '', '', '', '', '', totals.get('E', '0')]))
                 markup = totals.get('markup_eff', '10.00')
-                detail_rows.append(('total_f', [Paragraph(f"Profit/Margin {markup}% (F)", wrap_style_bold), '', '', '', '', '', totals.get('F', '0')]))
-                detail_rows.append(('total_g', [Paragraph('Harga Satuan Pekerjaan (G = E + F)', wrap_style_bold), '', '', '', '', '', totals.get('G', '0')]))
+                detail_rows.append(('total_f', [self.layout.paragraph(f"Profit/Margin {markup}% (F)", wrap_style_bold), '', '', '', '', '', totals.get('F', '0')]))
+                detail_rows.append(('total_g', [self.layout.paragraph('Harga Satuan Pekerjaan (G = E + F)', wrap_style_bold), '', '', '', '', '', totals.get('G', '0')]))
                 
                 # Build table
                 table_data = [detail_headers] + [row[1] for row in detail_rows]
@@ -940,7 +995,10 @@ class PDFExporter(ConfigExporterBase):
         # Build PDF
         # Note: NumberedCanvas temporarily disabled due to ReportLab compatibility
         # TODO: Re-enable with proper implementation
+        total_steps = len(pages) + 1 if pages else 2
+        self._report_progress(total_steps - 1, total_steps, "Merender PDF")
         doc.build(story)
+        logger.info(f"[PDFExporter] {self.layout.report()}")
         
         # Create response
         pdf_content = buffer.getvalue()
@@ -1772,7 +1830,28 @@ class PDFExporter(ConfigExporterBase):
                 )
                 story.extend(gantt_elements)
                 story.append(PageBreak())
-        
+
+        # 7b. Gantt Chart for monthly reports (server-side data, landscape A3)
+        gantt_data = data.get('gantt_data') or {}
+        if report_type == 'monthly' and gantt_data.get('rows') and gantt_data.get('time_columns'):
+            story.append(NextPageTemplate('landscape'))
+            story.append(PageBreak())
+            story.append(SegmentMarker("Gantt Chart"))
+            section_title = self._cached_style(
+                'SectionHeader',
+                fontSize=14,
+                textColor=colors.HexColor(UTS.PRIMARY_LIGHT),
+                fontName='Helvetica-Bold',
+                spaceAfter=5*mm,
+            )
+            story.append(Paragraph("<b>GANTT CHART</b>", section_title))
+            story.append(Spacer(1, 5*mm))
+            story.extend(self._build_gantt_chart(
+                gantt_data['rows'], gantt_data['time_columns'],
+                gantt_data.get('planned', {}), gantt_data.get('actual', {}),
+                width=landscape_size[0] - margin_left - margin_right,
+            ))
+
         # 8. Fallback: Attachments (Frontend rendered images) - only if backend Gantt not available
         attachments = data.get('attachments') or []
         gantt_section_added = 'gantt_data' in data and data.get('gantt_data', {}).get('rows')
@@ -1829,6 +1908,7 @@ class PDFExporter(ConfigExporterBase):
         project_name = project_info.get('nama', self.config.project_name) or ''
         section_title = 'Jadwal Pekerjaan'
         doc.build(story, canvasmaker=make_numbered_canvas(project_name, section_title))
+        logger.info(f"[PDFExporter] {self.layout.report()}")
         
         pdf_content = buffer.getvalue()
         buffer.close()
@@ -1901,14 +1981,14 @@ class PDFExporter(ConfigExporterBase):
             return Table([['No data']])
         
         # Create wrap style for text
-        wrap_style = ParagraphStyle(
+        wrap_style = self._cached_style(
             'SimpleWrap',
             parent=self.styles['normal'],
             fontSize=8,
             leading=10,
             wordWrap='CJK'
         )
-        wrap_style_bold = ParagraphStyle(
+        wrap_style_bold = self._cached_style(
             'SimpleWrapBold',
             parent=wrap_style,
             fontName='Helvetica-Bold'
@@ -1929,14 +2009,14 @@ class PDFExporter(ConfigExporterBase):
             
             if row_type == 'category':
                 # Category row - first cell and last cell, merge middle columns
-                wrapped_row = [Paragraph(str(row[0]) if row else '', wrap_style_bold)]
+                wrapped_row = [self.layout.paragraph(str(row[0]) if row else '', wrap_style_bold)]
                 # Fill middle cells with empty strings (will be merged)
                 wrapped_row.extend(['' for _ in range(len(headers) - 2)])
                 # Keep last cell for total value
                 wrapped_row.append(row[-1] if len(row) > 1 else '')
             elif row_type == 'subcategory':
                 # Subcategory row - similar to category but with different style
-                wrapped_row = [Paragraph(str(row[0]) if row else '', wrap_style_bold)]
+                wrapped_row = [self.layout.paragraph(str(row[0]) if row else '', wrap_style_bold)]
                 wrapped_row.extend(['' for _ in range(len(headers) - 2)])
                 wrapped_row.append(row[-1] if len(row) > 1 else '')
             else:
@@ -1947,9 +2027,9 @@ class PDFExporter(ConfigExporterBase):
                     # Convert newlines to HTML <br/> for ReportLab
                     if '\n' in cell_text:
                         cell_text = cell_text.replace('\n', '<br/>')
-                        wrapped_row.append(Paragraph(cell_text, wrap_style))
+                        wrapped_row.append(self.layout.paragraph(cell_text, wrap_style))
                     elif col_idx in wrap_columns:  # Detected wrap columns by header
-                        wrapped_row.append(Paragraph(cell_text, wrap_style))
+                        wrapped_row.append(self.layout.paragraph(cell_text, wrap_style))
                     else:
                         wrapped_row.append(cell_text)
             table_rows.append(wrapped_row)
@@ -2060,15 +2140,16 @@ class PDFExporter(ConfigExporterBase):
 
         # Convert text to Paragraphs for wrapping
         def P(text, bold=False, align='LEFT'):
-            styles = getSampleStyleSheet()
-            st = ParagraphStyle(
-                'Cell', parent=styles['Normal'],
+            attrs = {}
+            if bold:
+                attrs['fontName'] = 'Helvetica-Bold'
+            st = self._cached_style(
+                'Cell', parent='Normal',
                 fontSize=self.config.font_size_normal,
-                alignment={'LEFT': 0, 'CENTER': 1, 'RIGHT': 2}.get(align, 0)
+                alignment={'LEFT': 0, 'CENTER': 1, 'RIGHT': 2}.get(align, 0),
+                **attrs
             )
-            if bold:
-                st.fontName = 'Helvetica-Bold'
-            return Paragraph(str(text or ''), st)
+            return self.layout.paragraph(text, st)
 
         # Helper to check if value is effectively 0% (handles comma decimal)
         def is_zero_percent(val):
@@ -2103,7 +2184,6 @@ class PDFExporter(ConfigExporterBase):
         import re
         def create_header_cell(header_text, is_week=False):
             """Create header cell, with 2-line format for week columns"""
-            styles = getSampleStyleSheet()
             
             if is_week:
                 # Parse week header like "Week 1 (01/01 - 07/01)" or "W1 (01/01-07/01)"
@@ -2126,8 +2206,8 @@ class PDFExporter(ConfigExporterBase):
                     else:
                         header_text = week_label
                 
-                st = ParagraphStyle(
-                    'WeekHeader', parent=styles['Normal'],
+                st = self._cached_style(
+                    'WeekHeader', parent='Normal',
                     fontSize=5,
                     fontName='Helvetica-Bold',
                     alignment=1,  # CENTER
@@ -2137,14 +2217,14 @@ class PDFExporter(ConfigExporterBase):
                     splitLongWords=0,  # Don't split words
                 )
             else:
-                st = ParagraphStyle(
-                    'Header', parent=styles['Normal'],
+                st = self._cached_style(
+                    'Header', parent='Normal',
                     fontSize=7,
                     fontName='Helvetica-Bold',
                     alignment=1,  # CENTER
                     textColor=colors.white,
                 )
-            return Paragraph(str(header_text or ''), st)
+            return self.layout.paragraph(header_text, st)
         
         # Identify which headers are week columns (start after static columns)
         # UNIFIED: 3 static columns (Uraian, Volume, Satuan) - NO Kode
@@ -2185,16 +2265,16 @@ class PDFExporter(ConfigExporterBase):
         # ==================================================
         # ADD BLANK CELLS TO FILL TO MAX_WEEKS_PER_PAGE
         # ==================================================
-        blank_cell_style = ParagraphStyle(
-            'BlankCell', parent=getSampleStyleSheet()['Normal'],
+        blank_cell_style = self._cached_style(
+            'BlankCell', parent='Normal',
             fontSize=5,
             alignment=1,
         )
         for _ in range(blank_cols):
-            header_cells.append(Paragraph('', blank_cell_style))
+            header_cells.append(self.layout.paragraph('', blank_cell_style))
         for row in wrapped_rows:
             for _ in range(blank_cols):
-                row.append(Paragraph('', blank_cell_style))
+                row.append(self.layout.paragraph('', blank_cell_style))
         
         # Rebuild full_data
         full_data = [header_cells] + wrapped_rows
@@ -2313,14 +2393,13 @@ class PDFExporter(ConfigExporterBase):
 
         # Helper for paragraphs
         def P(text, style_name='Normal', bold=False):
-            styles = getSampleStyleSheet()
-            st = ParagraphStyle(
-                'Custom', parent=styles[style_name],
-                fontSize=self.config.font_size_normal
+            attrs = {'fontName': 'Helvetica-Bold'} if bold else {}
+            st = self._cached_style(
+                'Custom', parent=style_name,
+                fontSize=self.config.font_size_normal,
+                **attrs
             )
-            if bold:
-                st.fontName = 'Helvetica-Bold'
-            return Paragraph(str(text or ''), st)
+            return self.layout.paragraph(text, st)
 
         # Pekerjaan Header Section (similar to .rk-right-header)
         # Metadata line: Kode • Satuan
@@ -2379,15 +2458,14 @@ class PDFExporter(ConfigExporterBase):
 
             # Wrap cells in Paragraphs
             def wrap_cell(text, align='LEFT', bold=False):
-                styles = getSampleStyleSheet()
-                st = ParagraphStyle(
-                    'Cell', parent=styles['Normal'],
+                attrs = {'fontName': 'Helvetica-Bold'} if bold else {}
+                st = self._cached_style(
+                    'Cell', parent='Normal',
                     fontSize=self.config.font_size_normal,
-                    alignment={'LEFT': 0, 'CENTER': 1, 'RIGHT': 2}.get(align, 0)
+                    alignment={'LEFT': 0, 'CENTER': 1, 'RIGHT': 2}.get(align, 0),
+                    **attrs
                 )
-                if bold:
-                    st.fontName = 'Helvetica-Bold'
-                return Paragraph(str(text or ''), st)
+                return self.layout.paragraph(text, st)
 
             # Header row
             header_cells = [wrap_cell(h, align='CENTER', bold=True) for h in headers]
@@ -3035,27 +3113,27 @@ class PDFExporter(ConfigExporterBase):
                     text = text[:max_chars-3].rstrip() + '...'
             
             al = {'LEFT': TA_LEFT, 'CENTER': TA_CENTER, 'RIGHT': TA_RIGHT}.get(align, TA_LEFT)
-            st = ParagraphStyle(
-                'Cell', 
-                fontSize=size, 
+            st = self._cached_style(
+                'Cell',
+                fontSize=size,
                 alignment=al,
                 fontName='Helvetica-Bold' if bold else 'Helvetica',
                 textColor=colors.HexColor(color) if color else colors.black,
                 leading=size + 2,
             )
-            return Paragraph(str(text or ''), st)
+            return self.layout.paragraph(text, st)
         
         def PHeader(text):
             """Header paragraph with white color."""
-            st = ParagraphStyle(
-                'Header', 
-                fontSize=7, 
+            st = self._cached_style(
+                'Header',
+                fontSize=7,
                 alignment=TA_CENTER,
                 fontName='Helvetica-Bold',
                 textColor=colors.white,
                 leading=9,
             )
-            return Paragraph(str(text or ''), st)
+            return self.layout.paragraph(text, st)
         
         # Build header row with white font
         header_row = [PHeader(h) for h in headers]
@@ -3116,12 +3194,12 @@ class PDFExporter(ConfigExporterBase):
             else:
                 # Pekerjaan: show all values using helpers
                 volume_fmt = f"{volume:,.2f}".replace(',', '.') if volume > 0 else "-"
-                harga_satuan_fmt = self._format_rupiah(harga_satuan) if harga_satuan > 0 else "-"
-                harga_fmt = self._format_rupiah(harga) if harga > 0 else "-"
-                bobot_fmt = self._format_percent(bobot, show_zero=False)
-                progress_ini_fmt = self._format_percent(progress_ini)
-                kumulatif_lalu_fmt = self._format_percent(kumulatif_lalu)
-                progress_kumulatif_fmt = self._format_percent(progress_kumulatif)
+                harga_satuan_fmt = self.layout.formatted(self._format_rupiah, harga_satuan) if harga_satuan > 0 else "-"
+                harga_fmt = self.layout.formatted(self._format_rupiah, harga) if harga > 0 else "-"
+                bobot_fmt = self.layout.formatted(self._format_percent, bobot, 2, False)
+                progress_ini_fmt = self.layout.formatted(self._format_percent, progress_ini)
+                kumulatif_lalu_fmt = self.layout.formatted(self._format_percent, kumulatif_lalu)
+                progress_kumulatif_fmt = self.layout.formatted(self._format_percent, progress_kumulatif)
             
             row = [
                 P(display_name, bold=row_bold, align='LEFT', size=font_size, max_lines=2, indent_level=level),  # Smart truncation
@@ -3152,11 +3230,11 @@ class PDFExporter(ConfigExporterBase):
             P("TOTAL", bold=True, align='LEFT', size=7),
             P("", bold=True, align='CENTER', size=7),
             P("", bold=True, align='CENTER', size=7),
-            P(self._format_rupiah(total_harga), bold=True, align='CENTER', size=7),
-            P(self._format_percent(total_bobot), bold=True, align='CENTER', size=7),
-            P(self._format_percent(total_kumulatif_lalu), bold=True, align='CENTER', size=7),
-            P(self._format_percent(total_progress_ini), bold=True, align='CENTER', size=7),
-            P(self._format_percent(total_progress_kumulatif), bold=True, align='CENTER', size=7),
+            P(self.layout.formatted(self._format_rupiah, total_harga), bold=True, align='CENTER', size=7),
+            P(self.layout.formatted(self._format_percent, total_bobot), bold=True, align='CENTER', size=7),
+            P(self.layout.formatted(self._format_percent, total_kumulatif_lalu), bold=True, align='CENTER', size=7),
+            P(self.layout.formatted(self._format_percent, total_progress_ini), bold=True, align='CENTER', size=7),
+            P(self.layout.formatted(self._format_percent, total_progress_kumulatif), bold=True, align='CENTER', size=7),
         ]
         
         # Build full table data
@@ -3436,26 +3514,26 @@ class PDFExporter(ConfigExporterBase):
                     text = text[:max_chars-3].rstrip() + '...'
             
             al = {'LEFT': TA_LEFT, 'CENTER': TA_CENTER, 'RIGHT': TA_RIGHT}.get(align, TA_LEFT)
-            st = ParagraphStyle(
-                'Cell', 
-                fontSize=size, 
+            st = self._cached_style(
+                'Cell',
+                fontSize=size,
                 alignment=al,
                 fontName='Helvetica-Bold' if bold else 'Helvetica',
                 textColor=colors.HexColor(color) if color else colors.black,
                 leading=size + 2,
             )
-            return Paragraph(str(text or ''), st)
+            return self.layout.paragraph(text, st)
         
         def PHeader(text):
-            st = ParagraphStyle(
-                'Header', 
-                fontSize=7, 
+            st = self._cached_style(
+                'Header',
+                fontSize=7,
                 alignment=TA_CENTER,
                 fontName='Helvetica-Bold',
                 textColor=colors.white,
                 leading=9,
             )
-            return Paragraph(str(text or ''), st)
+            return self.layout.paragraph(text, st)
         
         header_row = [PHeader(h) for h in headers]
         
@@ -3508,12 +3586,12 @@ class PDFExporter(ConfigExporterBase):
                 progress_kumulatif_fmt = ""
             else:
                 volume_fmt = f"{volume:,.2f}".replace(',', '.') if volume > 0 else "-"
-                harga_satuan_fmt = self._format_rupiah(harga_satuan) if harga_satuan > 0 else "-"
-                harga_fmt = self._format_rupiah(harga) if harga > 0 else "-"
-                bobot_fmt = self._format_percent(bobot, show_zero=False)
-                progress_ini_fmt = self._format_percent(progress_ini)
-                kumulatif_lalu_fmt = self._format_percent(kumulatif_lalu)
-                progress_kumulatif_fmt = self._format_percent(progress_kumulatif)
+                harga_satuan_fmt = self.layout.formatted(self._format_rupiah, harga_satuan) if harga_satuan > 0 else "-"
+                harga_fmt = self.layout.formatted(self._format_rupiah, harga) if harga > 0 else "-"
+                bobot_fmt = self.layout.formatted(self._format_percent, bobot, 2, False)
+                progress_ini_fmt = self.layout.formatted(self._format_percent, progress_ini)
+                kumulatif_lalu_fmt = self.layout.formatted(self._format_percent, kumulatif_lalu)
+                progress_kumulatif_fmt = self.layout.formatted(self._format_percent, progress_kumulatif)
             
             row = [
                 P(display_name, bold=row_bold, align='LEFT', size=font_size, max_lines=2, indent_level=level),
@@ -3541,11 +3619,11 @@ class PDFExporter(ConfigExporterBase):
             P("TOTAL", bold=True, align='LEFT', size=7),
             P("", bold=True, align='CENTER', size=7),
             P("", bold=True, align='CENTER', size=7),
-            P(self._format_rupiah(total_harga), bold=True, align='CENTER', size=7),
-            P(self._format_percent(total_bobot), bold=True, align='CENTER', size=7),
-            P(self._format_percent(total_kumulatif_lalu), bold=True, align='CENTER', size=7),
-            P(self._format_percent(total_progress_ini), bold=True, align='CENTER', size=7),
-            P(self._format_percent(total_progress_kumulatif), bold=True, align='CENTER', size=7),
+            P(self.layout.formatted(self._format_rupiah, total_harga), bold=True, align='CENTER', size=7),
+            P(self.layout.formatted(self._format_percent, total_bobot), bold=True, align='CENTER', size=7),
+            P(self.layout.formatted(self._format_percent, total_kumulatif_lalu), bold=True, align='CENTER', size=7),
+            P(self.layout.formatted(self._format_percent, total_progress_ini), bold=True, align='CENTER', size=7),
+            P(self.layout.formatted(self._format_percent, total_progress_kumulatif), bold=True, align='CENTER', size=7),
         ]
         
         table_data = [header_row]
@@ -3865,15 +3943,14 @@ class PDFExporter(ConfigExporterBase):
         
         # Create paragraphs for wrapping
         def P(text, bold=False, align='LEFT'):
-            styles = getSampleStyleSheet()
-            st = ParagraphStyle(
-                'Cell', parent=styles['Normal'],
+            attrs = {'fontName': 'Helvetica-Bold'} if bold else {}
+            st = self._cached_style(
+                'Cell', parent='Normal',
                 fontSize=10,
-                alignment={'LEFT': TA_LEFT, 'CENTER': TA_CENTER, 'RIGHT': TA_RIGHT}.get(align, TA_LEFT)
+                alignment={'LEFT': TA_LEFT, 'CENTER': TA_CENTER, 'RIGHT': TA_RIGHT}.get(align, TA_LEFT),
+                **attrs
             )
-            if bold:
-                st.fontName = 'Helvetica-Bold'
-            return Paragraph(str(text or ''), st)
+            return self.layout.paragraph(text, st)
         
         header_cells = [P(h, bold=True, align='CENTER') for h in headers]
         wrapped_rows = []
@@ -4025,15 +4102,14 @@ class PDFExporter(ConfigExporterBase):
         
         # Create paragraphs
         def P(text, bold=False, align='LEFT'):
-            styles = getSampleStyleSheet()
-            st = ParagraphStyle(
-                'Cell', parent=styles['Normal'],
+            attrs = {'fontName': 'Helvetica-Bold'} if bold else {}
+            st = self._cached_style(
+                'Cell', parent='Normal',
                 fontSize=8,
-                alignment={'LEFT': TA_LEFT, 'CENTER': TA_CENTER, 'RIGHT': TA_RIGHT}.get(align, TA_LEFT)
+                alignment={'LEFT': TA_LEFT, 'CENTER': TA_CENTER, 'RIGHT': TA_RIGHT}.get(align, TA_LEFT),
+                **attrs
             )
-            if bold:
-                st.fontName = 'Helvetica-Bold'
-            return Paragraph(str(text or ''), st)
+            return self.layout.paragraph(text, st)
         
         header_cells = [P(h, bold=True, align='CENTER') for h in headers]
         
@@ -4367,8 +4443,8 @@ class PDFExporter(ConfigExporterBase):
                     return f'<b>{week_label}</b><br/><font size="4">-</font>'
             
             # Create header cells with proper leading for 2-line display
-            header_style = ParagraphStyle(
-                'GanttHeader', parent=getSampleStyleSheet()['Normal'],
+            header_style = self._cached_style(
+                'GanttHeader', parent='Normal',
                 fontSize=5,
                 fontName='Helvetica-Bold',
                 alignment=1,
@@ -4377,8 +4453,8 @@ class PDFExporter(ConfigExporterBase):
             )
             
             # Static column header style (larger font)
-            static_header_style = ParagraphStyle(
-                'StaticHeader', parent=getSampleStyleSheet()['Normal'],
+            static_header_style = self._cached_style(
+                'StaticHeader', parent='Normal',
                 fontSize=7,
                 fontName='Helvetica-Bold',
                 alignment=1,
@@ -4521,8 +4597,8 @@ class PDFExporter(ConfigExporterBase):
                 # Don't truncate name - let Paragraph handle wrapping
                 full_display_name = f"{indent}{name}"
                 
-                name_cell = Paragraph(full_display_name, ParagraphStyle(
-                    'NameCell', parent=getSampleStyleSheet()['Normal'],
+                name_cell = self.layout.paragraph(full_display_name, self._cached_style(
+                    'NameCell', parent='Normal',
                     fontSize=font_size,
                     fontName=font_name,
                     alignment=0,
@@ -4531,14 +4607,14 @@ class PDFExporter(ConfigExporterBase):
                 ))
                 
                 # UNIFIED: Create Volume and Satuan cells
-                data_cell_style = ParagraphStyle(
-                    'DataCell', parent=getSampleStyleSheet()['Normal'],
+                data_cell_style = self._cached_style(
+                    'DataCell', parent='Normal',
                     fontSize=font_size,
                     fontName=font_name,
                     alignment=2,  # RIGHT align
                 )
-                volume_cell = Paragraph(str(volume) if volume else '', data_cell_style)
-                satuan_cell = Paragraph(str(satuan) if satuan else '', data_cell_style)
+                volume_cell = self.layout.paragraph(volume if volume else '', data_cell_style)
+                satuan_cell = self.layout.paragraph(satuan if satuan else '', data_cell_style)
                 
                 # Create bar chart drawing for timeline area
                 bar_drawing = create_bar_cell(
@@ -0,0 +1,124 @@
+# =====================================================================
+# FILE: detail_project/exports/project_tree.py
+# Shared hierarchy loader for export adapters
+# =====================================================================
+"""
+Project tree (Klasifikasi → SubKlasifikasi → Pekerjaan) loaded once per export.
+
+Each level is fetched with one flat query ordered by ``(ordering_index, id)``
+and grouped in memory, so walking the tree costs no further queries no matter
+how many klasifikasi or sub-klasifikasi the project has. Volume and pricing
+are loaded alongside; the rekap (``compute_rekap_for_project``) rows are
+computed lazily and kept for the rest of the run.
+
+Usage:
+    tree = load_project_tree(project)
+    for klas in tree.klasifikasi:
+        for sub in tree.subs_of(klas):
+            for pek in tree.pekerjaan_of(sub):
+                tree.volume(pek.id)
+
+``ExportManager`` builds one tree per instance and hands it to every adapter;
+adapters constructed without one load their own on first use.
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, List, Optional
+
+
+class ProjectTree:
+    """In-memory hierarchy + volume/pricing maps for one project."""
+
+    def __init__(self, project, klasifikasi, sub_klasifikasi, pekerjaan, volumes, pricing=None):
+        self.project = project
+        self.klasifikasi: List[Any] = list(klasifikasi)
+        self.volumes: Dict[int, Decimal] = volumes
+        self.pricing = pricing
+
+        self._subs: Dict[int, List[Any]] = {}
+        for sub in sub_klasifikasi:
+            self._subs.setdefault(sub.klasifikasi_id, []).append(sub)
+        self._pekerjaan: Dict[int, List[Any]] = {}
+        for pek in pekerjaan:
+            self._pekerjaan.setdefault(pek.sub_klasifikasi_id, []).append(pek)
+
+        self._rekap_map: Optional[Dict[int, Dict[str, Any]]] = None
+
+    # ------------------------------------------------------------------
+    # Hierarchy
+    # ------------------------------------------------------------------
+    def subs_of(self, klas) -> List[Any]:
+        return self._subs.get(klas.id, [])
+
+    def pekerjaan_of(self, sub) -> List[Any]:
+        return self._pekerjaan.get(sub.id, [])
+
+    def iter_pekerjaan(self):
+        """All pekerjaan in display order."""
+        for klas in self.klasifikasi:
+            for sub in self.subs_of(klas):
+                yield from self.pekerjaan_of(sub)
+
+    # ------------------------------------------------------------------
+    # Volume & pricing
+    # ------------------------------------------------------------------
+    def has_volume(self, pekerjaan_id: int) -> bool:
+        return pekerjaan_id in self.volumes
+
+    def volume(self, pekerjaan_id: int, default: Decimal = Decimal('0')) -> Decimal:
+        return self.volumes.get(pekerjaan_id, default)
+
+    def pricing_value(self, field: str, default: Any) -> Any:
+        value = getattr(self.pricing, field, None) if self.pricing else None
+        return default if value is None else value
+
+    @property
+    def rekap_map(self) -> Dict[int, Dict[str, Any]]:
+        """pekerjaan_id -> row from ``compute_rekap_for_project`` (computed once)."""
+        if self._rekap_map is None:
+            from detail_project.services import compute_rekap_for_project
+
+            rekap_map: Dict[int, Dict[str, Any]] = {}
+            try:
+                for row in compute_rekap_for_project(self.project):
+                    pek_id = row.get('pekerjaan_id')
+                    if pek_id:
+                        rekap_map[int(pek_id)] = row
+            except Exception:
+                rekap_map = {}
+            self._rekap_map = rekap_map
+        return self._rekap_map
+
+
+def _to_decimal(value: Any) -> Decimal:
+    if value is None:
+        return Decimal('0')
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return Decimal('0')
+
+
+def load_project_tree(project) -> ProjectTree:
+    """Fetch the hierarchy with three flat queries plus volume and pricing."""
+    from detail_project.models import (
+        Klasifikasi,
+        Pekerjaan,
+        ProjectPricing,
+        SubKlasifikasi,
+        VolumePekerjaan,
+    )
+
+    klasifikasi = Klasifikasi.objects.filter(project=project).order_by('ordering_index', 'id')
+    sub_klasifikasi = SubKlasifikasi.objects.filter(project=project).order_by('ordering_index', 'id')
+    pekerjaan = Pekerjaan.objects.filter(project=project).order_by('ordering_index', 'id')
+
+    volumes = {
+        row['pekerjaan_id']: _to_decimal(row['quantity'])
+        for row in VolumePekerjaan.objects.filter(project=project).values('pekerjaan_id', 'quantity')
+    }
+    pricing = ProjectPricing.objects.filter(project=project).first()
+
+    return ProjectTree(project, klasifikasi, sub_klasifikasi, pekerjaan, volumes, pricing)
@@ -7,6 +7,8 @@ from collections import Counter
 from datetime import date, timedelta
 import calendar
 
+from config.query_budget import query_budget
+
 
 class RekapKebutuhanAdapter:
     """Data adapter for Rekap Kebutuhan export"""
@@ -84,6 +86,7 @@ class RekapKebutuhanAdapter:
             return f"Bulan {start_raw} - {end_raw}"
         return ''
 
+    @query_budget(11, max_repeats=1)
     def get_export_data(self, unit_mode: str = 'base') -> Dict[str, Any]:
         """
         Transform Rekap Kebutuhan data (flat) for export.
@@ -6,26 +6,28 @@
 from decimal import Decimal, ROUND_HALF_UP
 from typing import Dict, Any, List
 
+from config.query_budget import query_budget
+
+from .project_tree import ProjectTree, load_project_tree
+
 
 class RekapRABAdapter:
     """Data adapter for Rekap RAB export"""
     
-    def __init__(self, project):
+    def __init__(self, project, tree: ProjectTree | None = None):
         self.project = project
+        self._tree = tree
+
+    @property
+    def tree(self) -> ProjectTree:
+        if self._tree is None:
+            self._tree = load_project_tree(self.project)
+        return self._tree
     
+    @query_budget(15, max_repeats=2)
     def get_export_data(self) -> Dict[str, Any]:
         """Transform Rekap RAB data for export"""
-        from detail_project.models import Klasifikasi
-        try:
-            from detail_project.models import ProjectPricing  # type: ignore
-        except Exception:  # fallback if not available
-            ProjectPricing = None  # type: ignore
-        
-        # Use the same computation as the page to ensure parity
-        try:
-            from detail_project.services import compute_rekap_for_project  # type: ignore
-        except Exception:
-            compute_rekap_for_project = None  # type: ignore
+        tree = self.tree
         
         rows = []
         hierarchy_levels = {}
@@ -43,29 +45,13 @@ class RekapRABAdapter:
         
         col_widths = [65, 25, 18, 20, 30, 32]  # in mm (total: 190mm for A4 Portrait)
         
-        # Fetch hierarchical containers
-        klasifikasi_list = (
-            Klasifikasi.objects
-            .filter(project=self.project)
-            .prefetch_related('sub_list__pekerjaan_list')
-            .order_by('ordering_index', 'id')
-        )
-        
         # Compute pekerjaan values via service for parity with UI
-        pkj_map: Dict[int, Dict[str, Any]] = {}
-        if compute_rekap_for_project:
-            try:
-                rows_calc = compute_rekap_for_project(self.project)
-                for r in rows_calc:
-                    pid = int(r.get('pekerjaan_id'))
-                    pkj_map[pid] = r
-            except Exception:
-                pkj_map = {}
+        pkj_map: Dict[int, Dict[str, Any]] = tree.rekap_map
         
         grand_total = Decimal('0')  # total biaya langsung
         summary_by_klas = []
         
-        for klas in klasifikasi_list:
+        for klas in tree.klasifikasi:
             # Klasifikasi header
             rows.append([
                 getattr(klas, 'name', getattr(klas, 'nama', 'Klasifikasi')),
@@ -81,7 +67,7 @@ class RekapRABAdapter:
             
             klas_total = Decimal('0')
             
-            for sub in klas.sub_list.all().order_by('ordering_index', 'id'):
+            for sub in tree.subs_of(klas):
                 # Sub header
                 rows.append([
                     getattr(sub, 'name', getattr(sub, 'nama', 'Sub')),
@@ -98,7 +84,7 @@ class RekapRABAdapter:
                 sub_total = Decimal('0')
                 
                 # Pekerjaan items
-                for pek in sub.pekerjaan_list.all().order_by('ordering_index', 'id'):
+                for pek in tree.pekerjaan_of(sub):
                     # Prefer computed row for exact parity with UI
                     calc = pkj_map.get(int(getattr(pek, 'id', 0)))
                     if calc:
@@ -155,15 +141,11 @@ class RekapRABAdapter:
         # Determine ppn_percent and rounding_base from ProjectPricing if exists
         ppn_pct = None
         rounding_base = None
-        if ProjectPricing:
-            try:
-                pricing = ProjectPricing.objects.filter(project=self.project).first()
-                if pricing and hasattr(pricing, 'ppn_percent'):
-                    ppn_pct = Decimal(str(pricing.ppn_percent))
-                if pricing and hasattr(pricing, 'rounding_base') and pricing.rounding_base:
-                    rounding_base = int(pricing.rounding_base)
-            except Exception:
-                pass
+        pricing = tree.pricing
+        if pricing and getattr(pricing, 'ppn_percent', None) is not None:
+            ppn_pct = Decimal(str(pricing.ppn_percent))
+        if pricing and getattr(pricing, 'rounding_base', None):
+            rounding_base = int(pricing.rounding_base)
 
         if ppn_pct is None:
             ppn_pct = Decimal('11')
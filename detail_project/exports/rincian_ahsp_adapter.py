@@ -5,13 +5,25 @@
 from decimal import Decimal
 from typing import Dict, Any, List
 
+from config.query_budget import query_budget
+
+from .project_tree import ProjectTree, load_project_tree
+
 
 class RincianAHSPAdapter:
     """Data adapter for Rincian AHSP (Detail AHSP) export"""
 
-    def __init__(self, project):
+    def __init__(self, project, tree: ProjectTree | None = None):
         self.project = project
+        self._tree = tree
+
+    @property
+    def tree(self) -> ProjectTree:
+        if self._tree is None:
+            self._tree = load_project_tree(self.project)
+        return self._tree
 
+    @query_budget(6, max_repeats=1)
     def get_export_data(self) -> Dict[str, Any]:
         """
         Transform Rincian AHSP data for export.
@@ -19,11 +31,12 @@ class RincianAHSPAdapter:
         Similar to the web page .rk-right .ra-editor structure.
         """
         from detail_project.models import (
-            Klasifikasi,
             DetailAHSPProject,
             DetailAHSPExpanded,
         )
 
+        tree = self.tree
+
         sections = []  # List of pekerjaan sections
         recap_rows = []  # Lampiran Rekap AHSP rows
 
@@ -41,14 +54,6 @@ class RincianAHSPAdapter:
         # Column widths for A4 Landscape (297mm width - 20mm margins = 277mm usable)
         detail_col_widths = [15, 80, 35, 25, 30, 46, 46]  # in mm (total: 277mm)
 
-        # Fetch hierarchical containers with detail AHSP
-        klasifikasi_list = (
-            Klasifikasi.objects
-            .filter(project=self.project)
-            .prefetch_related('sub_list__pekerjaan_list')
-            .order_by('ordering_index', 'id')
-        )
-
         # Fetch all details at once for efficiency
         all_details = (
             DetailAHSPProject.objects
@@ -91,20 +96,17 @@ class RincianAHSPAdapter:
 
         # Build sections - each pekerjaan becomes a section
         # Determine default project markup (Profit/Margin)
-        try:
-            default_markup = Decimal(str(getattr(self.project.pricing, 'markup_percent', '10.00')))
-        except Exception:
-            # If pricing not created yet, use 10.00%
-            default_markup = Decimal('10.00')
+        # If pricing not created yet, use 10.00%
+        default_markup = Decimal(str(tree.pricing_value('markup_percent', '10.00')))
 
-        for klas in klasifikasi_list:
+        for klas in tree.klasifikasi:
             klas_name = getattr(klas, 'name', getattr(klas, 'nama', 'Klasifikasi'))
 
-            for sub in klas.sub_list.all().order_by('ordering_index', 'id'):
+            for sub in tree.subs_of(klas):
                 sub_name = getattr(sub, 'name', getattr(sub, 'nama', 'Sub'))
 
                 # Pekerjaan items
-                for pek in sub.pekerjaan_list.all().order_by('ordering_index', 'id'):
+                for pek in tree.pekerjaan_of(sub):
                     uraian = getattr(pek, 'snapshot_uraian', getattr(pek, 'nama', getattr(pek, 'name', '')))
                     kode_pek = getattr(pek, 'snapshot_kode', getattr(pek, 'kode_ahsp', ''))
                     satuan_pek = getattr(pek, 'satuan', '-')
@@ -0,0 +1,78 @@
+"""
+Tests for the per-export ReportLab layout cache.
+
+Run with: python -m pytest detail_project/exports/tests/test_layout_cache.py -v
+"""
+
+import unittest
+
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import Paragraph
+
+from detail_project.export_config import ExportConfig
+from detail_project.exports.layout_cache import LayoutCache
+from detail_project.exports.pdf_exporter import PDFExporter
+
+LONG_TEXT = "Pekerjaan galian tanah biasa sedalam satu meter untuk pondasi batu kali " * 3
+
+
+class LayoutCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.cache = LayoutCache()
+        self.style = self.cache.style(('Cell', 8), lambda: ParagraphStyle('Cell', fontSize=8, leading=10))
+
+    def test_paragraphs_share_parse_and_wrap(self):
+        first = self.cache.paragraph(LONG_TEXT, self.style)
+        second = self.cache.paragraph(LONG_TEXT, self.style)
+        self.assertIsNot(first, second)
+        self.assertIs(first.frags, second.frags)
+
+        expected = Paragraph(LONG_TEXT, self.style).wrap(120, 1000)
+        self.assertEqual(first.wrap(120, 1000), expected)
+        self.assertEqual(second.wrap(120, 1000), expected)
+        self.assertIs(first.blPara, second.blPara)
+
+        stats = self.cache.stats()
+        self.assertEqual(stats['paragraph'], {'hits': 1, 'misses': 1, 'hit_rate': 50.0})
+        self.assertEqual(stats['wrap']['hits'], 1)
+        self.assertIn('paragraph 1/2 (50.0%)', self.cache.report())
+
+    def test_split_does_not_touch_shared_lines(self):
+        first = self.cache.paragraph(LONG_TEXT, self.style)
+        _, height = first.wrap(120, 1000)
+        line_count = len(first.blPara.lines)
+
+        second = self.cache.paragraph(LONG_TEXT, self.style)
+        second.wrap(120, 1000)
+        parts = second.split(120, height / 2)
+        self.assertEqual(len(parts), 2)
+
+        third = self.cache.paragraph(LONG_TEXT, self.style)
+        self.assertEqual(third.wrap(120, 1000), (120, height))
+        self.assertEqual(len(third.blPara.lines), line_count)
+
+    def test_table_style_returns_copies(self):
+        cmds = self.cache.table_style('base', lambda: [('GRID', (0, 0), (-1, -1), 0.5, None)])
+        cmds.append(('FONTSIZE', (0, 0), (-1, -1), 7))
+        self.assertEqual(len(self.cache.table_style('base', list)), 1)
+
+    def test_pdf_export_reuses_repeated_cells(self):
+        config = ExportConfig(
+            title='DAFTAR HARGA ITEMS', project_name='P', project_code='C', location='L', year='2026'
+        )
+        exporter = PDFExporter(config)
+        rows = [['1', 'Pekerja', 'OH', '100.000'] for _ in range(50)]
+        response = exporter.export({
+            'table_data': {'headers': ['No', 'Uraian', 'Satuan', 'Harga'], 'rows': rows},
+            'col_widths': [10, 80, 20, 40],
+        })
+        self.assertEqual(response.status_code, 200)
+
+        stats = exporter.layout.stats()
+        self.assertGreaterEqual(stats['paragraph']['hits'], 49)
+        self.assertGreaterEqual(stats['wrap']['hits'], 49)
+        self.assertEqual(stats['style']['hits'], 0)  # each style is built exactly once
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,16 +10,34 @@ from decimal import Decimal, ROUND_HALF_UP
 from typing import Dict, Any, List, Optional
 import re
 
+from config.query_budget import query_budget
+
+from .project_tree import ProjectTree, load_project_tree
+
 
 class VolumePekerjaanAdapter:
     """Data adapter for Volume Pekerjaan export"""
 
-    def __init__(self, project, include_signatures: bool = True, parameters: dict = None):
+    def __init__(
+        self,
+        project,
+        include_signatures: bool = True,
+        parameters: dict = None,
+        tree: ProjectTree | None = None,
+    ):
         self.project = project
+        self._tree = tree
         self.include_signatures = include_signatures
         self.parameters = parameters or {}  # { 'panjang': 100.0, 'lebar': 50.0, ... }
         self._parameter_cells = {}  # For Excel formula references: {'panjang': 'B2', ...}
 
+    @property
+    def tree(self) -> ProjectTree:
+        if self._tree is None:
+            self._tree = load_project_tree(self.project)
+        return self._tree
+
+    @query_budget(7, max_repeats=1)
     def get_export_data(self) -> Dict[str, Any]:
         """
         Transform Volume Pekerjaan data for export.
@@ -28,21 +46,9 @@ class VolumePekerjaanAdapter:
         1. Parameter Perhitungan - table of parameters with codes and values
         2. Volume & Formula - work items with formulas and calculated volumes
         """
-        from detail_project.models import Klasifikasi, VolumePekerjaan, VolumeFormulaState
-
-        # Fetch hierarchical containers with volume data
-        klasifikasi_list = (
-            Klasifikasi.objects
-            .filter(project=self.project)
-            .prefetch_related('sub_list__pekerjaan_list')
-            .order_by('ordering_index', 'id')
-        )
-
-        # Fetch all volumes at once for efficiency
-        vol_map = {}
-        all_volume_qs = VolumePekerjaan.objects.filter(project=self.project).values('pekerjaan_id', 'quantity')
-        for v in all_volume_qs:
-            vol_map[v['pekerjaan_id']] = self._to_decimal(v['quantity'])
+        from detail_project.models import VolumeFormulaState
+
+        tree = self.tree
 
         # Fetch all formula states
         formula_map = {}
@@ -57,7 +63,7 @@ class VolumePekerjaanAdapter:
         param_page = self._build_parameter_segment()
 
         # ===== SEGMENT 2: VOLUME & FORMULA =====
-        volume_page = self._build_volume_segment(klasifikasi_list, vol_map, formula_map)
+        volume_page = self._build_volume_segment(tree, formula_map)
 
         # Build signature data (same as Harga Items)
         signature_data = None
@@ -141,7 +147,7 @@ class VolumePekerjaanAdapter:
             'row_types': ['item'] * len(rows),
         }
 
-    def _build_volume_segment(self, klasifikasi_list, vol_map, formula_map) -> Dict[str, Any]:
+    def _build_volume_segment(self, tree: ProjectTree, formula_map) -> Dict[str, Any]:
         """Build Segment 2: Volume & Formula"""
         
         # Column configuration (no empty columns)
@@ -154,7 +160,7 @@ class VolumePekerjaanAdapter:
         row_idx = 0
         item_num = 0
 
-        for klas in klasifikasi_list:
+        for klas in tree.klasifikasi:
             # Klasifikasi header
             klas_name = getattr(klas, 'name', getattr(klas, 'nama', 'Klasifikasi'))
             rows.append([klas_name, '', '', '', ''])
@@ -162,7 +168,7 @@ class VolumePekerjaanAdapter:
             hierarchy_levels[row_idx] = 1
             row_idx += 1
 
-            for sub in klas.sub_list.all().order_by('ordering_index', 'id'):
+            for sub in tree.subs_of(klas):
                 # Sub header
                 sub_name = getattr(sub, 'name', getattr(sub, 'nama', 'Sub'))
                 rows.append([sub_name, '', '', '', ''])
@@ -171,11 +177,11 @@ class VolumePekerjaanAdapter:
                 row_idx += 1
 
                 # Pekerjaan items
-                for pek in sub.pekerjaan_list.all().order_by('ordering_index', 'id'):
+                for pek in tree.pekerjaan_of(sub):
                     item_num += 1
                     uraian = getattr(pek, 'snapshot_uraian', getattr(pek, 'nama', getattr(pek, 'name', '')))
                     satuan = getattr(pek, 'snapshot_satuan', getattr(pek, 'satuan', ''))
-                    volume = vol_map.get(pek.id, Decimal('0'))
+                    volume = tree.volume(pek.id)
 
                     # Get formula if exists
                     formula_info = formula_map.get(pek.id, {})
@@ -36,6 +36,7 @@ from ..export_config import (
     get_level_style,
     build_identity_rows,
 )
+from .base import report_progress
 from .table_styles import UnifiedTableStyles as UTS, ExportDefaults as ED
 from .signature_config import SignatureLayoutRules as SLR
 
@@ -121,6 +122,7 @@ class WordExporter:
             pages = [data]
         
         for idx, page in enumerate(pages):
+            report_progress(self.config, idx, len(pages), f"Menyusun halaman {idx + 1}/{len(pages)}")
             # Page title
             title = page.get('title') or self.config.title or f'Page {idx + 1}'
             self._build_section_header(title)
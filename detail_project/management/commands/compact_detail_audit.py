@@ -0,0 +1,103 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from detail_project.audit_delta import compact_chain
+from detail_project.models import DetailAHSPAudit
+
+COMPACT_FIELDS = [
+    "old_data",
+    "new_data",
+    "delta",
+    "is_checkpoint",
+    "chain_length",
+    "state_hash",
+    "chain_pekerjaan_id",
+]
+
+
+def _json_size(*values) -> int:
+    return sum(len(json.dumps(v, default=str)) for v in values if v is not None)
+
+
+class Command(BaseCommand):
+    help = "Ubah DetailAHSPAudit format lama (old_data/new_data penuh) ke delta + checkpoint"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--project-id",
+            type=int,
+            help="Hanya compact audit untuk project ini",
+        )
+        parser.add_argument(
+            "--checkpoint-interval",
+            type=int,
+            default=None,
+            help="Checkpoint penuh setiap N entry per pekerjaan (default: DETAIL_AUDIT_CHECKPOINT_INTERVAL)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Jumlah entry per bulk_update",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Hitung penghematan tanpa menyimpan",
+        )
+
+    def handle(self, *args, **options):
+        project_id = options.get("project_id")
+        interval = options.get("checkpoint_interval")
+        batch_size = options.get("batch_size")
+        dry_run = options.get("dry_run")
+
+        legacy = DetailAHSPAudit.objects.filter(state_hash="").filter(
+            Q(old_data__isnull=False) | Q(new_data__isnull=False)
+        )
+        if project_id:
+            legacy = legacy.filter(project_id=project_id)
+
+        # Rantai = pekerjaan; pekerjaan yang sudah dihapus (NULL) dilewati
+        chain_ids = sorted(
+            {pk for pk in legacy.values_list("pekerjaan_id", flat=True) if pk is not None}
+        )
+
+        total_entries = 0
+        bytes_before = 0
+        bytes_after = 0
+        checkpoints = 0
+
+        for chain_id in chain_ids:
+            entries = list(
+                DetailAHSPAudit.objects
+                .filter(Q(chain_pekerjaan_id=chain_id) | Q(chain_pekerjaan_id__isnull=True, pekerjaan_id=chain_id))
+                .order_by("id")
+            )
+            before = {e.id: _json_size(e.old_data, e.new_data, e.delta) for e in entries}
+            changed = compact_chain(entries, interval=interval)
+            if not changed:
+                continue
+
+            total_entries += len(changed)
+            bytes_before += sum(before[e.id] for e in changed)
+            bytes_after += sum(_json_size(e.old_data, e.new_data, e.delta) for e in changed)
+            checkpoints += sum(1 for e in changed if e.is_checkpoint)
+
+            if not dry_run:
+                with transaction.atomic():
+                    DetailAHSPAudit.objects.bulk_update(changed, COMPACT_FIELDS, batch_size=batch_size)
+
+        saved = bytes_before - bytes_after
+        pct = (saved / bytes_before * 100) if bytes_before else 0.0
+        prefix = "[DRY RUN] " if dry_run else ""
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{prefix}{total_entries} entry di {len(chain_ids)} pekerjaan "
+                f"({checkpoints} checkpoint); JSON {bytes_before} -> {bytes_after} bytes "
+                f"(hemat {saved} bytes, {pct:.1f}%)"
+            )
+        )
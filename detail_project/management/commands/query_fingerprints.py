@@ -0,0 +1,80 @@
+"""
+Tampilkan fingerprint SQL yang paling sering berulang untuk satu URL.
+
+Usage:
+    python manage.py query_fingerprints /detail_project/api/project/12/rekap/ --user admin
+    python manage.py query_fingerprints /detail_project/api/v2/project/12/assign-weekly/ \\
+        --user admin --method post --data '{"assignments": [...]}' --max-repeats 5
+
+Request dijalankan lewat test Client di dalam transaksi yang di-rollback,
+jadi aman juga untuk POST. --budget / --max-repeats membuat command gagal
+bila budget terlampaui (untuk CI).
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+
+from config.query_budget import QueryRecorder, query_budget
+
+
+class Command(BaseCommand):
+    help = "Hitung query per fingerprint untuk satu URL dan tampilkan yang paling sering berulang"
+
+    def add_arguments(self, parser):
+        parser.add_argument("url", help="Path yang diminta, mis. /detail_project/api/project/1/rekap/")
+        parser.add_argument("--user", help="Username untuk force_login")
+        parser.add_argument("--host", default="testserver", help="Host header (harus ada di ALLOWED_HOSTS)")
+        parser.add_argument("--method", default="get", choices=["get", "post", "put", "patch", "delete"])
+        parser.add_argument("--data", default=None, help="Body JSON untuk POST/PUT/PATCH")
+        parser.add_argument("--top", type=int, default=10, help="Jumlah fingerprint yang ditampilkan")
+        parser.add_argument(
+            "--min-repeats", type=int, default=2,
+            help="Hanya tampilkan fingerprint yang muncul minimal N kali (default: 2)",
+        )
+        parser.add_argument("--show-sql", action="store_true", help="Tampilkan contoh SQL asli")
+        parser.add_argument("--budget", type=int, default=None, help="Gagal bila total query melebihi N")
+        parser.add_argument(
+            "--max-repeats", type=int, default=None,
+            help="Gagal bila satu fingerprint muncul lebih dari N kali",
+        )
+
+    def handle(self, *args, **options):
+        client = Client(raise_request_exception=False, SERVER_NAME=options["host"])
+        if options.get("user"):
+            User = get_user_model()
+            try:
+                client.force_login(User.objects.get(username=options["user"]))
+            except User.DoesNotExist:
+                raise CommandError(f'User "{options["user"]}" tidak ditemukan')
+
+        request = getattr(client, options["method"])
+        kwargs = {}
+        if options.get("data") is not None:
+            kwargs = {"data": options["data"], "content_type": "application/json"}
+
+        recorder = QueryRecorder()
+        with transaction.atomic():
+            with connection.execute_wrapper(recorder):
+                response = request(options["url"], **kwargs)
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"{options['method'].upper()} {options['url']} -> {response.status_code}: "
+            f"{recorder.total} queries, {len(recorder.counts)} fingerprints, {recorder.db_ms:.1f} ms"
+        )
+        rows = [(fp, count) for fp, count in recorder.top(options["top"]) if count >= options["min_repeats"]]
+        if not rows:
+            self.stdout.write(self.style.SUCCESS(f"Tidak ada fingerprint yang berulang >= {options['min_repeats']}x"))
+        for fp, count in rows:
+            self.stdout.write(f"{count:>6}x  {fp}")
+            if options.get("show_sql"):
+                self.stdout.write(f"         e.g. {recorder.samples[fp]}")
+
+        budget = query_budget(
+            options.get("budget"), max_repeats=options.get("max_repeats"), label=options["url"], strict=False,
+        )
+        problems = budget.violations(recorder)
+        if problems:
+            raise CommandError("Query budget terlampaui: " + "; ".join(problems))
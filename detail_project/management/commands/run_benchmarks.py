@@ -0,0 +1,146 @@
+"""
+Benchmark performa detail_project dengan project sintetis deterministik.
+
+Usage:
+    python manage.py run_benchmarks --size M --output bench/M.json
+    python manage.py run_benchmarks --size L --only "rekap.*" "kebutuhan.*"
+    python manage.py run_benchmarks --size M --compare bench/M.json --fail-on-regression
+
+Seluruh data dibuat di dalam satu transaksi yang di-rollback di akhir
+(kecuali --keep), jadi aman dijalankan di database dev.
+"""
+
+import json
+import time
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from detail_project.benchmarks import SIZES, generate_project, run_suite
+from detail_project.benchmarks.generator import dataset_counts
+from detail_project.benchmarks.suite import DEFAULT_EXPORT_FORMATS, compare_results, environment_info
+
+
+class Command(BaseCommand):
+    help = "Jalankan benchmark rekap/kebutuhan/progress/copy/export pada project sintetis"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", choices=sorted(SIZES), default="S", help="Ukuran dataset (default: S)")
+        parser.add_argument("--seed", type=int, default=0, help="Seed generator (default: 0)")
+        parser.add_argument("--repeat", type=int, default=3, help="Pengulangan per benchmark (default: 3)")
+        parser.add_argument(
+            "--only", nargs="*", default=None,
+            help="Pola nama benchmark (fnmatch), mis. 'rekap.*' 'export.rekap-rab.*'",
+        )
+        parser.add_argument(
+            "--formats", default=",".join(DEFAULT_EXPORT_FORMATS),
+            help="Format exporter yang diukur, dipisah koma",
+        )
+        parser.add_argument("--user", help="Username owner project (default: user sementara)")
+        parser.add_argument("--output", help="Tulis hasil JSON ke file ('-' = stdout)")
+        parser.add_argument("--compare", help="File hasil sebelumnya sebagai baseline")
+        parser.add_argument(
+            "--threshold", type=float, default=0.2,
+            help="Kenaikan median relatif yang dianggap regresi (default: 0.2)",
+        )
+        parser.add_argument(
+            "--fail-on-regression", action="store_true",
+            help="Exit dengan error bila --compare menemukan regresi",
+        )
+        parser.add_argument("--keep", action="store_true", help="Simpan project benchmark (tidak di-rollback)")
+
+    def handle(self, *args, **options):
+        size = SIZES[options["size"]]
+        repeat = max(1, options["repeat"])
+        formats = tuple(f.strip() for f in options["formats"].split(",") if f.strip())
+
+        baseline = None
+        if options.get("compare"):
+            try:
+                baseline = json.loads(Path(options["compare"]).read_text())
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Baseline tidak bisa dibaca: {exc}")
+
+        with transaction.atomic():
+            owner = self._get_owner(options.get("user"))
+
+            self.stderr.write(f"Generate project {size.name} (seed={options['seed']})...")
+            start = time.perf_counter()
+            project = generate_project(owner, size, seed=options["seed"])
+            generate_ms = (time.perf_counter() - start) * 1000
+
+            results = run_suite(
+                project, owner, repeat=repeat, only=options.get("only"), export_formats=formats,
+                progress=lambda name: self.stderr.write(f"  {name}"),
+            )
+            report = {
+                "meta": {
+                    **environment_info(),
+                    "timestamp": timezone.now().isoformat(),
+                    "size": size.as_dict(),
+                    "seed": options["seed"],
+                    "repeat": repeat,
+                    "dataset": dataset_counts(project),
+                    "generate_ms": round(generate_ms, 3),
+                },
+                "results": results,
+            }
+
+            if not options.get("keep"):
+                transaction.set_rollback(True)
+
+        self._write_table(results)
+        output = options.get("output")
+        if output == "-":
+            self.stdout.write(json.dumps(report, indent=2))
+        elif output:
+            path = Path(output)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(report, indent=2))
+            self.stderr.write(self.style.SUCCESS(f"Hasil ditulis ke {path}"))
+
+        if baseline is not None:
+            regressions = self._write_comparison(compare_results(baseline, report, threshold=options["threshold"]))
+            if regressions and options.get("fail_on_regression"):
+                raise CommandError(f"{regressions} benchmark mengalami regresi")
+
+    def _get_owner(self, username):
+        User = get_user_model()
+        if username:
+            try:
+                return User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f'User "{username}" tidak ditemukan')
+        # Staff = akses penuh, supaya jalur khusus Pro (export JSON) ikut terukur
+        return User.objects.create_user(
+            username=f"bench-{int(time.time())}", email="bench@example.invalid", password=None, is_staff=True
+        )
+
+    def _write_table(self, results):
+        self.stderr.write(f"\n{'benchmark':<40} {'median ms':>12} {'min ms':>10} {'queries':>8}")
+        for row in results:
+            if "error" in row:
+                self.stderr.write(self.style.ERROR(f"{row['name']:<40} {row['error']}"))
+                continue
+            self.stderr.write(
+                f"{row['name']:<40} {row['ms']['median']:>12.1f} {row['ms']['min']:>10.1f} {row['queries']:>8}"
+            )
+
+    def _write_comparison(self, rows):
+        regressions = 0
+        self.stderr.write(f"\n{'benchmark':<40} {'baseline':>10} {'current':>10} {'ratio':>7} {'queries':>11}")
+        for row in rows:
+            line = (
+                f"{row['name']:<40} {row['median_ms'][0]:>10.1f} {row['median_ms'][1]:>10.1f} "
+                f"{row['ratio'] if row['ratio'] is not None else '-':>7} "
+                f"{row['queries'][0]:>5}->{row['queries'][1]:<5}"
+            )
+            if row["regression"]:
+                regressions += 1
+                self.stderr.write(self.style.ERROR(line))
+            else:
+                self.stderr.write(line)
+        return regressions
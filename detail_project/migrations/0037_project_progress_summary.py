@@ -0,0 +1,36 @@
+# Generated by Django 5.2.4 on 2026-10-18 22:55
+
+import django.db.models.deletion
+import django.utils.timezone
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0014_alter_project_owner'),
+        ('detail_project', '0036_alter_detailahspaudit_pekerjaan'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectProgressSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('total_cost', models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='Total biaya pekerjaan (budgeted_cost atau total rekap)', max_digits=20)),
+                ('planned_percent', models.DecimalField(decimal_places=4, default=Decimal('0'), help_text='Progress rencana (%) tertimbang biaya', max_digits=7)),
+                ('actual_percent', models.DecimalField(decimal_places=4, default=Decimal('0'), help_text='Progress realisasi (%) tertimbang biaya (fallback rata-rata bila biaya kosong)', max_digits=7)),
+                ('weighted_realization', models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='Nilai realisasi (Rp) = sum(biaya pekerjaan x realisasi %)', max_digits=20)),
+                ('last_progress_week', models.PositiveIntegerField(blank=True, help_text='Minggu terakhir yang memiliki realisasi > 0', null=True)),
+                ('is_stale', models.BooleanField(db_index=True, default=True)),
+                ('computed_at', models.DateTimeField(blank=True, null=True)),
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='progress_summary', to='dashboard.project')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.4 on 2026-10-18 23:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0014_alter_project_owner'),
+        ('detail_project', '0037_project_progress_summary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exportsession',
+            name='export_type',
+            field=models.CharField(blank=True, help_text="Export type for async exports (e.g. 'rekap-rab', 'jadwal-professional')", max_length=40),
+        ),
+        migrations.AddField(
+            model_name='exportsession',
+            name='progress',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Generation progress 0-100 (async exports)'),
+        ),
+        migrations.AddField(
+            model_name='exportsession',
+            name='progress_message',
+            field=models.CharField(blank=True, help_text='Current generation step (async exports)', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='exportsession',
+            name='project',
+            field=models.ForeignKey(blank=True, help_text='Exported project (async server-side exports)', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='export_sessions', to='dashboard.project'),
+        ),
+        migrations.AddField(
+            model_name='exportsession',
+            name='task_id',
+            field=models.CharField(blank=True, db_index=True, help_text='Celery task id generating this export', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='exportsession',
+            name='format_type',
+            field=models.CharField(choices=[('pdf', 'PDF'), ('word', 'Word Document'), ('xlsx', 'Excel Workbook'), ('csv', 'CSV'), ('json', 'JSON')], help_text='Output format (PDF or Word)', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='exportsession',
+            name='report_type',
+            field=models.CharField(choices=[('rekap', 'Laporan Rekap'), ('monthly', 'Laporan Bulanan'), ('weekly', 'Laporan Mingguan'), ('standard', 'Export Standar')], help_text='Type of report to generate', max_length=20),
+        ),
+    ]
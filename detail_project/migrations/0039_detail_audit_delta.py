@@ -0,0 +1,45 @@
+# Generated by Django 5.2.4 on 2026-10-19 00:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0014_alter_project_owner'),
+        ('detail_project', '0038_export_session_async'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='detailahspaudit',
+            name='chain_length',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Jumlah delta sejak checkpoint terakhir (0 = checkpoint)'),
+        ),
+        migrations.AddField(
+            model_name='detailahspaudit',
+            name='chain_pekerjaan_id',
+            field=models.IntegerField(blank=True, help_text='ID pekerjaan pemilik rantai delta (tetap ada walau pekerjaan dihapus)', null=True),
+        ),
+        migrations.AddField(
+            model_name='detailahspaudit',
+            name='delta',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='detailahspaudit',
+            name='is_checkpoint',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='detailahspaudit',
+            name='state_hash',
+            field=models.CharField(blank=True, default='', help_text='SHA1 snapshot detail sesudah perubahan; kosong = entry tanpa state / format lama', max_length=40),
+        ),
+        migrations.AddIndex(
+            model_name='detailahspaudit',
+            index=models.Index(fields=['chain_pekerjaan_id', '-id'], name='detail_proj_chain_p_2420f7_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-19 01:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('detail_project', '0039_detail_audit_delta'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectprogresssummary',
+            name='version',
+            field=models.PositiveIntegerField(default=0, help_text='Naik setiap kali ditandai stale; refresh hanya menyimpan bila versi tidak berubah'),
+        ),
+    ]
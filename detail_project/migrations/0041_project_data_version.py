@@ -0,0 +1,22 @@
+# Generated by Django 5.2.4 on 2026-10-19 01:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0014_alter_project_owner'),
+        ('detail_project', '0040_progress_summary_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectDataVersion',
+            fields=[
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='data_version', serialize=False, to='dashboard.project')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -592,12 +592,34 @@ class DetailAHSPAudit(TimeStampedModel):
     )
     change_summary = models.TextField(blank=True)
 
+    # Delta encoding (lihat detail_project/audit_delta.py). Entry lama memakai
+    # old_data/new_data penuh; entry baru menyimpan delta per kode dan hanya
+    # checkpoint yang menyimpan new_data penuh.
+    delta = models.JSONField(null=True, blank=True)
+    is_checkpoint = models.BooleanField(default=False)
+    chain_length = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Jumlah delta sejak checkpoint terakhir (0 = checkpoint)",
+    )
+    state_hash = models.CharField(
+        max_length=40,
+        blank=True,
+        default="",
+        help_text="SHA1 snapshot detail sesudah perubahan; kosong = entry tanpa state / format lama",
+    )
+    chain_pekerjaan_id = models.IntegerField(
+        null=True,
+        blank=True,
+        help_text="ID pekerjaan pemilik rantai delta (tetap ada walau pekerjaan dihapus)",
+    )
+
     class Meta:
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["project", "-created_at"]),
             models.Index(fields=["pekerjaan", "-created_at"]),
             models.Index(fields=["action"]),
+            models.Index(fields=["chain_pekerjaan_id", "-id"]),
         ]
 
     def __str__(self):
@@ -1071,6 +1093,71 @@ class ProjectChangeStatus(TimeStampedModel):
         return f"ChangeStatus[{self.project_id}]"
 
 
+class ProjectProgressSummary(TimeStampedModel):
+    """
+    Rollup progress per project untuk list & export dashboard.
+
+    Diisi oleh ``progress_utils.get_progress_summaries``; signal perubahan
+    progress mingguan, volume, harga, detail AHSP atau pricing hanya menandai
+    ``is_stale`` (dan menaikkan ``version``) sehingga rekap dihitung ulang
+    sekali saat dibaca berikutnya.
+    """
+    project = models.OneToOneField(
+        'dashboard.Project',
+        on_delete=models.CASCADE,
+        related_name='progress_summary'
+    )
+    total_cost = models.DecimalField(
+        max_digits=20, decimal_places=2, default=Decimal('0.00'),
+        help_text="Total biaya pekerjaan (budgeted_cost atau total rekap)"
+    )
+    planned_percent = models.DecimalField(
+        max_digits=7, decimal_places=4, default=Decimal('0'),
+        help_text="Progress rencana (%) tertimbang biaya"
+    )
+    actual_percent = models.DecimalField(
+        max_digits=7, decimal_places=4, default=Decimal('0'),
+        help_text="Progress realisasi (%) tertimbang biaya (fallback rata-rata bila biaya kosong)"
+    )
+    weighted_realization = models.DecimalField(
+        max_digits=20, decimal_places=2, default=Decimal('0.00'),
+        help_text="Nilai realisasi (Rp) = sum(biaya pekerjaan x realisasi %)"
+    )
+    last_progress_week = models.PositiveIntegerField(
+        null=True, blank=True,
+        help_text="Minggu terakhir yang memiliki realisasi > 0"
+    )
+    is_stale = models.BooleanField(default=True, db_index=True)
+    version = models.PositiveIntegerField(
+        default=0,
+        help_text="Naik setiap kali ditandai stale; refresh hanya menyimpan bila versi tidak berubah"
+    )
+    computed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"ProgressSummary[{self.project_id}]"
+
+
+class ProjectDataVersion(models.Model):
+    """
+    Counter versi data per project (naik setiap transaksi yang mengubah data).
+
+    Disimpan di database, bukan di cache, supaya web dan worker Celery selalu
+    melihat versi yang sama walau backend cache per proses (locmem). Dipakai
+    sebagai kunci artefak export dan ETag.
+    """
+    project = models.OneToOneField(
+        'dashboard.Project',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='data_version'
+    )
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"DataVersion[{self.project_id}]={self.version}"
+
+
 class PekerjaanTemplate(TimeStampedModel):
     """
     Template Library - reusable work item templates.
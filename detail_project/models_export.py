@@ -38,22 +38,28 @@ class ExportSession(models.Model):
     FORMAT_PDF = 'pdf'
     FORMAT_WORD = 'word'
     FORMAT_XLSX = 'xlsx'
+    FORMAT_CSV = 'csv'
+    FORMAT_JSON = 'json'
 
     FORMAT_CHOICES = [
         (FORMAT_PDF, 'PDF'),
         (FORMAT_WORD, 'Word Document'),
         (FORMAT_XLSX, 'Excel Workbook'),
+        (FORMAT_CSV, 'CSV'),
+        (FORMAT_JSON, 'JSON'),
     ]
 
     # Report type choices
     REPORT_REKAP = 'rekap'
     REPORT_MONTHLY = 'monthly'
     REPORT_WEEKLY = 'weekly'
+    REPORT_STANDARD = 'standard'
 
     REPORT_CHOICES = [
         (REPORT_REKAP, 'Laporan Rekap'),
         (REPORT_MONTHLY, 'Laporan Bulanan'),
         (REPORT_WEEKLY, 'Laporan Mingguan'),
+        (REPORT_STANDARD, 'Export Standar'),
     ]
 
     # Primary fields
@@ -71,6 +77,29 @@ class ExportSession(models.Model):
         help_text="User who initiated the export"
     )
 
+    # Async (server-side) exports: project, export type and Celery task
+    project = models.ForeignKey(
+        'dashboard.Project',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='export_sessions',
+        help_text="Exported project (async server-side exports)"
+    )
+
+    export_type = models.CharField(
+        max_length=40,
+        blank=True,
+        help_text="Export type for async exports (e.g. 'rekap-rab', 'jadwal-professional')"
+    )
+
+    task_id = models.CharField(
+        max_length=255,
+        blank=True,
+        db_index=True,
+        help_text="Celery task id generating this export"
+    )
+
     # Export configuration
     report_type = models.CharField(
         max_length=20,
@@ -108,6 +137,17 @@ class ExportSession(models.Model):
         help_text="Number of batches uploaded"
     )
 
+    progress = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Generation progress 0-100 (async exports)"
+    )
+
+    progress_message = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text="Current generation step (async exports)"
+    )
+
     # Metadata
     project_name = models.CharField(
         max_length=255,
@@ -188,9 +228,16 @@ class ExportSession(models.Model):
         """Check if session has expired"""
         return timezone.now() > self.expires_at
 
+    @property
+    def is_async(self):
+        """Session generated server-side by generate_export_async"""
+        return bool(self.task_id)
+
     @property
     def progress_percent(self):
-        """Calculate upload progress percentage"""
+        """Calculate upload progress percentage (or generation progress for async exports)"""
+        if self.is_async:
+            return self.progress
         if self.estimated_pages == 0:
             return 0
         return min(100, int((self.pages_received / self.estimated_pages) * 100))
@@ -212,13 +259,28 @@ class ExportSession(models.Model):
         self.status = self.STATUS_PROCESSING
         self.save(update_fields=['status', 'updated_at'])
 
-    def mark_completed(self, output_file, file_size):
-        """Mark session as completed"""
+    def mark_completed(self, output_file, file_size, retain_for=None):
+        """Mark session as completed; ``retain_for`` (timedelta) extends expires_at"""
         self.status = self.STATUS_COMPLETED
         self.output_file = output_file
         self.file_size = file_size
         self.completed_at = timezone.now()
-        self.save(update_fields=['status', 'output_file', 'file_size', 'completed_at', 'updated_at'])
+        self.progress = 100
+        update_fields = ['status', 'output_file', 'file_size', 'completed_at', 'progress', 'updated_at']
+        if retain_for is not None:
+            self.expires_at = self.completed_at + retain_for
+            update_fields.append('expires_at')
+        self.save(update_fields=update_fields)
+
+    def mark_progress(self, progress, message=''):
+        """Update generation progress without touching other fields"""
+        self.progress = max(0, min(100, int(progress)))
+        self.progress_message = (message or '')[:255]
+        ExportSession.objects.filter(pk=self.pk).update(
+            progress=self.progress,
+            progress_message=self.progress_message,
+            updated_at=timezone.now(),
+        )
 
     def mark_failed(self, error_message):
         """Mark session as failed"""
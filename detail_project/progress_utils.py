@@ -286,6 +286,9 @@ def sync_weekly_to_tahapan(
     # Bulk create
     if assignments_to_create:
         PekerjaanTahapan.objects.bulk_create(assignments_to_create)
+        # bulk_create tidak memicu signal
+        from .services import bump_project_data_version
+        bump_project_data_version(project_id)
 
     return len(assignments_to_create)
 
@@ -371,6 +374,9 @@ def reset_project_progress(project, regenerate_weekly=True):
         if new_tahapan:
             TahapPelaksanaan.objects.bulk_create(new_tahapan)
             tahapan_created = len(new_tahapan)
+            # bulk_create tidak memicu signal
+            from .services import bump_project_data_version
+            bump_project_data_version(project.id)
 
     return {
         'weekly_deleted': weekly_deleted,
@@ -483,8 +489,253 @@ def migrate_existing_data_to_weekly_canonical(project_id: int) -> Dict[str, int]
             weekly_records_to_create,
             ignore_conflicts=True  # Skip if already exists
         )
+        # bulk_create tidak memicu signal
+        from .services import bump_project_data_version
+        mark_progress_summary_stale(project.id)
+        bump_project_data_version(project.id)
 
     return {
         'weekly_created': len(weekly_records_to_create),
         'old_assignments': len(old_assignments)
     }
+
+
+# ============================================================================
+# PROJECT PROGRESS SUMMARY (dashboard rollup)
+# ============================================================================
+
+class _MarkSummaryStale:
+    """on_commit callback; identifiable so repeated saves queue it only once."""
+
+    def __init__(self, project_id: int):
+        self.project_id = project_id
+
+    def __call__(self):
+        from django.db.models import F
+        from detail_project.models import ProjectProgressSummary
+
+        # Selalu naikkan version (juga bila sudah stale): refresh yang sedang
+        # berjalan dengan data sebelum commit ini tidak boleh menimpa tanda stale.
+        rows = ProjectProgressSummary.objects.filter(project_id=self.project_id)
+        if rows.update(is_stale=True, version=F('version') + 1):
+            return
+        # Belum ada baris (atau baris refresh yang belum commit): buat lalu
+        # naikkan versinya agar refresh yang bersamaan gagal di cek versi.
+        ProjectProgressSummary.objects.bulk_create(
+            [ProjectProgressSummary(project_id=self.project_id, is_stale=True)],
+            ignore_conflicts=True,
+        )
+        rows.update(is_stale=True, version=F('version') + 1)
+
+
+def mark_progress_summary_stale(project_id: Optional[int]) -> None:
+    """
+    Tandai rollup progress project sebagai stale setelah transaksi commit.
+
+    Dipanggil dari signal progress/volume/harga; satu transaksi yang menyimpan
+    ratusan baris tetap hanya menghasilkan satu UPDATE.
+    """
+    if not project_id:
+        return
+    connection = transaction.get_connection()
+    if connection.in_atomic_block:
+        for _, func, _ in connection.run_on_commit:
+            if isinstance(func, _MarkSummaryStale) and func.project_id == project_id:
+                return
+    transaction.on_commit(_MarkSummaryStale(project_id))
+
+
+def _compute_progress_summary_values(projects) -> Dict[int, Dict]:
+    """
+    Hitung nilai rollup untuk sekumpulan project dengan query batch.
+
+    Logika sama dengan kurva S dashboard: biaya pekerjaan memakai
+    budgeted_cost, fallback ke total rekap bila budgeted_cost kosong.
+    """
+    from django.db.models import Max, Sum
+    from detail_project.models import Pekerjaan, PekerjaanProgressWeekly
+    from detail_project.services import compute_rekap_for_project
+
+    project_ids = [project.id for project in projects]
+    if not project_ids:
+        return {}
+
+    proportion_totals = {
+        row['pekerjaan_id']: (
+            min(float(row['total_planned'] or 0), 100.0),
+            min(float(row['total_actual'] or 0), 100.0),
+        )
+        for row in PekerjaanProgressWeekly.objects.filter(project_id__in=project_ids)
+        .values('pekerjaan_id')
+        .annotate(total_planned=Sum('planned_proportion'), total_actual=Sum('actual_proportion'))
+    }
+    last_weeks = dict(
+        PekerjaanProgressWeekly.objects.filter(
+            project_id__in=project_ids, actual_proportion__gt=0
+        )
+        .values('project_id')
+        .annotate(last_week=Max('week_number'))
+        .values_list('project_id', 'last_week')
+    )
+
+    pekerjaan_by_project = defaultdict(list)
+    projects_needing_rekap = set()
+    for row in Pekerjaan.objects.filter(project_id__in=project_ids).values(
+        'id', 'project_id', 'budgeted_cost'
+    ):
+        pekerjaan_by_project[row['project_id']].append(row)
+        if not row['budgeted_cost'] or row['budgeted_cost'] <= 0:
+            projects_needing_rekap.add(row['project_id'])
+
+    values = {}
+    for project in projects:
+        fallback_lookup = {}
+        if project.id in projects_needing_rekap:
+            try:
+                fallback_lookup = {
+                    row['pekerjaan_id']: Decimal(str(row.get('total', 0)))
+                    for row in compute_rekap_for_project(project)
+                }
+            except Exception:
+                fallback_lookup = {}
+
+        pekerjaan_rows = pekerjaan_by_project.get(project.id, [])
+        total_cost = Decimal('0')
+        planned_cost = Decimal('0')
+        realization_cost = Decimal('0')
+        for pkj in pekerjaan_rows:
+            budgeted_cost = pkj['budgeted_cost']
+            if budgeted_cost and budgeted_cost > 0:
+                item_cost = budgeted_cost
+            else:
+                item_cost = fallback_lookup.get(pkj['id'], Decimal('0'))
+            if item_cost <= 0:
+                continue
+            planned, actual = proportion_totals.get(pkj['id'], (0.0, 0.0))
+            total_cost += item_cost
+            planned_cost += item_cost * Decimal(str(planned / 100.0))
+            realization_cost += item_cost * Decimal(str(actual / 100.0))
+
+        if total_cost > 0:
+            planned_percent = planned_cost / total_cost * 100
+            actual_percent = realization_cost / total_cost * 100
+        elif pekerjaan_rows:
+            # Awal project tanpa data biaya: rata-rata tidak tertimbang
+            count = len(pekerjaan_rows)
+            planned_percent = Decimal(str(
+                sum(proportion_totals.get(p['id'], (0.0, 0.0))[0] for p in pekerjaan_rows) / count
+            ))
+            actual_percent = Decimal(str(
+                sum(proportion_totals.get(p['id'], (0.0, 0.0))[1] for p in pekerjaan_rows) / count
+            ))
+        else:
+            planned_percent = actual_percent = Decimal('0')
+
+        values[project.id] = {
+            'total_cost': total_cost.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP),
+            'planned_percent': planned_percent.quantize(Decimal('0.0001'), rounding=ROUND_HALF_UP),
+            'actual_percent': actual_percent.quantize(Decimal('0.0001'), rounding=ROUND_HALF_UP),
+            'weighted_realization': realization_cost.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP),
+            'last_progress_week': last_weeks.get(project.id),
+        }
+    return values
+
+
+def refresh_progress_summaries(projects) -> Dict[int, "ProjectProgressSummary"]:
+    """
+    Hitung ulang dan simpan rollup untuk project yang diberikan.
+
+    Versi rollup dibaca sebelum menghitung; hasil hanya disimpan (dan
+    ``is_stale`` dihapus) bila versinya masih sama. Bila sebuah perubahan
+    commit di tengah perhitungan, baris tetap stale dan dihitung ulang pada
+    pembacaan berikutnya. Nilai yang dihitung tetap dikembalikan untuk
+    request ini.
+    """
+    from django.utils import timezone
+    from detail_project.models import ProjectProgressSummary
+
+    projects = list(projects)
+    if not projects:
+        return {}
+
+    project_ids = [project.id for project in projects]
+    # Pastikan baris ada dulu, supaya tanda stale dari writer selalu punya target
+    ProjectProgressSummary.objects.bulk_create(
+        [ProjectProgressSummary(project_id=pid, is_stale=True) for pid in project_ids],
+        ignore_conflicts=True,
+    )
+    versions = dict(
+        ProjectProgressSummary.objects.filter(project_id__in=project_ids)
+        .values_list('project_id', 'version')
+    )
+
+    values = _compute_progress_summary_values(projects)
+    now = timezone.now()
+    summaries = {}
+    to_save = []
+    with transaction.atomic():
+        # Kunci baris lalu cek versi; satu bulk_update untuk yang masih cocok
+        current = {
+            row.project_id: row
+            for row in ProjectProgressSummary.objects.select_for_update().filter(
+                project_id__in=list(values)
+            )
+        }
+        for project_id, fields in values.items():
+            version = versions.get(project_id, 0)
+            row = current.get(project_id)
+            saved = row is not None and row.version == version
+            if saved:
+                for name, value in fields.items():
+                    setattr(row, name, value)
+                row.is_stale = False
+                row.computed_at = now
+                row.updated_at = now
+                to_save.append(row)
+            summaries[project_id] = ProjectProgressSummary(
+                project_id=project_id, is_stale=not saved, version=version,
+                computed_at=now, updated_at=now, **fields
+            )
+        if to_save:
+            field_names = list(next(iter(values.values())))
+            ProjectProgressSummary.objects.bulk_update(
+                to_save, ['is_stale', 'computed_at', 'updated_at', *field_names], batch_size=500
+            )
+    return summaries
+
+
+def get_stored_progress_summaries(projects) -> Dict[int, "ProjectProgressSummary"]:
+    """Rollup terakhir yang tersimpan (termasuk yang stale), tanpa menghitung ulang."""
+    from detail_project.models import ProjectProgressSummary
+
+    return {
+        summary.project_id: summary
+        for summary in ProjectProgressSummary.objects.filter(
+            project_id__in=[project.id for project in projects], computed_at__isnull=False
+        )
+    }
+
+
+def get_progress_summaries(projects) -> Dict[int, "ProjectProgressSummary"]:
+    """
+    Ambil rollup progress untuk daftar project.
+
+    Rollup yang masih valid dibaca langsung (satu query); hanya project
+    tanpa rollup atau yang ditandai stale yang dihitung ulang.
+    """
+    from detail_project.models import ProjectProgressSummary
+
+    projects = list(projects)
+    if not projects:
+        return {}
+
+    summaries = {
+        summary.project_id: summary
+        for summary in ProjectProgressSummary.objects.filter(
+            project_id__in=[project.id for project in projects], is_stale=False
+        )
+    }
+    missing = [project for project in projects if project.id not in summaries]
+    if missing:
+        summaries.update(refresh_progress_summaries(missing))
+    return summaries
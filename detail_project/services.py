@@ -64,14 +64,15 @@ from .models import (
     HargaItemProject,
     ProjectPricing,
     ProjectParameter,
+    ProjectDataVersion,
     TahapPelaksanaan,
     PekerjaanTahapan,
 )
 
 def invalidate_rekap_cache(project_or_id) -> None:
     """
-    Hapus cache rekap untuk 1 project.
-    Terima instance Project atau angka project_id.
+    Hapus cache rekap untuk 1 project, naikkan versi data dan tandai rollup
+    progress stale. Terima instance Project atau angka project_id.
     """
     try:
         pid = int(getattr(project_or_id, "id", project_or_id))
@@ -79,6 +80,92 @@ def invalidate_rekap_cache(project_or_id) -> None:
         return
     cache.delete(f"rekap:{pid}:v1")
     cache.delete(f"rekap:{pid}:v2")
+    bump_project_data_version(pid)
+
+    # Jalur queryset.update() (mis. override markup) tidak mengirim signal:
+    # rollup progress dashboard/export juga harus dihitung ulang
+    from .progress_utils import mark_progress_summary_stale
+    mark_progress_summary_stale(pid)
+
+
+# ---------------------------------------------------------------------------
+# Versi data project
+# ---------------------------------------------------------------------------
+# Counter di database (ProjectDataVersion) yang naik setiap kali data project
+# berubah (signal model + invalidate_rekap_cache untuk jalur bulk). Dipakai
+# sebagai kunci turunan (artefak export, ETag) tanpa agregat Max/Count. Tidak
+# disimpan di cache: dengan cache per proses (locmem) web dan worker Celery
+# akan melihat versi berbeda.
+
+def get_project_data_version(project_or_id) -> int:
+    """Versi data project saat ini (0 bila belum pernah berubah)."""
+    pid = int(getattr(project_or_id, "id", project_or_id))
+    version = (
+        ProjectDataVersion.objects.filter(project_id=pid)
+        .values_list("version", flat=True)
+        .first()
+    )
+    return version or 0
+
+
+class _BumpDataVersion:
+    """on_commit callback; dibandingkan per project agar satu transaksi = satu bump."""
+
+    def __init__(self, project_id: int):
+        self.project_id = project_id
+
+    def __call__(self):
+        from django.db import IntegrityError
+        from django.db.models import F
+
+        rows = ProjectDataVersion.objects.filter(project_id=self.project_id)
+        if rows.update(version=F("version") + 1):
+            return
+        try:
+            with transaction.atomic():
+                ProjectDataVersion.objects.bulk_create(
+                    [ProjectDataVersion(project_id=self.project_id, version=0)],
+                    ignore_conflicts=True,
+                )
+        except IntegrityError:
+            # Project sudah dihapus (bump dari signal cascade delete)
+            return
+        rows.update(version=F("version") + 1)
+
+
+def bump_project_data_version(project_or_id) -> None:
+    """Naikkan versi data project setelah transaksi aktif commit."""
+    try:
+        pid = int(getattr(project_or_id, "id", project_or_id))
+    except (TypeError, ValueError):
+        return
+    connection = transaction.get_connection()
+    if connection.in_atomic_block:
+        for _, func, _ in connection.run_on_commit:
+            if isinstance(func, _BumpDataVersion) and func.project_id == pid:
+                return
+    transaction.on_commit(_BumpDataVersion(pid))
+
+
+def invalidate_after_bulk_write(project_or_id) -> None:
+    """
+    Efek signal post_save/post_delete untuk jalur bulk_create/bulk_update
+    (yang tidak mengirim signal): cache rekap + rekap kebutuhan, rollup
+    progress dashboard, dan versi data. Cukup dipanggil sekali per request.
+    """
+    try:
+        pid = int(getattr(project_or_id, "id", project_or_id))
+    except (TypeError, ValueError):
+        return
+
+    def _clear():
+        cache.delete_many([f"rekap:{pid}:v1", f"rekap:{pid}:v2", f"rekap_kebutuhan:{pid}"])
+
+    transaction.on_commit(_clear)
+    bump_project_data_version(pid)
+
+    from .progress_utils import mark_progress_summary_stale
+    mark_progress_summary_stale(pid)
 
 
 KEBUTUHAN_CACHE_TIMEOUT = 300  # seconds
@@ -713,6 +800,9 @@ def log_audit(
 ):
     """
     Create audit log entry; fail-safe (never raises).
+
+    Snapshot disimpan sebagai delta per kode (lihat audit_delta); hanya
+    checkpoint yang menyimpan new_data penuh.
     """
     if project is None or pekerjaan is None:
         return
@@ -720,15 +810,19 @@ def log_audit(
     summary = change_summary or _build_change_summary(old_data, new_data, action)
 
     try:
+        from .audit_delta import encode_fields, previous_chain_state
+
+        previous = None
+        if old_data is not None or new_data is not None:
+            previous = previous_chain_state(pekerjaan.id)
         DetailAHSPAudit.objects.create(
             project=project,
             pekerjaan=pekerjaan,
             action=action,
-            old_data=old_data,
-            new_data=new_data,
             triggered_by=triggered_by,
             user=user if getattr(user, "id", None) else None,
             change_summary=summary,
+            **encode_fields(pekerjaan.id, old_data, new_data, previous=previous),
         )
     except Exception:
         logger.exception(
@@ -2003,7 +2097,7 @@ def _get_markup_percent(project) -> Decimal:
         return Decimal(str(obj.markup_percent))
     return Decimal("0.00")
 
-def compute_rekap_for_project(project):
+def _rekap_signature(project):
     raw_ts = DetailAHSPProject.objects.filter(project=project).aggregate(last=Max('updated_at'))['last']
     expanded_ts = DetailAHSPExpanded.objects.filter(project=project).aggregate(last=Max('updated_at'))['last']
     volume_ts = VolumePekerjaan.objects.filter(project=project).aggregate(last=Max('updated_at'))['last']
@@ -2013,17 +2107,62 @@ def compute_rekap_for_project(project):
     def _ts(val):
         return val.isoformat() if val else "0"
 
-    cache_key = f"rekap:{project.id}:v2"
-    signature = (
+    return (
         _ts(raw_ts),
         _ts(expanded_ts),
         _ts(volume_ts),
         _ts(pekerjaan_ts),
         _ts(pricing_ts),
     )
-    cached = cache.get(cache_key)
-    if cached and cached.get("sig") == signature:
-        return cached.get("data", [])
+
+
+def _rekap_cache_keys(project_id):
+    """(lock_key, stale_key) rekap biaya satu project."""
+    return f"rekap:{project_id}:lock", f"rekap:{project_id}:last_good"
+
+
+def _rekap_cache_plan(project):
+    """(lock_key, stale_key, load_fresh, compute) untuk stale_cache.revalidating_get."""
+    cache_key = f"rekap:{project.id}:v2"
+    signature = _rekap_signature(project)
+
+    def _load_fresh():
+        cached = cache.get(cache_key)
+        if cached and cached.get("sig") == signature:
+            return cached.get("data", [])
+        return None
+
+    def _compute():
+        result = _build_rekap_rows(project)
+        cache.set(cache_key, {"sig": signature, "data": result}, 300)  # 5 menit (atau sesuai kebutuhan)
+        return result
+
+    lock_key, stale_key = _rekap_cache_keys(project.id)
+    return lock_key, stale_key, _load_fresh, _compute
+
+
+def compute_rekap_for_project(project, *, allow_stale=False):
+    """
+    Rekap biaya per pekerjaan (lihat _build_rekap_rows), di-cache per signature.
+
+    allow_stale=True (endpoint baca) boleh mengembalikan StaleRows berisi rekap
+    terakhir selama worker lain menghitung ulang; default tetap strict.
+    """
+    from .stale_cache import revalidating_get
+
+    lock_key, stale_key, load_fresh, compute = _rekap_cache_plan(project)
+
+    def _offload():
+        from .tasks import revalidate_project_cache
+        revalidate_project_cache.delay(project.id, 'rekap')
+
+    return revalidating_get(
+        'rekap', lock_key, stale_key, load_fresh, compute,
+        allow_stale=allow_stale, offload=_offload,
+    )
+
+
+def _build_rekap_rows(project):
     """
     Hitung komponen biaya per pekerjaan (pakai override Profit/Margin per-pekerjaan jika ada):
       A = Σ(TK), B = Σ(BHN), C = Σ(ALT), LAIN = Σ(LAIN)
@@ -2154,16 +2293,81 @@ def compute_rekap_for_project(project):
             volume=volume,
             total=total,      # = G * volume
         ))
-    cache.set(cache_key, {"sig": signature, "data": result}, 300)  # 5 menit (atau sesuai kebutuhan)
     return result
 
 
+def _kebutuhan_entry(mode='all', tahapan_id=None, filters=None, time_scope=None):
+    """(mode_flag, normalized_filters, normalized_time_scope, entry_key) satu entry rekap kebutuhan."""
+    mode_flag = 'tahapan' if (mode == 'tahapan' and tahapan_id) else 'all'
+    normalized_filters = _normalize_kebutuhan_filters(filters)
+    normalized_time_scope = _normalize_time_scope(time_scope)
+    entry_key = _kebutuhan_entry_key(
+        mode_flag,
+        tahapan_id if mode_flag == 'tahapan' else None,
+        normalized_filters,
+        normalized_time_scope,
+    )
+    return mode_flag, normalized_filters, normalized_time_scope, entry_key
+
+
+def _kebutuhan_cache_keys(project_id, entry_key):
+    """(lock_key, stale_key) satu entry rekap kebutuhan."""
+    cache_namespace = f"rekap_kebutuhan:{project_id}"
+    entry_id = hashlib.md5(entry_key.encode('utf-8')).hexdigest()[:16]
+    return f"{cache_namespace}:lock:{entry_id}", f"{cache_namespace}:last_good:{entry_id}"
+
+
+def _revalidation_lock_key(project_id, kind='rekap', params=None):
+    """
+    Kunci lock recompute untuk tasks.revalidate_project_cache, tanpa memuat
+    project (agar lock tetap bisa dilepas bila project sudah dihapus).
+    """
+    if kind == 'kebutuhan':
+        params = params or {}
+        entry_key = _kebutuhan_entry(
+            params.get('mode', 'all'), params.get('tahapan_id'),
+            params.get('filters'), params.get('time_scope'),
+        )[3]
+        return _kebutuhan_cache_keys(project_id, entry_key)[0]
+    return _rekap_cache_keys(project_id)[0]
+
+
+def _kebutuhan_cache_plan(project, mode='all', tahapan_id=None, filters=None, time_scope=None):
+    """(lock_key, stale_key, load_fresh, compute) untuk satu entry rekap kebutuhan."""
+    mode_flag, normalized_filters, normalized_time_scope, entry_key = _kebutuhan_entry(
+        mode, tahapan_id, filters, time_scope
+    )
+    cache_namespace = f"rekap_kebutuhan:{project.id}"
+    signature = _kebutuhan_signature(project)
+
+    def _load_fresh():
+        bucket = cache.get(cache_namespace)
+        cached_entry = bucket.get(entry_key) if bucket else None
+        if cached_entry and cached_entry.get('sig') == signature:
+            return cached_entry.get('data', [])
+        return None
+
+    def _compute():
+        rows = _build_kebutuhan_rows(
+            project, mode_flag, tahapan_id, normalized_filters, normalized_time_scope
+        )
+        new_bucket = cache.get(cache_namespace) or {}
+        new_bucket[entry_key] = {"sig": signature, "data": rows}
+        cache.set(cache_namespace, new_bucket, KEBUTUHAN_CACHE_TIMEOUT)
+        return rows
+
+    lock_key, stale_key = _kebutuhan_cache_keys(project.id, entry_key)
+    return lock_key, stale_key, _load_fresh, _compute
+
+
 def compute_kebutuhan_items(
     project,
     mode='all',
     tahapan_id=None,
     filters=None,
     time_scope=None,
+    *,
+    allow_stale=False,
 ):
     """
     Compute rekap kebutuhan dengan support split volume dan filtering.
@@ -2175,34 +2379,38 @@ def compute_kebutuhan_items(
         tahapan_id: ID tahapan saat mode='tahapan'
         filters: dict filter klasifikasi/sub/kategori/pekerjaan
         time_scope: dict rentang waktu {'mode','start','end'} untuk scope mingguan/bulanan
+        allow_stale: boleh mengembalikan StaleRows (hasil terakhir) selama
+            worker lain menghitung ulang entry yang sama
     """
-    import time
-    import logging
+    from .stale_cache import revalidating_get
 
-    logger = logging.getLogger(__name__)
     start_time = time.perf_counter()
+    lock_key, stale_key, load_fresh, compute = _kebutuhan_cache_plan(
+        project, mode, tahapan_id, filters, time_scope
+    )
 
-    mode_flag = 'tahapan' if (mode == 'tahapan' and tahapan_id) else 'all'
-    normalized_filters = _normalize_kebutuhan_filters(filters)
-    normalized_time_scope = _normalize_time_scope(time_scope)
-    cache_namespace = f"rekap_kebutuhan:{project.id}"
-    entry_key = _kebutuhan_entry_key(
-        mode_flag,
-        tahapan_id if mode_flag == 'tahapan' else None,
-        normalized_filters,
-        normalized_time_scope,
+    def _load_fresh_logged():
+        rows = load_fresh()
+        if rows is not None:
+            elapsed = (time.perf_counter() - start_time) * 1000
+            logger.info(f"Rekap Kebutuhan CACHE HIT - project={project.id}, elapsed={elapsed:.2f}ms, rows={len(rows)}")
+        return rows
+
+    def _offload():
+        from .tasks import revalidate_project_cache
+        revalidate_project_cache.delay(project.id, 'kebutuhan', {
+            'mode': mode, 'tahapan_id': tahapan_id, 'filters': filters, 'time_scope': time_scope,
+        })
+
+    return revalidating_get(
+        'rekap_kebutuhan', lock_key, stale_key, _load_fresh_logged, compute,
+        allow_stale=allow_stale, offload=_offload,
     )
-    signature = None
 
-    bucket = cache.get(cache_namespace)
-    if bucket:
-        cached_entry = bucket.get(entry_key)
-        if cached_entry:
-            signature = _kebutuhan_signature(project)
-            if cached_entry.get('sig') == signature:
-                elapsed = (time.perf_counter() - start_time) * 1000
-                logger.info(f"Rekap Kebutuhan CACHE HIT - project={project.id}, elapsed={elapsed:.2f}ms, rows={len(cached_entry.get('data', []))}")
-                return cached_entry.get('data', [])
+
+def _build_kebutuhan_rows(project, mode_flag, tahapan_id, normalized_filters, normalized_time_scope):
+    """Hitung rows rekap kebutuhan tanpa cache (lihat compute_kebutuhan_items)."""
+    start_time = time.perf_counter()
 
     # ========================================================================
     # STEP 1: Determine scope - pekerjaan mana yang akan di-aggregate
@@ -2249,14 +2457,7 @@ def compute_kebutuhan_items(
         }
 
     if not pekerjaan_ids:
-        rows = []
-        # Cache empty result
-        new_bucket = bucket or {}
-        if signature is None:
-            signature = _kebutuhan_signature(project)
-        new_bucket[entry_key] = {"sig": signature, "data": rows}
-        cache.set(cache_namespace, new_bucket, KEBUTUHAN_CACHE_TIMEOUT)
-        return rows
+        return []
 
     apply_time_scope = (
         mode_flag == 'all' and normalized_time_scope.get('mode') != 'all'
@@ -2435,12 +2636,6 @@ def compute_kebutuhan_items(
         x['uraian'] or ''
     ))
 
-    new_bucket = bucket or {}
-    new_bucket[entry_key] = {"sig": signature, "data": rows}
-    if signature is None:
-        signature = _kebutuhan_signature(project)
-    cache.set(cache_namespace, new_bucket, KEBUTUHAN_CACHE_TIMEOUT)
-
     # Performance logging
     elapsed = (time.perf_counter() - start_time) * 1000
     logger.info(
@@ -3183,6 +3378,7 @@ def get_unassigned_pekerjaan(project):
 # ==============================================================================
 
 import logging
+import uuid
 from .exceptions import (
     DeepCopyValidationError,
     DeepCopyBusinessError,
@@ -3195,6 +3391,169 @@ from .exceptions import (
 logger = logging.getLogger(__name__)
 
 
+BATCH_COPY_JOB_TTL = 60 * 60  # 1 hour, same as Celery result expiry
+BATCH_COPY_PENDING = 'pending'
+BATCH_COPY_RUNNING = 'running'
+BATCH_COPY_SUCCESS = 'success'
+BATCH_COPY_FAILED = 'failed'
+
+
+def _batch_copy_key(job_id, part='meta'):
+    return f"batch_copy:{job_id}:{part}"
+
+
+def run_batch_copy_item(job_id, index):
+    """
+    Execute one copy of a batch copy job (called from the Celery task).
+
+    Reads the shared snapshot from the cache; if it is gone (e.g. a worker with a
+    non-shared cache backend), the source project is captured again as fallback.
+    The per-copy progress entry is updated before and after the copy; a failed
+    copy is recorded there and returns None instead of raising.
+    """
+    from dashboard.models import Project
+    from django.contrib.auth import get_user_model
+
+    meta = cache.get(_batch_copy_key(job_id))
+    if meta is None:
+        raise ValueError(f"Batch copy job {job_id} not found or expired")
+
+    entry_key = _batch_copy_key(job_id, index)
+    entry = cache.get(entry_key) or {'index': index, 'name': None}
+    entry.update(status=BATCH_COPY_RUNNING, started_at=timezone.now().isoformat())
+    cache.set(entry_key, entry, BATCH_COPY_JOB_TTL)
+
+    try:
+        snapshot = cache.get(_batch_copy_key(job_id, 'snapshot'))
+        if snapshot is None:
+            source = Project.objects.get(pk=meta['source_project_id'])
+            snapshot = ProjectCopySnapshot.capture(source)
+        source = snapshot.project
+
+        owner = get_user_model().objects.get(pk=meta['owner_id'])
+        new_tanggal_mulai = (
+            date.fromisoformat(meta['new_tanggal_mulai']) if meta['new_tanggal_mulai'] else None
+        )
+        name = entry.get('name') or f"{source.nama} - Copy {index}"
+
+        new_project = DeepCopyService(source, snapshot=snapshot).copy(
+            new_owner=owner,
+            new_name=name,
+            new_tanggal_mulai=new_tanggal_mulai,
+            copy_jadwal=meta['copy_jadwal'],
+        )
+    except Exception as exc:
+        logger.error(f"Batch copy job {job_id} copy {index} failed: {exc}")
+        entry.update(status=BATCH_COPY_FAILED, error=str(exc),
+                     finished_at=timezone.now().isoformat())
+        cache.set(entry_key, entry, BATCH_COPY_JOB_TTL)
+        # Recorded per copy; the remaining copies of the batch carry on
+        return None
+
+    entry.update(status=BATCH_COPY_SUCCESS, project_id=new_project.id,
+                 finished_at=timezone.now().isoformat())
+    cache.set(entry_key, entry, BATCH_COPY_JOB_TTL)
+    return new_project
+
+
+def get_batch_copy_job(job_id):
+    """
+    Progress of a batch copy job, or None if unknown/expired.
+
+    Returns:
+        {'job_id', 'source_project_id', 'owner_id', 'status', 'requested',
+         'completed', 'successful', 'failed', 'progress', 'copies': [...]}
+    """
+    meta = cache.get(_batch_copy_key(job_id))
+    if meta is None:
+        return None
+
+    count = meta['count']
+    keys = [_batch_copy_key(job_id, i) for i in range(1, count + 1)]
+    found = cache.get_many(keys)
+    copies = [
+        found.get(key) or {'index': i, 'status': BATCH_COPY_PENDING}
+        for i, key in enumerate(keys, 1)
+    ]
+
+    successful = sum(1 for c in copies if c['status'] == BATCH_COPY_SUCCESS)
+    failed = sum(1 for c in copies if c['status'] == BATCH_COPY_FAILED)
+    completed = successful + failed
+    if completed == count:
+        status = BATCH_COPY_SUCCESS if successful else BATCH_COPY_FAILED
+    elif completed or any(c['status'] == BATCH_COPY_RUNNING for c in copies):
+        status = BATCH_COPY_RUNNING
+    else:
+        status = BATCH_COPY_PENDING
+
+    return {
+        'job_id': job_id,
+        'source_project_id': meta['source_project_id'],
+        'owner_id': meta['owner_id'],
+        'status': status,
+        'requested': count,
+        'completed': completed,
+        'successful': successful,
+        'failed': failed,
+        'progress': round(completed * 100 / count),
+        'copies': copies,
+    }
+
+
+class ProjectCopySnapshot:
+    """
+    In-memory snapshot of everything DeepCopyService reads from a source project.
+
+    Loaded once (one query per table) and shared by every copy in a batch, so
+    N copies no longer re-read the source project N times. The snapshot holds
+    plain model instances and is picklable, which lets batch jobs park it in the
+    cache for Celery workers.
+
+    Usage:
+        snapshot = ProjectCopySnapshot.capture(source_project)
+        DeepCopyService(source_project, snapshot=snapshot).copy(...)
+    """
+
+    KEYS = (
+        'parameter', 'klasifikasi', 'subklasifikasi', 'pekerjaan', 'volume',
+        'harga_item', 'ahsp_template', 'tahapan', 'jadwal',
+    )
+
+    def __init__(self, project, pricing, rows):
+        self.project = project
+        self.pricing = pricing
+        self.rows = rows
+
+    @staticmethod
+    def source_querysets(project):
+        """Querysets DeepCopyService copies from, keyed like the snapshot rows."""
+        return {
+            'parameter': ProjectParameter.objects.filter(project=project),
+            'klasifikasi': Klasifikasi.objects.filter(project=project),
+            'subklasifikasi': SubKlasifikasi.objects.filter(project=project),
+            'pekerjaan': Pekerjaan.objects.filter(project=project),
+            'volume': VolumePekerjaan.objects.filter(project=project),
+            'harga_item': HargaItemProject.objects.filter(project=project),
+            'ahsp_template': DetailAHSPProject.objects.filter(project=project),
+            'tahapan': TahapPelaksanaan.objects.filter(project=project),
+            # PekerjaanTahapan doesn't have project field
+            'jadwal': PekerjaanTahapan.objects.filter(tahapan__project=project),
+        }
+
+    @classmethod
+    def capture(cls, project):
+        """Read the source project once and return a snapshot."""
+        pricing = ProjectPricing.objects.filter(project=project).first()
+        rows = {
+            key: list(queryset)
+            for key, queryset in cls.source_querysets(project).items()
+        }
+        return cls(project, pricing, rows)
+
+    def size(self):
+        return {key: len(rows) for key, rows in self.rows.items()}
+
+
 class DeepCopyService:
     """
     Service for deep copying projects with all related data.
@@ -3230,12 +3589,14 @@ class DeepCopyService:
         5. Tracks skipped items and generates warnings
     """
 
-    def __init__(self, source_project):
+    def __init__(self, source_project, snapshot=None):
         """
         Initialize the service with source project.
 
         Args:
             source_project: The project to copy from
+            snapshot: Optional ProjectCopySnapshot of source_project; when given,
+                all copy steps read from it instead of querying the source
 
         Raises:
             DeepCopyValidationError: If source_project is invalid
@@ -3257,10 +3618,13 @@ class DeepCopyService:
             )
 
         self.source = source_project
+        self.snapshot = snapshot
 
         # Validate project size and log warning for large projects
-        from .models import Pekerjaan
-        pekerjaan_count = Pekerjaan.objects.filter(project=source_project).count()
+        if snapshot is not None:
+            pekerjaan_count = len(snapshot.rows['pekerjaan'])
+        else:
+            pekerjaan_count = Pekerjaan.objects.filter(project=source_project).count()
 
         if pekerjaan_count > 1000:
             logger.warning(
@@ -3545,7 +3909,9 @@ class DeepCopyService:
 
         Creates multiple copies with auto-incrementing names.
         Each copy is independent and uses a fresh DeepCopyService instance
-        to avoid ID mapping conflicts.
+        to avoid ID mapping conflicts; the source project is read once into a
+        shared ProjectCopySnapshot. For large batches prefer start_batch_copy_job(),
+        which fans the copies out to Celery workers.
 
         Args:
             new_owner: User who will own the copied projects
@@ -3585,6 +3951,7 @@ class DeepCopyService:
 
         projects = []
         errors = []
+        snapshot = self.snapshot or ProjectCopySnapshot.capture(self.source)
 
         for i in range(1, count + 1):
             # Generate unique name for this copy
@@ -3596,7 +3963,7 @@ class DeepCopyService:
 
             try:
                 # Create fresh service instance for each copy to avoid ID mapping conflicts
-                service = DeepCopyService(self.source)
+                service = DeepCopyService(self.source, snapshot=snapshot)
 
                 # Perform the copy
                 new_project = service.copy(
@@ -3629,6 +3996,64 @@ class DeepCopyService:
 
         return projects
 
+    def start_batch_copy_job(
+        self,
+        new_owner,
+        base_name,
+        count,
+        new_tanggal_mulai=None,
+        copy_jadwal=True
+    ):
+        """
+        Start an asynchronous batch copy and return its job id.
+
+        The source project is captured once into a ProjectCopySnapshot and parked
+        in the cache; one Celery task per copy then runs the bulk-create chain
+        against that snapshot. Progress is tracked per copy and can be polled
+        with get_batch_copy_job(job_id).
+
+        Raises:
+            ValidationError: If count is invalid
+        """
+        from django.core.exceptions import ValidationError as DjangoValidationError
+        from .tasks import batch_copy_project_async
+
+        if not isinstance(count, int) or count < 1:
+            raise DjangoValidationError("Count must be a positive integer")
+        if count > 50:
+            raise DjangoValidationError("Maximum 50 copies allowed in one batch")
+
+        job_id = uuid.uuid4().hex
+        snapshot = self.snapshot or ProjectCopySnapshot.capture(self.source)
+        copies = [
+            {'index': i, 'name': f"{base_name} - Copy {i}", 'status': BATCH_COPY_PENDING}
+            for i in range(1, count + 1)
+        ]
+
+        cache.set_many({
+            _batch_copy_key(job_id): {
+                'job_id': job_id,
+                'source_project_id': self.source.id,
+                'owner_id': new_owner.id,
+                'count': count,
+                'new_tanggal_mulai': new_tanggal_mulai.isoformat() if new_tanggal_mulai else None,
+                'copy_jadwal': copy_jadwal,
+                'created_at': timezone.now().isoformat(),
+            },
+            _batch_copy_key(job_id, 'snapshot'): snapshot,
+            **{_batch_copy_key(job_id, copy['index']): copy for copy in copies},
+        }, BATCH_COPY_JOB_TTL)
+
+        logger.info(
+            f"Batch copy job {job_id} queued: {count} copies of project {self.source.id}",
+            extra={'job_id': job_id, 'source_project_id': self.source.id, 'count': count}
+        )
+
+        for copy in copies:
+            batch_copy_project_async.delay(job_id, copy['index'])
+
+        return job_id
+
     def _copy_project(
         self,
         new_owner,
@@ -3690,6 +4115,12 @@ class DeepCopyService:
 
         return new_project
 
+    def _source_rows(self, key):
+        """Source rows for one copy step, from the shared snapshot when available."""
+        if self.snapshot is not None:
+            return self.snapshot.rows[key]
+        return ProjectCopySnapshot.source_querysets(self.source)[key]
+
     def _copy_project_pricing(self, new_project):
         """
         Step 2: Copy ProjectPricing (OneToOne with Project).
@@ -3698,7 +4129,12 @@ class DeepCopyService:
             new_project: The newly created project
         """
         try:
-            old_pricing = ProjectPricing.objects.get(project=self.source)
+            if self.snapshot is not None:
+                old_pricing = self.snapshot.pricing
+                if old_pricing is None:
+                    raise ProjectPricing.DoesNotExist
+            else:
+                old_pricing = ProjectPricing.objects.get(project=self.source)
             old_id = old_pricing.id
 
             new_pricing = ProjectPricing(
@@ -3724,7 +4160,7 @@ class DeepCopyService:
         Args:
             new_project: The newly created project
         """
-        parameters = ProjectParameter.objects.filter(project=self.source)
+        parameters = self._source_rows('parameter')
 
         # Prepare instances for bulk creation
         items_to_create = []
@@ -3758,7 +4194,7 @@ class DeepCopyService:
         Args:
             new_project: The newly created project
         """
-        klasifikasi_list = Klasifikasi.objects.filter(project=self.source)
+        klasifikasi_list = self._source_rows('klasifikasi')
 
         # Prepare instances for bulk creation
         items_to_create = []
@@ -3789,7 +4225,7 @@ class DeepCopyService:
         Args:
             new_project: The newly created project
         """
-        subklas_list = SubKlasifikasi.objects.filter(project=self.source)
+        subklas_list = self._source_rows('subklasifikasi')
 
         # Prepare instances for bulk creation and track skipped items
         items_to_create = []
@@ -3850,7 +4286,7 @@ class DeepCopyService:
         Args:
             new_project: The newly created project
         """
-        pekerjaan_list = Pekerjaan.objects.filter(project=self.source)
+        pekerjaan_list = self._source_rows('pekerjaan')
 
         # Prepare instances for bulk creation and track skipped items
         items_to_create = []
@@ -3874,8 +4310,8 @@ class DeepCopyService:
                     ordering_index=old_pekerjaan.ordering_index,
                 )
                 # Copy optional fields if they exist
-                if hasattr(old_pekerjaan, 'ref') and old_pekerjaan.ref:
-                    new_pekerjaan.ref = old_pekerjaan.ref
+                if getattr(old_pekerjaan, 'ref_id', None):
+                    new_pekerjaan.ref_id = old_pekerjaan.ref_id
                 if hasattr(old_pekerjaan, 'auto_load_rincian'):
                     new_pekerjaan.auto_load_rincian = old_pekerjaan.auto_load_rincian
                 if hasattr(old_pekerjaan, 'markup_override_percent') and old_pekerjaan.markup_override_percent:
@@ -3924,7 +4360,7 @@ class DeepCopyService:
         Args:
             new_project: The newly created project
         """
-        volume_list = VolumePekerjaan.objects.filter(project=self.source)
+        volume_list = self._source_rows('volume')
 
         # Prepare instances for bulk creation and track skipped items
         items_to_create = []
@@ -3972,7 +4408,7 @@ class DeepCopyService:
         Args:
             new_project: The newly created project
         """
-        harga_list = HargaItemProject.objects.filter(project=self.source)
+        harga_list = self._source_rows('harga_item')
 
         # Prepare instances for bulk creation
         items_to_create = []
@@ -4007,7 +4443,7 @@ class DeepCopyService:
         Args:
             new_project: The newly created project
         """
-        ahsp_list = DetailAHSPProject.objects.filter(project=self.source)
+        ahsp_list = self._source_rows('ahsp_template')
 
         # Prepare instances for bulk creation and track skipped items
         items_to_create = []
@@ -4081,7 +4517,7 @@ class DeepCopyService:
         Args:
             new_project: The newly created project
         """
-        tahapan_list = TahapPelaksanaan.objects.filter(project=self.source)
+        tahapan_list = self._source_rows('tahapan')
 
         # Prepare instances for bulk creation
         items_to_create = []
@@ -4125,8 +4561,7 @@ class DeepCopyService:
         Args:
             new_project: The newly created project
         """
-        # Filter by tahapan__project since PekerjaanTahapan doesn't have project field
-        jadwal_list = PekerjaanTahapan.objects.filter(tahapan__project=self.source)
+        jadwal_list = self._source_rows('jadwal')
 
         # Prepare instances for bulk creation
         items_to_create = []
@@ -2,7 +2,12 @@ from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 from django.core.cache import cache
 from django.db import transaction
+from dashboard.models import Project
 from .models import (
+    Klasifikasi,
+    SubKlasifikasi,
+    VolumeFormulaState,
+    ProjectParameter,
     DetailAHSPProject,
     HargaItemProject,
     VolumePekerjaan,
@@ -11,7 +16,11 @@ from .models import (
     DetailAHSPExpanded,
     TahapPelaksanaan,
     PekerjaanTahapan,
+    PekerjaanProgressWeekly,
+    ProjectChangeStatus,
 )
+from .progress_utils import mark_progress_summary_stale
+from .services import bump_project_data_version
 import logging
 
 logger = logging.getLogger(__name__)
@@ -115,6 +124,57 @@ def _invalidate_on_pekerjaan_tahapan(sender, instance, **kwargs):
     _clear_rekap_kebutuhan_cache(project_id)
 
 
+# ============================================================================
+# DASHBOARD PROGRESS ROLLUP
+# ============================================================================
+
+@receiver([post_save, post_delete], sender=PekerjaanProgressWeekly)
+@receiver([post_save, post_delete], sender=VolumePekerjaan)
+@receiver([post_save, post_delete], sender=HargaItemProject)
+@receiver([post_save, post_delete], sender=DetailAHSPProject)
+@receiver([post_save, post_delete], sender=Pekerjaan)
+@receiver([post_save, post_delete], sender=ProjectPricing)
+def _invalidate_progress_summary(sender, instance, **kwargs):
+    """Mark the dashboard progress rollup stale when its inputs change."""
+    mark_progress_summary_stale(instance.project_id)
+
+
+# ============================================================================
+# PROJECT DATA VERSION
+# ============================================================================
+
+@receiver([post_save, post_delete], sender=Klasifikasi)
+@receiver([post_save, post_delete], sender=SubKlasifikasi)
+@receiver([post_save, post_delete], sender=Pekerjaan)
+@receiver([post_save, post_delete], sender=VolumePekerjaan)
+@receiver([post_save, post_delete], sender=VolumeFormulaState)
+@receiver([post_save, post_delete], sender=HargaItemProject)
+@receiver([post_save, post_delete], sender=DetailAHSPProject)
+@receiver([post_save, post_delete], sender=DetailAHSPExpanded)
+@receiver([post_save, post_delete], sender=ProjectPricing)
+@receiver([post_save, post_delete], sender=ProjectParameter)
+@receiver([post_save, post_delete], sender=TahapPelaksanaan)
+@receiver([post_save, post_delete], sender=PekerjaanProgressWeekly)
+@receiver([post_save, post_delete], sender=ProjectChangeStatus)
+def _bump_data_version(sender, instance, **kwargs):
+    """Versi data project naik untuk setiap perubahan yang tampil di export/API."""
+    bump_project_data_version(instance.project_id)
+
+
+@receiver([post_save, post_delete], sender=PekerjaanTahapan)
+def _bump_data_version_tahapan(sender, instance, **kwargs):
+    tahapan = getattr(instance, 'tahapan', None)
+    if tahapan is not None:
+        bump_project_data_version(tahapan.project_id)
+
+
+@receiver(post_save, sender=Project)
+def _bump_data_version_project(sender, instance, created, **kwargs):
+    # Identitas project (nama, lokasi, tanda tangan) ikut tercetak di export
+    if not created:
+        bump_project_data_version(instance.id)
+
+
 @receiver(pre_save, sender=DetailAHSPProject)
 def _sync_guard_detail_kategori(sender, instance, **kwargs):
     if instance.harga_item_id and instance.kategori and instance.harga_item.kategori:
@@ -0,0 +1,151 @@
+"""
+Stale-while-revalidate untuk cache rekap per project.
+
+Cache rekap (``rekap:<pid>:v2``) dan rekap kebutuhan divalidasi dengan
+signature; saat signature berubah nilai lama tidak dipakai lagi. Modul ini
+menyimpan salinan "last good" terpisah (tidak ikut dihapus invalidasi) dan
+mengatur satu recompute per project:
+
+- Pemegang lock (``cache.add``) menghitung ulang; worker lain menunggu hasil
+  (strict) atau langsung menerima nilai terakhir yang ditandai stale.
+- Bila ``REKAP_SWR_ASYNC`` aktif, recompute untuk pembaca stale dilempar ke
+  Celery dan lock dilepas oleh task.
+- Counter ``stale_serve``/``lock_wait``/dll. disimpan di cache bersama
+  (lihat :func:`get_swr_metrics`).
+"""
+
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+SWR_METRIC_NAMES = (
+    'fresh_hit',
+    'stale_serve',
+    'recompute',
+    'offload',
+    'lock_wait',
+    'lock_wait_ms',
+    'lock_timeout',
+)
+_LOCK_POLL_INTERVAL = 0.05  # seconds
+
+
+class StaleRows(list):
+    """Rows dari nilai terakhir yang valid; recompute sedang berjalan."""
+
+    stale = True
+
+
+def is_stale(value) -> bool:
+    return bool(getattr(value, 'stale', False))
+
+
+def _metric_key(name: str) -> str:
+    return f"swr_cache:metric:{name}"
+
+
+def _record(name: str, amount: int = 1) -> None:
+    key = _metric_key(name)
+    try:
+        cache.incr(key, amount)
+    except ValueError:
+        if not cache.add(key, amount, None):
+            cache.incr(key, amount)
+
+
+def get_swr_metrics() -> Dict[str, int]:
+    """Snapshot counter stale-while-revalidate (untuk monitoring)."""
+    values = cache.get_many([_metric_key(name) for name in SWR_METRIC_NAMES])
+    return {name: int(values.get(_metric_key(name)) or 0) for name in SWR_METRIC_NAMES}
+
+
+def reset_swr_metrics() -> None:
+    cache.delete_many([_metric_key(name) for name in SWR_METRIC_NAMES])
+
+
+def finish_revalidation(lock_key: str, stale_key: str, compute: Callable[[], Any]) -> Any:
+    """Hitung ulang, simpan salinan last-good, lalu lepas lock (dipakai juga oleh task)."""
+    try:
+        data = compute()
+        cache.set(stale_key, data, settings.REKAP_SWR_STALE_TTL)
+        _record('recompute')
+        return data
+    finally:
+        cache.delete(lock_key)
+
+
+def revalidating_get(
+    label: str,
+    lock_key: str,
+    stale_key: str,
+    load_fresh: Callable[[], Optional[Any]],
+    compute: Callable[[], Any],
+    *,
+    allow_stale: bool = False,
+    offload: Optional[Callable[[], None]] = None,
+):
+    """
+    Ambil nilai cache dengan kebijakan stale-while-revalidate.
+
+    Args:
+        label: nama cache untuk log (mis. ``'rekap'``)
+        lock_key: kunci lock recompute (per project/entry)
+        stale_key: kunci salinan last-good
+        load_fresh: mengembalikan data bila cache masih valid, else ``None``
+        compute: menghitung ulang dan menyimpan cache segar; mengembalikan data
+        allow_stale: boleh mengembalikan :class:`StaleRows` dari nilai lama
+        offload: menjadwalkan recompute di background (dipakai bila
+            ``REKAP_SWR_ASYNC`` aktif); task wajib memanggil
+            :func:`finish_revalidation` agar lock dilepas
+    """
+    data = load_fresh()
+    if data is not None:
+        _record('fresh_hit')
+        return data
+
+    stale = cache.get(stale_key) if allow_stale else None
+
+    if cache.add(lock_key, time.time(), settings.REKAP_SWR_LOCK_TIMEOUT):
+        if stale is not None and offload is not None and settings.REKAP_SWR_ASYNC:
+            try:
+                offload()
+            except Exception:
+                logger.exception("SWR %s: offload gagal, recompute inline", label)
+            else:
+                _record('offload')
+                _record('stale_serve')
+                return StaleRows(stale)
+        return finish_revalidation(lock_key, stale_key, compute)
+
+    # Worker lain sedang recompute
+    if stale is not None:
+        _record('stale_serve')
+        logger.debug("SWR %s: serve stale (%s)", label, lock_key)
+        return StaleRows(stale)
+
+    started = time.monotonic()
+    deadline = started + settings.REKAP_SWR_LOCK_WAIT
+    while True:
+        time.sleep(_LOCK_POLL_INTERVAL)
+        released = cache.get(lock_key) is None
+        data = load_fresh()
+        if data is not None:
+            _record('lock_wait')
+            _record('lock_wait_ms', int((time.monotonic() - started) * 1000))
+            return data
+        if released:
+            break  # pemegang lock selesai/gagal tanpa hasil segar
+        if time.monotonic() >= deadline:
+            _record('lock_timeout')
+            logger.warning("SWR %s: lock wait habis (%s), recompute tanpa lock", label, lock_key)
+            break
+
+    data = compute()
+    cache.set(stale_key, data, settings.REKAP_SWR_STALE_TTL)
+    _record('recompute')
+    return data
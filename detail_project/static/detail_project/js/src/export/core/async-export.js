@@ -0,0 +1,151 @@
+/**
+ * Async Export Client
+ * Menjalankan export backend lewat endpoint export-async (Celery) lalu polling status
+ * sampai file siap, supaya laporan besar tidak menahan worker web.
+ *
+ * @module export/core/async-export
+ */
+
+/** Default polling: 2 detik x 150 = 5 menit */
+const DEFAULT_POLL_INTERVAL_MS = 2000;
+const DEFAULT_MAX_POLLS = 150;
+
+/**
+ * Get CSRF token from cookie
+ * @returns {string} CSRF token
+ */
+function getCsrfToken() {
+  const cookie = document.cookie.split('; ').find(c => c.startsWith('csrftoken='));
+  return cookie ? decodeURIComponent(cookie.split('=')[1]) : '';
+}
+
+/**
+ * Extract filename from Content-Disposition header
+ * @param {Response} response - Fetch response
+ * @param {string} fallback - Filename used when header is missing
+ * @returns {string} Filename
+ */
+function filenameFromResponse(response, fallback) {
+  const disposition = response.headers.get('Content-Disposition');
+  if (disposition) {
+    const match = disposition.match(/filename[^;=\n]*=((['"]).*?\2|[^;\n]*)/i);
+    if (match && match[1]) {
+      return match[1].replace(/["']/g, '');
+    }
+  }
+  return fallback;
+}
+
+/**
+ * Read error message from a JSON (or plain text) error response
+ * @param {Response} response - Fetch response
+ * @returns {Promise<string>} Error message
+ */
+async function readError(response) {
+  const text = await response.text();
+  try {
+    const data = JSON.parse(text);
+    return data.error || data.message || text;
+  } catch {
+    return text;
+  }
+}
+
+/**
+ * Run a backend export asynchronously and return the generated file.
+ *
+ * @param {Object} params
+ * @param {number|string} params.projectId - Project ID
+ * @param {string} params.exportType - ExportManager export type, e.g. 'jadwal-professional'
+ * @param {string} params.format - 'pdf' | 'word' | 'xlsx' | 'csv' | 'json'
+ * @param {Object} [params.options={}] - Export keyword arguments (report_type, months, weeks, ...)
+ * @param {Function} [params.onProgress] - Callback(message, percent) per status poll
+ * @param {string} [params.filename] - Fallback filename when the response has none
+ * @param {number} [params.maxPolls] - Maximum status polls before giving up
+ * @param {number} [params.intervalMs] - Delay between status polls
+ * @returns {Promise<{blob: Blob, filename: string, taskId: string}>}
+ */
+export async function runAsyncExport({
+  projectId,
+  exportType,
+  format,
+  options = {},
+  onProgress = null,
+  filename = null,
+  maxPolls = DEFAULT_MAX_POLLS,
+  intervalMs = DEFAULT_POLL_INTERVAL_MS
+}) {
+  if (!projectId) {
+    throw new Error('[AsyncExport] projectId is required');
+  }
+
+  // 1. Enqueue export task
+  const startResponse = await fetch(`/detail_project/api/project/${projectId}/export-async/`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+      'X-CSRFToken': getCsrfToken(),
+      'X-Requested-With': 'XMLHttpRequest'
+    },
+    credentials: 'same-origin',
+    body: JSON.stringify({ export_type: exportType, format, options })
+  });
+
+  if (!startResponse.ok) {
+    throw new Error(`Export gagal: ${startResponse.status} - ${await readError(startResponse)}`);
+  }
+
+  const { task_id: taskId, status_url: statusUrl, download_url: downloadUrl } = await startResponse.json();
+  onProgress?.('Export dijadwalkan, menunggu worker...', 5);
+
+  // 2. Poll status (dibatasi supaya UI tidak menunggu selamanya)
+  let finished = false;
+  for (let attempt = 0; attempt < maxPolls; attempt++) {
+    const statusResponse = await fetch(statusUrl, {
+      headers: { 'X-Requested-With': 'XMLHttpRequest' },
+      credentials: 'same-origin'
+    });
+    if (!statusResponse.ok) {
+      throw new Error(`Status export gagal: ${statusResponse.status} - ${await readError(statusResponse)}`);
+    }
+
+    const status = await statusResponse.json();
+    if (status.progress) {
+      onProgress?.(status.progress.status || 'Memproses...', Math.min(status.progress.progress || 0, 90));
+    }
+    if (status.status === 'SUCCESS') {
+      finished = true;
+      break;
+    }
+    if (status.status === 'FAILURE') {
+      throw new Error(status.error || 'Export gagal di server');
+    }
+
+    await new Promise(resolve => setTimeout(resolve, intervalMs));
+  }
+
+  if (!finished) {
+    const minutes = Math.round((maxPolls * intervalMs) / 60000);
+    throw new Error(
+      `Export belum selesai setelah ${minutes} menit (worker mungkin sedang sibuk). ` +
+      'Silakan coba lagi beberapa saat lagi.'
+    );
+  }
+
+  // 3. Download result
+  onProgress?.('Mengunduh file...', 95);
+  const downloadResponse = await fetch(downloadUrl, {
+    headers: { 'X-Requested-With': 'XMLHttpRequest' },
+    credentials: 'same-origin'
+  });
+  if (!downloadResponse.ok) {
+    throw new Error(`Download export gagal: ${downloadResponse.status} - ${await readError(downloadResponse)}`);
+  }
+
+  const blob = await downloadResponse.blob();
+  return {
+    blob,
+    filename: filenameFromResponse(downloadResponse, filename || `export_${taskId}`),
+    taskId
+  };
+}
@@ -9,6 +9,7 @@ import { renderKurvaS } from '../core/kurva-s-renderer.js';
 import { generatePDF, downloadPDF } from '../generators/pdf-generator.js';
 import { generateWord, downloadWord } from '../generators/word-generator.js';
 import { generateExcel, downloadExcel } from '../generators/excel-generator.js';
+import { runAsyncExport } from '../core/async-export.js';
 
 // ============================================================================
 // Helper Functions for Monthly Report Data Preparation
@@ -304,46 +305,25 @@ export async function generateMonthlyReport(state, format, month, options = {})
             throw new Error('[MonthlyReport] projectId is required for xlsx export. Cannot determine project ID.');
           }
 
-          // Call professional export endpoint directly
-          const xlsxUrl = `/detail_project/api/project/${projectId}/export/jadwal-pekerjaan/professional/`;
-
           // Support multi-month export via options.months array
           const months = options?.months;
           const isMultiMonth = months && Array.isArray(months) && months.length > 0;
 
-          console.log('[MonthlyReport] Calling backend xlsx export:', xlsxUrl, 'projectId:', projectId,
+          console.log('[MonthlyReport] Starting async xlsx export, projectId:', projectId,
             isMultiMonth ? `months: [${months.join(',')}]` : `month: ${month}`);
 
-          const response = await fetch(xlsxUrl, {
-            method: 'POST',
-            headers: {
-              'Content-Type': 'application/json',
-              'X-CSRFToken': document.cookie.split('; ').find(c => c.startsWith('csrftoken='))?.split('=')[1] || ''
-            },
-            body: JSON.stringify({
-              format: 'xlsx',
+          // Professional export dijalankan worker Celery (export-async)
+          const { blob } = await runAsyncExport({
+            projectId,
+            exportType: 'jadwal-professional',
+            format: 'xlsx',
+            options: {
               report_type: 'monthly',
               // For multi-month: send months array; for single month: send period
               period: isMultiMonth ? null : month,
               months: isMultiMonth ? months : null
-            })
+            }
           });
-
-          if (!response.ok) {
-            const errorText = await response.text();
-            throw new Error(`Excel export failed: ${response.status} - ${errorText}`);
-          }
-
-          // Validate content-type to ensure we got an xlsx file, not an error
-          const contentType = response.headers.get('Content-Type') || '';
-          if (!contentType.includes('spreadsheet') && !contentType.includes('octet-stream')) {
-            // Might be JSON error response
-            const errorText = await response.text();
-            console.error('[MonthlyReport] Unexpected content-type:', contentType, 'Response:', errorText);
-            throw new Error(`Excel export returned invalid content-type: ${contentType}. Response: ${errorText.substring(0, 200)}`);
-          }
-
-          const blob = await response.blob();
           console.log('[MonthlyReport] Excel blob received:', blob.size, 'bytes, type:', blob.type);
 
           result = {
@@ -10,6 +10,7 @@ import { renderGanttPaged } from '../core/gantt-renderer.js';
 import { generatePDF, downloadPDF } from '../generators/pdf-generator.js';
 import { generateWord, downloadWord } from '../generators/word-generator.js';
 import { generateExcel, downloadExcel } from '../generators/excel-generator.js';
+import { runAsyncExport } from '../core/async-export.js';
 
 /**
  * Download JSON blob as file
@@ -205,29 +206,15 @@ export async function generateRekapReport(state, format, options = {}) {
             throw new Error('[RekapReport] projectId is required for xlsx export. Cannot determine project ID.');
           }
 
-          // Call professional export endpoint directly
-          const xlsxUrl = `/detail_project/api/project/${projectId}/export/jadwal-pekerjaan/professional/`;
+          // Professional export dijalankan worker Celery (export-async)
+          console.log('[RekapReport] Starting async xlsx export, projectId:', projectId);
 
-          console.log('[RekapReport] Calling backend xlsx export:', xlsxUrl, 'projectId:', projectId);
-
-          const response = await fetch(xlsxUrl, {
-            method: 'POST',
-            headers: {
-              'Content-Type': 'application/json',
-              'X-CSRFToken': document.cookie.split('; ').find(c => c.startsWith('csrftoken='))?.split('=')[1] || ''
-            },
-            body: JSON.stringify({
-              format: 'xlsx',
-              report_type: 'rekap'
-            })
+          const { blob } = await runAsyncExport({
+            projectId,
+            exportType: 'jadwal-professional',
+            format: 'xlsx',
+            options: { report_type: 'rekap' }
           });
-
-          if (!response.ok) {
-            const errorText = await response.text();
-            throw new Error(`Excel export failed: ${response.status} - ${errorText}`);
-          }
-
-          const blob = await response.blob();
           result = {
             blob,
             metadata: {
@@ -257,27 +244,14 @@ export async function generateRekapReport(state, format, options = {}) {
             throw new Error('[RekapReport] projectId is required for json export');
           }
 
-          const jsonUrl = `/detail_project/api/project/${projectId}/export/jadwal-pekerjaan/professional/`;
-          console.log('[RekapReport] Calling backend json export:', jsonUrl);
+          console.log('[RekapReport] Starting async json export, projectId:', projectId);
 
-          const response = await fetch(jsonUrl, {
-            method: 'POST',
-            headers: {
-              'Content-Type': 'application/json',
-              'X-CSRFToken': document.cookie.split('; ').find(c => c.startsWith('csrftoken='))?.split('=')[1] || ''
-            },
-            body: JSON.stringify({
-              format: 'json',
-              report_type: 'rekap'
-            })
+          const { blob } = await runAsyncExport({
+            projectId,
+            exportType: 'jadwal-professional',
+            format: 'json',
+            options: { report_type: 'rekap' }
           });
-
-          if (!response.ok) {
-            const errorText = await response.text();
-            throw new Error(`JSON export failed: ${response.status} - ${errorText}`);
-          }
-
-          const blob = await response.blob();
           result = {
             blob,
             metadata: {
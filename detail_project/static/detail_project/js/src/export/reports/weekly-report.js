@@ -21,6 +21,7 @@
 import { downloadPDF } from '../generators/pdf-generator.js';
 import { downloadWord } from '../generators/word-generator.js';
 import { generateExcel, downloadExcel } from '../generators/excel-generator.js';
+import { runAsyncExport } from '../core/async-export.js';
 
 // ============================================================================
 // Helper Functions for Weekly Report Data Preparation
@@ -193,7 +194,7 @@ function extractProjectIdFromUrl() {
 
 /**
  * Generate Weekly Report via Backend API
- * Calls the professional export endpoint directly, bypassing frontend image rendering.
+ * Runs the professional export through the export-async endpoint, bypassing frontend image rendering.
  * 
  * @param {Object} state - Application state (for projectId lookup)
  * @param {string} format - 'pdf' or 'word'
@@ -208,49 +209,23 @@ async function generateWeeklyReportFromBackend(state, format, weeksOrWeek, optio
     throw new Error('[WeeklyReport] projectId not found in state or URL');
   }
 
-  // Build URL params
-  const params = new URLSearchParams({
-    report_type: 'weekly',
-    format: format
-  });
-
-  // Support both single week and array of weeks
-  if (Array.isArray(weeksOrWeek)) {
-    params.set('weeks', weeksOrWeek.join(','));
-  } else {
-    params.set('period', String(weeksOrWeek));
-  }
-
-  const url = `/detail_project/api/project/${projectId}/export/jadwal-pekerjaan/professional/?${params.toString()}`;
-
-  console.log('[WeeklyReport] Calling backend API:', url);
-
-  const response = await fetch(url, {
-    method: 'GET',
-    headers: {
-      'Accept': 'application/pdf, application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-    }
-  });
-
-  if (!response.ok) {
-    const errorText = await response.text();
-    throw new Error(`Backend export failed: ${response.status} - ${errorText}`);
-  }
-
-  const blob = await response.blob();
-
-  // Extract filename from Content-Disposition if available
-  const contentDisposition = response.headers.get('Content-Disposition');
-  let filename = Array.isArray(weeksOrWeek)
+  const defaultFilename = Array.isArray(weeksOrWeek)
     ? `weekly_W${Math.min(...weeksOrWeek)}-W${Math.max(...weeksOrWeek)}.${format === 'word' ? 'docx' : 'pdf'}`
     : `weekly_W${weeksOrWeek}.${format === 'word' ? 'docx' : 'pdf'}`;
 
-  if (contentDisposition) {
-    const match = contentDisposition.match(/filename[^;=\n]*=((['"]).*?\2|[^;\n]*)/i);
-    if (match && match[1]) {
-      filename = match[1].replace(/["']/g, '');
-    }
-  }
+  console.log('[WeeklyReport] Starting async backend export, projectId:', projectId);
+
+  // Professional export dijalankan worker Celery (export-async)
+  const { blob, filename } = await runAsyncExport({
+    projectId,
+    exportType: 'jadwal-professional',
+    format,
+    // Support both single week and array of weeks
+    options: Array.isArray(weeksOrWeek)
+      ? { report_type: 'weekly', weeks: weeksOrWeek }
+      : { report_type: 'weekly', period: weeksOrWeek },
+    filename: defaultFilename
+  });
 
   return {
     blob,
@@ -358,50 +333,29 @@ export async function generateWeeklyReport(state, format, week, options = {}) {
             throw new Error('[WeeklyReport] projectId is required for xlsx export');
           }
 
-          const xlsxUrl = `/detail_project/api/project/${projectId}/export/jadwal-pekerjaan/professional/`;
-
           // Support multi-week export via options.weeks array
           const weeks = options?.weeks;
           const isMultiWeek = weeks && Array.isArray(weeks) && weeks.length > 0;
 
-          console.log('[WeeklyReport] Calling backend xlsx export:', xlsxUrl, 'projectId:', projectId,
+          console.log('[WeeklyReport] Starting async xlsx export, projectId:', projectId,
             isMultiWeek ? `weeks: [${weeks.join(',')}]` : `week: ${week}`);
 
-          const response = await fetch(xlsxUrl, {
-            method: 'POST',
-            headers: {
-              'Content-Type': 'application/json',
-              'X-CSRFToken': document.cookie.split('; ').find(c => c.startsWith('csrftoken='))?.split('=')[1] || ''
-            },
-            body: JSON.stringify({
-              format: 'xlsx',
+          // Professional export dijalankan worker Celery (export-async)
+          const { blob, filename: xlsxFilename } = await runAsyncExport({
+            projectId,
+            exportType: 'jadwal-professional',
+            format: 'xlsx',
+            options: {
               report_type: 'weekly',
               // For multi-week: send weeks array; for single week: send period
               period: isMultiWeek ? null : week,
               weeks: isMultiWeek ? weeks : null
-            })
+            },
+            filename: isMultiWeek
+              ? `Laporan_Minggu_${weeks[0]}-${weeks[weeks.length - 1]}.xlsx`
+              : `Laporan_Minggu_${week}.xlsx`
           });
 
-          if (!response.ok) {
-            const errorText = await response.text();
-            throw new Error(`Excel export failed: ${response.status} - ${errorText}`);
-          }
-
-          const blob = await response.blob();
-
-          // Extract filename from Content-Disposition
-          const contentDisposition = response.headers.get('Content-Disposition');
-          let xlsxFilename = isMultiWeek
-            ? `Laporan_Minggu_${weeks[0]}-${weeks[weeks.length - 1]}.xlsx`
-            : `Laporan_Minggu_${week}.xlsx`;
-
-          if (contentDisposition) {
-            const match = contentDisposition.match(/filename[^;=\n]*=((['"]).*?\2|[^;\n]*)/i);
-            if (match && match[1]) {
-              xlsxFilename = match[1].replace(/["']/g, '');
-            }
-          }
-
           result = {
             blob,
             metadata: {
@@ -552,42 +506,17 @@ export async function generateMultiWeeklyReport(state, format, weeks, options =
       throw new Error('[WeeklyReport] projectId is required for xlsx multi-week export');
     }
 
-    const xlsxUrl = `/detail_project/api/project/${projectId}/export/jadwal-pekerjaan/professional/`;
+    console.log('[WeeklyReport] Starting async xlsx multi-week export, projectId:', projectId, `weeks: [${weeks.join(',')}]`);
 
-    console.log('[WeeklyReport] Calling backend xlsx multi-week export:', xlsxUrl, 'projectId:', projectId, `weeks: [${weeks.join(',')}]`);
-
-    const response = await fetch(xlsxUrl, {
-      method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-        'X-CSRFToken': document.cookie.split('; ').find(c => c.startsWith('csrftoken='))?.split('=')[1] || ''
-      },
-      body: JSON.stringify({
-        format: 'xlsx',
-        report_type: 'weekly',
-        period: null,
-        weeks: weeks
-      })
+    // Professional export dijalankan worker Celery (export-async)
+    const { blob, filename: xlsxFilename } = await runAsyncExport({
+      projectId,
+      exportType: 'jadwal-professional',
+      format: 'xlsx',
+      options: { report_type: 'weekly', period: null, weeks },
+      filename: `Laporan_Minggu_${weeks[0]}-${weeks[weeks.length - 1]}.xlsx`
     });
 
-    if (!response.ok) {
-      const errorText = await response.text();
-      throw new Error(`Excel multi-week export failed: ${response.status} - ${errorText}`);
-    }
-
-    const blob = await response.blob();
-
-    // Extract filename from Content-Disposition
-    const contentDisposition = response.headers.get('Content-Disposition');
-    let xlsxFilename = `Laporan_Minggu_${weeks[0]}-${weeks[weeks.length - 1]}.xlsx`;
-
-    if (contentDisposition) {
-      const match = contentDisposition.match(/filename[^;=\n]*=((['"]).*?\2|[^;\n]*)/i);
-      if (match && match[1]) {
-        xlsxFilename = match[1].replace(/["']/g, '');
-      }
-    }
-
     return {
       blob,
       metadata: {
@@ -31,6 +31,7 @@ import {
 import { exportReport } from './export/export-coordinator.js';
 import { renderKurvaS } from './export/core/kurva-s-renderer.js';
 import { renderGanttPaged } from './export/core/gantt-renderer.js';
+import { runAsyncExport } from './export/core/async-export.js';
 
 /**
  * Initialize Jadwal Kegiatan Grid Application
@@ -1010,16 +1011,21 @@ class JadwalKegiatanApp {
 
       // ========================================================================
       // Phase 5: Professional Export (Direct API Call) - For ALL report types
-      // Weekly skips chart rendering, Rekap/Monthly include charts
+      // Charts are rendered server-side unless chartMode is 'client'
       // ========================================================================
       if (useProfessional && (format === 'pdf' || format === 'word')) {
+        // Gantt and Kurva S are drawn server-side as vector graphics;
+        // 'client' mode keeps the legacy PNG rendering below.
+        const chartMode = 'server';
         // Skip chart rendering for weekly reports (no charts needed)
-        const skipChartRendering = (reportType === 'weekly');
+        const skipChartRendering = (reportType === 'weekly') || chartMode === 'server';
 
         if (!skipChartRendering) {
           this._updateExportProgress('Rendering charts...', 'Kurva S dan Gantt Chart (150 DPI)...');
-        } else {
+        } else if (reportType === 'weekly') {
           this._updateExportProgress('Generating weekly report...', 'Memproses data mingguan...');
+        } else {
+          this._updateExportProgress('Generating report...', 'Kurva S dan Gantt Chart dibuat di server...');
         }
 
         // Time tracking for performance analysis
@@ -1153,9 +1159,6 @@ class JadwalKegiatanApp {
 
         this._updateExportProgress('Generating professional report...', 'Cover page, grids, signatures...');
 
-        // Build professional export URL
-        const professionalUrl = `/detail_project/api/project/${projectId}/export/jadwal-pekerjaan/professional/`;
-
         // Collect selected weeks from checkboxes (for weekly reports)
         const weekCheckboxes = exportModal.querySelectorAll('input[name="weeks"]:checked');
         const selectedWeeks = Array.from(weekCheckboxes).map(cb => parseInt(cb.value, 10)).sort((a, b) => a - b);
@@ -1172,6 +1175,7 @@ class JadwalKegiatanApp {
           months: (reportType === 'monthly' && selectedMonths && selectedMonths.length > 0) ? selectedMonths : null,
           // Multi-week support: send weeks array for weekly reports
           weeks: (reportType === 'weekly' && selectedWeeks.length > 0) ? selectedWeeks : null,
+          chart_mode: chartMode,
           attachments: attachments.map(att => ({
             title: att.title,
             bytes: att.bytes,
@@ -1190,25 +1194,17 @@ class JadwalKegiatanApp {
         console.log('[Export] ⏱️ Sending payload with', attachments.length, 'attachments, size:', JSON.stringify(payload).length, 'bytes');
         const apiCallStart = performance.now();
 
-        const response = await fetch(professionalUrl, {
-          method: 'POST',
-          headers: {
-            'Content-Type': 'application/json',
-            'X-CSRFToken': this.getCsrfToken?.() || this._getCsrfToken()
-          },
-          body: JSON.stringify(payload)
+        // Laporan dibuat oleh worker Celery (export-async), bukan di request web
+        const { blob, filename } = await runAsyncExport({
+          projectId,
+          exportType: 'jadwal-professional',
+          format,
+          options: payload,
+          filename: `Laporan_${reportType}_${new Date().toISOString().slice(0, 10)}.${format === 'pdf' ? 'pdf' : 'docx'}`,
+          onProgress: (message, percent) => this._updateExportProgress('Generating professional report...', `${message} (${percent}%)`)
         });
 
-        console.log(`[Export] ⏱️ API response received in ${(performance.now() - apiCallStart).toFixed(0)}ms`);
-
-        if (!response.ok) {
-          const errorText = await response.text();
-          throw new Error(`Export gagal: ${response.status} - ${errorText}`);
-        }
-
-        // Download the file
-        const blob = await response.blob();
-        const filename = `Laporan_${reportType}_${new Date().toISOString().slice(0, 10)}.${format === 'pdf' ? 'pdf' : 'docx'}`;
+        console.log(`[Export] ⏱️ Async export finished in ${(performance.now() - apiCallStart).toFixed(0)}ms`);
 
         // Trigger download
         const url = window.URL.createObjectURL(blob);
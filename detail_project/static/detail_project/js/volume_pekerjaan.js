@@ -2422,6 +2422,7 @@
 
       if (res.ok && res.data?.ok) {
         console.log('[VP] Params synced to server:', res.data);
+        applyServerRecomputedVolumes(res.data.volumes);
         // Show subtle sync indicator
         showParamSyncStatus('synced');
       } else {
@@ -2434,6 +2435,19 @@
     }
   }
 
+  // Server already recomputed & saved volumes whose formula uses a changed
+  // parameter: adopt them as the saved baseline so they are not re-posted.
+  function applyServerRecomputedVolumes(volumes) {
+    const changed = Array.isArray(volumes?.changed) ? volumes.changed : [];
+    changed.forEach(({ pekerjaan_id: id, quantity }) => {
+      const qty = Number(quantity);
+      if (!Number.isFinite(qty)) return;
+      originalValueById[id] = roundHalfUp(qty, STORE_PLACES);
+      updateDirty(id);
+    });
+    if (changed.length) setBtnSaveEnabled();
+  }
+
   // Load parameters from server and replace localStorage snapshot
   async function loadParamsFromServer() {
     try {
@@ -2,7 +2,9 @@
 Celery tasks for AHSP Project - Async Export Operations
 
 This module contains background tasks for heavy export operations.
-All PDF and Word exports are processed asynchronously to prevent browser timeouts.
+Every export type and format (PDF/Word/XLSX/CSV/JSON, including the
+professional monthly/weekly reports) can run asynchronously to prevent
+browser timeouts; progress and the result file are tracked on ExportSession.
 
 Usage:
     from detail_project.tasks import generate_export_async
@@ -29,26 +31,45 @@ logger = logging.getLogger(__name__)
 User = get_user_model()
 
 
+ASYNC_EXPORT_FORMATS = ('pdf', 'word', 'xlsx', 'csv', 'json')
+ASYNC_EXPORT_EXTENSIONS = {'pdf': 'pdf', 'word': 'docx', 'xlsx': 'xlsx', 'csv': 'csv', 'json': 'json'}
+
+
+def _write_response(response, fileobj):
+    """Write an exporter response (plain, streaming or FileResponse) into fileobj."""
+    if getattr(response, 'streaming', False):
+        for chunk in response.streaming_content:
+            fileobj.write(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+    else:
+        fileobj.write(response.content)
+
+
 @shared_task(bind=True, max_retries=3, time_limit=600)
-def generate_export_async(self, project_id, export_type, format_type, user_id, options=None):
+def generate_export_async(self, project_id, export_type, format_type, user_id, options=None, session_id=None):
     """
-    Unified async export task for all PDF/Word exports.
+    Unified async export task for every export type and format.
     
     This task handles background generation of heavy exports to prevent browser timeouts.
     User can close browser and return later to download the completed export.
     
     Args:
         project_id (int): Project ID to export
-        export_type (str): Type of export
+        export_type (str): Type of export (see ExportManager.EXPORT_METHODS)
             - 'rekap-rab': Rekap RAB summary
             - 'jadwal-pekerjaan': Gantt chart & schedule
+            - 'jadwal-professional': Laporan rekap/bulanan/mingguan
             - 'harga-items': Price items listing
             - 'rincian-ahsp': Detailed AHSP breakdown
             - 'rekap-kebutuhan': Material requirements
             - 'volume-pekerjaan': Work volume
-        format_type (str): Output format ('pdf' or 'word')
+        format_type (str): Output format ('pdf', 'word', 'xlsx', 'csv' or 'json')
         user_id (int): User requesting export
-        options (dict, optional): Export configuration options
+        options (dict, optional): Keyword arguments of the export method
+            (e.g. report_type/period/months/weeks for jadwal-professional),
+            plus 'add_watermark'
+        session_id (str, optional): ExportSession tracking this task. When given,
+            progress is written to the session and the file is stored in
+            ``session.output_file`` until ``EXPORT_ASYNC_RETENTION_HOURS``.
     
     Returns:
         dict: {
@@ -56,7 +77,8 @@ def generate_export_async(self, project_id, export_type, format_type, user_id, o
             'file_path': '/path/to/export.pdf',
             'file_size': 1024000,
             'export_type': 'rekap-rab',
-            'format': 'pdf'
+            'format': 'pdf',
+            'session_id': 'uuid' or None
         }
     
     Raises:
@@ -71,17 +93,35 @@ def generate_export_async(self, project_id, export_type, format_type, user_id, o
         >>> print(result['file_path'])
     """
     from detail_project.models import Project
+    from detail_project.models_export import ExportSession
+
+    session = None
+    if session_id:
+        session = ExportSession.objects.filter(export_id=session_id).first()
+    last_progress = {'value': -1}
+
+    def set_progress(progress, message):
+        progress = int(progress)
+        if session is None:
+            self.update_state(
+                state='PROCESSING',
+                meta={
+                    'status': message,
+                    'progress': progress,
+                    'total': 100
+                }
+            )
+        # Session-backed tasks report through the session (polled by
+        # api_export_status_async); one write per percent step since
+        # exporters may report per page
+        elif progress != last_progress['value']:
+            last_progress['value'] = progress
+            session.mark_progress(progress, message)
     
     try:
-        # Update task state to PROCESSING
-        self.update_state(
-            state='PROCESSING',
-            meta={
-                'status': 'Loading project data...',
-                'progress': 0,
-                'total': 100
-            }
-        )
+        if session is not None:
+            session.mark_processing()
+        set_progress(0, 'Loading project data...')
         
         # Validate and load project
         try:
@@ -95,90 +135,68 @@ def generate_export_async(self, project_id, export_type, format_type, user_id, o
         except User.DoesNotExist:
             raise ValueError(f"User {user_id} not found")
         
-        # Validate export type
-        valid_types = [
-            'rekap-rab', 'jadwal-pekerjaan', 'harga-items',
-            'rincian-ahsp', 'rekap-kebutuhan', 'volume-pekerjaan'
-        ]
-        if export_type not in valid_types:
-            raise ValueError(f"Invalid export_type: {export_type}. Must be one of {valid_types}")
-        
-        # Validate format
-        if format_type not in ['pdf', 'word']:
-            raise ValueError(f"Invalid format_type: {format_type}. Must be 'pdf' or 'word'")
+        # Validate format (export_type is validated by ExportManager.export)
+        if format_type not in ASYNC_EXPORT_FORMATS:
+            raise ValueError(f"Invalid format_type: {format_type}. Must be one of {list(ASYNC_EXPORT_FORMATS)}")
         
-        # Update progress
-        self.update_state(
-            state='PROCESSING',
-            meta={
-                'status': f'Generating {export_type} {format_type.upper()}...',
-                'progress': 20,
-                'total': 100
-            }
-        )
-        
-        # Dynamic routing to appropriate exporter
-        # Convert export_type to method name: 'rekap-rab' -> 'export_rekap_rab'
-        export_type_normalized = export_type.replace('-', '_')
-        method_name = f"export_{export_type_normalized}"
+        set_progress(10, f'Generating {export_type} {format_type.upper()}...')
         
-        # Use ExportManager which handles config creation properly
+        from detail_project.exports.artifact_cache import response_filename
         from detail_project.exports.export_manager import ExportManager
-        
-        manager = ExportManager(project, user)
-        
-        # Check if export method exists on manager
-        if not hasattr(manager, method_name):
-            raise ValueError(
-                f"Export method '{method_name}' not found in ExportManager"
-            )
-        
-        # Progress callback for tracking
+
         def progress_callback(current, total, message):
-            """Update task progress during export generation."""
-            progress_pct = int((current / total) * 80) + 20  # 20-100% range
-            self.update_state(
-                state='PROCESSING',
-                meta={
-                    'status': message,
-                    'progress': progress_pct,
-                    'total': 100
-                }
-            )
+            """Map exporter progress onto the 20-90% range."""
+            set_progress(20 + int(min(current, total) / total * 70), message)
+
+        manager = ExportManager(project, user, progress_callback=progress_callback)
         
         # Execute export
         logger.info(
             f"Starting export: project={project_id}, type={export_type}, "
-            f"format={format_type}, user={user_id}"
+            f"format={format_type}, user={user_id}, session={session_id}"
         )
+        response = manager.export(export_type, format_type, options)
+        if response.status_code != 200:
+            raise ValueError(f"Export returned HTTP {response.status_code}")
         
-        export_method = getattr(manager, method_name)
-        
-        # Call export method with format_type
-        # ExportManager methods take format_type as first arg
-        response = export_method(format_type)
+        set_progress(95, 'Saving file...')
         
-        # ExportManager returns HttpResponse, we need to save content to file
         import tempfile
         import time
+        from datetime import timedelta
+        from django.core.files import File
         
-        # Determine file extension
-        ext = 'pdf' if format_type == 'pdf' else 'docx'
-        
-        # Create exports directory if not exists
-        exports_dir = os.path.join(settings.MEDIA_ROOT, 'exports', 'async')
-        os.makedirs(exports_dir, exist_ok=True)
-        
-        # Generate unique filename
+        ext = ASYNC_EXPORT_EXTENSIONS[format_type]
+        export_type_normalized = export_type.replace('-', '_')
         timestamp = int(time.time())
         filename = f"{export_type_normalized}_{project_id}_{timestamp}.{ext}"
-        file_path = os.path.join(exports_dir, filename)
         
-        # Write response content to file
-        with open(file_path, 'wb') as f:
-            f.write(response.content)
-        
-        file_size = os.path.getsize(file_path)
+        if session is not None:
+            # Retained with the session; cleanup_old_exports removes it at expires_at
+            with tempfile.TemporaryFile() as tmp:
+                _write_response(response, tmp)
+                file_size = tmp.tell()
+                tmp.seek(0)
+                session.metadata = {
+                    **(session.metadata or {}),
+                    'filename': response_filename(response) or filename,
+                    'content_type': response.get('Content-Type', 'application/octet-stream'),
+                }
+                session.save(update_fields=['metadata', 'updated_at'])
+                session.mark_completed(
+                    File(tmp, name=filename),
+                    file_size,
+                    retain_for=timedelta(hours=settings.EXPORT_ASYNC_RETENTION_HOURS),
+                )
+            file_path = session.output_file.path
+        else:
+            exports_dir = os.path.join(settings.MEDIA_ROOT, 'exports', 'async')
+            os.makedirs(exports_dir, exist_ok=True)
+            file_path = os.path.join(exports_dir, filename)
+            # Write response content to file (artifact cache hits are FileResponse)
+            with open(file_path, 'wb') as f:
+                _write_response(response, f)
+            file_size = os.path.getsize(file_path)
         
         logger.info(
             f"Export completed: {file_path} ({file_size} bytes)"
@@ -191,7 +209,8 @@ def generate_export_async(self, project_id, export_type, format_type, user_id, o
             'file_size': file_size,
             'export_type': export_type,
             'format': format_type,
-            'project_id': project_id
+            'project_id': project_id,
+            'session_id': str(session.export_id) if session is not None else None,
         }
     
     except Exception as exc:
@@ -200,21 +219,86 @@ def generate_export_async(self, project_id, export_type, format_type, user_id, o
             f"format={format_type}, error={str(exc)}",
             exc_info=True
         )
-        
-        # Update state to FAILURE with error details
-        self.update_state(
-            state='FAILURE',
-            meta={
-                'error': str(exc),
-                'export_type': export_type,
-                'format': format_type
-            }
-        )
+        if session is not None:
+            session.mark_failed(str(exc))
+        else:
+            # Update state to FAILURE with error details
+            self.update_state(
+                state='FAILURE',
+                meta={
+                    'error': str(exc),
+                    'export_type': export_type,
+                    'format': format_type
+                }
+            )
         
         # Re-raise for Celery to handle retry logic
         raise
 
 
+@shared_task(bind=True, time_limit=600)
+def batch_copy_project_async(self, job_id, copy_index):
+    """
+    Create one copy of a batch copy job started by
+    DeepCopyService.start_batch_copy_job().
+
+    The source project is read from the shared snapshot cached for the job, so
+    each worker only runs the bulk-create chain for its own copy.
+
+    Returns:
+        dict: {'job_id': ..., 'copy_index': 1, 'project_id': 123 or None}
+    """
+    from detail_project.services import run_batch_copy_item
+
+    new_project = run_batch_copy_item(job_id, copy_index)
+    return {
+        'job_id': job_id,
+        'copy_index': copy_index,
+        'project_id': new_project.id if new_project else None,
+    }
+
+
+@shared_task(time_limit=300)
+def revalidate_project_cache(project_id, kind='rekap', params=None):
+    """
+    Recompute a stale rekap cache entry in the background.
+
+    Scheduled by ``services.compute_rekap_for_project`` /
+    ``compute_kebutuhan_items`` (``allow_stale=True``) when REKAP_SWR_ASYNC is
+    enabled; the caller already holds the recompute lock, which is released
+    here once the fresh value and its last-good copy are stored.
+    """
+    from django.core.cache import cache
+    from dashboard.models import Project
+    from detail_project import services
+    from detail_project.stale_cache import finish_revalidation
+
+    params = params or {}
+    # Kunci lock dihitung dari project_id dulu: setiap jalur keluar harus
+    # melepasnya, termasuk saat project sudah tidak ada
+    lock_key = services._revalidation_lock_key(project_id, kind, params)
+    try:
+        project = Project.objects.filter(id=project_id).first()
+        if project is None:
+            logger.warning(f"revalidate_project_cache: project {project_id} not found")
+            cache.delete(lock_key)
+            return {'project_id': project_id, 'kind': kind, 'rows': None}
+
+        if kind == 'kebutuhan':
+            _, stale_key, _, compute = services._kebutuhan_cache_plan(
+                project, params.get('mode', 'all'), params.get('tahapan_id'),
+                params.get('filters'), params.get('time_scope'),
+            )
+        else:
+            _, stale_key, _, compute = services._rekap_cache_plan(project)
+    except Exception:
+        cache.delete(lock_key)
+        raise
+
+    rows = finish_revalidation(lock_key, stale_key, compute)
+    return {'project_id': project_id, 'kind': kind, 'rows': len(rows)}
+
+
 @shared_task
 def cleanup_old_exports():
     """
@@ -222,25 +306,78 @@ def cleanup_old_exports():
     
     This task should be run periodically via Celery Beat to prevent
     disk space issues from accumulated export files.
+
+    The export artifact cache is skipped by the 24 hour sweep; it is trimmed
+    by its own LRU eviction (size limit + EXPORT_ARTIFACT_CACHE_MAX_AGE).
+
+    Files owned by an unexpired ExportSession are kept. Async export sessions
+    (EXPORT_ASYNC_RETENTION_HOURS) have their file deleted and are marked
+    expired once ``expires_at`` has passed.
     
     Returns:
         dict: {
             'deleted_count': 10,
-            'freed_bytes': 5242880
+            'freed_bytes': 5242880,
+            'expired_sessions': 3,
+            'artifact_cache': {'deleted_count': 2, 'freed_bytes': 1048576, 'total_bytes': ...}
         }
     """
     import time
     from pathlib import Path
+    from django.utils import timezone
+    from detail_project.exports.artifact_cache import get_artifact_cache
+    from detail_project.models_export import ExportSession
+
+    artifact_cache = get_artifact_cache()
+    cache_result = artifact_cache.evict(max_age=settings.EXPORT_ARTIFACT_CACHE_MAX_AGE)
+    cache_root = artifact_cache.root.resolve()
+
+    deleted_count = 0
+    freed_bytes = 0
+
+    # Expire async sessions past their retention window (file first, then status).
+    # Batch-upload sessions keep the 24 hour sweep below.
+    expired_sessions = 0
+    now = timezone.now()
+    expired_qs = (
+        ExportSession.objects.filter(expires_at__lt=now)
+        .exclude(task_id='')
+        .exclude(status=ExportSession.STATUS_EXPIRED)
+    )
+    for session in expired_qs:
+        if session.output_file:
+            try:
+                freed_bytes += session.output_file.size
+                session.output_file.delete(save=False)
+                deleted_count += 1
+            except OSError as e:
+                logger.error(f"Failed to delete export file of session {session.export_id}: {e}")
+        session.status = ExportSession.STATUS_EXPIRED
+        session.save(update_fields=['status', 'output_file', 'updated_at'])
+        expired_sessions += 1
+
+    retained_files = {
+        Path(settings.MEDIA_ROOT, name).resolve()
+        for name in ExportSession.objects.filter(expires_at__gte=now)
+        .exclude(output_file='').exclude(output_file__isnull=True)
+        .values_list('output_file', flat=True)
+    }
     
     exports_dir = os.path.join(settings.MEDIA_ROOT, 'exports')
     if not os.path.exists(exports_dir):
-        return {'deleted_count': 0, 'freed_bytes': 0}
+        return {
+            'deleted_count': deleted_count,
+            'freed_bytes': freed_bytes,
+            'expired_sessions': expired_sessions,
+            'artifact_cache': cache_result,
+        }
     
-    deleted_count = 0
-    freed_bytes = 0
     cutoff_time = time.time() - (24 * 60 * 60)  # 24 hours ago
     
     for export_file in Path(exports_dir).rglob('*'):
+        resolved = export_file.resolve()
+        if cache_root in resolved.parents or resolved in retained_files:
+            continue
         if export_file.is_file():
             if export_file.stat().st_mtime < cutoff_time:
                 file_size = export_file.stat().st_size
@@ -254,10 +391,14 @@ def cleanup_old_exports():
     
     logger.info(
         f"Export cleanup: deleted {deleted_count} files, "
-        f"freed {freed_bytes / 1024 / 1024:.2f} MB"
+        f"freed {freed_bytes / 1024 / 1024:.2f} MB, "
+        f"expired {expired_sessions} sessions; "
+        f"artifact cache evicted {cache_result['deleted_count']} files"
     )
     
     return {
         'deleted_count': deleted_count,
-        'freed_bytes': freed_bytes
+        'freed_bytes': freed_bytes,
+        'expired_sessions': expired_sessions,
+        'artifact_cache': cache_result,
     }
@@ -0,0 +1,110 @@
+import gzip
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase
+
+from dashboard.models import Project
+from detail_project.models import (
+    DetailAHSPProject,
+    HargaItemProject,
+    Klasifikasi,
+    Pekerjaan,
+    PekerjaanProgressWeekly,
+    SubKlasifikasi,
+    VolumePekerjaan,
+)
+from detail_project.views_api import api_kurva_s_harga_data, api_rekap_kebutuhan_weekly
+
+
+class ColumnarChartApiTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.owner = get_user_model().objects.create_user(
+            username="owner_columnar", email="columnar@example.com", password="Secret123!"
+        )
+        self.project = Project.objects.create(
+            owner=self.owner, nama="Columnar Project", sumber_dana="APBN",
+            lokasi_project="Jakarta", nama_client="Client", anggaran_owner=1000,
+            tanggal_mulai=date(2025, 1, 6),
+        )
+        klas = Klasifikasi.objects.create(project=self.project, name="Klas", ordering_index=1)
+        sub = SubKlasifikasi.objects.create(project=self.project, klasifikasi=klas, name="Sub", ordering_index=1)
+        self.pekerjaan = []
+        for idx, cost in enumerate(("300", "100"), start=1):
+            pkj = Pekerjaan.objects.create(
+                project=self.project, sub_klasifikasi=sub, source_type="custom",
+                snapshot_uraian=f"Pekerjaan {idx}", snapshot_satuan="m3",
+                ordering_index=idx, budgeted_cost=Decimal(cost),
+            )
+            VolumePekerjaan.objects.create(project=self.project, pekerjaan=pkj, quantity=Decimal("10"))
+            self.pekerjaan.append(pkj)
+
+        harga = HargaItemProject.objects.create(
+            project=self.project, kode_item="L.01", kategori="TK",
+            uraian="Pekerja", satuan="OH", harga_satuan=Decimal("100000"),
+        )
+        DetailAHSPProject.objects.create(
+            project=self.project, pekerjaan=self.pekerjaan[0], harga_item=harga, kategori="TK",
+            kode="L.01", uraian="Pekerja", satuan="OH", koefisien=Decimal("0.5"),
+        )
+
+        start = date(2025, 1, 6)
+        for pkj, week, planned in ((self.pekerjaan[0], 1, "50"), (self.pekerjaan[0], 2, "50"),
+                                   (self.pekerjaan[1], 2, "100")):
+            week_start = start + timedelta(weeks=week - 1)
+            PekerjaanProgressWeekly.objects.create(
+                pekerjaan=pkj, project=self.project, week_number=week,
+                week_start_date=week_start, week_end_date=week_start + timedelta(days=6),
+                planned_proportion=Decimal(planned), actual_proportion=Decimal("0"),
+            )
+
+    def _get(self, view, query="", **headers):
+        request = self.factory.get(f"/api/?{query}", **headers)
+        request.user = self.owner
+        return view(request, self.project.id)
+
+    def test_kurva_s_harga_columnar_matches_nested_shape(self):
+        nested = json.loads(self._get(api_kurva_s_harga_data).content)
+        columnar = json.loads(self._get(api_kurva_s_harga_data, "format=columnar").content)
+
+        self.assertEqual(columnar["format"], "columnar")
+        self.assertEqual(columnar["pekerjaan"], [pkj.id for pkj in self.pekerjaan])
+        self.assertEqual(columnar["weeks"], [1, 2])
+
+        width = len(columnar["pekerjaan"])
+        planned = columnar["series"]["planned"]
+        for w, week in enumerate(nested["weeklyData"]["planned"]):
+            self.assertEqual(planned["cost"][w], week["cost"])
+            self.assertEqual(planned["cumulative_percent"][w], week["cumulative_percent"])
+            for p, pkj_id in enumerate(columnar["pekerjaan"]):
+                expected = week["pekerjaan_breakdown"].get(str(pkj_id), 0.0)
+                self.assertEqual(planned["breakdown"][w * width + p], expected)
+        self.assertEqual(columnar["pekerjaanMeta"]["uraian"], ["Pekerjaan 1", "Pekerjaan 2"])
+        self.assertEqual(columnar["summary"], nested["summary"])
+
+    def test_rekap_kebutuhan_weekly_columnar(self):
+        nested = json.loads(self._get(api_rekap_kebutuhan_weekly).content)
+        columnar = json.loads(self._get(api_rekap_kebutuhan_weekly, "format=columnar").content)
+
+        self.assertEqual(columnar["weeks"], [week["week_number"] for week in nested["weeklyData"]])
+        self.assertEqual(columnar["items"]["kode"], ["L.01"])
+        self.assertEqual(
+            columnar["quantity"],
+            [week["items"]["TK"][0]["quantity"] for week in nested["weeklyData"]],
+        )
+        self.assertEqual(columnar["pekerjaan"], [self.pekerjaan[0].id])
+        self.assertEqual(columnar["breakdown"]["week"], [0, 1])
+        self.assertEqual(columnar["breakdown"]["value"], [2.5, 2.5])
+
+    def test_gzip_negotiation(self):
+        plain = self._get(api_kurva_s_harga_data)
+        self.assertNotIn("Content-Encoding", plain)
+        self.assertIn("Accept-Encoding", plain["Vary"])
+
+        compressed = self._get(api_kurva_s_harga_data, HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual(compressed["Content-Encoding"], "gzip")
+        body = json.loads(gzip.decompress(compressed.content))
+        self.assertEqual(body["summary"], json.loads(plain.content)["summary"])
@@ -0,0 +1,120 @@
+import json
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
+
+from dashboard.models import Project
+from detail_project.audit_delta import reconstruct_entries
+from detail_project.models import DetailAHSPAudit, Klasifikasi, Pekerjaan, SubKlasifikasi
+from detail_project.services import log_audit
+from detail_project.views_api import api_get_audit_state, api_get_audit_trail
+
+
+def _row(pk, kode, koefisien, kategori="TK"):
+    return {
+        "id": pk, "kategori": kategori, "kode": kode, "uraian": f"Item {kode}", "satuan": "OH",
+        "koefisien": koefisien, "ref_kind": None, "ref_id": None,
+    }
+
+
+VERSIONS = [
+    [],
+    [_row(1, "L.01", "0.500000"), _row(2, "L.02", "0.100000")],
+    [_row(1, "L.01", "0.750000"), _row(2, "L.02", "0.100000")],
+    [_row(1, "L.01", "0.750000"), _row(3, "B.01", "2.000000", "BHN")],
+    [_row(1, "L.01", "1.000000"), _row(3, "B.01", "2.000000", "BHN")],
+]
+
+
+class DetailAuditDeltaTests(TestCase):
+    def setUp(self):
+        self.owner = get_user_model().objects.create_user(
+            username="owner_audit_delta", email="audit-delta@example.com", password="Secret123!"
+        )
+        self.project = Project.objects.create(owner=self.owner, nama="Audit Delta Project")
+        klas = Klasifikasi.objects.create(project=self.project, name="Klas")
+        sub = SubKlasifikasi.objects.create(project=self.project, klasifikasi=klas, name="Sub")
+        self.pekerjaan = Pekerjaan.objects.create(
+            project=self.project, sub_klasifikasi=sub, source_type=Pekerjaan.SOURCE_CUSTOM,
+            snapshot_kode="CUST-0001", snapshot_uraian="Pekerjaan Audit",
+        )
+
+    def _log_versions(self):
+        for old, new in zip(VERSIONS, VERSIONS[1:]):
+            log_audit(self.project, self.pekerjaan, old_data=old, new_data=new, user=self.owner)
+        return list(DetailAHSPAudit.objects.filter(project=self.project).order_by("id"))
+
+    def _assert_roundtrip(self, entries):
+        states = reconstruct_entries(entries)
+        for entry, old, new in zip(entries, VERSIONS, VERSIONS[1:]):
+            self.assertEqual(states[entry.id], (old, new))
+
+    def test_entries_store_deltas_between_checkpoints(self):
+        entries = self._log_versions()
+        self.assertEqual([e.is_checkpoint for e in entries], [True, False, False, False])
+        self.assertEqual([e.chain_length for e in entries], [0, 1, 2, 3])
+        self.assertIsNone(entries[1].new_data)
+        self.assertEqual(entries[1].delta["changed"], [
+            {"kode": "L.01", "old": {"koefisien": "0.500000"}, "new": {"koefisien": "0.750000"}},
+        ])
+        self.assertEqual(entries[1].change_summary, "updated 1 (L.01)")
+        self._assert_roundtrip(entries)
+
+    @override_settings(DETAIL_AUDIT_CHECKPOINT_INTERVAL=2)
+    def test_checkpoint_interval_and_untracked_changes(self):
+        entries = self._log_versions()
+        self.assertEqual([e.is_checkpoint for e in entries], [True, False, True, False])
+        self._assert_roundtrip(entries)
+
+        # Detail berubah tanpa audit: old tidak cocok dengan state terakhir -> checkpoint
+        log_audit(self.project, self.pekerjaan, old_data=VERSIONS[1], new_data=VERSIONS[2])
+        drift = DetailAHSPAudit.objects.filter(project=self.project).order_by("-id").first()
+        self.assertTrue(drift.is_checkpoint)
+        self.assertEqual(reconstruct_entries([drift])[drift.id], (VERSIONS[1], VERSIONS[2]))
+
+    def test_reconstruction_api_and_audit_trail_detail(self):
+        entries = self._log_versions()
+        factory = RequestFactory()
+
+        request = factory.get("/api/")
+        request.user = self.owner
+        body = json.loads(api_get_audit_state(request, self.project.id, entries[2].id).content)
+        self.assertEqual((body["old_data"], body["new_data"]), (VERSIONS[2], VERSIONS[3]))
+        self.assertFalse(body["is_checkpoint"])
+
+        request = factory.get("/api/", {"entry_id": entries[3].id})
+        request.user = self.owner
+        result = json.loads(api_get_audit_trail(request, self.project.id).content)["result"]
+        self.assertEqual(result["new_data"], VERSIONS[4])
+        self.assertIn("delta", result)
+
+        request = factory.get("/api/", {"include_diff": "1"})
+        request.user = self.owner
+        rows = json.loads(api_get_audit_trail(request, self.project.id).content)["results"]
+        self.assertEqual({r["id"]: r["old_data"] for r in rows}[entries[0].id], VERSIONS[0])
+
+    def test_compact_command_rewrites_legacy_rows(self):
+        for old, new in zip(VERSIONS, VERSIONS[1:]):
+            DetailAHSPAudit.objects.create(
+                project=self.project, pekerjaan=self.pekerjaan,
+                action=DetailAHSPAudit.ACTION_UPDATE, old_data=old, new_data=new,
+            )
+
+        out = StringIO()
+        call_command("compact_detail_audit", "--dry-run", stdout=out)
+        self.assertIn("[DRY RUN] 4 entry", out.getvalue())
+        self.assertFalse(DetailAHSPAudit.objects.exclude(state_hash="").exists())
+
+        call_command("compact_detail_audit", stdout=StringIO())
+        entries = list(DetailAHSPAudit.objects.filter(project=self.project).order_by("id"))
+        self.assertEqual([e.is_checkpoint for e in entries], [True, False, False, False])
+        self.assertTrue(all(e.old_data is None for e in entries))
+        self._assert_roundtrip(entries)
+
+        # Entry baru melanjutkan rantai hasil compact
+        log_audit(self.project, self.pekerjaan, old_data=VERSIONS[4], new_data=VERSIONS[3])
+        latest = DetailAHSPAudit.objects.order_by("-id").first()
+        self.assertFalse(latest.is_checkpoint)
+        self.assertEqual(latest.chain_length, 4)
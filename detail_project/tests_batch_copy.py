@@ -0,0 +1,142 @@
+import json
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from dashboard.models import Project
+from detail_project.models import (
+    DetailAHSPProject,
+    HargaItemProject,
+    Klasifikasi,
+    Pekerjaan,
+    SubKlasifikasi,
+    VolumePekerjaan,
+)
+from detail_project.services import DeepCopyService, ProjectCopySnapshot
+
+
+class BatchCopyJobTests(TestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(
+            username="owner_batch_copy",
+            email="owner-batch-copy@example.com",
+            password="Secret123!",
+        )
+        self.project = Project.objects.create(
+            owner=self.owner,
+            nama="Project Template",
+            sumber_dana="APBN",
+            lokasi_project="Jakarta",
+            nama_client="Client A",
+            anggaran_owner=1000,
+        )
+        klas = Klasifikasi.objects.create(project=self.project, name="Klas", ordering_index=1)
+        sub = SubKlasifikasi.objects.create(
+            project=self.project, klasifikasi=klas, name="Sub", ordering_index=1
+        )
+        pekerjaan = Pekerjaan.objects.create(
+            project=self.project, sub_klasifikasi=sub, source_type="custom",
+            snapshot_uraian="Galian", snapshot_satuan="m3", ordering_index=1,
+        )
+        VolumePekerjaan.objects.create(project=self.project, pekerjaan=pekerjaan, quantity=Decimal("12"))
+        harga = HargaItemProject.objects.create(
+            project=self.project, kode_item="L.01", kategori="TK",
+            uraian="Pekerja", satuan="OH", harga_satuan=Decimal("100000"),
+        )
+        DetailAHSPProject.objects.create(
+            project=self.project, pekerjaan=pekerjaan, harga_item=harga, kategori="TK",
+            kode="L.01", uraian="Pekerja", satuan="OH", koefisien=Decimal("0.5"),
+        )
+        self.client.force_login(self.owner)
+
+    def test_index_project_retries_when_a_concurrent_copy_took_the_candidate(self):
+        # A parallel copy's uncommitted row is invisible to exists(); only the
+        # unique constraint catches it.
+        other = DeepCopyService(self.project).copy(new_owner=self.owner, new_name="Copy A")
+        prefix, number = self.project.index_project.rsplit("-", 1)
+        taken = f"{prefix}-{int(number) + 2:04d}"
+        Project.objects.filter(pk=other.pk).update(index_project=taken)
+
+        with mock.patch("django.db.models.query.QuerySet.exists", return_value=False):
+            copy = DeepCopyService(self.project).copy(new_owner=self.owner, new_name="Copy B")
+
+        copy.refresh_from_db()
+        self.assertEqual(copy.index_project, f"{prefix}-{int(number) + 3:04d}")
+
+    def test_snapshot_copy_does_not_reread_source(self):
+        snapshot = ProjectCopySnapshot.capture(self.project)
+        self.assertEqual(snapshot.size()["ahsp_template"], 1)
+
+        with CaptureQueriesContext(connection) as ctx:
+            DeepCopyService(self.project, snapshot=snapshot).copy(self.owner, "Salinan")
+        source_reads = [
+            q for q in ctx.captured_queries
+            if q["sql"].startswith("SELECT") and f'"project_id" = {self.project.id}' in q["sql"]
+        ]
+        self.assertEqual(source_reads, [])
+
+    def test_batch_copy_job_reports_progress_per_copy(self):
+        url = reverse("detail_project:api_batch_copy_project", kwargs={"project_id": self.project.id})
+        response = self.client.post(
+            url, data=json.dumps({"base_name": "Bulanan", "count": 3}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 202)
+        data = response.json()
+        self.assertTrue(data["ok"])
+        # Contract used by dashboard/project_detail.html (handleBatchCopy)
+        self.assertEqual(set(data["summary"]), {"requested", "successful", "failed"})
+        self.assertEqual(data["summary"]["requested"], 3)
+
+        status = self.client.get(data["status_url"]).json()
+        self.assertEqual(status["summary"], {"requested": 3, "successful": 3, "failed": 0})
+        self.assertEqual(status["job"]["status"], "success")
+        self.assertEqual(status["job"]["progress"], 100)
+        self.assertEqual(
+            [copy["status"] for copy in status["job"]["copies"]], ["success"] * 3
+        )
+        self.assertEqual(
+            [p["nama"] for p in status["projects"]],
+            ["Bulanan - Copy 1", "Bulanan - Copy 2", "Bulanan - Copy 3"],
+        )
+        for project_data in status["projects"]:
+            self.assertEqual(
+                DetailAHSPProject.objects.filter(project_id=project_data["id"]).count(), 1
+            )
+
+        other = get_user_model().objects.create_user(
+            username="other_batch_copy", email="other@example.com", password="Secret123!"
+        )
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(data["status_url"]).status_code, 404)
+
+    def test_failed_copy_is_recorded_without_stopping_batch(self):
+        Project.objects.create(
+            owner=self.owner, nama="Dup - Copy 2", sumber_dana="APBN",
+            lokasi_project="Jakarta", nama_client="Client A", anggaran_owner=1000,
+        )
+        job_id = DeepCopyService(self.project).start_batch_copy_job(self.owner, "Dup", 3)
+
+        url = reverse(
+            "detail_project:api_batch_copy_status",
+            kwargs={"project_id": self.project.id, "job_id": job_id},
+        )
+        job = self.client.get(url).json()["job"]
+        self.assertEqual((job["successful"], job["failed"]), (2, 1))
+        self.assertEqual(job["copies"][1]["status"], "failed")
+        self.assertIn("error", job["copies"][1])
+
+    def test_dashboard_batch_copy_polls_status_url(self):
+        response = self.client.get(reverse("dashboard:project_detail", args=[self.project.id]))
+        self.assertEqual(response.status_code, 200)
+        content = response.content.decode()
+        self.assertIn("waitForBatchCopyJob(data)", content)
+        self.assertIn("fetch(data.status_url", content)
+        self.assertIn("status.summary", content)
+        self.assertIn("BATCH_COPY_MAX_POLLS", content)
@@ -0,0 +1,84 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from dashboard.models import Project
+from detail_project.benchmarks import BenchmarkSize, generate_project, run_suite
+from detail_project.benchmarks.generator import dataset_counts
+from detail_project.benchmarks.suite import compare_results
+from detail_project.models import DetailAHSPExpanded, DetailAHSPProject, PekerjaanProgressWeekly
+
+TINY = BenchmarkSize("T", pekerjaan=12, details_per_pekerjaan=4, bundle_depth=2, weeks=6, bundle_share=0.5)
+
+
+class BenchmarkSuiteTests(TestCase):
+    def setUp(self):
+        self.owner = get_user_model().objects.create_user(
+            username="owner_bench", email="bench@example.com", password="Secret123!", is_staff=True
+        )
+
+    def _fingerprint(self, project):
+        details = DetailAHSPProject.objects.filter(project=project).order_by("pekerjaan__ordering_index", "kode")
+        progress = PekerjaanProgressWeekly.objects.filter(project=project).order_by(
+            "pekerjaan__ordering_index", "week_number"
+        )
+        return (
+            [(d.kode, str(d.koefisien), d.harga_item.harga_satuan) for d in details],
+            [(p.week_number, str(p.planned_proportion), str(p.actual_proportion)) for p in progress],
+        )
+
+    def test_generator_is_deterministic_and_nests_bundles(self):
+        first = generate_project(self.owner, TINY, seed=3)
+        second = generate_project(self.owner, TINY, seed=3)
+        other = generate_project(self.owner, TINY, seed=4)
+
+        self.assertEqual(self._fingerprint(first), self._fingerprint(second))
+        self.assertNotEqual(self._fingerprint(first), self._fingerprint(other))
+        self.assertEqual(dataset_counts(first)["pekerjaan"], 12)
+        depth = DetailAHSPExpanded.objects.filter(project=first).order_by("-expansion_depth").first()
+        self.assertEqual(depth.expansion_depth, TINY.bundle_depth)
+
+    def test_suite_reports_time_and_queries_without_leaving_writes(self):
+        project = generate_project(self.owner, TINY)
+        results = run_suite(
+            project, self.owner, repeat=2,
+            only=["rekap.*", "progress.*", "deep_copy", "json.*", "export.rekap-rab.csv"],
+        )
+        by_name = {row["name"]: row for row in results}
+
+        self.assertEqual(
+            sorted(by_name),
+            ["deep_copy", "export.rekap-rab.csv", "json.export", "json.import",
+             "progress.weekly_save", "rekap.cold", "rekap.warm"],
+        )
+        self.assertFalse([row for row in results if "error" in row])
+        self.assertLess(by_name["rekap.warm"]["queries"], by_name["rekap.cold"]["queries"])
+        self.assertEqual(by_name["deep_copy"]["runs"], 2)
+        # Setiap run di-rollback: copy/import tidak menambah project
+        self.assertEqual(Project.objects.count(), 1)
+
+        rows = compare_results({"results": results}, {"results": [
+            dict(by_name["rekap.cold"], ms={"median": by_name["rekap.cold"]["ms"]["median"] * 2 + 1}),
+        ]})
+        self.assertTrue(rows[0]["regression"])
+
+    def test_command_writes_machine_readable_results(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "bench.json")
+            call_command(
+                "run_benchmarks", "--size", "S", "--repeat", "1", "--only", "kebutuhan.*",
+                "--output", output, stderr=StringIO(),
+            )
+            with open(output) as fh:
+                report = json.load(fh)
+
+        self.assertEqual(report["meta"]["size"]["name"], "S")
+        self.assertEqual(report["meta"]["dataset"]["pekerjaan"], 20)
+        self.assertEqual([r["name"] for r in report["results"]], ["kebutuhan.items", "kebutuhan.timeline"])
+        self.assertTrue(all("ms" in r for r in report["results"]))
+        self.assertFalse(Project.objects.exists())
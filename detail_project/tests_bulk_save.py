@@ -0,0 +1,151 @@
+import json
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from dashboard.models import Project
+from detail_project.models import (
+    DetailAHSPExpanded,
+    DetailAHSPProject,
+    HargaItemProject,
+    Klasifikasi,
+    Pekerjaan,
+    SubKlasifikasi,
+    VolumeFormulaState,
+    VolumePekerjaan,
+)
+from detail_project.views_api import (
+    api_save_harga_items,
+    api_save_volume_pekerjaan,
+    api_volume_formula_state,
+)
+
+
+class BulkSaveEndpointTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(
+            username="owner_bulk", email="bulk@example.com", password="Secret123!"
+        )
+        self.project = Project.objects.create(
+            owner=self.owner, nama="Bulk Project", sumber_dana="APBN",
+            lokasi_project="Jakarta", nama_client="Client", anggaran_owner=1000,
+        )
+        other_project = Project.objects.create(
+            owner=self.owner, nama="Other Project", sumber_dana="APBN",
+            lokasi_project="Jakarta", nama_client="Client", anggaran_owner=1000,
+        )
+        klas = Klasifikasi.objects.create(project=self.project, name="Klas", ordering_index=1)
+        sub = SubKlasifikasi.objects.create(project=self.project, klasifikasi=klas, name="Sub", ordering_index=1)
+        self.pekerjaan = [
+            Pekerjaan.objects.create(
+                project=self.project, sub_klasifikasi=sub, source_type="custom",
+                snapshot_uraian=f"Pekerjaan {idx}", snapshot_satuan="m3", ordering_index=idx,
+            )
+            for idx in range(1, 31)
+        ]
+        other_klas = Klasifikasi.objects.create(project=other_project, name="Klas", ordering_index=1)
+        other_sub = SubKlasifikasi.objects.create(
+            project=other_project, klasifikasi=other_klas, name="Sub", ordering_index=1
+        )
+        self.foreign = Pekerjaan.objects.create(
+            project=other_project, sub_klasifikasi=other_sub, source_type="custom",
+            snapshot_uraian="Asing", snapshot_satuan="m3", ordering_index=1,
+        )
+
+    def _post(self, view, payload):
+        request = self.factory.post("/api/", data=json.dumps(payload), content_type="application/json")
+        request.user = self.owner
+        response = view(request, self.project.id)
+        return response, json.loads(response.content)
+
+    def _count_queries(self, view, payload):
+        with CaptureQueriesContext(connection) as ctx:
+            response, body = self._post(view, payload)
+        queries = [q for q in ctx.captured_queries if not q["sql"].startswith("EXPLAIN")]
+        return response, body, len(queries)
+
+    def test_volume_save_query_count_does_not_grow_with_rows(self):
+        VolumePekerjaan.objects.create(project=self.project, pekerjaan=self.pekerjaan[0], quantity=Decimal("1"))
+        small = [{"pekerjaan_id": p.id, "quantity": "2"} for p in self.pekerjaan[:2]]
+        large = [{"pekerjaan_id": p.id, "quantity": "3.5"} for p in self.pekerjaan]
+
+        _, body, small_queries = self._count_queries(api_save_volume_pekerjaan, small)
+        self.assertEqual(body["saved"], 2)
+        _, body, large_queries = self._count_queries(api_save_volume_pekerjaan, large)
+        self.assertEqual(body["saved"], 30)
+        self.assertEqual(small_queries, large_queries)
+
+        self.assertEqual(VolumePekerjaan.objects.filter(project=self.project).count(), 30)
+        self.assertEqual(
+            set(VolumePekerjaan.objects.filter(project=self.project).values_list("quantity", flat=True)),
+            {Decimal("3.500")},
+        )
+
+    def test_volume_save_reports_row_errors(self):
+        response, body = self._post(api_save_volume_pekerjaan, {"items": [
+            {"pekerjaan_id": self.pekerjaan[0].id, "quantity": "5"},
+            {"pekerjaan_id": self.foreign.id, "quantity": "5"},
+            {"pekerjaan_id": self.pekerjaan[1].id, "quantity": "abc"},
+            {"quantity": "1"},
+        ]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body["saved"], 1)
+        self.assertEqual(
+            [e["path"] for e in body["errors"]],
+            ["items[1].pekerjaan_id", "items[2].quantity", "items[3].pekerjaan_id"],
+        )
+        self.assertFalse(VolumePekerjaan.objects.filter(pekerjaan=self.foreign).exists())
+
+    def test_formula_state_counts_created_and_updated(self):
+        VolumeFormulaState.objects.create(project=self.project, pekerjaan=self.pekerjaan[0], raw="=1+1")
+        response, body = self._post(api_volume_formula_state, {"items": [
+            {"pekerjaan_id": self.pekerjaan[0].id, "raw": "=2*3", "is_fx": True},
+            {"pekerjaan_id": self.pekerjaan[1].id, "raw": "12", "is_fx": False},
+            {"pekerjaan_id": self.pekerjaan[1].id, "raw": "13", "is_fx": False},
+            {"pekerjaan_id": self.foreign.id, "raw": "1"},
+        ]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((body["created"], body["updated"]), (1, 2))
+        self.assertEqual(len(body["errors"]), 1)
+        states = dict(VolumeFormulaState.objects.filter(project=self.project).values_list("pekerjaan_id", "raw"))
+        self.assertEqual(states, {self.pekerjaan[0].id: "=2*3", self.pekerjaan[1].id: "13"})
+
+    def test_harga_items_bulk_update_only_changed_rows(self):
+        items = []
+        for idx in range(3):
+            harga = HargaItemProject.objects.create(
+                project=self.project, kode_item=f"B.0{idx}", kategori="BHN",
+                uraian=f"Bahan {idx}", satuan="kg", harga_satuan=Decimal("1000"),
+            )
+            detail = DetailAHSPProject.objects.create(
+                project=self.project, pekerjaan=self.pekerjaan[0], harga_item=harga, kategori="BHN",
+                kode=harga.kode_item, uraian=harga.uraian, satuan="kg", koefisien=Decimal("1"),
+            )
+            DetailAHSPExpanded.objects.create(
+                project=self.project, pekerjaan=self.pekerjaan[0], source_detail=detail,
+                harga_item=harga, kategori="BHN", kode=harga.kode_item, uraian=harga.uraian,
+                satuan="kg", koefisien=Decimal("1"),
+            )
+            items.append(harga)
+        unused = HargaItemProject.objects.create(
+            project=self.project, kode_item="B.99", kategori="BHN", uraian="Tidak dipakai",
+        )
+
+        response, body = self._post(api_save_harga_items, {"items": [
+            {"id": items[0].id, "harga_satuan": "1500"},
+            {"id": items[1].id, "harga_satuan": "1000"},
+            {"id": items[2].id, "harga_satuan": "2500,5"},
+            {"id": unused.id, "harga_satuan": "10"},
+        ]})
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(body["updated"], 2)
+        prices = dict(HargaItemProject.objects.filter(project=self.project).values_list("kode_item", "harga_satuan"))
+        self.assertEqual(prices["B.00"], Decimal("1500.00"))
+        self.assertEqual(prices["B.01"], Decimal("1000.00"))
+        self.assertEqual(prices["B.02"], Decimal("2500.50"))
+        self.assertIsNone(prices["B.99"])
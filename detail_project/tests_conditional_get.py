@@ -0,0 +1,95 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.http import Http404
+from django.test import RequestFactory, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from dashboard.models import Project
+from detail_project.models import Klasifikasi, Pekerjaan, SubKlasifikasi, TahapPelaksanaan, VolumePekerjaan
+from detail_project.progress_utils import reset_project_progress
+from detail_project.services import get_project_data_version
+from detail_project.views_api import (
+    api_get_change_status,
+    api_get_list_pekerjaan_tree,
+    api_get_rekap_rab,
+)
+
+
+class ProjectEtagTests(TransactionTestCase):
+    """Data version bumps run on commit, which TestCase never reaches."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(
+            username="owner_etag", email="etag@example.com", password="Secret123!"
+        )
+        self.other = user_model.objects.create_user(
+            username="other_etag", email="other-etag@example.com", password="Secret123!"
+        )
+        self.project = Project.objects.create(
+            owner=self.owner, nama="ETag Project", sumber_dana="APBN",
+            lokasi_project="Jakarta", nama_client="Client", anggaran_owner=1000,
+        )
+        klas = Klasifikasi.objects.create(project=self.project, name="Klas", ordering_index=1)
+        sub = SubKlasifikasi.objects.create(project=self.project, klasifikasi=klas, name="Sub", ordering_index=1)
+        pekerjaan = Pekerjaan.objects.create(
+            project=self.project, sub_klasifikasi=sub, source_type="custom",
+            snapshot_uraian="Galian", snapshot_satuan="m3", ordering_index=1,
+        )
+        self.volume = VolumePekerjaan.objects.create(
+            project=self.project, pekerjaan=pekerjaan, quantity=Decimal("10")
+        )
+
+    def _get(self, view, user=None, query="", etag=None):
+        headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+        request = self.factory.get(f"/api/?{query}", **headers)
+        request.user = user or self.owner
+        return view(request, self.project.id)
+
+    def test_unchanged_project_returns_304_without_running_view(self):
+        first = self._get(api_get_rekap_rab)
+        self.assertEqual(first.status_code, 200)
+        etag = first["ETag"]
+        self.assertTrue(etag.startswith('"'))
+
+        with CaptureQueriesContext(connection) as ctx:
+            second = self._get(api_get_rekap_rab, etag=etag)
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second["ETag"], etag)
+        queries = [q for q in ctx.captured_queries if not q["sql"].startswith("EXPLAIN")]
+        self.assertEqual(len(queries), 1)  # ownership check only
+
+        self.volume.quantity = Decimal("20")
+        self.volume.save()
+        third = self._get(api_get_rekap_rab, etag=etag)
+        self.assertEqual(third.status_code, 200)
+        self.assertNotEqual(third["ETag"], etag)
+
+    def test_etag_varies_by_endpoint_and_query(self):
+        tree = self._get(api_get_list_pekerjaan_tree)["ETag"]
+        status = self._get(api_get_change_status)["ETag"]
+        filtered = self._get(api_get_change_status, query="since_ahsp=2025-01-01T00:00:00")["ETag"]
+        self.assertEqual(len({tree, status, filtered}), 3)
+
+    def test_non_owner_never_gets_304(self):
+        etag = self._get(api_get_list_pekerjaan_tree)["ETag"]
+        with self.assertRaises(Http404):
+            self._get(api_get_list_pekerjaan_tree, user=self.other, etag=etag)
+
+    def test_bulk_created_tahapan_bump_data_version(self):
+        self.project.tanggal_mulai = date(2025, 1, 6)
+        self.project.tanggal_selesai = date(2025, 2, 2)
+        self.project.save()
+        TahapPelaksanaan.objects.filter(project=self.project).delete()
+        etag = self._get(api_get_list_pekerjaan_tree)["ETag"]
+        before = get_project_data_version(self.project)
+
+        result = reset_project_progress(self.project)
+
+        self.assertGreater(result["tahapan_created"], 0)
+        self.assertGreater(get_project_data_version(self.project), before)
+        self.assertEqual(self._get(api_get_list_pekerjaan_tree, etag=etag).status_code, 200)
@@ -0,0 +1,123 @@
+import os
+import shutil
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.test import TransactionTestCase, override_settings
+
+from dashboard.models import Project
+from detail_project.exports.artifact_cache import ExportArtifactCache
+from detail_project.exports.export_manager import ExportManager
+from detail_project.models import Klasifikasi, Pekerjaan, SubKlasifikasi, VolumePekerjaan
+from detail_project.tasks import cleanup_old_exports
+
+
+class ExportArtifactCacheTests(TransactionTestCase):
+    """Data version bumps run on commit, which TestCase never reaches."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp(prefix="export-cache-tests-")
+        self.cache_dir = os.path.join(self.media_root, "exports", "cache")
+        settings_override = override_settings(
+            MEDIA_ROOT=self.media_root,
+            EXPORT_ARTIFACT_CACHE_ENABLED=True,
+            EXPORT_ARTIFACT_CACHE_DIR=self.cache_dir,
+            EXPORT_ARTIFACT_CACHE_MAX_BYTES=50 * 1024 * 1024,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.owner = get_user_model().objects.create_user(
+            username="owner_export_cache", email="cache@example.com", password="Secret123!"
+        )
+        self.project = Project.objects.create(
+            owner=self.owner, nama="Cache Project", sumber_dana="APBN",
+            lokasi_project="Jakarta", nama_client="Client", anggaran_owner=1000,
+        )
+        klas = Klasifikasi.objects.create(project=self.project, name="Klas", ordering_index=1)
+        sub = SubKlasifikasi.objects.create(project=self.project, klasifikasi=klas, name="Sub", ordering_index=1)
+        self.pekerjaan = Pekerjaan.objects.create(
+            project=self.project, sub_klasifikasi=sub, source_type="custom",
+            snapshot_uraian="Galian", snapshot_satuan="m3", ordering_index=1,
+        )
+        self.volume = VolumePekerjaan.objects.create(
+            project=self.project, pekerjaan=self.pekerjaan, quantity=Decimal("10")
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_second_export_is_served_from_cache_until_data_changes(self):
+        first = ExportManager(self.project, self.owner).export_rekap_rab("xlsx")
+        self.assertEqual(first["X-Export-Cache"], "MISS")
+
+        second = ExportManager(self.project, self.owner).export_rekap_rab("xlsx")
+        self.assertEqual(second["X-Export-Cache"], "HIT")
+        self.assertEqual(b"".join(second.streaming_content), first.content)
+        self.assertIn("attachment;", second["Content-Disposition"])
+
+        # Watermarked and other-format exports are separate artifacts
+        watermarked = ExportManager(self.project, self.owner).export(
+            "rekap-rab", "xlsx", {"add_watermark": True, "watermark_text": "DEMO"}
+        )
+        self.assertEqual(watermarked["X-Export-Cache"], "MISS")
+        clean = ExportManager(self.project, self.owner).export("rekap-rab", "xlsx", {})
+        self.assertEqual(clean["X-Export-Cache"], "HIT")
+
+        self.volume.quantity = Decimal("20")
+        self.volume.save()
+        third = ExportManager(self.project, self.owner).export_rekap_rab("xlsx")
+        self.assertEqual(third["X-Export-Cache"], "MISS")
+
+    def test_lru_eviction_by_total_size(self):
+        store = ExportArtifactCache(root=self.cache_dir, max_bytes=250)
+        for key in ("aa01", "bb02"):
+            store.put(key, b"x" * 100, f"{key}.pdf", "application/pdf")
+            time.sleep(0.01)
+        # Touch the older entry so the newer one becomes least recently used
+        self.assertIsNotNone(store.get("aa01"))
+        store.put("cc03", b"x" * 100, "cc03.pdf", "application/pdf")
+
+        self.assertIsNotNone(store.get("aa01"))
+        self.assertIsNone(store.get("bb02"))
+        self.assertIsNotNone(store.get("cc03"))
+        self.assertEqual(store.stats()["total_bytes"], 200)
+
+    def test_cleanup_task_leaves_cache_to_lru(self):
+        store = ExportArtifactCache(root=self.cache_dir)
+        artifact = store.put("dd04", b"pdf-bytes", "dd04.pdf", "application/pdf")
+        async_file = Path(self.media_root, "exports", "async", "old.pdf")
+        async_file.parent.mkdir(parents=True)
+        async_file.write_bytes(b"old")
+        day_ago = time.time() - 2 * 24 * 3600
+        for path in (artifact.path, async_file):
+            os.utime(path, (day_ago, day_ago))
+
+        result = cleanup_old_exports()
+        self.assertEqual(result["deleted_count"], 1)
+        self.assertFalse(async_file.exists())
+        self.assertTrue(artifact.path.exists())  # younger than EXPORT_ARTIFACT_CACHE_MAX_AGE
+
+        with override_settings(EXPORT_ARTIFACT_CACHE_MAX_AGE=3600):
+            result = cleanup_old_exports()
+        self.assertEqual(result["artifact_cache"]["deleted_count"], 1)
+        self.assertIsNone(store.get("dd04"))
+
+    def test_data_version_is_shared_through_the_database(self):
+        from django.core.cache import cache
+        from detail_project.services import get_project_data_version
+
+        before = get_project_data_version(self.project)
+        ExportManager(self.project, self.owner).export_rekap_rab("xlsx")
+
+        # Another process (Celery worker with its own locmem cache) sees the
+        # same version as the web process that made the edit
+        self.volume.quantity = Decimal("30")
+        self.volume.save()
+        cache.clear()
+        self.assertGreater(get_project_data_version(self.project), before)
+        response = ExportManager(self.project, self.owner).export_rekap_rab("xlsx")
+        self.assertEqual(response["X-Export-Cache"], "MISS")
@@ -0,0 +1,161 @@
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from dashboard.models import Project
+from detail_project.exports.export_manager import ExportManager
+from detail_project.models import Klasifikasi, Pekerjaan, SubKlasifikasi, VolumePekerjaan
+from detail_project.models_export import ExportSession
+from detail_project.tasks import cleanup_old_exports
+from detail_project.views_export import (
+    api_export_download_async,
+    api_export_status_async,
+    api_start_export_async,
+)
+
+
+class AsyncExportPipelineTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp(prefix="export-async-tests-")
+        settings_override = override_settings(MEDIA_ROOT=self.media_root, EXPORT_ASYNC_RETENTION_HOURS=24)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.factory = RequestFactory()
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(
+            username="owner_export_async", email="async@example.com", password="Secret123!"
+        )
+        self.other = user_model.objects.create_user(
+            username="other_export_async", email="other-async@example.com", password="Secret123!"
+        )
+        for user in (self.owner, self.other):
+            user.subscription_status = user.SubscriptionStatus.PRO
+            user.subscription_end_date = timezone.now() + timedelta(days=30)
+            user.save(update_fields=["subscription_status", "subscription_end_date"])
+
+        self.project = Project.objects.create(
+            owner=self.owner, nama="Async Project", sumber_dana="APBN",
+            lokasi_project="Jakarta", nama_client="Client", anggaran_owner=1000,
+        )
+        klas = Klasifikasi.objects.create(project=self.project, name="Klas", ordering_index=1)
+        sub = SubKlasifikasi.objects.create(project=self.project, klasifikasi=klas, name="Sub", ordering_index=1)
+        pekerjaan = Pekerjaan.objects.create(
+            project=self.project, sub_klasifikasi=sub, source_type="custom",
+            snapshot_uraian="Galian", snapshot_satuan="m3", ordering_index=1,
+        )
+        VolumePekerjaan.objects.create(project=self.project, pekerjaan=pekerjaan, quantity=Decimal("10"))
+
+    def tearDown(self):
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def _start(self, export_type, format_type, options=None):
+        request = self.factory.post(
+            f"/detail_project/api/project/{self.project.id}/export-async/",
+            data=json.dumps({"export_type": export_type, "format": format_type, "options": options or {}}),
+            content_type="application/json",
+        )
+        request.user = self.owner
+        return api_start_export_async(request, self.project.id)
+
+    def _get(self, view, task_id, user):
+        request = self.factory.get("/")
+        request.user = user
+        return view(request, task_id)
+
+    def test_xlsx_export_is_retained_on_session(self):
+        response = self._start("rekap-rab", "xlsx")
+        self.assertEqual(response.status_code, 202)
+        payload = json.loads(response.content)
+        task_id = payload["task_id"]
+
+        session = ExportSession.objects.get(export_id=payload["session_id"])
+        self.assertEqual(session.task_id, task_id)
+        self.assertEqual(session.status, ExportSession.STATUS_COMPLETED)
+        self.assertEqual(session.progress, 100)
+        self.assertEqual(session.report_type, ExportSession.REPORT_STANDARD)
+        self.assertGreater(session.expires_at, timezone.now() + timedelta(hours=23))
+
+        status = json.loads(self._get(api_export_status_async, task_id, self.owner).content)
+        self.assertEqual(status["status"], "SUCCESS")
+        self.assertEqual(status["result"]["format"], "xlsx")
+
+        download = self._get(api_export_download_async, task_id, self.owner)
+        self.assertEqual(download.status_code, 200)
+        self.assertIn(".xlsx", download["Content-Disposition"])
+        self.assertEqual(len(b"".join(download.streaming_content)), session.file_size)
+
+        self.assertEqual(self._get(api_export_status_async, task_id, self.other).status_code, 404)
+
+    def test_csv_and_professional_reports_run_async(self):
+        csv_payload = json.loads(self._start("volume-pekerjaan", "csv").content)
+        csv_session = ExportSession.objects.get(export_id=csv_payload["session_id"])
+        self.assertEqual(csv_session.status, ExportSession.STATUS_COMPLETED)
+        self.assertTrue(csv_session.output_file.read().startswith("﻿".encode("utf-8")))
+
+        monthly = json.loads(
+            self._start("jadwal-professional", "xlsx", {"report_type": "monthly", "period": 1}).content
+        )
+        session = ExportSession.objects.get(export_id=monthly["session_id"])
+        self.assertEqual(session.report_type, ExportSession.REPORT_MONTHLY)
+        self.assertEqual(session.status, ExportSession.STATUS_COMPLETED, session.error_message)
+
+    def test_jadwal_page_payload_runs_async(self):
+        # Payload persis seperti yang dikirim jadwal_kegiatan_app.js / weekly-report.js
+        payload = {
+            "report_type": "weekly", "format": "xlsx", "period": None, "months": None,
+            "weeks": [1, 2], "chart_mode": "server", "attachments": [], "gantt_data": None,
+        }
+        started = json.loads(self._start("jadwal-professional", "xlsx", payload).content)
+        session = ExportSession.objects.get(export_id=started["session_id"])
+        self.assertEqual(session.report_type, ExportSession.REPORT_WEEKLY)
+        self.assertEqual(session.status, ExportSession.STATUS_COMPLETED, session.error_message)
+
+        src = os.path.join(os.path.dirname(__file__), "static", "detail_project", "js", "src")
+        for name in (
+            "jadwal_kegiatan_app.js",
+            "export/reports/rekap-report.js",
+            "export/reports/monthly-report.js",
+            "export/reports/weekly-report.js",
+        ):
+            with open(os.path.join(src, name), encoding="utf-8") as fh:
+                source = fh.read()
+            self.assertNotIn("export/jadwal-pekerjaan/professional/", source, name)
+            self.assertIn("runAsyncExport", source, name)
+
+    def test_exporters_report_progress(self):
+        calls = []
+        ExportManager(
+            self.project, self.owner, progress_callback=lambda *args: calls.append(args)
+        ).export("rekap-rab", "pdf")
+        self.assertTrue(calls)
+        self.assertTrue(all(current <= total for current, total, _ in calls))
+        self.assertEqual(calls[-1][2], "Merender PDF")
+
+    def test_cleanup_expires_session_files(self):
+        payload = json.loads(self._start("harga-items", "xlsx").content)
+        session = ExportSession.objects.get(export_id=payload["session_id"])
+        file_path = session.output_file.path
+
+        cleanup_old_exports()
+        session.refresh_from_db()
+        self.assertEqual(session.status, ExportSession.STATUS_COMPLETED)
+        self.assertTrue(os.path.exists(file_path))
+
+        ExportSession.objects.filter(pk=session.pk).update(expires_at=timezone.now() - timedelta(minutes=1))
+        result = cleanup_old_exports()
+        self.assertEqual(result["expired_sessions"], 1)
+        session.refresh_from_db()
+        self.assertEqual(session.status, ExportSession.STATUS_EXPIRED)
+        self.assertFalse(session.output_file)
+        self.assertFalse(os.path.exists(file_path))
+
+        download = self._get(api_export_download_async, payload["task_id"], self.owner)
+        self.assertEqual(download.status_code, 410)
@@ -0,0 +1,91 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from dashboard.models import Project
+from detail_project.exports.jadwal_pekerjaan_adapter import JadwalPekerjaanExportAdapter
+from detail_project.exports.project_tree import load_project_tree
+from detail_project.exports.rekap_rab_adapter import RekapRABAdapter
+from detail_project.exports.rincian_ahsp_adapter import RincianAHSPAdapter
+from detail_project.exports.volume_pekerjaan_adapter import VolumePekerjaanAdapter
+from detail_project.models import Klasifikasi, Pekerjaan, SubKlasifikasi, VolumePekerjaan
+
+
+def _count_queries(func):
+    with CaptureQueriesContext(connection) as ctx:
+        result = func()
+    # The test SQL trace hook adds EXPLAIN statements; they are not app queries
+    return len([q for q in ctx.captured_queries if not q["sql"].startswith("EXPLAIN")]), result
+
+
+class ProjectTreeLoaderTests(TestCase):
+    def setUp(self):
+        self.owner = get_user_model().objects.create_user(
+            username="owner_export_tree", email="tree@example.com", password="Secret123!"
+        )
+
+    def _make_project(self, name, klas_count, sub_count, pek_count):
+        project = Project.objects.create(
+            owner=self.owner, nama=name, sumber_dana="APBN",
+            lokasi_project="Jakarta", nama_client="Client", anggaran_owner=1000,
+        )
+        order = 0
+        for k in range(klas_count):
+            klas = Klasifikasi.objects.create(project=project, name=f"Klas {k}", ordering_index=klas_count - k)
+            for s in range(sub_count):
+                sub = SubKlasifikasi.objects.create(
+                    project=project, klasifikasi=klas, name=f"Sub {k}.{s}", ordering_index=s
+                )
+                for p in range(pek_count):
+                    order += 1
+                    pek = Pekerjaan.objects.create(
+                        project=project, sub_klasifikasi=sub, source_type="custom",
+                        snapshot_uraian=f"Pekerjaan {k}.{s}.{p}", snapshot_satuan="m3",
+                        ordering_index=order,
+                    )
+                    if p % 2 == 0:
+                        VolumePekerjaan.objects.create(project=project, pekerjaan=pek, quantity=Decimal("2.5"))
+        return project
+
+    def test_tree_is_grouped_and_ordered(self):
+        project = self._make_project("Tree", 2, 2, 2)
+        count, tree = _count_queries(lambda: load_project_tree(project))
+        self.assertEqual(count, 5)
+
+        with self.assertNumQueries(0):
+            self.assertEqual([k.name for k in tree.klasifikasi], ["Klas 1", "Klas 0"])
+            subs = tree.subs_of(tree.klasifikasi[0])
+            self.assertEqual([s.name for s in subs], ["Sub 1.0", "Sub 1.1"])
+            self.assertEqual(len(list(tree.iter_pekerjaan())), 8)
+            first = tree.pekerjaan_of(subs[0])[0]
+            self.assertEqual(tree.volume(first.id), Decimal("2.5"))
+
+    def test_adapter_query_count_does_not_grow_with_tree(self):
+        small = self._make_project("Small", 1, 1, 1)
+        large = self._make_project("Large", 4, 3, 3)
+
+        def export_counts(project):
+            return [
+                _count_queries(lambda: RekapRABAdapter(project).get_export_data())[0],
+                _count_queries(lambda: RincianAHSPAdapter(project).get_export_data())[0],
+                _count_queries(lambda: VolumePekerjaanAdapter(project).get_export_data())[0],
+                _count_queries(
+                    lambda: JadwalPekerjaanExportAdapter(project).get_monthly_comparison_data(1)
+                )[0],
+            ]
+
+        self.assertEqual(export_counts(small), export_counts(large))
+
+    def test_shared_tree_is_not_reloaded(self):
+        project = self._make_project("Shared", 2, 2, 2)
+        tree = load_project_tree(project)
+        tree.rekap_map  # compute once
+
+        adapter = JadwalPekerjaanExportAdapter(project, tree=tree)
+        count, _ = _count_queries(adapter._build_base_rows)
+        self.assertEqual(count, 0)
+        rows, _ = adapter._build_base_rows()
+        self.assertEqual(len([r for r in rows if r["type"] == "pekerjaan"]), 8)
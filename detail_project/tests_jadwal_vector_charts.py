@@ -0,0 +1,80 @@
+import base64
+import io
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from PIL import Image as PILImage
+
+from dashboard.models import Project
+from detail_project.exports.export_manager import ExportManager
+from detail_project.exports.jadwal_pekerjaan_adapter import JadwalPekerjaanExportAdapter
+from detail_project.models import (
+    Klasifikasi,
+    Pekerjaan,
+    PekerjaanProgressWeekly,
+    SubKlasifikasi,
+    VolumePekerjaan,
+)
+
+
+class JadwalVectorChartTests(TestCase):
+    def setUp(self):
+        owner = get_user_model().objects.create_user(
+            username="owner_vector_charts", email="vector@example.com", password="Secret123!"
+        )
+        self.project = Project.objects.create(
+            owner=owner, nama="Vector Project", sumber_dana="APBN",
+            lokasi_project="Jakarta", nama_client="Client", anggaran_owner=1000,
+            tanggal_mulai=date(2025, 1, 6),
+        )
+        klas = Klasifikasi.objects.create(project=self.project, name="Klas", ordering_index=1)
+        sub = SubKlasifikasi.objects.create(project=self.project, klasifikasi=klas, name="Sub", ordering_index=1)
+        self.pekerjaan = Pekerjaan.objects.create(
+            project=self.project, sub_klasifikasi=sub, source_type="custom",
+            snapshot_uraian="Galian", snapshot_satuan="m3", ordering_index=1,
+        )
+        VolumePekerjaan.objects.create(project=self.project, pekerjaan=self.pekerjaan, quantity=Decimal("10"))
+        start = date(2025, 1, 6)
+        for week, planned, actual in ((1, "40", "30"), (2, "60", "20")):
+            week_start = start + timedelta(weeks=week - 1)
+            PekerjaanProgressWeekly.objects.create(
+                pekerjaan=self.pekerjaan, project=self.project, week_number=week,
+                week_start_date=week_start, week_end_date=week_start + timedelta(days=6),
+                planned_proportion=Decimal(planned), actual_proportion=Decimal(actual),
+            )
+        self.manager = ExportManager(self.project, owner)
+
+    def test_adapter_builds_gantt_data(self):
+        gantt = JadwalPekerjaanExportAdapter(self.project).get_gantt_data()
+        self.assertEqual([row["type"] for row in gantt["rows"]], ["klasifikasi", "sub_klasifikasi", "pekerjaan"])
+        self.assertEqual(gantt["rows"][2]["id"], self.pekerjaan.id)
+        self.assertEqual(gantt["planned"][str(self.pekerjaan.id)], {1: 40.0, 2: 60.0})
+        self.assertEqual(gantt["actual"][str(self.pekerjaan.id)], {1: 30.0, 2: 20.0})
+        self.assertGreaterEqual(len(gantt["time_columns"]), 2)
+
+    def test_server_mode_ignores_uploaded_chart_images(self):
+        buffer = io.BytesIO()
+        PILImage.new("RGB", (400, 300), "white").save(buffer, format="PNG")
+        attachments = [{"title": "Gantt Chart Planned - W1", "bytes": buffer.getvalue()}]
+
+        server = self.manager.export_jadwal_professional("pdf", "rekap", attachments=attachments)
+        client = self.manager.export_jadwal_professional(
+            "pdf", "rekap", attachments=attachments, chart_mode="client"
+        )
+        self.assertTrue(server.content.startswith(b"%PDF"))
+        self.assertNotIn(b"/Subtype /Image", server.content)
+        self.assertIn(b"/Subtype /Image", client.content)
+
+    def test_monthly_report_renders_headless(self):
+        response = self.manager.export("jadwal-professional", "pdf", {"report_type": "monthly", "period": 1})
+        self.assertTrue(response.content.startswith(b"%PDF"))
+        self.assertNotIn(b"/Subtype /Image", response.content)
+
+    def test_async_options_accept_base64_only_in_client_mode(self):
+        png = io.BytesIO()
+        PILImage.new("RGB", (10, 10), "white").save(png, format="PNG")
+        options = {"attachments": [{"title": "Gantt", "bytes": base64.b64encode(png.getvalue()).decode()}]}
+        response = self.manager.export("jadwal-professional", "pdf", options)
+        self.assertNotIn(b"/Subtype /Image", response.content)
@@ -0,0 +1,148 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from dashboard.models import Project
+from detail_project.models import (
+    Klasifikasi,
+    Pekerjaan,
+    PekerjaanProgressWeekly,
+    ProjectProgressSummary,
+    SubKlasifikasi,
+)
+from detail_project import progress_utils
+from detail_project.progress_utils import get_progress_summaries
+
+
+class ProjectProgressSummaryTests(TransactionTestCase):
+    # on_commit callbacks must really fire to mark the rollup stale
+    def setUp(self):
+        self.owner = owner = get_user_model().objects.create_user(
+            username="owner_progress_summary",
+            email="owner-progress-summary@example.com",
+            password="Secret123!",
+        )
+        self.project = Project.objects.create(
+            owner=owner,
+            nama="Project Rollup",
+            sumber_dana="APBN",
+            lokasi_project="Jakarta",
+            nama_client="Client A",
+            anggaran_owner=1000,
+            tanggal_mulai=date(2025, 1, 6),
+        )
+        klas = Klasifikasi.objects.create(project=self.project, name="Klas", ordering_index=1)
+        sub = SubKlasifikasi.objects.create(
+            project=self.project, klasifikasi=klas, name="Sub", ordering_index=1
+        )
+        self.pkj_big = Pekerjaan.objects.create(
+            project=self.project, sub_klasifikasi=sub, source_type="custom",
+            snapshot_uraian="Besar", ordering_index=1, budgeted_cost=Decimal("300"),
+        )
+        self.pkj_small = Pekerjaan.objects.create(
+            project=self.project, sub_klasifikasi=sub, source_type="custom",
+            snapshot_uraian="Kecil", ordering_index=2, budgeted_cost=Decimal("100"),
+        )
+
+    def _progress(self, pekerjaan, week, planned, actual):
+        start = self.project.tanggal_mulai + timedelta(weeks=week - 1)
+        return PekerjaanProgressWeekly.objects.create(
+            pekerjaan=pekerjaan, project=self.project, week_number=week,
+            week_start_date=start, week_end_date=start + timedelta(days=6),
+            planned_proportion=Decimal(planned), actual_proportion=Decimal(actual),
+        )
+
+    def test_rollup_is_cost_weighted_and_cached_until_inputs_change(self):
+        self._progress(self.pkj_big, 1, "50", "40")
+        self._progress(self.pkj_small, 2, "100", "0")
+
+        summary = get_progress_summaries([self.project])[self.project.id]
+        self.assertEqual(summary.total_cost, Decimal("400.00"))
+        self.assertEqual(summary.planned_percent, Decimal("62.5000"))
+        self.assertEqual(summary.actual_percent, Decimal("30.0000"))
+        self.assertEqual(summary.weighted_realization, Decimal("120.00"))
+        self.assertEqual(summary.last_progress_week, 1)
+
+        # Fresh rollup is served with a single query
+        with CaptureQueriesContext(connection) as ctx:
+            get_progress_summaries([self.project])
+        selects = [q for q in ctx.captured_queries if not q['sql'].startswith('EXPLAIN')]
+        self.assertEqual(len(selects), 1)
+
+        self._progress(self.pkj_small, 3, "0", "50")
+        self.assertTrue(
+            ProjectProgressSummary.objects.get(project=self.project).is_stale
+        )
+
+        summary = get_progress_summaries([self.project])[self.project.id]
+        self.assertEqual(summary.actual_percent, Decimal("42.5000"))
+        self.assertEqual(summary.last_progress_week, 3)
+        self.assertFalse(
+            ProjectProgressSummary.objects.get(project=self.project).is_stale
+        )
+
+    def test_stale_mark_during_refresh_is_not_overwritten(self):
+        self._progress(self.pkj_big, 1, "50", "40")
+        compute = progress_utils._compute_progress_summary_values
+
+        def compute_then_concurrent_write(projects):
+            values = compute(projects)
+            # Writer commits after the reader read its inputs
+            self._progress(self.pkj_small, 2, "0", "100")
+            return values
+
+        with mock.patch.object(
+            progress_utils, "_compute_progress_summary_values", side_effect=compute_then_concurrent_write
+        ):
+            summary = get_progress_summaries([self.project])[self.project.id]
+        self.assertEqual(summary.actual_percent, Decimal("30.0000"))
+
+        stored = ProjectProgressSummary.objects.get(project=self.project)
+        self.assertTrue(stored.is_stale)
+        self.assertEqual(
+            get_progress_summaries([self.project])[self.project.id].actual_percent, Decimal("55.0000")
+        )
+        self.assertFalse(ProjectProgressSummary.objects.get(project=self.project).is_stale)
+
+    def test_dashboard_falls_back_to_stored_rollup_when_refresh_fails(self):
+        self._progress(self.pkj_big, 1, "50", "40")
+        get_progress_summaries([self.project])
+        self._progress(self.pkj_small, 2, "0", "50")
+
+        self.client.force_login(self.owner)
+        with mock.patch.object(
+            progress_utils, "_compute_progress_summary_values", side_effect=RuntimeError("boom")
+        ), self.assertLogs("dashboard.views", level="ERROR"):
+            response = self.client.get(reverse("dashboard:dashboard"))
+        project = response.context["page_obj"].object_list[0]
+        self.assertEqual(project.progress_realisasi, 30.0)
+
+    def test_rekap_invalidation_marks_rollup_stale(self):
+        # queryset.update() paths (markup override) only call invalidate_rekap_cache
+        from detail_project.services import invalidate_rekap_cache
+
+        get_progress_summaries([self.project])
+        Pekerjaan.objects.filter(pk=self.pkj_big.pk).update(markup_override_percent=Decimal("15"))
+        invalidate_rekap_cache(self.project)
+        self.assertTrue(ProjectProgressSummary.objects.get(project=self.project).is_stale)
+
+    def test_refresh_saves_all_projects_with_one_update(self):
+        other = Project.objects.create(
+            owner=self.owner, nama="Project Lain", sumber_dana="APBN",
+            lokasi_project="Bandung", nama_client="Client B", anggaran_owner=1000,
+            tanggal_mulai=date(2025, 1, 6),
+        )
+        self._progress(self.pkj_big, 1, "50", "40")
+
+        with CaptureQueriesContext(connection) as ctx:
+            summaries = progress_utils.refresh_progress_summaries([self.project, other])
+        updates = [q for q in ctx.captured_queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(set(summaries), {self.project.id, other.id})
+        self.assertFalse(ProjectProgressSummary.objects.filter(is_stale=True).exists())
@@ -0,0 +1,142 @@
+import json
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.urls import reverse
+
+from config.query_budget import QueryBudgetExceeded, fingerprint, query_budget
+from dashboard.models import Project
+from detail_project.exports.harga_items_adapter import HargaItemsAdapter
+from detail_project.exports.jadwal_pekerjaan_adapter import JadwalPekerjaanExportAdapter
+from detail_project.exports.rekap_kebutuhan_adapter import RekapKebutuhanAdapter
+from detail_project.exports.rekap_rab_adapter import RekapRABAdapter
+from detail_project.exports.rincian_ahsp_adapter import RincianAHSPAdapter
+from detail_project.exports.volume_pekerjaan_adapter import VolumePekerjaanAdapter
+from detail_project.models import Klasifikasi, Pekerjaan, SubKlasifikasi, VolumePekerjaan
+from detail_project.views_api_tahapan_v2 import api_assign_pekerjaan_weekly
+
+
+class FingerprintTests(SimpleTestCase):
+    def test_values_and_lists_are_normalized(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM "t" WHERE "id" = %s AND "kode" = \'A.1\''),
+            'SELECT * FROM "t" WHERE "id" = ? AND "kode" = ?',
+        )
+        self.assertEqual(
+            fingerprint('SELECT 1 FROM "t2" WHERE "id" IN (%s, %s, %s)'),
+            fingerprint('SELECT 7 FROM "t2" WHERE "id" IN (%s)'),
+        )
+        self.assertEqual(
+            fingerprint('INSERT INTO "t" ("a") VALUES (%s), (%s), (%s) /* bulk */'),
+            'INSERT INTO "t" ("a") VALUES (?), ...',
+        )
+
+
+class QueryBudgetTests(TestCase):
+    def setUp(self):
+        self.owner = get_user_model().objects.create_user(
+            username="owner_budget", email="budget@example.com", password="Secret123!"
+        )
+        self.project = Project.objects.create(
+            owner=self.owner, nama="Budget", sumber_dana="APBN",
+            lokasi_project="Jakarta", nama_client="Client", anggaran_owner=1000,
+        )
+        klas = Klasifikasi.objects.create(project=self.project, name="K")
+        sub = SubKlasifikasi.objects.create(project=self.project, klasifikasi=klas, name="S")
+        self.ids = [
+            Pekerjaan.objects.create(
+                project=self.project, sub_klasifikasi=sub, source_type="custom",
+                snapshot_uraian=f"P{i}", ordering_index=i,
+            ).id
+            for i in range(4)
+        ]
+
+    def test_repeated_fingerprint_fails_the_budget(self):
+        with self.assertRaises(QueryBudgetExceeded) as ctx:
+            with query_budget(max_repeats=2, label="per-row get"):
+                for pk in self.ids:
+                    Pekerjaan.objects.get(id=pk)
+        recorder = ctx.exception.recorder
+        self.assertEqual(recorder.total, 4)
+        self.assertEqual(len(recorder.counts), 1)
+        self.assertIn("repeated 4x > 2", str(ctx.exception))
+
+        with query_budget(1, max_repeats=1) as recorder:
+            list(Pekerjaan.objects.filter(id__in=self.ids))
+        self.assertEqual(recorder.total, 1)
+
+    def test_decorator_enforces_total_and_only_warns_when_not_strict(self):
+        @query_budget(2)
+        def load():
+            return [Pekerjaan.objects.filter(id=pk).exists() for pk in self.ids[:3]]
+
+        with self.assertRaisesMessage(QueryBudgetExceeded, "3 queries > budget 2"):
+            load()
+
+        with self.assertLogs("query_budget", "WARNING"):
+            with query_budget(0, strict=False):
+                Pekerjaan.objects.count()
+
+    def test_command_prints_repeated_fingerprints_for_url(self):
+        url = reverse("detail_project:api_get_rekap_rab", args=[self.project.id])
+        out = StringIO()
+        call_command("query_fingerprints", url, "--user", "owner_budget", "--min-repeats", "1", stdout=out)
+        self.assertIn("-> 200", out.getvalue())
+        self.assertIn("SELECT", out.getvalue())
+
+        with self.assertRaisesMessage(CommandError, "Query budget terlampaui"):
+            call_command("query_fingerprints", url, "--user", "owner_budget", "--budget", "1", stdout=StringIO())
+
+
+class HotPathBudgetTests(TestCase):
+    """Budget jalur panas, diukur pada kode saat ini; naik = regresi N+1."""
+
+    # api_assign_pekerjaan_weekly: query tetap + query per assignment
+    ASSIGN_FIXED = 7
+    ASSIGN_PER_ITEM = 7
+
+    def _project(self, pekerjaan_count):
+        owner = get_user_model().objects.create_user(
+            username=f"owner_hot_{pekerjaan_count}", email=f"hot{pekerjaan_count}@example.com",
+            password="Secret123!",
+        )
+        project = Project.objects.create(
+            owner=owner, nama="Hot", sumber_dana="APBN", lokasi_project="Jakarta",
+            nama_client="Client", anggaran_owner=1000,
+            tanggal_mulai=date(2025, 1, 6), tanggal_selesai=date(2025, 3, 2),
+        )
+        klas = Klasifikasi.objects.create(project=project, name="K", ordering_index=1)
+        sub = SubKlasifikasi.objects.create(project=project, klasifikasi=klas, name="S", ordering_index=1)
+        for i in range(pekerjaan_count):
+            pekerjaan = Pekerjaan.objects.create(
+                project=project, sub_klasifikasi=sub, source_type="custom",
+                snapshot_uraian=f"P{i}", snapshot_satuan="m3", ordering_index=i,
+            )
+            VolumePekerjaan.objects.create(project=project, pekerjaan=pekerjaan, quantity=10)
+        return owner, project
+
+    def test_export_adapters_stay_within_budget_as_project_grows(self):
+        # Budget terpasang sebagai decorator di get_export_data (strict di settings test)
+        for size in (2, 12):
+            _, project = self._project(size)
+            RekapRABAdapter(project).get_export_data()
+            VolumePekerjaanAdapter(project).get_export_data()
+            HargaItemsAdapter(project).get_export_data()
+            RincianAHSPAdapter(project).get_export_data()
+            JadwalPekerjaanExportAdapter(project).get_export_data()
+            RekapKebutuhanAdapter(project).get_export_data(unit_mode="market")
+
+    def test_assign_weekly_cost_is_linear_in_assignments(self):
+        for size in (2, 8):
+            owner, project = self._project(size)
+            ids = list(Pekerjaan.objects.filter(project=project).values_list("id", flat=True))
+            body = {"assignments": [{"pekerjaan_id": pk, "week_number": 1, "proportion": 10} for pk in ids]}
+            for _ in range(2):  # insert, lalu update
+                request = RequestFactory().post("/", data=json.dumps(body), content_type="application/json")
+                request.user = owner
+                with query_budget(self.ASSIGN_FIXED + self.ASSIGN_PER_ITEM * size, max_repeats=size):
+                    response = api_assign_pekerjaan_weekly(request, project.id)
+                self.assertEqual(response.status_code, 200, response.content)
@@ -0,0 +1,115 @@
+import json
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+
+from dashboard.models import Project
+from detail_project.models import Klasifikasi, Pekerjaan, SubKlasifikasi, VolumePekerjaan
+from detail_project.services import (
+    _kebutuhan_cache_plan,
+    _revalidation_lock_key,
+    compute_kebutuhan_items,
+    compute_rekap_for_project,
+)
+from detail_project.stale_cache import get_swr_metrics, is_stale, reset_swr_metrics
+from detail_project.tasks import revalidate_project_cache
+from detail_project.views_api import api_get_rekap_rab
+
+
+class RekapStaleWhileRevalidateTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        reset_swr_metrics()
+        self.owner = get_user_model().objects.create_user(
+            username="owner_swr", email="swr@example.com", password="Secret123!"
+        )
+        self.project = Project.objects.create(
+            owner=self.owner, nama="SWR Project", sumber_dana="APBN",
+            lokasi_project="Jakarta", nama_client="Client", anggaran_owner=1000,
+        )
+        klas = Klasifikasi.objects.create(project=self.project, name="Klas", ordering_index=1)
+        sub = SubKlasifikasi.objects.create(project=self.project, klasifikasi=klas, name="Sub", ordering_index=1)
+        pekerjaan = Pekerjaan.objects.create(
+            project=self.project, sub_klasifikasi=sub, source_type="custom",
+            snapshot_uraian="Galian", snapshot_satuan="m3", ordering_index=1,
+        )
+        self.volume = VolumePekerjaan.objects.create(
+            project=self.project, pekerjaan=pekerjaan, quantity=Decimal("10")
+        )
+        self.lock_key = f"rekap:{self.project.id}:lock"
+
+    def _change_volume(self, quantity):
+        self.volume.quantity = Decimal(quantity)
+        self.volume.save()
+
+    def test_serves_last_good_while_another_worker_recomputes(self):
+        self.assertEqual(compute_rekap_for_project(self.project)[0]["volume"], 10.0)
+        self._change_volume("20")
+
+        cache.add(self.lock_key, 1)  # recompute in progress elsewhere
+        stale = compute_rekap_for_project(self.project, allow_stale=True)
+        self.assertTrue(is_stale(stale))
+        self.assertEqual(stale[0]["volume"], 10.0)
+        self.assertEqual(get_swr_metrics()["stale_serve"], 1)
+
+        cache.delete(self.lock_key)
+        fresh = compute_rekap_for_project(self.project, allow_stale=True)
+        self.assertFalse(is_stale(fresh))
+        self.assertEqual(fresh[0]["volume"], 20.0)
+
+    @override_settings(REKAP_SWR_LOCK_WAIT=0.1)
+    def test_strict_callers_never_get_stale_rows(self):
+        compute_rekap_for_project(self.project)
+        self._change_volume("30")
+
+        cache.add(self.lock_key, 1)
+        rows = compute_rekap_for_project(self.project)
+        self.assertFalse(is_stale(rows))
+        self.assertEqual(rows[0]["volume"], 30.0)
+        self.assertEqual(get_swr_metrics()["lock_timeout"], 1)
+
+    @override_settings(REKAP_SWR_ASYNC=True)
+    def test_async_recompute_releases_lock(self):
+        compute_kebutuhan_items(self.project)
+        self._change_volume("40")
+
+        served = compute_kebutuhan_items(self.project, allow_stale=True)
+        self.assertTrue(is_stale(served))
+        metrics = get_swr_metrics()
+        self.assertEqual(metrics["offload"], 1)
+        self.assertEqual(metrics["recompute"], 2)  # initial fill + eager task
+
+        again = compute_kebutuhan_items(self.project, allow_stale=True)
+        self.assertFalse(is_stale(again))
+        self.assertEqual(get_swr_metrics()["fresh_hit"], 1)
+
+    def test_revalidate_task_releases_lock_when_project_is_gone(self):
+        params = {"mode": "all", "filters": {"kategori_items": ["TK"]}}
+        kebutuhan_lock = _kebutuhan_cache_plan(self.project, "all", None, params["filters"])[0]
+        self.assertEqual(_revalidation_lock_key(self.project.id, "kebutuhan", params), kebutuhan_lock)
+        self.assertEqual(_revalidation_lock_key(self.project.id), self.lock_key)
+
+        missing_id = self.project.id + 1000
+        rekap_lock = _revalidation_lock_key(missing_id)
+        missing_kebutuhan_lock = _revalidation_lock_key(missing_id, "kebutuhan", params)
+        cache.add(rekap_lock, 1)
+        cache.add(missing_kebutuhan_lock, 1)
+
+        self.assertIsNone(revalidate_project_cache(missing_id)["rows"])
+        self.assertIsNone(revalidate_project_cache(missing_id, "kebutuhan", params)["rows"])
+        self.assertIsNone(cache.get(rekap_lock))
+        self.assertIsNone(cache.get(missing_kebutuhan_lock))
+
+    def test_stale_response_is_flagged_without_etag(self):
+        compute_rekap_for_project(self.project)
+        self._change_volume("50")
+        cache.add(self.lock_key, 1)
+
+        request = RequestFactory().get("/api/rekap/")
+        request.user = self.owner
+        response = api_get_rekap_rab(request, self.project.id)
+        self.assertEqual(response["X-Data-Stale"], "1")
+        self.assertNotIn("ETag", response)
+        self.assertTrue(json.loads(response.content)["meta"]["stale"])
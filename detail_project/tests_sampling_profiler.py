@@ -0,0 +1,76 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from config import sampling_profiler
+
+
+def _busy_loop(ms):
+    deadline = time.monotonic() + ms / 1000.0
+    while time.monotonic() < deadline:
+        sum(range(200))
+
+
+class SamplingProfilerTests(SimpleTestCase):
+    def tearDown(self):
+        sampling_profiler.reset_profiles()
+
+    def test_samples_are_collapsed_root_first(self):
+        with sampling_profiler.profiling(interval_ms=1) as samples:
+            _busy_loop(80)
+
+        self.assertGreater(sum(samples.values()), 0)
+        stack = samples.most_common(1)[0][0]
+        frames = stack.split(";")
+        self.assertIn(f"{__name__}:_busy_loop", frames)
+        self.assertLess(frames.index(f"{__name__}:test_samples_are_collapsed_root_first"),
+                        frames.index(f"{__name__}:_busy_loop"))
+
+        sampling_profiler.record_profile("ep", samples, duration_ms=80)
+        sampling_profiler.record_profile("ep", samples, duration_ms=40)
+        lines = sampling_profiler.collapsed_stacks("ep").splitlines()
+        self.assertTrue(all(line.rsplit(" ", 1)[1].isdigit() for line in lines))
+        summary = sampling_profiler.get_profile_summary()["ep"]
+        self.assertEqual(summary["requests"], 2)
+        self.assertEqual(summary["samples"], 2 * sum(samples.values()))
+
+
+@override_settings(SAMPLING_PROFILER_ENABLED=True, SAMPLING_PROFILER_INTERVAL_MS=1,
+                   SAMPLING_PROFILER_THRESHOLD_MS=60000)
+class SamplingProfilerMiddlewareTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.staff = User.objects.create_user(
+            username="staff_prof", email="staff_prof@example.com", password="Secret123!", is_staff=True
+        )
+        self.user = User.objects.create_user(
+            username="user_prof", email="user_prof@example.com", password="Secret123!"
+        )
+        sampling_profiler.reset_profiles()
+
+    def tearDown(self):
+        sampling_profiler.reset_profiles()
+
+    def test_only_slow_or_staff_flagged_requests_are_kept(self):
+        url = reverse("detail_project:api_performance_metrics")
+        client = Client()
+        client.force_login(self.user)
+        client.get(url, HTTP_X_PROFILE="1")
+        client.force_login(self.staff)
+        client.get(url)
+        self.assertEqual(sampling_profiler.get_profile_summary(), {})
+
+        client.get(url, HTTP_X_PROFILE="1")
+        response = client.get(reverse("detail_project:api_profiler_stacks"), {"format": "json"})
+        endpoints = response.json()["endpoints"]
+        self.assertEqual(list(endpoints), ["detail_project:api_performance_metrics"])
+        self.assertEqual(endpoints["detail_project:api_performance_metrics"]["requests"], 1)
+
+        response = client.get(reverse("detail_project:api_profiler_stacks"))
+        self.assertEqual(response["Content-Type"], "text/plain; charset=utf-8")
+
+        client.force_login(self.user)
+        response = client.get(reverse("detail_project:api_profiler_stacks"))
+        self.assertNotEqual(response.status_code, 200)
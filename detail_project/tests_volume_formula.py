@@ -0,0 +1,141 @@
+import json
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, SimpleTestCase, TestCase
+
+from dashboard.models import Project
+from detail_project.models import (
+    Klasifikasi,
+    Pekerjaan,
+    ProjectParameter,
+    SubKlasifikasi,
+    VolumeFormulaState,
+    VolumePekerjaan,
+)
+from detail_project.views_api import api_project_parameters_sync
+from detail_project.volume_formula import (
+    FormulaError,
+    build_dependency_graph,
+    compile_formula,
+    evaluate_formula,
+)
+
+
+class FormulaEngineTests(SimpleTestCase):
+    def _eval(self, expr, **variables):
+        return evaluate_formula(compile_formula(expr), {k: Decimal(str(v)) for k, v in variables.items()})
+
+    def test_matches_browser_grammar(self):
+        self.assertEqual(self._eval("= Panjang * lebar * 0,2", panjang=10, lebar=5), Decimal("10.000"))
+        self.assertEqual(self._eval("1.000,25 + 1_000.25"), Decimal("2000.500"))
+        self.assertEqual(self._eval("2 ^ 3 ^ 2"), Decimal("512.000"))
+        self.assertEqual(self._eval("-3 + max(1, 2, 3) * 2"), Decimal("3.000"))
+        self.assertEqual(self._eval("round(2.345, 2) + ceil(0.1) + floor(1.9)"), Decimal("4.350"))
+        self.assertEqual(self._eval("avg(1, 2) + sum(1, 1) + pow(2, 2) + abs(0 - 1)"), Decimal("8.500"))
+        self.assertEqual(self._eval("1 - 5"), Decimal("0.000"))  # clamp ≥ 0
+
+    def test_errors_are_reported_not_executed(self):
+        for expr, message in (
+            ("__import__('os')", "Token tidak dikenal"),
+            ("(1 + 2", "Kurung"),
+            ("foo(1)", "Fungsi tidak dikenal"),
+            ("1 / (2 - 2)", "Pembagian dengan nol"),
+            ("x * 2", "Variabel tidak dikenal"),
+        ):
+            with self.assertRaisesMessage(FormulaError, message):
+                self._eval(expr)
+
+    def test_overflow_and_out_of_range_results_are_formula_errors(self):
+        for expr in ("10^1000000", "9^9^9", "pow(10, 999999999)", "10^26", "10^1000"):
+            with self.assertRaisesMessage(FormulaError, "Hasil formula tidak valid"):
+                self._eval(expr)
+        # Quantizes fine but does not fit VolumePekerjaan.quantity (max_digits=18, dp=3)
+        for expr in ("10^16", "10^15", "999999999999999,9999"):
+            with self.assertRaisesMessage(FormulaError, "melebihi batas volume"):
+                self._eval(expr)
+        self.assertEqual(self._eval("10^15 - 1"), Decimal("999999999999999.000"))
+
+    def test_compile_is_cached_and_tracks_dependencies(self):
+        self.assertIs(compile_formula("=a*B+pi"), compile_formula("=a*B+pi"))
+        compiled, dependents, errors = build_dependency_graph([
+            (1, "=a*b", True), (2, "b+1", True), (3, "7", False), (4, "=(", True),
+        ])
+        self.assertEqual(set(compiled), {1, 2})
+        self.assertEqual(dependents, {"a": {1}, "b": {1, 2}})
+        self.assertIn(4, errors)
+
+
+class ParameterSyncRecomputeTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.owner = get_user_model().objects.create_user(
+            username="owner_formula", email="formula@example.com", password="Secret123!"
+        )
+        self.project = Project.objects.create(
+            owner=self.owner, nama="Formula Project", sumber_dana="APBN",
+            lokasi_project="Jakarta", nama_client="Client", anggaran_owner=1000,
+        )
+        klas = Klasifikasi.objects.create(project=self.project, name="Klas", ordering_index=1)
+        sub = SubKlasifikasi.objects.create(project=self.project, klasifikasi=klas, name="Sub", ordering_index=1)
+        self.pekerjaan = [
+            Pekerjaan.objects.create(
+                project=self.project, sub_klasifikasi=sub, source_type="custom",
+                snapshot_uraian=f"Pekerjaan {idx}", snapshot_satuan="m3", ordering_index=idx,
+            )
+            for idx in range(1, 4)
+        ]
+        for name, value in (("panjang", "10"), ("lebar", "2"), ("tinggi", "1")):
+            ProjectParameter.objects.create(project=self.project, name=name, value=Decimal(value))
+        formulas = ("=panjang*lebar", "=lebar*tinggi", "=tinggi+1")
+        for pkj, raw in zip(self.pekerjaan, formulas):
+            VolumeFormulaState.objects.create(project=self.project, pekerjaan=pkj, raw=raw, is_fx=True)
+            VolumePekerjaan.objects.create(project=self.project, pekerjaan=pkj, quantity=Decimal("0"))
+
+    def _sync(self, parameters, mode="merge"):
+        request = self.factory.post(
+            "/api/", data=json.dumps({"parameters": parameters, "mode": mode}),
+            content_type="application/json",
+        )
+        request.user = self.owner
+        return json.loads(api_project_parameters_sync(request, self.project.id).content)
+
+    def _quantities(self):
+        return [
+            VolumePekerjaan.objects.get(pekerjaan=pkj).quantity for pkj in self.pekerjaan
+        ]
+
+    def test_only_dependent_volumes_are_recomputed(self):
+        body = self._sync({"panjang": {"value": 12}, "tinggi": {"value": 1}})
+        self.assertEqual(body["volumes"]["changed"], [
+            {"pekerjaan_id": self.pekerjaan[0].id, "quantity": "24.000"},
+        ])
+        self.assertEqual(self._quantities(), [Decimal("24.000"), Decimal("0.000"), Decimal("0.000")])
+
+        body = self._sync({"lebar": {"value": 3}})
+        self.assertEqual(
+            [row["pekerjaan_id"] for row in body["volumes"]["changed"]],
+            [self.pekerjaan[0].id, self.pekerjaan[1].id],
+        )
+        self.assertEqual(self._quantities(), [Decimal("36.000"), Decimal("3.000"), Decimal("0.000")])
+
+    def test_replace_mode_reports_formulas_missing_a_parameter(self):
+        body = self._sync({"panjang": 10, "lebar": 2}, mode="replace")
+        self.assertEqual(
+            body["volumes"]["errors"],
+            [{"pekerjaan_id": self.pekerjaan[1].id, "message": "Variabel tidak dikenal: tinggi"},
+             {"pekerjaan_id": self.pekerjaan[2].id, "message": "Variabel tidak dikenal: tinggi"}],
+        )
+        self.assertEqual(body["volumes"]["changed"], [])
+
+    def test_overflowing_stored_formula_does_not_block_parameter_save(self):
+        VolumeFormulaState.objects.filter(pekerjaan=self.pekerjaan[1]).update(raw="=lebar^1000000")
+        VolumeFormulaState.objects.filter(pekerjaan=self.pekerjaan[2]).update(raw="=tinggi*10^16")
+        body = self._sync({"lebar": {"value": 3}, "tinggi": {"value": 2}})
+        self.assertEqual(
+            body["volumes"]["errors"],
+            [{"pekerjaan_id": self.pekerjaan[1].id, "message": "Hasil formula tidak valid"},
+             {"pekerjaan_id": self.pekerjaan[2].id, "message": "Hasil formula melebihi batas volume"}],
+        )
+        self.assertEqual(self._quantities(), [Decimal("30.000"), Decimal("0.000"), Decimal("0.000")])
+        self.assertEqual(ProjectParameter.objects.get(project=self.project, name="lebar").value, Decimal("3"))
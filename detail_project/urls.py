@@ -103,6 +103,7 @@ urlpatterns = [
     path('api/project/<int:project_id>/orphaned-items/cleanup/', views_api.api_cleanup_orphaned_harga_items, name='api_cleanup_orphaned_items'),
     path('api/project/<int:project_id>/change-status/', views_api.api_get_change_status, name='api_get_change_status'),
     path('api/project/<int:project_id>/audit-trail/', views_api.api_get_audit_trail, name='api_get_audit_trail'),
+    path('api/project/<int:project_id>/audit-trail/<int:entry_id>/state/', views_api.api_get_audit_state, name='api_get_audit_state'),
     
     # ===== API: Conversion Profiles =====
     path('api/project/<int:project_id>/conversion-profiles/', views_api.api_get_conversion_profiles, name='api_get_conversion_profiles'),
@@ -141,6 +142,7 @@ urlpatterns = [
 
     # ===== API: Batch Copy (FASE 3.2) =====
     path('api/project/<int:project_id>/batch-copy/', views_api.api_batch_copy_project, name='api_batch_copy_project'),
+    path('api/project/<int:project_id>/batch-copy/<str:job_id>/', views_api.api_batch_copy_status, name='api_batch_copy_status'),
 
 
     # Export endpoints
@@ -423,6 +425,10 @@ urlpatterns = [
          views_monitoring.api_reset_performance_metrics,
          name='api_reset_performance_metrics'),
 
+    path('api/monitoring/profiler/',
+         views_monitoring.api_profiler_stacks,
+         name='api_profiler_stacks'),
+
     path('api/monitoring/report-client-metric/',
          views_monitoring.api_report_client_metric,
          name='api_report_client_metric'),
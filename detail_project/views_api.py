@@ -85,6 +85,7 @@ from django.http import JsonResponse, HttpRequest, HttpResponse, Http404
 from django.views.decorators.http import require_POST, require_GET, require_http_methods
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django.db import transaction, IntegrityError
 from django.db.models import Max, F, Sum, DecimalField, ExpressionWrapper
 from django.db.models.functions import Coalesce
@@ -94,7 +95,9 @@ from django.utils.timezone import now
 from django.utils.dateparse import parse_datetime
 from django.core.cache import cache
 from .numeric import parse_any, to_dp_str, quantize_half_up, DECIMAL_SPEC
-from .api_helpers import parse_kebutuhan_query_params
+from .api_helpers import (
+    compact_json_response, mark_stale_response, parse_kebutuhan_query_params, wants_columnar,
+)
 from referensi.models import AHSPReferensi
 from .models import (
     Project,  # ADDED: Required for export_template_ahsp_json
@@ -106,8 +109,9 @@ from .models import (
 )
 from .services import (
     clone_ref_pekerjaan, _upsert_harga_item, compute_rekap_for_project,
-    compute_kebutuhan_items, summarize_kebutuhan_rows,
-    generate_custom_code, invalidate_rekap_cache, validate_bundle_reference,
+    compute_kebutuhan_items, summarize_kebutuhan_rows, KEBUTUHAN_KATEGORI_ORDER,
+    generate_custom_code, invalidate_rekap_cache, invalidate_after_bulk_write,
+    bump_project_data_version, validate_bundle_reference,
     expand_bundle_to_components,  # NEW: Dual storage expansion (Pekerjaan)
     expand_ahsp_bundle_to_components,  # NEW: Dual storage expansion (AHSP)
     cascade_bundle_re_expansion,  # CRITICAL: Re-expand pekerjaan that reference modified one
@@ -118,6 +122,7 @@ from .services import (
     touch_project_change,
     get_change_tracker,
     _populate_expanded_from_raw,
+    get_batch_copy_job,
 )
 
 from .export_config import (
@@ -129,7 +134,10 @@ from .export_config import (
     format_volume,
 )
 from .exports import RekapRABExporter, RekapKebutuhanExporter
-from .api_helpers import rate_limit
+from .api_helpers import project_etag, rate_limit
+from .stale_cache import is_stale
+from .audit_delta import compute_delta, reconstruct_entries, reconstruct_entry
+from .volume_formula import recompute_dependent_volumes
 from accounts.mixins import api_pdf_export_allowed
 
 try:
@@ -366,6 +374,23 @@ def _owner_or_404(project_id, user):
     return get_object_or_404(qs)
 
 
+def _as_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _owned_pekerjaan_ids(project, raw_ids) -> set:
+    """Subset id pekerjaan (int) yang milik project; satu query id__in."""
+    ids = {pid for pid in map(_as_int, raw_ids) if pid is not None}
+    if not ids:
+        return set()
+    return set(
+        Pekerjaan.objects.filter(project=project, id__in=ids).values_list("id", flat=True)
+    )
+
+
 def _extract_parameters_from_request(request: HttpRequest) -> dict:
     """
     Extract parameters from request query string or body
@@ -430,12 +455,11 @@ def api_search_ahsp(request: HttpRequest, project_id: int):
         limit = 20
     limit = max(1, min(limit, 50))
 
-    qs = AHSPReferensi.objects.all()
-    if q:
-        from django.db.models import Q
-        qs = qs.filter(Q(kode_ahsp__icontains=q) | Q(nama_ahsp__icontains=q))
+    sumber = (request.GET.get("sumber") or "").strip() or None
 
-    qs = qs.order_by("kode_ahsp")[:limit]
+    # Shared autocomplete index with referensi lookup API (no per-keystroke SQL)
+    from referensi.search_cache import search_ahsp
+    qs = search_ahsp(q, sumber=sumber, limit=limit)
     results = [{
         "id": obj.id,
         "text": f"{obj.kode_ahsp} — {obj.nama_ahsp[:80]}",
@@ -626,6 +650,7 @@ def _str_to_src(s):
 # ---------- View 1: TREE ----------
 @login_required
 @require_GET
+@project_etag('list-pekerjaan-tree')
 def api_get_list_pekerjaan_tree(request: HttpRequest, project_id: int):
     """
     Kembalikan struktur Klasifikasi → Sub → Pekerjaan yang sudah tersimpan.
@@ -1443,6 +1468,12 @@ def api_save_volume_pekerjaan(request: HttpRequest, project_id: int):
     saved = 0
     errors = []
 
+    # Validasi kepemilikan sekaligus supaya tidak 500 saat FK tak cocok
+    owned_ids = _owned_pekerjaan_ids(
+        project, (row.get("pekerjaan_id") or row.get("id") for row in rows)
+    )
+    quantities = {}  # pekerjaan_id -> qty (baris terakhir menang, seperti update_or_create berurutan)
+
     for idx, row in enumerate(rows):
         pid = row.get("pekerjaan_id") or row.get("id")
         raw = row.get("quantity")
@@ -1452,11 +1483,8 @@ def api_save_volume_pekerjaan(request: HttpRequest, project_id: int):
             errors.append(_err(key, "Wajib"))
             continue
 
-        # Validasi kepemilikan pekerjaan supaya tidak 500 saat FK tak cocok
-        try:
-            from .models import Pekerjaan
-            Pekerjaan.objects.get(id=pid, project=project)
-        except Pekerjaan.DoesNotExist:
+        pid = _as_int(pid)
+        if pid not in owned_ids:
             key = f"{path_prefix}[{idx}].pekerjaan_id" if path_prefix else f"[{idx}].pekerjaan_id"
             errors.append(_err(key, "Pekerjaan tidak ditemukan di project ini"))
             continue
@@ -1473,16 +1501,22 @@ def api_save_volume_pekerjaan(request: HttpRequest, project_id: int):
             errors.append(_err(key, "Tidak boleh negatif"))
             continue
 
-        VolumePekerjaan.objects.update_or_create(
-            project=project,
-            pekerjaan_id=pid,
-            defaults={"quantity": qty},
-        )
+        quantities[pid] = qty
         saved += 1
 
-    # CACHE FIX: Invalidate cache AFTER transaction commits
-    if saved:
-        transaction.on_commit(lambda: invalidate_rekap_cache(project))
+    if quantities:
+        # Satu INSERT ... ON CONFLICT untuk create + update (tanpa signal per baris)
+        VolumePekerjaan.objects.bulk_create(
+            [
+                VolumePekerjaan(project=project, pekerjaan_id=pid, quantity=qty)
+                for pid, qty in quantities.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["project", "pekerjaan"],
+            update_fields=["quantity", "updated_at"],
+        )
+        # CACHE FIX: Invalidate cache AFTER transaction commits (sekali per request)
+        invalidate_after_bulk_write(project)
 
     # Partial success → 200. Semua gagal → 400.
 
@@ -2425,6 +2459,15 @@ def api_save_harga_items(request: HttpRequest, project_id: int):
 
     dp = getattr(HargaItemProject._meta.get_field('harga_satuan'), 'decimal_places', DECIMAL_SPEC["HARGA"].dp)
 
+    # P0 FIX: ROW-LEVEL LOCKING - kunci semua baris yang dikirim dalam satu query
+    requested_ids = {it.get('id') for it in items if it.get('id') in allowed_ids}
+    locked = {
+        obj.id: obj
+        for obj in HargaItemProject.objects.select_for_update().filter(project=project, id__in=requested_ids)
+    }
+    changed = {}
+    now = timezone.now()
+
     for i, it in enumerate(items):
         item_id = it.get('id')
         harga_raw = it.get('harga_satuan')
@@ -2438,23 +2481,21 @@ def api_save_harga_items(request: HttpRequest, project_id: int):
         if dec is None:
             errors.append(_err(f"items[{i}].harga_satuan", "Harus ≥ 0 dan berupa angka yang valid")); continue
 
-        # P0 FIX: ROW-LEVEL LOCKING - Prevent concurrent edit race condition
-        try:
-            # Acquire row-level lock with select_for_update()
-            obj = (HargaItemProject.objects
-                   .select_for_update()  # Lock this row
-                   .get(project=project, id=item_id))
-
-            # Update with lock held
-            new_price = quantize_half_up(dec, dp)
-            if obj.harga_satuan != new_price:
-                obj.harga_satuan = new_price
-                obj.save(update_fields=['harga_satuan', 'updated_at'])
-                updated += 1
-        except HargaItemProject.DoesNotExist:
+        obj = locked.get(item_id)
+        if obj is None:
             errors.append(_err(f"items[{i}].id", "Item tidak ditemukan"))
             continue
 
+        new_price = quantize_half_up(dec, dp)
+        if obj.harga_satuan != new_price:
+            obj.harga_satuan = new_price
+            obj.updated_at = now  # bulk_update tidak menjalankan auto_now
+            changed[obj.id] = obj
+            updated += 1
+
+    if changed:
+        HargaItemProject.objects.bulk_update(list(changed.values()), ['harga_satuan', 'updated_at'])
+
     # === NEW: Profit/Margin (opsional)
     pricing_saved = False
     if 'markup_percent' in (payload or {}):
@@ -2485,11 +2526,9 @@ def api_save_harga_items(request: HttpRequest, project_id: int):
         project.save(update_fields=['updated_at'])
         logger.info(f"[PROJECT_TIMESTAMP] Updated project {project.id} timestamp after {updated} harga changes")
 
-        def invalidate_harga_cache():
-            invalidate_rekap_cache(project)
-            logger.info(f"[CACHE] Invalidated cache for project {project.id} after harga items update")
-
-        transaction.on_commit(invalidate_harga_cache)
+        # Harga disimpan via bulk_update (tanpa signal): invalidasi sekali per request
+        invalidate_after_bulk_write(project)
+        logger.info(f"[CACHE] Scheduled cache invalidation for project {project.id} after harga items update")
 
     # Build user-friendly message
     if status_code == 200:
@@ -2917,10 +2956,13 @@ def api_project_parameter_detail(request: HttpRequest, project_id: int, param_id
     if updated_fields:
         updated_fields.append("updated_at")
         param.save(update_fields=updated_fields)
-    
+
+    recomputed = recompute_dependent_volumes(project, [param.name] if "value" in updated_fields else [])
+
     return JsonResponse({
         "ok": True,
         "updated": True,
+        "volumes": _recomputed_volumes_payload(recomputed),
         "parameter": {
             "id": param.id,
             "name": param.name,
@@ -2974,8 +3016,11 @@ def api_project_parameters_sync(request: HttpRequest, project_id: int):
     
     import re
     
+    changed_names = set()  # parameter yang nilainya berubah -> volume dependen dihitung ulang
+
     if mode == "replace":
         # Delete all existing parameters
+        previous_values = dict(ProjectParameter.objects.filter(project=project).values_list("name", "value"))
         deleted_count = ProjectParameter.objects.filter(project=project).delete()[0]
         
         # Create all from payload
@@ -2991,7 +3036,7 @@ def api_project_parameters_sync(request: HttpRequest, project_id: int):
             label = data.get("label", name) if isinstance(data, dict) else name
             unit = data.get("unit", "") if isinstance(data, dict) else ""
             
-            ProjectParameter.objects.create(
+            param = ProjectParameter.objects.create(
                 project=project,
                 name=name,
                 value=value,
@@ -2999,6 +3044,9 @@ def api_project_parameters_sync(request: HttpRequest, project_id: int):
                 unit=unit,
             )
             created_count += 1
+            if previous_values.pop(name, None) != param.value:
+                changed_names.add(name)
+        changed_names.update(previous_values)  # parameter yang dihapus
     else:
         # Merge mode: update existing, create new
         existing = {p.name: p for p in ProjectParameter.objects.filter(project=project)}
@@ -3018,12 +3066,15 @@ def api_project_parameters_sync(request: HttpRequest, project_id: int):
             if name in existing:
                 # Update existing
                 param = existing[name]
+                previous_value = param.value
                 param.value = value
                 param.label = label or name
                 if unit:
                     param.unit = unit
                 param.save(update_fields=["value", "label", "unit", "updated_at"])
                 updated_count += 1
+                if value != previous_value:
+                    changed_names.add(name)
             else:
                 # Create new
                 ProjectParameter.objects.create(
@@ -3034,16 +3085,35 @@ def api_project_parameters_sync(request: HttpRequest, project_id: int):
                     unit=unit,
                 )
                 created_count += 1
-    
+                changed_names.add(name)
+
+    # Hitung ulang hanya volume yang formulanya memakai parameter yang berubah
+    recomputed = recompute_dependent_volumes(project, changed_names)
+
     return JsonResponse({
         "ok": True,
         "created": created_count,
         "updated": updated_count,
         "deleted": deleted_count,
         "mode": mode,
+        "volumes": _recomputed_volumes_payload(recomputed),
     })
 
 
+def _recomputed_volumes_payload(recomputed):
+    dp_vol = getattr(VolumePekerjaan._meta.get_field('quantity'), 'decimal_places', DECIMAL_SPEC["VOL"].dp)
+    return {
+        "changed": [
+            {"pekerjaan_id": pid, "quantity": to_dp_str(qty, dp_vol)}
+            for pid, qty in sorted(recomputed["changed"].items())
+        ],
+        "errors": [
+            {"pekerjaan_id": pid, "message": msg}
+            for pid, msg in sorted(recomputed["errors"].items())
+        ],
+    }
+
+
 # ---------- View 5: Detail Gabungan ----------
 @login_required
 @require_POST
@@ -3452,6 +3522,7 @@ def api_cleanup_orphaned_harga_items(request: HttpRequest, project_id: int):
 
 @login_required
 @require_GET
+@project_etag('change-status')
 def api_get_change_status(request: HttpRequest, project_id: int):
     project = _owner_or_404(project_id, request.user)
 
@@ -3552,7 +3623,7 @@ def api_get_audit_trail(request: HttpRequest, project_id: int):
             return default
         return str(value).strip().lower() not in ("0", "false", "no", "off", "")
 
-    def _serialize_entry(entry, include_diff):
+    def _serialize_entry(entry, include_diff, states=None):
         pekerjaan_data = {
             "id": entry.pekerjaan_id,
             "kode": entry.pekerjaan.snapshot_kode if entry.pekerjaan else None,
@@ -3572,8 +3643,16 @@ def api_get_audit_trail(request: HttpRequest, project_id: int):
             "user": user_data,
         }
         if include_diff:
-            payload["old_data"] = entry.old_data
-            payload["new_data"] = entry.new_data
+            # Entry delta-encoded direkonstruksi dari checkpoint terdekat
+            if states is None:
+                states = reconstruct_entries([entry])
+            old_rows, new_rows = states.get(entry.id, (entry.old_data, entry.new_data))
+            payload["old_data"] = old_rows
+            payload["new_data"] = new_rows
+            if entry.delta is not None:
+                payload["delta"] = entry.delta
+            elif old_rows is not None or new_rows is not None:
+                payload["delta"] = compute_delta(old_rows, new_rows)
         return payload
 
     include_diff = _parse_bool(request.GET.get("include_diff"), default=True)
@@ -3660,8 +3739,9 @@ def api_get_audit_trail(request: HttpRequest, project_id: int):
         entries = list(
             qs.select_related("pekerjaan", "user")[start:start + page_size]
         )
+        states = reconstruct_entries(entries)
         for entry in entries:
-            results.append(_serialize_entry(entry, include_diff=True))
+            results.append(_serialize_entry(entry, include_diff=True, states=states))
     else:
         entries = list(
             qs.values(
@@ -3713,12 +3793,39 @@ def api_get_audit_trail(request: HttpRequest, project_id: int):
 
     return JsonResponse({"ok": True, "results": results, "pagination": pagination})
 
+
+@login_required
+@require_GET
+def api_get_audit_state(request: HttpRequest, project_id: int, entry_id: int):
+    """
+    Rekonstruksi snapshot detail AHSP sebelum/sesudah satu entry audit.
+
+    Entry delta-encoded dibangun ulang dari checkpoint terdekat pada rantai
+    pekerjaannya; entry format lama dikembalikan apa adanya.
+    """
+    project = _owner_or_404(project_id, request.user)
+    entry = get_object_or_404(DetailAHSPAudit, id=entry_id, project=project)
+    old_rows, new_rows = reconstruct_entry(entry)
+    return JsonResponse({
+        "ok": True,
+        "entry_id": entry.id,
+        "pekerjaan_id": entry.chain_pekerjaan_id or entry.pekerjaan_id,
+        "created_at": entry.created_at.isoformat(),
+        "has_state": old_rows is not None or new_rows is not None,
+        "is_checkpoint": entry.is_checkpoint,
+        "old_data": old_rows,
+        "new_data": new_rows,
+    })
+
 @login_required
+@project_etag('rekap-rab')
 def api_get_rekap_rab(request: HttpRequest, project_id: int):
     project = _owner_or_404(project_id, request.user)
 
-    # Ambil hasil penuh dari services (A..G, total = G×volume)
-    data = compute_rekap_for_project(project)
+    # Ambil hasil penuh dari services (A..G, total = G×volume); boleh stale
+    # selama worker lain menghitung ulang (lihat stale_cache)
+    data = compute_rekap_for_project(project, allow_stale=True)
+    stale = is_stale(data)
 
     # Ambil pricing JIKA ADA (jangan create default row agar kompatibel dgn test stub)
     pp = None
@@ -3783,18 +3890,20 @@ def api_get_rekap_rab(request: HttpRequest, project_id: int):
     ppn_meta = pp.ppn_percent if pp and pp.ppn_percent is not None else Decimal("11.00")
     rb_meta = int(pp.rounding_base) if pp and getattr(pp, "rounding_base", None) else 10000
 
-    return JsonResponse({
+    return mark_stale_response(JsonResponse({
         "ok": True,
         "rows": data,
         "meta": {
             "markup_percent": to_dp_str(mp_meta, 2),
             "ppn_percent": to_dp_str(ppn_meta, 2),
             "rounding_base": rb_meta,
+            "stale": stale,
         }
-    })
+    }), stale)
 
 @login_required
 @require_GET
+@project_etag('rekap-kebutuhan')
 def api_get_rekap_kebutuhan(request: HttpRequest, project_id: int):
     """
     Kembalikan rows rekap kebutuhan (agregasi seluruh pekerjaan dalam project).
@@ -3815,10 +3924,12 @@ def api_get_rekap_kebutuhan(request: HttpRequest, project_id: int):
             tahapan_id=tahapan_id,
             filters=filters,
             time_scope=time_scope,
+            allow_stale=True,
         )
     except Exception as e:
         return JsonResponse({'ok': False, 'error': str(e)}, status=500)
 
+    stale = is_stale(raw_rows)
     rows, summary = summarize_kebutuhan_rows(raw_rows, search=search)
     scope_active = bool(time_scope and time_scope.get('mode') not in ('', 'all'))
     filters_applied = bool(
@@ -3839,9 +3950,10 @@ def api_get_rekap_kebutuhan(request: HttpRequest, project_id: int):
         "search": search,
         "time_scope": time_scope,
         "time_scope_active": scope_active,
+        "stale": stale,
     })
 
-    return JsonResponse({"ok": True, "rows": rows, "meta": summary})
+    return mark_stale_response(JsonResponse({"ok": True, "rows": rows, "meta": summary}), stale)
 
 
 
@@ -4189,6 +4301,14 @@ def api_volume_formula_state(request: HttpRequest, project_id: int):
     updated = 0
     errors  = []
 
+    owned_ids = _owned_pekerjaan_ids(project, (it.get("pekerjaan_id") for it in items))
+    existing = set(
+        VolumeFormulaState.objects
+        .filter(project=project, pekerjaan_id__in=owned_ids)
+        .values_list("pekerjaan_id", flat=True)
+    )
+    states = {}  # pekerjaan_id -> (raw, is_fx); baris terakhir menang
+
     for i, it in enumerate(items):
         pkj_id = it.get("pekerjaan_id")
         raw    = (it.get("raw") or "").strip()
@@ -4197,17 +4317,28 @@ def api_volume_formula_state(request: HttpRequest, project_id: int):
         if not pkj_id:
             errors.append(_err(f"items[{i}].pekerjaan_id", "Wajib")); continue
 
-        try:
-            pkj = Pekerjaan.objects.get(id=pkj_id, project=project)
-        except Pekerjaan.DoesNotExist:
+        pkj_id = _as_int(pkj_id)
+        if pkj_id not in owned_ids:
             errors.append(_err(f"items[{i}].pekerjaan_id", "Pekerjaan tidak ditemukan di project ini")); continue
 
-        obj, was_created = VolumeFormulaState.objects.update_or_create(
-            project=project, pekerjaan=pkj,
-            defaults=dict(raw=raw, is_fx=is_fx)
+        if pkj_id in existing or pkj_id in states:
+            updated += 1
+        else:
+            created += 1
+        states[pkj_id] = (raw, is_fx)
+
+    if states:
+        VolumeFormulaState.objects.bulk_create(
+            [
+                VolumeFormulaState(project=project, pekerjaan_id=pid, raw=raw, is_fx=is_fx)
+                for pid, (raw, is_fx) in states.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["project", "pekerjaan"],
+            update_fields=["raw", "is_fx", "updated_at"],
         )
-        if was_created: created += 1
-        else: updated += 1
+        # bulk_create tidak mengirim post_save; versi data dinaikkan sekali
+        bump_project_data_version(project)
 
     status_code = 400 if errors and (created + updated == 0) else 200
     return JsonResponse(
@@ -4791,7 +4922,11 @@ def export_jadwal_pekerjaan_professional(request: HttpRequest, project_id: int):
     - report_type: 'rekap' | 'monthly' | 'weekly' (default: 'rekap')
     - period: Month number (1-based) for monthly, Week number for weekly
     - format: 'pdf' | 'word' (default: 'pdf')
-    - attachments: Chart attachments (POST only)
+    - attachments: Chart attachments (POST only, chart_mode='client')
+    - chart_mode: 'server' (default, vector Gantt/Kurva S) | 'client'
+
+    Halaman jadwal memakai export-async (export_type 'jadwal-professional');
+    endpoint sinkron ini hanya dipertahankan untuk klien/skrip lama.
     """
     try:
         project = _owner_or_404(project_id, request.user)
@@ -4886,8 +5021,15 @@ def export_jadwal_pekerjaan_professional(request: HttpRequest, project_id: int):
                     'message': f"Invalid weeks format: {weeks_raw}. Must be comma-separated integers or list."
                 }, status=400)
 
+        chart_mode = request.GET.get('chart_mode') or payload.get('chart_mode') or 'server'
+        if chart_mode not in ('server', 'client'):
+            return JsonResponse({
+                'status': 'error',
+                'message': f"Invalid chart_mode: {chart_mode}. Must be 'server' or 'client'."
+            }, status=400)
+
         # Parse attachments (for POST)
-        attachments = _parse_export_attachments(request)
+        attachments = _parse_export_attachments(request) if chart_mode == 'client' else []
         
         # Parse gantt_data (structured data for backend Gantt rendering)
         gantt_data = None
@@ -4906,7 +5048,8 @@ def export_jadwal_pekerjaan_professional(request: HttpRequest, project_id: int):
             months=months,  # NEW: pass months list
             weeks=weeks,    # NEW: pass weeks list
             attachments=attachments,
-            gantt_data=gantt_data
+            gantt_data=gantt_data,
+            chart_mode=chart_mode,
         )
     except Http404:
         raise
@@ -5216,30 +5359,24 @@ def api_batch_copy_project(request: HttpRequest, project_id: int):
         "copy_jadwal": true (optional, default: true)
     }
 
-    Response:
+    Copies are created by Celery workers from a shared snapshot of the source
+    project; the response returns a job id to poll via api_batch_copy_status.
+
+    Response (202):
     {
         "ok": true,
-        "projects": [
-            {
-                "id": 123,
-                "nama": "Project Template - Copy 1",
-                "owner_id": 1,
-                ...
-            },
-            {
-                "id": 124,
-                "nama": "Project Template - Copy 2",
-                "owner_id": 1,
-                ...
-            },
-            ...
-        ],
-        "summary": {
+        "job_id": "9f1c...",
+        "status_url": "/detail_project/api/project/<project_id>/batch-copy/<job_id>/",
+        "job": {
+            "status": "pending" | "running" | "success" | "failed",
             "requested": 3,
-            "successful": 3,
+            "completed": 0,
+            "successful": 0,
             "failed": 0,
-            "errors": []
-        }
+            "progress": 0,
+            "copies": [{"index": 1, "name": "Project Template - Copy 1", "status": "pending"}, ...]
+        },
+        "summary": {"requested": 3, "successful": 0, "failed": 0}
     }
     """
     from datetime import datetime
@@ -5299,58 +5436,100 @@ def api_batch_copy_project(request: HttpRequest, project_id: int):
             "error": "Field 'copy_jadwal' must be a boolean"
         }, status=400)
 
-    # Perform batch copy
+    # Start batch copy job (fan-out to Celery workers)
     try:
         service = DeepCopyService(source_project)
-
-        # Use batch_copy method
-        projects = service.batch_copy(
+        job_id = service.start_batch_copy_job(
             new_owner=request.user,
             base_name=base_name,
             count=count,
             new_tanggal_mulai=new_tanggal_mulai,
             copy_jadwal=copy_jadwal,
         )
-
-        # Calculate summary
-        successful_count = len(projects)
-        failed_count = count - successful_count
-
-        # Build response
-        projects_data = []
-        for proj in projects:
-            projects_data.append({
-                "id": proj.id,
-                "nama": proj.nama,
-                "owner_id": proj.owner_id,
-                "lokasi_project": proj.lokasi_project,
-                "sumber_dana": proj.sumber_dana,
-                "nama_client": proj.nama_client,
-                "tanggal_mulai": proj.tanggal_mulai.isoformat() if proj.tanggal_mulai else None,
-                "tanggal_selesai": proj.tanggal_selesai.isoformat() if proj.tanggal_selesai else None,
-                "durasi_hari": proj.durasi_hari,
-                "is_active": proj.is_active,
-            })
-
-        return JsonResponse({
-            "ok": True,
-            "projects": projects_data,
-            "summary": {
-                "requested": count,
-                "successful": successful_count,
-                "failed": failed_count,
-                "errors": [] if failed_count == 0 else ["Some copies failed - check server logs"]
-            }
-        }, status=201)
-
     except Exception as e:
-        import traceback
-        print(traceback.format_exc())
+        logger.exception("Batch copy job failed to start for project %s", project_id)
         return JsonResponse({
             "ok": False,
             "error": f"Batch copy failed: {str(e)}"
         }, status=500)
 
+    job_payload = _batch_copy_job_payload(get_batch_copy_job(job_id))
+    return JsonResponse({
+        "ok": True,
+        "job_id": job_id,
+        "status_url": reverse(
+            "detail_project:api_batch_copy_status",
+            kwargs={"project_id": source_project.id, "job_id": job_id},
+        ),
+        "job": job_payload,
+        # Backwards compatible with the old synchronous response; final once
+        # job["status"] is no longer pending/running (poll status_url otherwise)
+        "summary": _batch_copy_summary(job_payload),
+    }, status=202)
+
+
+def _batch_copy_job_payload(job):
+    return {k: v for k, v in job.items() if k not in ("source_project_id", "owner_id")}
+
+
+def _batch_copy_summary(job):
+    return {
+        "requested": job["requested"],
+        "successful": job["successful"],
+        "failed": job["failed"],
+    }
+
+
+@login_required
+@require_GET
+def api_batch_copy_status(request: HttpRequest, project_id: int, job_id: str):
+    """
+    Poll progress of a batch copy job.
+
+    GET /api/project/<project_id>/batch-copy/<job_id>/
+
+    Response:
+    {
+        "ok": true,
+        "job": {"status": "running", "requested": 3, "completed": 1, "progress": 33, "copies": [...]},
+        "summary": {"requested": 3, "successful": 1, "failed": 0},
+        "projects": [{"id": 123, "nama": "Project Template - Copy 1", ...}]
+    }
+    """
+    source_project = _owner_or_404(project_id, request.user)
+
+    job = get_batch_copy_job(job_id)
+    if (
+        job is None
+        or job["source_project_id"] != source_project.id
+        or job["owner_id"] != request.user.id
+    ):
+        return JsonResponse({"ok": False, "error": "Batch copy job not found"}, status=404)
+
+    project_ids = [c["project_id"] for c in job["copies"] if c.get("project_id")]
+    projects_data = [
+        {
+            "id": proj.id,
+            "nama": proj.nama,
+            "owner_id": proj.owner_id,
+            "lokasi_project": proj.lokasi_project,
+            "sumber_dana": proj.sumber_dana,
+            "nama_client": proj.nama_client,
+            "tanggal_mulai": proj.tanggal_mulai.isoformat() if proj.tanggal_mulai else None,
+            "tanggal_selesai": proj.tanggal_selesai.isoformat() if proj.tanggal_selesai else None,
+            "durasi_hari": proj.durasi_hari,
+            "is_active": proj.is_active,
+        }
+        for proj in Project.objects.filter(id__in=project_ids, owner=request.user).order_by("id")
+    ]
+
+    return JsonResponse({
+        "ok": True,
+        "job": _batch_copy_job_payload(job),
+        "summary": _batch_copy_summary(job),
+        "projects": projects_data,
+    })
+
 
 # ===== CRITICAL FIX: Bundle Expansion Detail Visibility =====
 @login_required
@@ -5439,6 +5618,7 @@ def api_get_bundle_expansion(request: HttpRequest, project_id: int, pekerjaan_id
 
 @login_required
 @require_GET
+@project_etag('kurva-s')
 def api_kurva_s_data(request: HttpRequest, project_id: int) -> JsonResponse:
     """
     API untuk data Kurva S - mengirim harga map dan total biaya project.
@@ -5574,6 +5754,127 @@ def api_kurva_s_data(request: HttpRequest, project_id: int) -> JsonResponse:
     return JsonResponse(response_data)
 
 
+def _kurva_s_harga_columnar(response_data: dict) -> dict:
+    """
+    Dense ``?format=columnar`` shape for api_kurva_s_harga_data.
+
+    ``series.<name>.breakdown`` is a week-major matrix of
+    ``len(weeks) x len(pekerjaan)`` costs: the value for ``weeks[w]`` and
+    ``pekerjaan[p]`` is at index ``w * len(pekerjaan) + p``.
+    """
+    meta = response_data['pekerjaanMeta']
+    pekerjaan_keys = list(meta.keys())
+    index = {key: i for i, key in enumerate(pekerjaan_keys)}
+    width = len(pekerjaan_keys)
+
+    weekly = response_data['weeklyData']
+    week_rows = {}
+    for weeks_list in weekly.values():
+        for week in weeks_list:
+            week_rows.setdefault(week['week_number'], week)
+    weeks = sorted(week_rows)
+
+    series = {}
+    for name, weeks_list in weekly.items():
+        by_week = {week['week_number']: week for week in weeks_list}
+        cost, cumulative_cost, cumulative_percent = [], [], []
+        breakdown = [0.0] * (len(weeks) * width)
+        for w, week_number in enumerate(weeks):
+            week = by_week.get(week_number)
+            if week is None:
+                cost.append(0.0)
+                cumulative_cost.append(cumulative_cost[-1] if cumulative_cost else 0.0)
+                cumulative_percent.append(cumulative_percent[-1] if cumulative_percent else 0.0)
+                continue
+            cost.append(week['cost'])
+            cumulative_cost.append(week['cumulative_cost'])
+            cumulative_percent.append(week['cumulative_percent'])
+            offset = w * width
+            for key, value in week['pekerjaan_breakdown'].items():
+                breakdown[offset + index[key]] = value
+        series[name] = {
+            'cost': cost,
+            'cumulative_cost': cumulative_cost,
+            'cumulative_percent': cumulative_percent,
+            'breakdown': breakdown,
+        }
+
+    meta_fields = ('kode', 'uraian', 'satuan', 'total_cost', 'budgeted_cost', 'volume', 'unit_price')
+    return {
+        'format': 'columnar',
+        'pekerjaan': [int(key) for key in pekerjaan_keys],
+        'weeks': weeks,
+        'weekStart': [week_rows[week]['week_start'] for week in weeks],
+        'weekEnd': [week_rows[week]['week_end'] for week in weeks],
+        'series': series,
+        'pekerjaanMeta': {
+            field: [meta[key].get(field) for key in pekerjaan_keys] for field in meta_fields
+        },
+        'summary': response_data['summary'],
+        'evm': response_data['evm'],
+        'timestamp': response_data['timestamp'],
+    }
+
+
+def _rekap_kebutuhan_weekly_columnar(response_data: dict) -> dict:
+    """
+    Dense ``?format=columnar`` shape for api_rekap_kebutuhan_weekly.
+
+    ``quantity`` is a week-major ``len(weeks) x len(items)`` matrix. The
+    per-pekerjaan breakdown is mostly empty, so it is sent as parallel
+    coordinate arrays (week index, item index, pekerjaan index, value).
+    """
+    weekly_list = response_data['weeklyData']
+
+    item_keys = {}
+    pekerjaan_keys = {}
+    for week in weekly_list:
+        for kategori in KEBUTUHAN_KATEGORI_ORDER:
+            for item in week['items'].get(kategori, []):
+                item_keys.setdefault((kategori, item['kode']), item)
+                for pkj_key in item['pekerjaan_breakdown']:
+                    pekerjaan_keys.setdefault(pkj_key, None)
+
+    ordered_items = sorted(
+        item_keys, key=lambda key: (KEBUTUHAN_KATEGORI_ORDER.index(key[0]), key[1])
+    )
+    item_index = {key: i for i, key in enumerate(ordered_items)}
+    pekerjaan = sorted(int(key) for key in pekerjaan_keys)
+    pekerjaan_index = {str(pkj_id): i for i, pkj_id in enumerate(pekerjaan)}
+
+    width = len(ordered_items)
+    quantity = [0.0] * (len(weekly_list) * width)
+    breakdown = {'week': [], 'item': [], 'pekerjaan': [], 'value': []}
+    for w, week in enumerate(weekly_list):
+        for kategori in KEBUTUHAN_KATEGORI_ORDER:
+            for item in week['items'].get(kategori, []):
+                i = item_index[(kategori, item['kode'])]
+                quantity[w * width + i] = item['quantity']
+                for pkj_key, value in item['pekerjaan_breakdown'].items():
+                    breakdown['week'].append(w)
+                    breakdown['item'].append(i)
+                    breakdown['pekerjaan'].append(pekerjaan_index[pkj_key])
+                    breakdown['value'].append(value)
+
+    return {
+        'format': 'columnar',
+        'weeks': [week['week_number'] for week in weekly_list],
+        'weekStart': [week['week_start'] for week in weekly_list],
+        'weekEnd': [week['week_end'] for week in weekly_list],
+        'items': {
+            'kategori': [key[0] for key in ordered_items],
+            'kode': [key[1] for key in ordered_items],
+            'uraian': [item_keys[key]['uraian'] for key in ordered_items],
+            'satuan': [item_keys[key]['satuan'] for key in ordered_items],
+        },
+        'pekerjaan': pekerjaan,
+        'quantity': quantity,
+        'breakdown': breakdown,
+        'summary': response_data['summary'],
+        'metadata': response_data['metadata'],
+    }
+
+
 @require_GET
 @login_required
 def api_kurva_s_harga_data(request: HttpRequest, project_id: int) -> JsonResponse:
@@ -5626,6 +5927,12 @@ def api_kurva_s_harga_data(request: HttpRequest, project_id: int) -> JsonRespons
         }
     }
 
+    Query Parameters:
+        format: 'columnar' returns dense arrays (pekerjaan list, week list,
+            flattened breakdown matrix) instead of per-week objects
+
+    Responses are gzip/Brotli compressed when the client accepts it.
+
     URL: /detail-project/api/v2/project/<project_id>/kurva-s-harga/
     Method: GET
     Auth: login_required
@@ -5925,7 +6232,9 @@ def api_kurva_s_harga_data(request: HttpRequest, project_id: int) -> JsonRespons
         f"total cost Rp {total_project_cost:,.2f}"
     )
 
-    return JsonResponse(response_data)
+    if wants_columnar(request):
+        response_data = _kurva_s_harga_columnar(response_data)
+    return compact_json_response(request, response_data)
 
 
 @require_GET
@@ -5984,6 +6293,12 @@ def api_rekap_kebutuhan_weekly(request: HttpRequest, project_id: int) -> JsonRes
         }
     }
 
+    Query Parameters:
+        format: 'columnar' returns dense arrays (week list, item columns,
+            flattened quantity matrix, breakdown coordinates)
+
+    Responses are gzip/Brotli compressed when the client accepts it.
+
     URL: /detail-project/api/v2/project/<project_id>/rekap-kebutuhan-weekly/
     Method: GET
     Auth: login_required
@@ -6009,7 +6324,7 @@ def api_rekap_kebutuhan_weekly(request: HttpRequest, project_id: int) -> JsonRes
         signature = tuple(list(base_sig) + [weekly_ts.isoformat() if weekly_ts else "0"])
         cached = cache.get(cache_key)
         if cached and cached.get("sig") == signature:
-            return JsonResponse(cached.get("data", {}))
+            return _rekap_kebutuhan_weekly_response(request, cached.get("data", {}))
     except Exception:
         logger.warning(
             f"[Rekap Kebutuhan API] Cache precheck failed for project {project_id}",
@@ -6181,8 +6496,13 @@ def api_rekap_kebutuhan_weekly(request: HttpRequest, project_id: int) -> JsonRes
     if signature is not None:
         cache.set(cache_key, {"sig": signature, "data": response_data}, 300)
 
-    cache.set(cache_key, {"sig": signature, "data": response_data}, 300)
-    return JsonResponse(response_data)
+    return _rekap_kebutuhan_weekly_response(request, response_data)
+
+
+def _rekap_kebutuhan_weekly_response(request: HttpRequest, response_data: dict) -> JsonResponse:
+    if wants_columnar(request) and response_data:
+        response_data = _rekap_kebutuhan_weekly_columnar(response_data)
+    return compact_json_response(request, response_data)
 
 
 # ============================================================================
@@ -6191,6 +6511,7 @@ def api_rekap_kebutuhan_weekly(request: HttpRequest, project_id: int) -> JsonRes
 
 @require_GET
 @login_required
+@project_etag('chart-data')
 def api_chart_data(request: HttpRequest, project_id: int) -> JsonResponse:
     """
     Unified Chart Data API - Single Source of Truth for all chart views.
@@ -22,6 +22,7 @@ from .models import (
     SubKlasifikasi,
 )
 from .services import (
+    bump_project_data_version,
     compute_kebutuhan_items,
     compute_kebutuhan_timeline,
     summarize_kebutuhan_rows,
@@ -283,6 +284,8 @@ def api_reorder_tahapan(request, project_id):
                     id=tahapan_id,
                     project=project
                 ).update(urutan=idx)
+            # queryset.update() tidak memicu signal
+            bump_project_data_version(project)
         
         return JsonResponse({
             'ok': True,
@@ -1048,6 +1051,8 @@ def api_regenerate_tahapan(request, project_id):
 
         # Bulk create
         created_tahapan = TahapPelaksanaan.objects.bulk_create(new_tahapan)
+        # bulk_create tidak memicu signal: ETag list tahapan harus ikut berubah
+        bump_project_data_version(project)
 
         # STEP 5: Convert assignments (if requested)
         assignments_converted = 0
@@ -1359,6 +1364,7 @@ def _convert_assignments(old_assignments, new_tahapan_list, project):
     # Bulk create new assignments
     if new_assignments_to_create:
         PekerjaanTahapan.objects.bulk_create(new_assignments_to_create)
+        bump_project_data_version(project)
 
     return len(new_assignments_to_create)
 
@@ -35,6 +35,7 @@ from detail_project.progress_utils import (
     get_week_date_range,
     sync_weekly_to_tahapan,
 )
+from detail_project.services import bump_project_data_version
 
 # Import helper from original views
 from detail_project.views_api_tahapan import _owner_or_404
@@ -941,6 +942,8 @@ def api_regenerate_tahapan_v2(request, project_id):
 
         # Bulk create tahapan
         created_tahapan = TahapPelaksanaan.objects.bulk_create(new_tahapan)
+        # bulk_create tidak memicu signal: ETag list tahapan harus ikut berubah
+        bump_project_data_version(project)
 
         # STEP 3: Sync assignments from weekly canonical storage
         # This reads PekerjaanProgressWeekly and creates PekerjaanTahapan assignments
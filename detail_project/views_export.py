@@ -7,6 +7,7 @@ from django.http import JsonResponse, FileResponse, Http404
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_http_methods
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django.utils import timezone
 from django.core.files.base import ContentFile
 from django.db import transaction
@@ -14,6 +15,7 @@ from django.db import transaction
 import json
 import base64
 import logging
+import uuid
 
 from accounts.mixins import api_export_excel_word_required, api_pdf_export_allowed
 
@@ -22,6 +24,15 @@ from .models_export import ExportSession, ExportPage
 logger = logging.getLogger(__name__)
 
 
+EXPORT_CONTENT_TYPES = {
+    'pdf': 'application/pdf',
+    'word': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'csv': 'text/csv; charset=utf-8',
+    'json': 'application/json',
+}
+
+
 def _owner_project_or_404(project_id, user):
     from dashboard.models import Project
     return get_object_or_404(Project, id=project_id, owner=user)
@@ -41,12 +52,16 @@ def _enforce_export_tier(request, format_type, metadata=None, options=None):
 
     - PDF: PRO clean, EXPIRED with watermark, TRIAL blocked by decorator.
     - Word/Excel: PRO only.
+    - CSV/JSON: same access as the synchronous CSV/JSON endpoints (no tier check).
     """
     normalized_format = (format_type or '').lower()
 
     if normalized_format in (ExportSession.FORMAT_WORD, ExportSession.FORMAT_XLSX):
         return _require_pro_for_excel_word(request)
 
+    if normalized_format in (ExportSession.FORMAT_CSV, ExportSession.FORMAT_JSON):
+        return None
+
     if normalized_format == ExportSession.FORMAT_PDF:
         pdf_ctx = getattr(request, 'pdf_export_context', {})
         if pdf_ctx.get('add_watermark'):
@@ -60,7 +75,7 @@ def _enforce_export_tier(request, format_type, metadata=None, options=None):
         return None
 
     return JsonResponse({
-        'error': 'Invalid format. Must be pdf, word, or xlsx'
+        'error': 'Invalid format. Must be pdf, word, xlsx, csv, or json'
     }, status=400)
 
 
@@ -716,14 +731,19 @@ def export_download(request, export_id):
         if not session.output_file:
             raise Http404("Export file not found")
 
+        if session.is_async and session.is_expired:
+            raise Http404("Export expired")
+
         # Return file response
         response = FileResponse(
             session.output_file.open('rb'),
-            content_type='application/octet-stream'
+            content_type=session.metadata.get('content_type') or 'application/octet-stream'
         )
 
-        # Set filename for download
-        filename = f"{session.project_name or 'export'}_{session.report_type}.{session.format_type}"
+        # Set filename for download (async exports keep the exporter's filename)
+        filename = session.metadata.get('filename') or (
+            f"{session.project_name or 'export'}_{session.report_type}.{session.format_type}"
+        )
         filename = filename.replace(' ', '_')  # Remove spaces
         response['Content-Disposition'] = f'attachment; filename="{filename}"'
 
@@ -775,6 +795,14 @@ def export_status(request, export_id):
             'estimatedPages': session.estimated_pages,
         }
 
+        if session.is_async:
+            response_data.update({
+                'message': session.progress_message,
+                'taskId': session.task_id,
+                'exportType': session.export_type,
+                'expiresAt': session.expires_at.isoformat(),
+            })
+
         # Add download URL if completed
         if session.status == ExportSession.STATUS_COMPLETED:
             response_data['downloadUrl'] = f'/api/export/download/{export_id}'
@@ -794,51 +822,83 @@ def export_status(request, export_id):
 # Async Export API Endpoints (Celery-based)
 # ============================================================================
 
+# Celery-like state reported for a session-backed async export
+_SESSION_TASK_STATES = {
+    ExportSession.STATUS_INIT: 'PENDING',
+    ExportSession.STATUS_UPLOADING: 'PENDING',
+    ExportSession.STATUS_PROCESSING: 'PROCESSING',
+    ExportSession.STATUS_COMPLETED: 'SUCCESS',
+    ExportSession.STATUS_FAILED: 'FAILURE',
+    ExportSession.STATUS_EXPIRED: 'EXPIRED',
+}
+
+
+def _async_session_for_task(task_id, user):
+    """
+    ExportSession created by api_start_export_async for this task.
+
+    Returns None for tasks started without a session (older clients); raises
+    Http404 when the session belongs to another user.
+    """
+    session = ExportSession.objects.filter(task_id=task_id).first()
+    if session is not None and session.user_id != user.id:
+        raise Http404("Export not found")
+    return session
+
+
 @login_required
 @api_pdf_export_allowed
 @require_http_methods(["POST"])
 def api_start_export_async(request, project_id):
     """
-    Start async export task for PDF/Word generation.
+    Start async export task for any export type and format.
     
     POST /api/project/{project_id}/export-async/
     Body:
     {
-        "export_type": "rekap-rab" | "jadwal-pekerjaan" | "harga-items" | 
-                       "rincian-ahsp" | "rekap-kebutuhan" | "volume-pekerjaan",
-        "format": "pdf" | "word",
-        "options": {...}  // Optional export configuration
+        "export_type": "rekap-rab" | "jadwal-pekerjaan" | "jadwal-professional" |
+                       "harga-items" | "rincian-ahsp" | "rekap-kebutuhan" |
+                       "volume-pekerjaan",
+        "format": "pdf" | "word" | "xlsx" | "csv" | "json",
+        "options": {...}  // Keyword arguments of the export, e.g.
+                          // {"report_type": "monthly", "months": [1, 2]}
     }
     
     Returns:
     {
         "task_id": "abc-123-def",
-        "status_url": "/api/export-status/async/abc-123-def/"
+        "session_id": "uuid",
+        "status_url": ".../api/export-status/async/abc-123-def/",
+        "download_url": ".../api/export-download/async/abc-123-def/"
     }
     """
     try:
         # Validate project access
-        _owner_project_or_404(project_id, request.user)
+        project = _owner_project_or_404(project_id, request.user)
         
         # Parse request
         data = json.loads(request.body)
         export_type = data.get('export_type')
         format_type = data.get('format', 'pdf')
-        options = data.get('options', {})
+        options = data.get('options') or {}
+        if not isinstance(options, dict):
+            return JsonResponse({'error': 'options must be an object'}, status=400)
         
+        from detail_project.exports.export_manager import ExportManager
+        from detail_project.tasks import ASYNC_EXPORT_FORMATS, generate_export_async
+
         # Validate export_type
-        valid_types = [
-            'rekap-rab', 'jadwal-pekerjaan', 'harga-items',
-            'rincian-ahsp', 'rekap-kebutuhan', 'volume-pekerjaan'
-        ]
+        valid_types = list(ExportManager.EXPORT_METHODS)
         if export_type not in valid_types:
             return JsonResponse({
                 'error': f'Invalid export_type. Must be one of: {", ".join(valid_types)}'
             }, status=400)
         
         # Validate format
-        if format_type not in ['pdf', 'word']:
-            return JsonResponse({'error': 'Invalid format. Must be pdf or word'}, status=400)
+        if format_type not in ASYNC_EXPORT_FORMATS:
+            return JsonResponse({
+                'error': f'Invalid format. Must be one of: {", ".join(ASYNC_EXPORT_FORMATS)}'
+            }, status=400)
         
         access_error = _enforce_export_tier(
             request=request,
@@ -848,25 +908,47 @@ def api_start_export_async(request, project_id):
         if access_error:
             return access_error
 
-        from detail_project.tasks import generate_export_async
+        report_type = options.get('report_type')
+        if export_type != 'jadwal-professional' or report_type not in dict(ExportSession.REPORT_CHOICES):
+            report_type = ExportSession.REPORT_STANDARD
+
+        # Task id is fixed up front so the session can be looked up by it
+        # before the worker picks the task up
+        task_id = str(uuid.uuid4())
+        session = ExportSession.objects.create(
+            user=request.user,
+            project=project,
+            export_type=export_type,
+            task_id=task_id,
+            report_type=report_type,
+            format_type=format_type,
+            project_name=project.nama or '',
+            metadata={'options': {k: v for k, v in options.items() if k != 'attachments'}},
+        )
         
         # Start Celery task
         logger.info(
             f"Starting async export: project={project_id}, type={export_type}, "
-            f"format={format_type}, user={request.user.id}"
+            f"format={format_type}, user={request.user.id}, session={session.export_id}"
         )
         
-        task = generate_export_async.delay(
-            project_id=project_id,
-            export_type=export_type,
-            format_type=format_type,
-            user_id=request.user.id,
-            options=options
+        generate_export_async.apply_async(
+            kwargs={
+                'project_id': project_id,
+                'export_type': export_type,
+                'format_type': format_type,
+                'user_id': request.user.id,
+                'options': options,
+                'session_id': str(session.export_id),
+            },
+            task_id=task_id,
         )
         
         return JsonResponse({
-            'task_id': task.id,
-            'status_url': f'/api/export-status/async/{task.id}/'
+            'task_id': task_id,
+            'session_id': str(session.export_id),
+            'status_url': reverse('detail_project:api_export_status_async', args=[task_id]),
+            'download_url': reverse('detail_project:api_export_download_async', args=[task_id]),
         }, status=202)  # 202 Accepted
     
     except json.JSONDecodeError:
@@ -887,24 +969,56 @@ def api_export_status_async(request, task_id):
     Check status of async export task.
     
     GET /api/export-status/async/{task_id}/
+
+    Tasks started with an ExportSession (owner-only) are answered from the
+    session; other task ids fall back to the Celery result backend.
     
     Returns:
     {
         "task_id": "abc-123-def",
-        "status": "PENDING" | "PROCESSING" | "SUCCESS" | "FAILURE",
+        "status": "PENDING" | "PROCESSING" | "SUCCESS" | "FAILURE" | "EXPIRED",
         "progress": {
-            "status": "Generating rekap-rab PDF...",
+            "status": "Menyusun halaman 3/10",
             "progress": 45,
             "total": 100
         },  // Only if PROCESSING
         "result": {
-            "file_path": "/path/to/export.pdf",
             "file_size": 1024000,
-            "download_url": "/api/export-download/async/abc-123-def/"
+            "download_url": "/api/export-download/async/abc-123-def/",
+            "expires_at": "2026-01-01T10:00:00+07:00"
         },  // Only if SUCCESS
         "error": "Error message"  // Only if FAILURE
     }
     """
+    try:
+        session = _async_session_for_task(task_id, request.user)
+    except Http404:
+        return JsonResponse({'error': 'Export not found'}, status=404)
+
+    if session is not None:
+        state = _SESSION_TASK_STATES.get(session.status, 'PENDING')
+        response_data = {
+            'task_id': task_id,
+            'session_id': str(session.export_id),
+            'status': state,
+            'progress': {
+                'status': session.progress_message,
+                'progress': session.progress,
+                'total': 100,
+            },
+        }
+        if state == 'SUCCESS':
+            response_data['result'] = {
+                'export_type': session.export_type,
+                'format': session.format_type,
+                'file_size': session.file_size,
+                'download_url': reverse('detail_project:api_export_download_async', args=[task_id]),
+                'expires_at': session.expires_at.isoformat(),
+            }
+        elif state == 'FAILURE':
+            response_data['error'] = session.error_message
+        return JsonResponse(response_data)
+
     from celery.result import AsyncResult
     
     try:
@@ -932,7 +1046,7 @@ def api_export_status_async(request, task_id):
                 'export_type': result.get('export_type'),
                 'format': result.get('format'),
                 'file_size': result.get('file_size'),
-                'download_url': f'/api/export-download/async/{task_id}/'
+                'download_url': reverse('detail_project:api_export_download_async', args=[task_id]),
             }
         
         elif task.state == 'FAILURE':
@@ -959,12 +1073,36 @@ def api_export_download_async(request, task_id):
     
     GET /api/export-download/async/{task_id}/
     
-    Returns: File download (PDF or Word)
+    Returns: File download (any async export format)
     """
-    from celery.result import AsyncResult
     import os
-    
+
     try:
+        session = _async_session_for_task(task_id, request.user)
+        if session is not None:
+            access_error = _enforce_export_tier(request, session.format_type)
+            if access_error:
+                return access_error
+            if session.status == ExportSession.STATUS_EXPIRED or session.is_expired:
+                return JsonResponse({'error': 'Export expired'}, status=410)
+            if session.status != ExportSession.STATUS_COMPLETED:
+                return JsonResponse({
+                    'error': f'Export not ready. Status: {_SESSION_TASK_STATES.get(session.status)}'
+                }, status=400)
+            if not session.output_file:
+                raise Http404("Export file not found")
+            response = FileResponse(
+                session.output_file.open('rb'),
+                content_type=session.metadata.get('content_type')
+                or EXPORT_CONTENT_TYPES.get(session.format_type, 'application/octet-stream'),
+            )
+            filename = session.metadata.get('filename') or os.path.basename(session.output_file.name)
+            response['Content-Disposition'] = f'attachment; filename="{filename}"'
+            logger.info(f"Async export downloaded: task_id={task_id}, session={session.export_id}")
+            return response
+
+        from celery.result import AsyncResult
+
         # Get task result
         task = AsyncResult(task_id)
         
@@ -986,7 +1124,7 @@ def api_export_download_async(request, task_id):
         access_error = _enforce_export_tier(request, format_type)
         if access_error:
             return access_error
-        content_type = 'application/pdf' if format_type == 'pdf' else 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+        content_type = EXPORT_CONTENT_TYPES.get(format_type, 'application/octet-stream')
         
         # Return file
         response = FileResponse(
@@ -7,12 +7,15 @@ import json
 import logging
 import os
 
-from django.http import JsonResponse
-from django.core.cache import cache
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.shortcuts import render
 from django.views.decorators.csrf import csrf_exempt
+
+from config import rate_limiter, sampling_profiler
 from .decorators import get_deprecation_metrics, reset_deprecation_metrics
+from .stale_cache import get_swr_metrics, reset_swr_metrics
 from .utils.performance import (
     get_metrics_summary,
     reset_metrics,
@@ -152,6 +155,9 @@ def api_performance_metrics(request):
                     "hit_rate": 90.0
                 }
             },
+            "rekap_cache": {"fresh_hit": 300, "stale_serve": 12, "lock_wait": 3, ...},
+            "rate_limit": {"write": {"allowed": 840, "denied": 2}, ...},
+            "profiler": {"detail_project:export_jadwal_pekerjaan_professional": {...}},
             "database": {...},
             "slow_queries": [...],
             "query_breakdown": {...}
@@ -167,7 +173,10 @@ def api_performance_metrics(request):
         'summary': summary,
         'database': database,
         'slow_queries': slow_queries[:10],  # Top 10 slowest
-        'query_breakdown': query_breakdown
+        'query_breakdown': query_breakdown,
+        'rekap_cache': get_swr_metrics(),
+        'rate_limit': rate_limiter.get_rate_limit_metrics(),
+        'profiler': sampling_profiler.get_profile_summary(),
     })
 
 
@@ -199,6 +208,9 @@ def api_reset_performance_metrics(request):
         }, status=405)
 
     reset_metrics()
+    reset_swr_metrics()
+    rate_limiter.reset_rate_limit_metrics()
+    sampling_profiler.reset_profiles()
 
     return JsonResponse({
         'ok': True,
@@ -206,6 +218,32 @@ def api_reset_performance_metrics(request):
     })
 
 
+@login_required
+@user_passes_test(is_staff_or_superuser)
+def api_profiler_stacks(request):
+    """
+    Collapsed stacks dari sampling profiler (SamplingProfilerMiddleware).
+
+    GET ?format=json          -> ringkasan per endpoint
+    GET ?endpoint=<view_name> -> text/plain "frame;frame;frame count" untuk
+                                 satu endpoint (tanpa endpoint: semua, dengan
+                                 nama endpoint sebagai root frame)
+
+    Output text bisa langsung dipakai flamegraph.pl / speedscope / inferno.
+    """
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'ok': True,
+            'enabled': getattr(settings, 'SAMPLING_PROFILER_ENABLED', False),
+            'interval_ms': getattr(settings, 'SAMPLING_PROFILER_INTERVAL_MS', None),
+            'threshold_ms': getattr(settings, 'SAMPLING_PROFILER_THRESHOLD_MS', None),
+            'endpoints': sampling_profiler.get_profile_summary(),
+        })
+
+    stacks = sampling_profiler.collapsed_stacks(request.GET.get('endpoint') or None)
+    return HttpResponse(stacks, content_type='text/plain; charset=utf-8')
+
+
 @csrf_exempt
 def api_report_client_metric(request):
     """
@@ -250,15 +288,13 @@ def api_report_client_metric(request):
     else:
         client_ip = request.META.get("REMOTE_ADDR", "unknown")
 
-    rate_key = f"metrics_rate:{client_ip}"
-    current_count = cache.get(rate_key, 0)
-    if current_count >= rate_limit:
+    limit = rate_limiter.hit(f"metrics:{client_ip}", rate_limit, rate_window, category='client_metrics')
+    if not limit.allowed:
         return JsonResponse({
             'ok': False,
             'error': 'Rate limit exceeded',
-            'retry_after': rate_window
+            'retry_after': limit.retry_after
         }, status=429)
-    cache.set(rate_key, current_count + 1, rate_window)
 
     try:
         body = request.body.decode("utf-8") if request.body else "{}"
@@ -0,0 +1,388 @@
+"""
+Server-side volume formula engine (port of static/.../vol_formula_engine.js).
+
+Formula di ``VolumeFormulaState.raw`` dievaluasi dengan grammar yang sama
+dengan browser: angka lokal (``1.000,25``), identifier parameter
+(case-insensitive), operator ``+ - * / ^``, fungsi MIN/MAX/SUM/AVG/ABS/
+ROUND/CEIL/FLOOR/POW dan konstanta PI/E. Tidak memakai ``eval``.
+
+- :func:`compile_formula` mem-parse sekali ke RPN dan di-cache per teks formula.
+- :func:`build_dependency_graph` memetakan parameter -> pekerjaan yang memakainya.
+- :func:`recompute_dependent_volumes` menghitung ulang hanya volume pekerjaan
+  yang bergantung pada parameter yang berubah, lalu menyimpannya dalam satu
+  bulk upsert.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from decimal import ROUND_CEILING, ROUND_FLOOR, ROUND_HALF_UP, Decimal, InvalidOperation
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from .numeric import DECIMAL_SPEC, quantize_half_up
+
+logger = logging.getLogger(__name__)
+
+FORMULA_CACHE_SIZE = 4096
+
+_PRECEDENCE = {'^': 4, '*': 3, '/': 3, '+': 2, '-': 2}
+_CONSTS = {
+    'pi': Decimal('3.141592653589793238462643383'),
+    'e': Decimal('2.718281828459045235360287471'),
+}
+_NUMBER_RE = re.compile(r'[0-9_]|[.,](?=[0-9])')
+_IDENT_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+
+
+class FormulaError(ValueError):
+    """Formula tidak valid atau tidak bisa dievaluasi (pesan untuk user)."""
+
+
+@dataclass(frozen=True)
+class CompiledFormula:
+    source: str
+    rpn: Tuple[Tuple[str, object], ...]
+    variables: FrozenSet[str]  # identifier (lowercase) yang dirujuk formula
+
+
+# ---------------------------------------------------------------------------
+# Parse
+# ---------------------------------------------------------------------------
+
+def _normalize_number(raw: str) -> Decimal:
+    s = raw.replace('_', '')
+    if ',' in s and '.' in s:
+        s = s.replace('.', '').replace(',', '.', 1)
+    elif ',' in s:
+        s = s.replace(',', '.', 1)
+    try:
+        return Decimal(s)
+    except InvalidOperation:
+        raise FormulaError('Angka tidak valid')
+
+
+def _tokenize(expr: str) -> List[Tuple[str, object]]:
+    s = expr.strip()
+    if s.startswith('='):
+        s = s[1:]
+    tokens: List[Tuple[str, object]] = []
+    prev = None
+    i = 0
+    while i < len(s):
+        ch = s[i]
+        if ch.isspace():
+            i += 1
+            continue
+        nxt = s[i + 1] if i + 1 < len(s) else ''
+        if ch.isdigit() or (ch in '.,' and nxt.isdigit()):
+            j = i
+            while j < len(s) and _NUMBER_RE.match(s, j):
+                j += 1
+            tokens.append(('num', _normalize_number(s[i:j])))
+            prev = 'num'
+            i = j
+            continue
+        m = _IDENT_RE.match(s, i)
+        if m:
+            name = m.group(0)
+            k = m.end()
+            while k < len(s) and s[k].isspace():
+                k += 1
+            prev = 'func' if k < len(s) and s[k] == '(' else 'id'
+            tokens.append((prev, name))
+            i = m.end()
+            continue
+        if ch in '(),':
+            prev = {'(': 'lp', ')': 'rp', ',': 'comma'}[ch]
+            tokens.append((prev, ch))
+            i += 1
+            continue
+        if ch in '+-*/^':
+            if prev in (None, 'op', 'lp', 'comma', 'func') and ch in '+-':
+                if ch == '-':  # unary minus -> "0 -"
+                    tokens.append(('num', Decimal(0)))
+                    tokens.append(('op', '-'))
+                    prev = 'op'
+                i += 1
+                continue
+            tokens.append(('op', ch))
+            prev = 'op'
+            i += 1
+            continue
+        snippet = s[max(0, i - 5):i + 5]
+        raise FormulaError(f'Token tidak dikenal di posisi {i + 1}: "{snippet}"')
+    return tokens
+
+
+def _to_rpn(tokens) -> List[Tuple[str, object]]:
+    output: List[Tuple[str, object]] = []
+    ops: List[Tuple[str, object]] = []
+    argc_stack: List[Optional[int]] = []
+
+    for kind, value in tokens:
+        if kind in ('num', 'id'):
+            output.append((kind, value))
+        elif kind == 'func':
+            ops.append((kind, value))
+        elif kind == 'comma':
+            while ops and ops[-1][0] != 'lp':
+                output.append(ops.pop())
+            if not ops or not argc_stack or argc_stack[-1] is None:
+                raise FormulaError('Koma di luar pemanggilan fungsi')
+            argc_stack[-1] += 1
+        elif kind == 'op':
+            while ops:
+                top_kind, top_value = ops[-1]
+                if top_kind == 'op':
+                    if value == '^':
+                        pop = _PRECEDENCE[value] < _PRECEDENCE[top_value]
+                    else:
+                        pop = _PRECEDENCE[value] <= _PRECEDENCE[top_value]
+                    if not pop:
+                        break
+                elif top_kind != 'func':
+                    break
+                output.append(ops.pop())
+            ops.append((kind, value))
+        elif kind == 'lp':
+            argc_stack.append(1 if ops and ops[-1][0] == 'func' else None)
+            ops.append((kind, value))
+        elif kind == 'rp':
+            while ops and ops[-1][0] != 'lp':
+                output.append(ops.pop())
+            if not ops:
+                raise FormulaError('Kurung tutup tidak seimbang')
+            ops.pop()
+            argc = argc_stack.pop()
+            if ops and ops[-1][0] == 'func':
+                output.append(('call', (ops.pop()[1], argc or 0)))
+
+    while ops:
+        kind, _ = ops.pop()
+        if kind in ('lp', 'rp'):
+            raise FormulaError('Kurung tidak seimbang')
+        if kind == 'func':
+            raise FormulaError('Pemanggilan fungsi tanpa kurung tutup')
+        output.append((kind, _))
+    return output
+
+
+@lru_cache(maxsize=FORMULA_CACHE_SIZE)
+def compile_formula(expr: str) -> CompiledFormula:
+    """Parse formula sekali; hasil di-cache per teks formula (lintas project/request)."""
+    if expr is None or not str(expr).strip():
+        raise FormulaError('Ekspresi kosong')
+    rpn = tuple(_to_rpn(_tokenize(str(expr))))
+    variables = frozenset(str(value).lower() for kind, value in rpn if kind == 'id')
+    return CompiledFormula(source=str(expr), rpn=rpn, variables=variables)
+
+
+# ---------------------------------------------------------------------------
+# Evaluate
+# ---------------------------------------------------------------------------
+
+def _round_half_up(x: Decimal, n: Decimal = Decimal(0)) -> Decimal:
+    return x.quantize(Decimal(1).scaleb(-int(n)), rounding=ROUND_HALF_UP)
+
+
+def _need_args(name, args, minimum=1):
+    if len(args) < minimum:
+        raise FormulaError(f'{name.upper()} membutuhkan ≥{minimum} argumen')
+
+
+def _call(name: str, args: List[Decimal]) -> Decimal:
+    fn = name.lower()
+    if fn in ('min', 'max', 'avg'):
+        _need_args(fn, args)
+    if fn == 'min':
+        return min(args)
+    if fn == 'max':
+        return max(args)
+    if fn == 'sum':
+        return sum(args, Decimal(0))
+    if fn == 'avg':
+        return sum(args, Decimal(0)) / len(args)
+    if fn in ('abs', 'ceil', 'floor', 'round'):
+        _need_args(fn, args)
+        x = args[0]
+        if fn == 'abs':
+            return abs(x)
+        if fn == 'ceil':
+            return x.to_integral_value(rounding=ROUND_CEILING)
+        if fn == 'floor':
+            return x.to_integral_value(rounding=ROUND_FLOOR)
+        return _round_half_up(x, args[1] if len(args) > 1 else Decimal(0))
+    if fn == 'pow':
+        _need_args(fn, args, 2)
+        return args[0] ** args[1]
+    raise FormulaError(f'Fungsi tidak dikenal: {name}')
+
+
+def _volume_limit() -> Decimal:
+    """Batas eksklusif VolumePekerjaan.quantity (10 ** digit bulat max_digits)."""
+    from .models import VolumePekerjaan
+
+    field = VolumePekerjaan._meta.get_field("quantity")
+    return Decimal(10) ** (field.max_digits - field.decimal_places)
+
+
+def evaluate_formula(compiled: CompiledFormula, variables: Dict[str, Decimal]) -> Decimal:
+    """
+    Evaluasi formula terkompilasi. ``variables`` dikunci nama lowercase.
+
+    Hasil di-clamp ≥ 0 dan dibulatkan HALF_UP ke dp volume, sama seperti UI.
+    Semua error aritmetika (overflow, eksponen raksasa, presisi quantize) dan
+    hasil di luar jangkauan kolom ``quantity`` dilaporkan sebagai FormulaError.
+    """
+    stack: List[Decimal] = []
+    try:
+        for kind, value in compiled.rpn:
+            if kind == 'num':
+                stack.append(value)
+            elif kind == 'id':
+                name = str(value).lower()
+                if name in variables:
+                    stack.append(Decimal(variables[name]))
+                elif name in _CONSTS:
+                    stack.append(_CONSTS[name])
+                else:
+                    raise FormulaError(f'Variabel tidak dikenal: {value}')
+            elif kind == 'op':
+                if len(stack) < 2:
+                    raise FormulaError('Operator kekurangan operand')
+                b, a = stack.pop(), stack.pop()
+                if value == '+':
+                    stack.append(a + b)
+                elif value == '-':
+                    stack.append(a - b)
+                elif value == '*':
+                    stack.append(a * b)
+                elif value == '/':
+                    if b == 0:
+                        raise FormulaError('Pembagian dengan nol')
+                    stack.append(a / b)
+                else:
+                    stack.append(a ** b)
+            else:
+                name, argc = value
+                if len(stack) < argc:
+                    raise FormulaError(f'Fungsi {name} kekurangan argumen')
+                args = stack[len(stack) - argc:] if argc else []
+                del stack[len(stack) - argc:]
+                stack.append(_call(name, args))
+
+        if len(stack) != 1:
+            raise FormulaError('Ekspresi tidak valid')
+        result = stack[0]
+        if not result.is_finite():
+            raise FormulaError('Hasil formula tidak valid')
+        result = quantize_half_up(max(result, Decimal(0)), DECIMAL_SPEC["VOL"])
+    except ArithmeticError as exc:
+        # decimal.DecimalException (Overflow, InvalidOperation, ...), OverflowError, ZeroDivisionError
+        raise FormulaError('Hasil formula tidak valid') from exc
+
+    if result >= _volume_limit():
+        raise FormulaError('Hasil formula melebihi batas volume')
+    return result
+
+
+def is_formula(raw: str, is_fx: bool) -> bool:
+    """Sama dengan isFormulaMode() di volume_pekerjaan.js."""
+    raw = (raw or '').strip()
+    return bool(raw) and (bool(is_fx) or raw.startswith('='))
+
+
+# ---------------------------------------------------------------------------
+# Dependency graph + recompute
+# ---------------------------------------------------------------------------
+
+def build_dependency_graph(states: Iterable[Tuple[int, str, bool]]):
+    """
+    Dari (pekerjaan_id, raw, is_fx) bangun:
+      - ``compiled``: pekerjaan_id -> CompiledFormula
+      - ``dependents``: nama parameter (lowercase) -> set pekerjaan_id
+      - ``errors``: pekerjaan_id -> pesan parse error
+    """
+    compiled: Dict[int, CompiledFormula] = {}
+    dependents: Dict[str, Set[int]] = {}
+    errors: Dict[int, str] = {}
+    for pekerjaan_id, raw, is_fx in states:
+        if not is_formula(raw, is_fx):
+            continue
+        try:
+            formula = compile_formula(raw.strip())
+        except FormulaError as exc:
+            errors[pekerjaan_id] = str(exc)
+            continue
+        compiled[pekerjaan_id] = formula
+        for name in formula.variables:
+            dependents.setdefault(name, set()).add(pekerjaan_id)
+    return compiled, dependents, errors
+
+
+def recompute_dependent_volumes(project, changed_names: Iterable[str]) -> Dict[str, object]:
+    """
+    Hitung ulang VolumePekerjaan.quantity untuk pekerjaan yang formulanya
+    merujuk parameter di ``changed_names`` dan simpan yang berubah dalam satu
+    bulk upsert.
+
+    Returns:
+        {"changed": {pekerjaan_id: Decimal}, "errors": {pekerjaan_id: pesan}}
+    """
+    from .models import ProjectParameter, VolumeFormulaState, VolumePekerjaan
+    from .services import invalidate_after_bulk_write
+
+    changed_names = {str(n).lower() for n in changed_names}
+    result = {"changed": {}, "errors": {}}
+    if not changed_names:
+        return result
+
+    states = (
+        VolumeFormulaState.objects
+        .filter(project=project)
+        .exclude(raw="")
+        .values_list("pekerjaan_id", "raw", "is_fx")
+    )
+    compiled, dependents, _ = build_dependency_graph(states)
+    affected = set()
+    for name in changed_names:
+        affected |= dependents.get(name, set())
+    if not affected:
+        return result
+
+    variables = {
+        name.lower(): value
+        for name, value in ProjectParameter.objects.filter(project=project).values_list("name", "value")
+    }
+    current = dict(
+        VolumePekerjaan.objects
+        .filter(project=project, pekerjaan_id__in=affected)
+        .values_list("pekerjaan_id", "quantity")
+    )
+
+    for pekerjaan_id in sorted(affected):
+        try:
+            qty = evaluate_formula(compiled[pekerjaan_id], variables)
+        except FormulaError as exc:
+            result["errors"][pekerjaan_id] = str(exc)
+            continue
+        if current.get(pekerjaan_id) != qty:
+            result["changed"][pekerjaan_id] = qty
+
+    if result["changed"]:
+        VolumePekerjaan.objects.bulk_create(
+            [
+                VolumePekerjaan(project=project, pekerjaan_id=pid, quantity=qty)
+                for pid, qty in result["changed"].items()
+            ],
+            update_conflicts=True,
+            unique_fields=["project", "pekerjaan"],
+            update_fields=["quantity", "updated_at"],
+        )
+        invalidate_after_bulk_write(project)
+        logger.info(
+            "[VOLUME_FORMULA] project=%s recomputed %s volume(s) for params %s",
+            project.id, len(result["changed"]), sorted(changed_names),
+        )
+    return result
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from simple_history.admin import SimpleHistoryAdmin
 
-from .models import AHSPReferensi, KodeItemReferensi, RincianReferensi
+from .models import AHSPReferensi, ImportHistoryBatch, KodeItemReferensi, RincianReferensi
 
 @admin.register(AHSPReferensi)
 class AHSPReferensiAdmin(SimpleHistoryAdmin):
@@ -9,7 +9,7 @@ class AHSPReferensiAdmin(SimpleHistoryAdmin):
     search_fields = ("kode_ahsp", "nama_ahsp", "klasifikasi", "sub_klasifikasi")
     list_filter = ("sumber",)
     ordering = ("kode_ahsp",)
-    history_list_display = ("kode_ahsp", "nama_ahsp", "sumber")
+    history_list_display = ("kode_ahsp", "nama_ahsp", "sumber", "history_batch")
 
 @admin.register(RincianReferensi)
 class RincianReferensiAdmin(SimpleHistoryAdmin):
@@ -28,3 +28,12 @@ class KodeItemReferensiAdmin(SimpleHistoryAdmin):
     search_fields = ("kode_item", "uraian_item", "satuan_item")
     ordering = ("kode_item",)
     history_list_display = ("kategori", "kode_item", "satuan_item")
+
+
+@admin.register(ImportHistoryBatch)
+class ImportHistoryBatchAdmin(admin.ModelAdmin):
+    list_display = ("id", "source", "source_file", "user", "created_at", "counts")
+    list_filter = ("source",)
+    search_fields = ("source_file", "user__username")
+    ordering = ("-created_at",)
+    readonly_fields = ("source", "source_file", "user", "created_at", "counts")
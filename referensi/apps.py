@@ -19,6 +19,13 @@ class ReferensiConfig(AppConfig):
         PHASE 3: Register cache invalidation signals.
         """
         import referensi.signals  # noqa: F401
+        from django.core.signals import request_finished
+        from referensi.services.audit_buffer import flush_audit_buffer_on_request_finished
+
+        request_finished.connect(
+            flush_audit_buffer_on_request_finished,
+            dispatch_uid="referensi.audit_buffer_request_flush",
+        )
         post_migrate.connect(self._warmup_search_endpoint, dispatch_uid="referensi.warmup_search", weak=False)
 
     def _warmup_search_endpoint(self, **kwargs):
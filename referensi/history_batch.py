@@ -0,0 +1,161 @@
+"""
+Batched simple_history capture for referensi imports.
+
+``HistoricalRecords`` on the referensi models writes one historical INSERT
+per ``save()``/``delete()`` and nothing at all for ``bulk_create`` /
+``bulk_update``. Inside ``import_history_batch(...)`` every historical row is
+instead buffered in memory and written with one ``bulk_create`` per model
+when the block exits, all pointing to a single ``ImportHistoryBatch``::
+
+    with import_history_batch("excel_import", user=request.user, source_file=name) as history:
+        AHSPReferensi.objects.get_or_create(...)     # captured via signal
+        RincianReferensi.objects.bulk_create(rows)
+        history.capture(rows, "+")                   # bulk paths: explicit
+
+Outside a batch the models behave exactly like plain ``HistoricalRecords``;
+``record_bulk_history`` then falls back to ``bulk_history_create`` so bulk
+paths never skip history.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.db import transaction
+from simple_history.models import HistoricalRecords
+
+HISTORY_BULK_BATCH_SIZE = 1000
+
+_state = threading.local()
+
+
+def _history_enabled() -> bool:
+    return getattr(settings, "SIMPLE_HISTORY_ENABLED", True)
+
+
+def _history_model_for(model):
+    manager_name = getattr(model._meta, "simple_history_manager_attribute", None)
+    if manager_name is None:
+        return None
+    return getattr(model, manager_name).model
+
+
+def _request_user():
+    request = getattr(HistoricalRecords.context, "request", None)
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return user
+    return None
+
+
+class HistoryBatch:
+    """Buffer historical rows for one import run; flushed by ``import_history_batch``."""
+
+    def __init__(self, record):
+        self.record = record
+        self._rows = defaultdict(list)  # history model -> [historical instance]
+
+    def add(self, instance, history_type: str) -> None:
+        """Snapshot ``instance`` now (deletes lose their values afterwards)."""
+        history_model = _history_model_for(type(instance))
+        if history_model is None or instance.pk is None:
+            return
+        self._rows[history_model].append(
+            history_model(
+                history_date=self.record.created_at,
+                history_user_id=self.record.user_id,
+                history_type=history_type,
+                history_change_reason=self.record.source,
+                history_batch=self.record,
+                **{field.attname: getattr(instance, field.attname) for field in history_model.tracked_fields},
+            )
+        )
+
+    def capture(self, objs: Iterable, history_type: str = "+") -> None:
+        """History for ``bulk_create`` (``"+"``) / ``bulk_update`` (``"~"``) results."""
+        if not _history_enabled():
+            return
+        for obj in objs:
+            self.add(obj, history_type)
+
+    def counts(self) -> dict:
+        summary = {}
+        for history_model, rows in self._rows.items():
+            summary[history_model.instance_type.__name__] = dict(Counter(row.history_type for row in rows))
+        return summary
+
+    def flush(self) -> int:
+        written = 0
+        for history_model, rows in self._rows.items():
+            history_model.objects.bulk_create(rows, batch_size=HISTORY_BULK_BATCH_SIZE)
+            written += len(rows)
+        self.record.counts = self.counts()
+        self.record.save(update_fields=["counts"])
+        self._rows.clear()
+        return written
+
+
+def current_history_batch() -> Optional[HistoryBatch]:
+    return getattr(_state, "batch", None)
+
+
+@contextmanager
+def import_history_batch(source: str, *, user=None, source_file: str = ""):
+    """
+    One ``ImportHistoryBatch`` plus bulk-inserted historical rows for this block.
+
+    Nested calls join the outer batch. If the block raises, the batch record
+    is rolled back together with the data it describes.
+    """
+    outer = current_history_batch()
+    if outer is not None:
+        yield outer
+        return
+
+    from referensi.models import ImportHistoryBatch
+
+    if user is not None and not getattr(user, "is_authenticated", False):
+        user = None
+    with transaction.atomic():
+        record = ImportHistoryBatch.objects.create(
+            source=source,
+            source_file=(source_file or "")[:255],
+            user=user or _request_user(),
+        )
+        batch = HistoryBatch(record)
+        _state.batch = batch
+        try:
+            yield batch
+            if _history_enabled():
+                batch.flush()
+        finally:
+            _state.batch = None
+
+
+def record_bulk_history(objs: Iterable, history_type: str = "+") -> None:
+    """History for bulk_create/bulk_update results, with or without an active batch."""
+    objs = [obj for obj in objs if obj.pk is not None]
+    if not objs or not _history_enabled():
+        return
+    batch = current_history_batch()
+    if batch is not None:
+        batch.capture(objs, history_type)
+        return
+    model = type(objs[0])
+    getattr(model, model._meta.simple_history_manager_attribute).bulk_history_create(
+        objs, batch_size=HISTORY_BULK_BATCH_SIZE, update=history_type == "~", default_user=_request_user(),
+    )
+
+
+class BatchedHistoricalRecords(HistoricalRecords):
+    """``HistoricalRecords`` that writes into the active batch instead of one INSERT per row."""
+
+    def create_historical_record(self, instance, history_type, using=None):
+        batch = current_history_batch()
+        if batch is None:
+            return super().create_historical_record(instance, history_type, using=using)
+        batch.add(instance, history_type)
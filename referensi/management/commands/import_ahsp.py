@@ -2,7 +2,11 @@
 import os
 from django.core.management.base import BaseCommand
 
-from referensi.services.ahsp_parser import parse_excel_dataframe, parse_excel_stream
+from referensi.services.ahsp_parser import (
+    parse_excel_dataframe,
+    parse_excel_stream,
+    parse_excel_workbook,
+)
 from referensi.services.import_writer import write_parse_result_to_db
 
 
@@ -11,6 +15,17 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument("excel_path", type=str, help="Path ke file Excel AHSP")
+        parser.add_argument(
+            "--all-sheets",
+            action="store_true",
+            help="Parse semua sheet (paralel per sheet), bukan hanya sheet aktif",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Jumlah proses worker untuk --all-sheets (default: jumlah CPU)",
+        )
 
     def handle(self, *args, **kwargs):
         excel_path = kwargs["excel_path"]
@@ -19,8 +34,15 @@ class Command(BaseCommand):
         streaming_note: str | None = None
 
         try:
-            with open(excel_path, "rb") as handle:
-                parse_result = parse_excel_stream(handle)
+            if kwargs.get("all_sheets"):
+                if not os.path.exists(excel_path):
+                    raise FileNotFoundError(excel_path)
+                parse_result = parse_excel_workbook(
+                    excel_path, max_workers=kwargs.get("workers")
+                )
+            else:
+                with open(excel_path, "rb") as handle:
+                    parse_result = parse_excel_stream(handle)
         except FileNotFoundError:
             streaming_note = f"Berkas '{excel_path}' tidak ditemukan; mencoba fallback pandas."
         except ModuleNotFoundError:
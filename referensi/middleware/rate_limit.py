@@ -7,7 +7,7 @@ of file import attempts per user within a time window.
 Features:
 - Per-user rate limiting
 - Configurable limits and time windows
-- Django cache backend support
+- Shared atomic limiter (config.rate_limiter): one Redis round-trip per check
 - Detailed rate limit headers
 - JSON error responses for API requests
 - HTML error page for browser requests
@@ -19,11 +19,12 @@ import time
 from typing import Callable
 
 from django.conf import settings
-from django.core.cache import cache
 from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import render
 from django.utils.translation import gettext as _
 
+from config import rate_limiter
+
 
 class ImportRateLimitMiddleware:
     """
@@ -118,7 +119,7 @@ class ImportRateLimitMiddleware:
         response['X-RateLimit-Limit'] = str(self.rate_limit)
         response['X-RateLimit-Remaining'] = str(max(0, remaining))
         response['X-RateLimit-Reset'] = str(int(reset_time))
-        response['Retry-After'] = str(int(reset_time - time.time()))
+        response['Retry-After'] = str(max(0, int(reset_time - time.time())))
 
         return response
 
@@ -151,60 +152,13 @@ class ImportRateLimitMiddleware:
         Returns:
             Tuple of (is_allowed, requests_remaining, reset_timestamp)
         """
-        # Generate cache key
-        cache_key = self._get_cache_key(request)
-
-        # Get current count and reset time
-        cache_data = cache.get(cache_key)
-
-        current_time = time.time()
-
-        if cache_data is None:
-            # First request in this window
-            count = 1
-            reset_time = current_time + self.rate_window
-
-            # Store in cache
-            cache.set(
-                cache_key,
-                {'count': count, 'reset_time': reset_time},
-                timeout=self.rate_window
-            )
-
-            return True, self.rate_limit - count, reset_time
-
-        # Existing window
-        count = cache_data.get('count', 0)
-        reset_time = cache_data.get('reset_time', current_time + self.rate_window)
-
-        # Check if window has expired
-        if current_time >= reset_time:
-            # Reset window
-            count = 1
-            reset_time = current_time + self.rate_window
-
-            cache.set(
-                cache_key,
-                {'count': count, 'reset_time': reset_time},
-                timeout=self.rate_window
-            )
-
-            return True, self.rate_limit - count, reset_time
-
-        # Within window - check limit
-        if count >= self.rate_limit:
-            # Rate limit exceeded
-            return False, 0, reset_time
-
-        # Increment count
-        count += 1
-        cache.set(
-            cache_key,
-            {'count': count, 'reset_time': reset_time},
-            timeout=int(reset_time - current_time) + 1
+        result = rate_limiter.hit(
+            self._get_cache_key(request),
+            self.rate_limit,
+            self.rate_window,
+            category='import',
         )
-
-        return True, self.rate_limit - count, reset_time
+        return result.allowed, result.remaining, result.reset_at
 
     def _get_cache_key(self, request: HttpRequest) -> str:
         """
@@ -342,6 +296,11 @@ class RateLimitChecker:
         self.rate_limit = rate_limit or ImportRateLimitMiddleware.DEFAULT_RATE_LIMIT
         self.rate_window = rate_window or ImportRateLimitMiddleware.DEFAULT_RATE_WINDOW
 
+    def _peek(self, user_id: int) -> rate_limiter.RateLimitResult:
+        return rate_limiter.peek(
+            f"import_rate_limit:user:{user_id}", self.rate_limit, self.rate_window
+        )
+
     def check_user_limit(self, user_id: int) -> bool:
         """
         Check if user has exceeded rate limit.
@@ -352,21 +311,7 @@ class RateLimitChecker:
         Returns:
             True if user is within rate limit
         """
-        cache_key = f"import_rate_limit:user:{user_id}"
-        cache_data = cache.get(cache_key)
-
-        if cache_data is None:
-            return True
-
-        current_time = time.time()
-        count = cache_data.get('count', 0)
-        reset_time = cache_data.get('reset_time', current_time)
-
-        # Check if window expired
-        if current_time >= reset_time:
-            return True
-
-        return count < self.rate_limit
+        return self._peek(user_id).allowed
 
     def get_remaining_time(self, user_id: int) -> int:
         """
@@ -378,17 +323,7 @@ class RateLimitChecker:
         Returns:
             Seconds until reset (0 if not rate limited)
         """
-        cache_key = f"import_rate_limit:user:{user_id}"
-        cache_data = cache.get(cache_key)
-
-        if cache_data is None:
-            return 0
-
-        current_time = time.time()
-        reset_time = cache_data.get('reset_time', current_time)
-
-        remaining = int(reset_time - current_time)
-        return max(0, remaining)
+        return max(0, int(self._peek(user_id).reset_at - time.time()))
 
     def get_remaining_requests(self, user_id: int) -> int:
         """
@@ -400,19 +335,4 @@ class RateLimitChecker:
         Returns:
             Number of requests remaining
         """
-        cache_key = f"import_rate_limit:user:{user_id}"
-        cache_data = cache.get(cache_key)
-
-        if cache_data is None:
-            return self.rate_limit
-
-        current_time = time.time()
-        count = cache_data.get('count', 0)
-        reset_time = cache_data.get('reset_time', current_time)
-
-        # Check if window expired
-        if current_time >= reset_time:
-            return self.rate_limit
-
-        remaining = self.rate_limit - count
-        return max(0, remaining)
+        return self._peek(user_id).remaining
@@ -2,21 +2,68 @@ from django.conf import settings
 from django.core.validators import MinValueValidator
 from django.db import models
 from django.utils import timezone
-from simple_history.models import HistoricalRecords
+from .history_batch import BatchedHistoricalRecords
 from .models_staging import AHSPImportStaging  # Import Staging Model
 
 
+class ImportHistoryBatch(models.Model):
+    """
+    Satu record per run import / simpan massal referensi.
+
+    Baris historical AHSPReferensi, RincianReferensi dan KodeItemReferensi
+    yang ditulis dalam ``import_history_batch`` menunjuk ke record ini
+    (``history_batch``), jadi satu import bisa ditelusuri tanpa history
+    INSERT per baris. Lihat ``referensi.history_batch``.
+    """
+
+    source = models.CharField(max_length=50, db_index=True)
+    source_file = models.CharField(max_length=255, blank=True, default="")
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+    # {"RincianReferensi": {"+": 120, "-": 118}, ...}
+    counts = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        verbose_name = "Import History Batch"
+        verbose_name_plural = "Import History Batches"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.source} #{self.pk} ({self.created_at:%Y-%m-%d %H:%M})"
+
+
+class HistoryBatchLink(models.Model):
+    """Kolom tambahan di tabel historical: batch import asal baris history."""
+
+    history_batch = models.ForeignKey(
+        ImportHistoryBatch,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+
+    class Meta:
+        abstract = True
+
+
 class AHSPReferensiManager(models.Manager):
     def create(self, **kwargs):
         obj = super().create(**kwargs)
-        from referensi.search_cache import invalidate_search_cache
-        invalidate_search_cache()
+        from referensi.search_cache import bump_search_generation
+        bump_search_generation()
         return obj
 
     def bulk_create(self, objs, **kwargs):
         result = super().bulk_create(objs, **kwargs)
-        from referensi.search_cache import rebuild_search_cache
-        rebuild_search_cache()
+        from referensi.search_cache import bump_search_generation
+        bump_search_generation()
         return result
 
 
@@ -40,7 +87,7 @@ class AHSPReferensi(models.Model):
     # This field is auto-updated by PostgreSQL trigger on INSERT/UPDATE
     # Do not set this field manually - it's computed from kode_ahsp, nama_ahsp, klasifikasi, sub_klasifikasi
 
-    history = HistoricalRecords()
+    history = BatchedHistoricalRecords(bases=[HistoryBatchLink])
     objects = AHSPReferensiManager()
 
     class Meta:
@@ -107,7 +154,7 @@ class RincianReferensi(models.Model):
         validators=[MinValueValidator(0)]
     )
 
-    history = HistoricalRecords()
+    history = BatchedHistoricalRecords(bases=[HistoryBatchLink])
 
     class Meta:
         verbose_name = "Rincian Item AHSP"
@@ -171,7 +218,7 @@ class KodeItemReferensi(models.Model):
     satuan_item = models.CharField(max_length=20)
     kode_item = models.CharField(max_length=50)
 
-    history = HistoricalRecords()
+    history = BatchedHistoricalRecords(bases=[HistoryBatchLink])
 
     def __str__(self):
         uraian = (self.uraian_item or "")[:50]
@@ -433,9 +480,18 @@ class SecurityAuditLog(models.Model):
         self.save(update_fields=['resolved', 'resolved_at', 'resolved_by', 'notes'])
 
     @classmethod
-    def log_file_validation_success(cls, user, ip_address, filename, file_size, **metadata):
+    def _record(cls, commit, **fields):
+        """Create the event, or return it unsaved when ``commit`` is False (buffered writers)."""
+        event = cls(**fields)
+        if commit:
+            event.save()
+        return event
+
+    @classmethod
+    def log_file_validation_success(cls, user, ip_address, filename, file_size, commit=True, **metadata):
         """Log successful file validation."""
-        return cls.objects.create(
+        return cls._record(
+            commit,
             severity=cls.SEVERITY_INFO,
             category=cls.CATEGORY_FILE_UPLOAD,
             event_type='file_validation_success',
@@ -450,9 +506,10 @@ class SecurityAuditLog(models.Model):
         )
 
     @classmethod
-    def log_file_validation_failure(cls, user, ip_address, filename, reason, **metadata):
+    def log_file_validation_failure(cls, user, ip_address, filename, reason, commit=True, **metadata):
         """Log failed file validation."""
-        return cls.objects.create(
+        return cls._record(
+            commit,
             severity=cls.SEVERITY_WARNING,
             category=cls.CATEGORY_FILE_UPLOAD,
             event_type='file_validation_failure',
@@ -467,9 +524,10 @@ class SecurityAuditLog(models.Model):
         )
 
     @classmethod
-    def log_malicious_file(cls, user, ip_address, filename, threat_type, **metadata):
+    def log_malicious_file(cls, user, ip_address, filename, threat_type, commit=True, **metadata):
         """Log detection of malicious file."""
-        return cls.objects.create(
+        return cls._record(
+            commit,
             severity=cls.SEVERITY_CRITICAL,
             category=cls.CATEGORY_FILE_UPLOAD,
             event_type='malicious_file_detected',
@@ -484,9 +542,10 @@ class SecurityAuditLog(models.Model):
         )
 
     @classmethod
-    def log_rate_limit_exceeded(cls, user, ip_address, path, limit, window, **metadata):
+    def log_rate_limit_exceeded(cls, user, ip_address, path, limit, window, commit=True, **metadata):
         """Log rate limit exceeded event."""
-        return cls.objects.create(
+        return cls._record(
+            commit,
             severity=cls.SEVERITY_WARNING,
             category=cls.CATEGORY_RATE_LIMIT,
             event_type='rate_limit_exceeded',
@@ -502,9 +561,10 @@ class SecurityAuditLog(models.Model):
         )
 
     @classmethod
-    def log_xss_attempt(cls, user, ip_address, path, input_field, dangerous_content, **metadata):
+    def log_xss_attempt(cls, user, ip_address, path, input_field, dangerous_content, commit=True, **metadata):
         """Log XSS attempt."""
-        return cls.objects.create(
+        return cls._record(
+            commit,
             severity=cls.SEVERITY_ERROR,
             category=cls.CATEGORY_XSS,
             event_type='xss_attempt',
@@ -520,9 +580,10 @@ class SecurityAuditLog(models.Model):
         )
 
     @classmethod
-    def log_import_operation(cls, user, ip_address, filename, jobs_count, details_count, **metadata):
+    def log_import_operation(cls, user, ip_address, filename, jobs_count, details_count, commit=True, **metadata):
         """Log successful import operation."""
-        return cls.objects.create(
+        return cls._record(
+            commit,
             severity=cls.SEVERITY_INFO,
             category=cls.CATEGORY_IMPORT,
             event_type='import_success',
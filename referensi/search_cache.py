@@ -1,39 +1,193 @@
+"""
+In-process autocomplete index for AHSP lookup.
+
+The index holds one shard per ``sumber``; each shard keeps its entries sorted
+by ``kode_ahsp`` plus a sorted token array over ``kode_ahsp``/``nama_ahsp`` so
+prefix lookups are a bisect instead of an ``icontains`` scan. Freshness is
+tracked by an import *generation* number kept in the shared Django cache
+(``CacheGeneration``, shared with ``ReferensiCache``): writers bump it once
+per transaction (after commit) and every process rebuilds its index lazily
+when the generation it was built for no longer matches. A lookup therefore
+costs one cache read, never a per-request ``Count``/``Max`` aggregate.
+"""
+
 from __future__ import annotations
 
-from django.db import models
+import re
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 
 from referensi.models import AHSPReferensi
+from referensi.services.cache_helpers import CacheGeneration
+
+SEARCH_GENERATION = CacheGeneration("referensi:search:generation")
+_TOKEN_SPLIT = re.compile(r"[^0-9a-z]+")
+# Queries at least this long fall back to a substring scan when no prefix matches
+_SUBSTRING_FALLBACK_MIN = 3
+
+
+@dataclass(frozen=True)
+class SearchEntry:
+    id: int
+    kode_ahsp: str
+    nama_ahsp: str
+    satuan: Optional[str]
+    sumber: str
+
+    @property
+    def text(self) -> str:
+        return f"{self.kode_ahsp} - {self.nama_ahsp}"
+
+
+def _tokenize(kode: str, nama: str) -> set:
+    """Whitespace words as-is (so "1.1.2" and "k-225" stay whole) plus their alphanumeric parts."""
+    tokens = set()
+    for word in f"{kode or ''} {nama or ''}".lower().split():
+        tokens.add(word)
+        tokens.update(part for part in _TOKEN_SPLIT.split(word) if part)
+    return tokens
+
+
+@dataclass
+class _Shard:
+    entries: List[SearchEntry] = field(default_factory=list)
+    normalized: List[str] = field(default_factory=list)
+    tokens: List[Tuple[str, int]] = field(default_factory=list)
+
+    def finalize(self) -> None:
+        self.entries.sort(key=lambda e: (e.kode_ahsp, e.id))
+        self.normalized = [f"{e.kode_ahsp} {e.nama_ahsp}".lower() for e in self.entries]
+        self.tokens = sorted(
+            (token, pos)
+            for pos, entry in enumerate(self.entries)
+            for token in _tokenize(entry.kode_ahsp, entry.nama_ahsp)
+        )
+
+    def _prefix_positions(self, term: str) -> set:
+        tokens = self.tokens
+        positions = set()
+        for idx in range(bisect_left(tokens, (term, -1)), len(tokens)):
+            token, pos = tokens[idx]
+            if not token.startswith(term):
+                break
+            positions.add(pos)
+        return positions
+
+    def search(self, query: str, limit: int) -> List[Tuple[int, SearchEntry]]:
+        """Return ``(rank, entry)`` pairs; lower rank is better."""
+        if not query:
+            return [(2, entry) for entry in self.entries[:limit]]
+
+        # Every query word must prefix-match some token of the entry
+        matched = None
+        for term in query.split():
+            positions = self._prefix_positions(term)
+            matched = positions if matched is None else matched & positions
+            if not matched:
+                break
+
+        if not matched and len(query) >= _SUBSTRING_FALLBACK_MIN:
+            matched = {pos for pos, text in enumerate(self.normalized) if query in text}
+
+        ranked = []
+        for pos in matched:
+            entry = self.entries[pos]
+            if entry.kode_ahsp.lower().startswith(query):
+                rank = 0
+            elif entry.nama_ahsp.lower().startswith(query):
+                rank = 1
+            else:
+                rank = 2
+            ranked.append((rank, pos, entry))
+        ranked.sort(key=lambda item: (item[0], item[1]))
+        return [(rank, entry) for rank, _, entry in ranked[:limit]]
+
 
-_SEARCH_CACHE = {"version": None, "data": []}
+class AutocompleteIndex:
+    """Token-prefix index over the AHSP catalogue, sharded by ``sumber``."""
+
+    def __init__(self, generation=None):
+        self.generation = generation
+        self.shards: Dict[str, _Shard] = {}
+
+    @classmethod
+    def build(cls, generation=None) -> "AutocompleteIndex":
+        index = cls(generation)
+        rows = AHSPReferensi.objects.values_list(
+            "id", "kode_ahsp", "nama_ahsp", "satuan", "sumber"
+        ).iterator(chunk_size=5000)
+        for row in rows:
+            entry = SearchEntry(*row)
+            index.shards.setdefault(entry.sumber, _Shard()).entries.append(entry)
+        for shard in index.shards.values():
+            shard.finalize()
+        return index
+
+    def search(self, query: str = "", sumber: Optional[str] = None, limit: int = 20) -> List[SearchEntry]:
+        query = (query or "").strip().lower()
+        if sumber:
+            shard = self.shards.get(sumber)
+            return [entry for _, entry in shard.search(query, limit)] if shard else []
+
+        merged = []
+        for shard in self.shards.values():
+            merged.extend(shard.search(query, limit))
+        merged.sort(key=lambda item: (item[0], item[1].kode_ahsp, item[1].id))
+        return [entry for _, entry in merged[:limit]]
+
+    def __len__(self):
+        return sum(len(shard.entries) for shard in self.shards.values())
+
+
+_INDEX: Optional[AutocompleteIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_search_generation():
+    """Current import generation; initialised once if missing from the cache."""
+    return SEARCH_GENERATION.get()
+
+
+def bump_search_generation():
+    """Mark the catalogue as changed; applied once after the current transaction commits."""
+    SEARCH_GENERATION.bump()
+
+
+def get_search_index() -> AutocompleteIndex:
+    """Return the index for the current generation, rebuilding it if outdated."""
+    global _INDEX
+    generation = get_search_generation()
+    index = _INDEX
+    if index is not None and index.generation == generation:
+        return index
+    with _INDEX_LOCK:
+        if _INDEX is None or _INDEX.generation != generation:
+            _INDEX = AutocompleteIndex.build(generation)
+        return _INDEX
+
+
+def search_ahsp(query: str = "", sumber: Optional[str] = None, limit: int = 20) -> List[SearchEntry]:
+    """Ranked autocomplete results: kode prefix, then nama prefix, then token matches."""
+    return get_search_index().search(query, sumber=sumber, limit=limit)
 
 
 def rebuild_search_cache():
-    aggregates = AHSPReferensi.objects.aggregate(
-        total=models.Count("id"),
-        max_id=models.Max("id"),
-    )
-    data = list(
-        AHSPReferensi.objects.values("id", "kode_ahsp", "nama_ahsp").order_by("kode_ahsp")
-    )
-    _SEARCH_CACHE["data"] = [
-        {
-            "id": item["id"],
-            "text": f"{item['kode_ahsp']} - {item['nama_ahsp']}",
-            "normalized": f"{item['kode_ahsp']} {item['nama_ahsp']}".lower(),
-        }
-        for item in data
-    ]
-    _SEARCH_CACHE["version"] = (
-        aggregates.get("total") or 0,
-        aggregates.get("max_id") or 0,
-    )
+    """Bump the generation so every process rebuilds its index on next lookup."""
+    bump_search_generation()
 
 
 def invalidate_search_cache():
-    _SEARCH_CACHE["version"] = None
+    bump_search_generation()
 
 
 def get_cached_search_data():
-    if _SEARCH_CACHE["version"] is None:
-        rebuild_search_cache()
-    return _SEARCH_CACHE["data"]
+    """Legacy shape used by older callers: all entries sorted by kode."""
+    return [
+        {"id": e.id, "text": e.text, "normalized": e.text.lower()}
+        for e in sorted(
+            (e for shard in get_search_index().shards.values() for e in shard.entries),
+            key=lambda e: (e.kode_ahsp, e.id),
+        )
+    ]
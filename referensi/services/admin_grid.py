@@ -0,0 +1,356 @@
+"""
+Query helpers for the JSON-backed AHSP database grid.
+
+- Keyset pagination: rows are ordered on ``(kode_ahsp, id)`` (jobs) or
+  ``(ahsp_id, id)`` (rincian) and the next page starts *after* the last
+  row's key, so page N costs the same as page 1 (no OFFSET scan).
+- Counts: on PostgreSQL the planner estimate (``EXPLAIN``) is used for
+  large result sets; an exact ``COUNT(*)`` only runs when the estimate is
+  small. Other backends always count exactly.
+- Search: kode-like input is a prefix match on the indexed kode column,
+  free text uses the ``search_vector`` GIN index on PostgreSQL
+  (``icontains`` fallback elsewhere).
+- Saves: partial row-level updates validated through the existing inline
+  ModelForms, recorded as one history batch per request.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.db import IntegrityError, connections, transaction
+from django.db.models import Count, Exists, OuterRef, Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+from referensi.forms import AHSPReferensiInlineForm, RincianReferensiInlineForm
+from referensi.history_batch import import_history_batch
+from referensi.models import AHSPReferensi, RincianReferensi
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+# Below this planner estimate an exact COUNT(*) is cheap enough
+EXACT_COUNT_THRESHOLD = 10000
+MAX_SAVE_ROWS = 200
+
+JOB_KEY = ("kode_ahsp", "id")
+ITEM_KEY = ("ahsp_id", "id")
+# Sortable columns -> keyset (only non-null, index-backed columns)
+JOB_SORT_KEYS = {
+    "kode_ahsp": JOB_KEY,
+    "sumber": ("sumber", "kode_ahsp", "id"),  # ix_ahsp_sumber_kode
+}
+ITEM_SORT_KEYS = {
+    "ahsp_id": ITEM_KEY,
+}
+
+_KODE_LIKE = re.compile(r"^[0-9A-Za-z][0-9A-Za-z.\-/_]*$")
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+# ---------------------------------------------------------------------------
+# Keyset pagination
+# ---------------------------------------------------------------------------
+
+def encode_cursor(values: Sequence) -> str:
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, size: int) -> list:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor("Cursor tidak valid") from exc
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursor("Cursor tidak valid")
+    return values
+
+
+def _after_filter(key: Sequence[str], values: Sequence, descending: bool) -> Q:
+    """Row-value comparison ``key > values`` expanded into OR-ed prefixes."""
+    op = "lt" if descending else "gt"
+    condition = Q()
+    for i, field in enumerate(key):
+        condition |= Q(**{key[j]: values[j] for j in range(i)}) & Q(**{f"{field}__{op}": values[i]})
+    return condition
+
+
+def keyset_page(
+    queryset: QuerySet,
+    key: Sequence[str],
+    *,
+    after: Optional[str] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    descending: bool = False,
+) -> Tuple[list, Optional[str]]:
+    """One page ordered on ``key`` plus the cursor for the next page (or None)."""
+    prefix = "-" if descending else ""
+    queryset = queryset.order_by(*[f"{prefix}{field}" for field in key])
+    if after:
+        queryset = queryset.filter(_after_filter(key, decode_cursor(after, len(key)), descending))
+    rows = list(queryset[: page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, field) for field in key])
+    return rows, next_cursor
+
+
+# ---------------------------------------------------------------------------
+# Counts
+# ---------------------------------------------------------------------------
+
+def _planner_estimate(queryset: QuerySet) -> Optional[int]:
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = queryset.order_by().values("pk").query.sql_with_params()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+    except Exception:
+        return None
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def estimate_count(queryset: QuerySet, *, exact_below: int = EXACT_COUNT_THRESHOLD) -> Tuple[int, bool]:
+    """``(count, is_estimate)``: planner rows for big results, exact COUNT otherwise."""
+    estimate = _planner_estimate(queryset)
+    if estimate is not None and estimate >= exact_below:
+        return estimate, True
+    return queryset.count(), False
+
+
+# ---------------------------------------------------------------------------
+# Filters
+# ---------------------------------------------------------------------------
+
+def _text_search(queryset: QuerySet, search: str, fields: Iterable[str]) -> QuerySet:
+    connection = connections[queryset.db]
+    if connection.vendor == "postgresql":
+        from referensi.services.ahsp_repository import TsMatch
+        from django.contrib.postgres.search import SearchQuery
+
+        table = queryset.model._meta.db_table
+        return queryset.annotate(
+            _grid_match=TsMatch(RawSQL(f"{table}.search_vector", []), SearchQuery(search, search_type="websearch")),
+        ).filter(_grid_match=True)
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f"{field}__icontains": search})
+    return queryset.filter(condition)
+
+
+def filter_jobs(
+    queryset: QuerySet,
+    *,
+    search: str = "",
+    sumber: str = "",
+    klasifikasi: str = "",
+    anomaly_only: bool = False,
+) -> QuerySet:
+    if sumber:
+        queryset = queryset.filter(sumber=sumber)
+    if klasifikasi:
+        queryset = queryset.filter(klasifikasi=klasifikasi)
+    if search:
+        if _KODE_LIKE.match(search) and any(ch.isdigit() for ch in search):
+            queryset = queryset.filter(kode_ahsp__startswith=search)
+        else:
+            queryset = _text_search(queryset, search, ("kode_ahsp", "nama_ahsp", "klasifikasi"))
+    if anomaly_only:
+        # EXISTS per row (index on rincian.ahsp_id) instead of a COUNT over all rincian
+        has_rincian = Exists(RincianReferensi.objects.filter(ahsp_id=OuterRef("pk")))
+        queryset = queryset.filter(
+            ~has_rincian
+            | Q(satuan__isnull=True) | Q(satuan="")
+            | Q(klasifikasi__isnull=True) | Q(klasifikasi="")
+        )
+    return queryset
+
+
+def filter_items(queryset: QuerySet, *, search: str = "", job_id: Optional[int] = None, kategori: str = "") -> QuerySet:
+    if job_id:
+        queryset = queryset.filter(ahsp_id=job_id)
+    if kategori in RincianReferensi.Kategori.values:
+        queryset = queryset.filter(kategori=kategori)
+    if search:
+        if _KODE_LIKE.match(search) and any(ch.isdigit() for ch in search):
+            queryset = queryset.filter(kode_item__startswith=search)
+        else:
+            queryset = _text_search(queryset, search, ("kode_item", "uraian_item"))
+    return queryset
+
+
+# ---------------------------------------------------------------------------
+# Serialization
+# ---------------------------------------------------------------------------
+
+def rincian_counts(job_ids: Iterable[int]) -> Dict[int, Dict[str, int]]:
+    """Rincian per kategori for the jobs of one page (single grouped query)."""
+    counts: Dict[int, Dict[str, int]] = {}
+    rows = (
+        RincianReferensi.objects.filter(ahsp_id__in=list(job_ids))
+        .values("ahsp_id", "kategori")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    for row in rows:
+        counts.setdefault(row["ahsp_id"], {})[row["kategori"]] = row["n"]
+    return counts
+
+
+def serialize_job(job: AHSPReferensi, counts: Optional[Dict[str, int]] = None) -> dict:
+    counts = counts or {}
+    rincian_count = sum(counts.values())
+    anomalies = []
+    if rincian_count == 0:
+        anomalies.append("Tidak ada rincian")
+    if not job.satuan:
+        anomalies.append("Satuan kosong")
+    if not job.klasifikasi:
+        anomalies.append("Klasifikasi kosong")
+    return {
+        "id": job.id,
+        "kode_ahsp": job.kode_ahsp,
+        "nama_ahsp": job.nama_ahsp or "",
+        "klasifikasi": job.klasifikasi or "",
+        "sub_klasifikasi": job.sub_klasifikasi or "",
+        "satuan": job.satuan or "",
+        "sumber": job.sumber or "",
+        "source_file": job.source_file or "",
+        "rincian_count": rincian_count,
+        "tk_count": counts.get("TK", 0),
+        "bhn_count": counts.get("BHN", 0),
+        "alt_count": counts.get("ALT", 0),
+        "lain_count": counts.get("LAIN", 0),
+        "anomalies": anomalies,
+        "has_anomaly": bool(anomalies),
+    }
+
+
+def serialize_item(item: RincianReferensi) -> dict:
+    anomalies = []
+    if not item.koefisien:
+        anomalies.append("Koefisien 0")
+    if not item.satuan_item:
+        anomalies.append("Satuan kosong")
+    return {
+        "id": item.id,
+        "job_id": item.ahsp_id,
+        "job_kode": item.ahsp.kode_ahsp,
+        "job_nama": item.ahsp.nama_ahsp or "",
+        "kategori": item.kategori,
+        "kode_item": item.kode_item or "",
+        "uraian_item": item.uraian_item or "",
+        "satuan_item": item.satuan_item or "",
+        "koefisien": str(item.koefisien) if item.koefisien else "0",
+        "anomalies": anomalies,
+        "has_anomaly": bool(anomalies),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Partial row saves
+# ---------------------------------------------------------------------------
+
+GRID_MODELS = {
+    "jobs": (AHSPReferensi, AHSPReferensiInlineForm),
+    "items": (RincianReferensi, RincianReferensiInlineForm),
+}
+
+
+def save_rows(kind: str, rows: List[dict], *, user=None) -> List[dict]:
+    """
+    Apply ``[{"id": 1, "changes": {"satuan": "m3"}}, ...]`` row by row.
+
+    Each row is validated with the inline ModelForm and saved with
+    ``update_fields`` limited to the changed columns. Invalid rows are
+    reported and skipped; valid rows are kept (one savepoint per row).
+    """
+    model, form_class = GRID_MODELS[kind]
+    allowed = set(form_class.Meta.fields)
+    ids = [row.get("id") for row in rows if isinstance(row.get("id"), int)]
+    queryset = model.objects.select_related("ahsp") if model is RincianReferensi else model.objects
+    instances = queryset.in_bulk(ids)
+
+    results = []
+    with import_history_batch("admin_grid", user=user):
+        for row in rows:
+            pk = row.get("id")
+            changes = row.get("changes")
+            instance = instances.get(pk)
+            if instance is None:
+                results.append({"id": pk, "ok": False, "errors": {"__all__": ["Data tidak ditemukan"]}})
+                continue
+            if not isinstance(changes, dict) or not changes:
+                results.append({"id": pk, "ok": False, "errors": {"__all__": ["Tidak ada perubahan"]}})
+                continue
+            unknown = sorted(set(changes) - allowed)
+            if unknown:
+                results.append({
+                    "id": pk, "ok": False,
+                    "errors": {field: ["Field tidak dapat diubah"] for field in unknown},
+                })
+                continue
+
+            changes = {
+                field: value.strip() if isinstance(value, str) else value
+                for field, value in changes.items()
+            }
+            if isinstance(changes.get("koefisien"), str):
+                # Format Indonesia: "0,25"
+                changes["koefisien"] = changes["koefisien"].replace(",", ".")
+            data = {field: getattr(instance, field) for field in form_class.Meta.fields}
+            data.update(changes)
+            form = form_class(data=data, instance=instance)
+            if not form.is_valid():
+                results.append({"id": pk, "ok": False, "errors": form.errors.get_json_data(escape_html=True)})
+                continue
+            try:
+                with transaction.atomic():
+                    form.instance.save(update_fields=sorted(changes))
+            except IntegrityError:
+                results.append({"id": pk, "ok": False, "errors": {"__all__": ["Data duplikat"]}})
+                continue
+
+            if kind == "jobs":
+                payload = serialize_job(form.instance, rincian_counts([pk]).get(pk))
+            else:
+                payload = serialize_item(form.instance)
+            results.append({"id": pk, "ok": True, "row": payload})
+    return results
+
+
+__all__ = [
+    "DEFAULT_PAGE_SIZE",
+    "EXACT_COUNT_THRESHOLD",
+    "InvalidCursor",
+    "ITEM_KEY",
+    "ITEM_SORT_KEYS",
+    "JOB_KEY",
+    "JOB_SORT_KEYS",
+    "MAX_PAGE_SIZE",
+    "MAX_SAVE_ROWS",
+    "decode_cursor",
+    "encode_cursor",
+    "estimate_count",
+    "filter_items",
+    "filter_jobs",
+    "keyset_page",
+    "rincian_counts",
+    "save_rows",
+    "serialize_item",
+    "serialize_job",
+]
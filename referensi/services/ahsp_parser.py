@@ -11,7 +11,7 @@ import os
 
 from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import TYPE_CHECKING, Dict, Iterable, List, Mapping, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple
 
 from .import_utils import (
     canonicalize_kategori,
@@ -51,8 +51,26 @@ def _resolve_column_mapping(columns_source) -> Tuple[Dict[str, Dict[str, str]],
     return mapping, errors
 
 
-def _read_optional_text(row, column_name: str | None, canonical: str) -> str:
-    if not column_name:
+def _resolve_column_indices(
+    headers: Sequence[str],
+) -> Tuple[Dict[str, Dict[str, int]], List[str]]:
+    """Seperti ``_resolve_column_mapping`` tetapi menghasilkan indeks kolom.
+
+    Dipakai reader streaming agar tiap baris cukup diakses per indeks tanpa
+    membangun dict header per baris. Header ganda mengikuti kolom terakhir,
+    sama seperti perilaku dict per baris sebelumnya.
+    """
+    mapping, errors = _resolve_column_mapping(headers)
+    positions = {name: idx for idx, name in enumerate(headers) if name}
+    indices = {
+        group_name: {canonical: positions[column] for canonical, column in columns.items()}
+        for group_name, columns in mapping.items()
+    }
+    return indices, errors
+
+
+def _read_optional_text(row, column_name: str | int | None, canonical: str) -> str:
+    if column_name is None:
         return ""
     getter = getattr(row, "get", None)
     if callable(getter):
@@ -86,6 +104,13 @@ def _validate_text_length(
         )
 
 
+def format_row_ref(row_number: int, sheet_name: str = "") -> str:
+    """Nomor baris Excel, ditambah nama sheet untuk hasil parse multi-sheet."""
+    if sheet_name:
+        return f"{row_number} (sheet '{sheet_name}')"
+    return str(row_number)
+
+
 @dataclass
 class RincianPreview:
     kategori: str
@@ -97,6 +122,11 @@ class RincianPreview:
     kategori_source: str = ""
     kode_item_source: str = "input"
     kode_item_original: str = ""
+    sheet_name: str = ""  # hanya diisi oleh parse_excel_workbook
+
+    @property
+    def row_ref(self) -> str:
+        return format_row_ref(self.row_number, self.sheet_name)
 
     @property
     def koef_display(self) -> str:
@@ -126,6 +156,11 @@ class AHSPPreview:
     sub_klasifikasi: str = ""
     satuan: str = ""
     rincian: List[RincianPreview] = field(default_factory=list)
+    sheet_name: str = ""
+
+    @property
+    def row_ref(self) -> str:
+        return format_row_ref(self.row_number, self.sheet_name)
 
     @property
     def rincian_count(self) -> int:
@@ -152,18 +187,23 @@ class ParseResult:
 
 
 def _parse_rows(
-    row_iter: Iterable[tuple[int, Mapping[str, object]]],
-    job_cols: Dict[str, str],
-    detail_cols: Dict[str, str],
+    row_iter: Iterable[tuple[int, Mapping[str, object] | Sequence[object]]],
+    job_cols: Dict[str, str] | Dict[str, int],
+    detail_cols: Dict[str, str] | Dict[str, int],
     result: ParseResult,
 ) -> None:
+    """Parse baris menjadi pekerjaan & rincian.
+
+    Baris bisa berupa mapping (kolom -> nilai, dengan peta kolom berisi nama
+    header) atau tuple nilai mentah (dengan peta kolom berisi indeks).
+    """
     current_src = ""
     current_job: AHSPPreview | None = None
     mapped_categories: dict[tuple[str, str], int] = {}
     missing_categories = 0
 
-    def cell(row_obj, column_name: str | None):
-        if not column_name:
+    def cell(row_obj, column_name: str | int | None):
+        if column_name is None:
             return ""
         getter = getattr(row_obj, "get", None)
         if callable(getter):
@@ -356,6 +396,25 @@ def _uploaded_file_size(excel_file) -> int | None:
             pass
 
 
+def _normalize_headers(header_row: Sequence[object]) -> List[str]:
+    return [str(value).strip() if value is not None else "" for value in header_row]
+
+
+def _parse_sheet_rows(
+    rows: Iterator[Sequence[object]],
+    column_map: Dict[str, Dict[str, int]],
+    result: ParseResult,
+) -> None:
+    """Parse baris data (tanpa header) dengan peta indeks kolom."""
+
+    def row_iter():
+        # Header di baris 1, data mulai baris 2
+        for row_number, values in enumerate(rows, start=2):
+            yield row_number, values
+
+    _parse_rows(row_iter(), column_map["jobs"], column_map["details"], result)
+
+
 def parse_excel_stream(excel_file) -> ParseResult:
     """Parse file Excel menggunakan reader streaming (openpyxl read_only)."""
 
@@ -385,44 +444,225 @@ def parse_excel_stream(excel_file) -> ParseResult:
             result.warnings.append("File Excel kosong.")
             return result
 
-        headers = [str(value).strip() if value is not None else "" for value in header_row]
-        column_map, column_errors = _resolve_column_mapping(headers)
+        column_map, column_errors = _resolve_column_indices(_normalize_headers(header_row))
         if column_errors:
             result.errors.extend(column_errors)
             return result
 
-        job_cols = column_map["jobs"]
-        detail_cols = column_map["details"]
-
-        def row_iter():
-            row_number = 2
-            for values in rows:
-                row_dict: dict[str, object] = {}
-                for idx, value in enumerate(values):
-                    if idx >= len(headers):
-                        continue
-                    column_name = headers[idx]
-                    if not column_name:
-                        continue
-                    row_dict[column_name] = value
-                yield row_number, row_dict
-                row_number += 1
-
-        _parse_rows(row_iter(), job_cols, detail_cols, result)
+        _parse_sheet_rows(rows, column_map, result)
         return result
     finally:
         wb.close()
 
 
-def load_preview_from_file(excel_file) -> ParseResult:
-    """Membaca file Excel (UploadedFile) dan mengembalikan hasil parse."""
+@dataclass(frozen=True)
+class SheetTask:
+    """Satu sheet data yang siap diparse oleh worker."""
+
+    sheet_name: str
+    last_row_number: int
+    column_map: Dict[str, Dict[str, int]]
+
+
+def _parse_sheet_worker(path: str, task: SheetTask) -> ParseResult:
+    """Entry point worker: buka workbook sendiri lalu parse satu sheet."""
+
+    from openpyxl import load_workbook  # type: ignore
+
+    result = ParseResult()
+    wb = load_workbook(path, data_only=True, read_only=True)
+    try:
+        rows = wb[task.sheet_name].iter_rows(values_only=True)
+        next(rows, None)  # header sudah divalidasi oleh proses induk
+        _parse_sheet_rows(rows, task.column_map, result)
+    finally:
+        wb.close()
+    # Nomor baris per sheet: simpan nama sheet agar pesan hilir tetap jelas
+    for job in result.jobs:
+        job.sheet_name = task.sheet_name
+        for detail in job.rincian:
+            detail.sheet_name = task.sheet_name
+    return result
+
+
+def _plan_sheet_tasks(path: str, result: ParseResult) -> List[SheetTask]:
+    """Baca header & ukuran tiap sheet data yang akan diparse.
+
+    Nomor baris tetap nomor baris Excel di dalam sheet masing-masing
+    (data mulai baris 2). Pesan parse diberi awalan nama sheet saat digabung
+    (lihat ``_merge_sheet_results``) dan setiap pekerjaan/rincian membawa
+    ``sheet_name`` untuk pesan import (lihat ``row_ref``).
+    """
+    from openpyxl import load_workbook  # type: ignore
+
+    tasks: List[SheetTask] = []
+    wb = load_workbook(path, data_only=True, read_only=True)
+    try:
+        for ws in wb.worksheets:
+            header_row = next(ws.iter_rows(max_row=1, values_only=True), None)
+            headers = _normalize_headers(header_row or ())
+            if not any(headers):
+                result.warnings.append(f"Sheet '{ws.title}' kosong dan dilewati.")
+                continue
+
+            column_map, column_errors = _resolve_column_indices(headers)
+            if column_errors:
+                result.warnings.append(
+                    f"Sheet '{ws.title}' dilewati: " + " ".join(column_errors)
+                )
+                continue
+
+            ws.calculate_dimension(force=True)
+            data_rows = max((ws.max_row or 1) - 1, 0)
+            if not data_rows:
+                result.warnings.append(f"Sheet '{ws.title}' tidak berisi data dan dilewati.")
+                continue
+
+            tasks.append(
+                SheetTask(
+                    sheet_name=ws.title,
+                    last_row_number=data_rows + 1,
+                    column_map=column_map,
+                )
+            )
+    finally:
+        wb.close()
+    return tasks
+
+
+def _run_sheet_tasks(path: str, tasks: List[SheetTask], max_workers: int | None):
+    """Jalankan parse per sheet, paralel di proses terpisah bila memungkinkan."""
+
+    workers = min(len(tasks), max_workers or os.cpu_count() or 1)
+    if workers <= 1:
+        return [_parse_sheet_worker(path, task) for task in tasks]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    initializer = None
+    try:
+        import django
+        from django.conf import settings
+
+        if settings.configured:
+            initializer = django.setup  # worker spawn perlu registry app Django
+    except ModuleNotFoundError:  # pragma: no cover - non-Django usage
+        pass
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=initializer) as pool:
+            # map() menjaga urutan sheet sehingga merge selalu deterministik
+            return list(pool.map(_parse_sheet_worker, [path] * len(tasks), tasks))
+    except (OSError, RuntimeError, ImportError):
+        # Lingkungan tanpa dukungan multiprocessing: parse berurutan
+        return [_parse_sheet_worker(path, task) for task in tasks]
+
+
+def _merge_sheet_results(
+    tasks: List[SheetTask], sheet_results: List[ParseResult], result: ParseResult
+) -> None:
+    for task, sheet_result in zip(tasks, sheet_results):
+        prefix = f"[Sheet {task.sheet_name}] "
+        result.jobs.extend(sheet_result.jobs)
+        result.errors.extend(prefix + message for message in sheet_result.errors)
+        result.warnings.extend(prefix + message for message in sheet_result.warnings)
+
+
+def parse_excel_workbook(excel_file, *, max_workers: int | None = None) -> ParseResult:
+    """Parse semua sheet dalam workbook, tiap sheet di proses worker terpisah.
+
+    Setiap sheet harus memiliki baris header sendiri dan diperlakukan mandiri
+    (sumber AHSP tidak diwariskan antar sheet). Hasil digabung sesuai urutan
+    sheet; nomor baris mengikuti baris Excel di sheet masing-masing.
+
+    Args:
+        excel_file: Path file atau file-like object (UploadedFile).
+        max_workers: Batas jumlah proses worker (default: jumlah CPU).
+    """
+
+    try:
+        import openpyxl  # type: ignore  # noqa: F401
+    except ModuleNotFoundError as exc:  # pragma: no cover - optional dependency
+        raise ModuleNotFoundError("openpyxl belum terpasang") from exc
+
+    result = ParseResult()
+    path, is_temporary = _materialize_excel_file(excel_file)
+    try:
+        try:
+            tasks = _plan_sheet_tasks(path, result)
+        except Exception as exc:  # pragma: no cover - engine specific
+            result.errors.append(f"Gagal membaca Excel: {exc}")
+            return result
+
+        if not tasks:
+            if not result.warnings:
+                result.warnings.append("File Excel kosong.")
+            result.errors.append("Tidak ada sheet dengan header kolom AHSP yang valid.")
+            return result
+
+        if len(tasks) > 1:
+            result.warnings.append(
+                "Nomor baris mengikuti baris Excel di masing-masing sheet: "
+                + ", ".join(
+                    f"'{task.sheet_name}' (baris 2-{task.last_row_number})"
+                    for task in tasks
+                )
+                + "."
+            )
+
+        sheet_results = _run_sheet_tasks(path, tasks, max_workers)
+        _merge_sheet_results(tasks, sheet_results, result)
+        if not result.jobs and not result.errors:
+            result.warnings.append("Tidak ada pekerjaan yang terdeteksi dari file Excel.")
+        return result
+    finally:
+        if is_temporary:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _materialize_excel_file(excel_file) -> Tuple[str, bool]:
+    """Kembalikan (path, is_temporary) yang bisa dibuka ulang oleh worker."""
+
+    if isinstance(excel_file, (str, os.PathLike)):
+        return os.fspath(excel_file), False
+
+    temporary_path = getattr(excel_file, "temporary_file_path", None)
+    if callable(temporary_path):
+        return temporary_path(), False
+
+    import shutil
+    import tempfile
+
+    try:
+        excel_file.seek(0)
+    except (AttributeError, OSError):
+        pass
+    fd, path = tempfile.mkstemp(prefix="ahsp_workbook_", suffix=".xlsx")
+    with os.fdopen(fd, "wb") as handle:
+        shutil.copyfileobj(excel_file, handle)
+    return path, True
+
+
+def load_preview_from_file(
+    excel_file, *, all_sheets: bool = False, max_workers: int | None = None
+) -> ParseResult:
+    """Membaca file Excel (UploadedFile) dan mengembalikan hasil parse.
+
+    Dengan ``all_sheets=True`` seluruh sheet diparse paralel melalui
+    ``parse_excel_workbook``; fallback pandas hanya membaca sheet pertama.
+    """
 
     streaming_notes: list[str] = []
     file_size = _uploaded_file_size(excel_file)
-    use_streaming = file_size is None or file_size >= STREAMING_THRESHOLD_BYTES
+    use_streaming = all_sheets or file_size is None or file_size >= STREAMING_THRESHOLD_BYTES
 
     if use_streaming:
         try:
+            if all_sheets:
+                return parse_excel_workbook(excel_file, max_workers=max_workers)
             result = parse_excel_stream(excel_file)
             return result
         except ModuleNotFoundError:
@@ -479,4 +719,5 @@ __all__ = [
     "load_preview_from_file",
     "parse_excel_dataframe",
     "parse_excel_stream",
+    "parse_excel_workbook",
 ]
@@ -0,0 +1,391 @@
+"""
+Buffered writer for SecurityAuditLog - Phase 2
+
+Audit events are queued and written with ``bulk_create`` in batches, keeping
+the audit table out of the request path during import storms. Two queues:
+
+- ``SharedAuditQueue``: a Redis list shared by every web and worker process
+  (used when the default cache is Redis). Web processes only RPUSH; the
+  ``flush_audit_log_buffer_task`` beat task drains the list, and a drain is
+  also scheduled as soon as ``flush_size`` events are waiting. Events
+  survive a web process being killed.
+- ``AuditBuffer``: an in-process deque flushed by a daemon thread every
+  ``flush_interval`` seconds or at ``flush_size``. Events still queued when
+  the process is killed (SIGKILL/OOM) are lost, and the beat task can only
+  drain the worker process that runs it.
+
+``buffered`` setting (``REFERENSI_CONFIG['audit']``):
+- ``"true"`` (default): shared queue when the cache is Redis. Without Redis
+  web processes write directly (a per-process buffer there could not be
+  drained by the beat task); Celery workers use the in-process buffer.
+- ``"process"``: in-process buffer in every process; web processes also
+  flush at request end once the oldest event is ``flush_interval`` old.
+- ``"false"``: every event is written immediately.
+
+Guarantees and limits:
+- Critical events bypass the queues and are written synchronously.
+- Queues are bounded (``max_queue``); events beyond it are dropped and
+  counted, never blocking the request.
+- A failed bulk write of the shared queue is pushed back to its head and
+  retried on the next drain.
+
+Usage:
+    from referensi.services.audit_buffer import get_audit_queue
+
+    queue = get_audit_queue()  # None: write directly
+    queue.enqueue(SecurityAuditLog(...))
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any
+
+from django.conf import settings
+from django.core import serializers
+from django.core.serializers.base import DeserializationError
+from django.core.cache import cache
+from django.db import close_old_connections, connection
+
+from config.redis_client import get_cache_redis_client
+from referensi.models import SecurityAuditLog
+
+logger = logging.getLogger(__name__)
+
+
+def _audit_config() -> dict[str, Any]:
+    return getattr(settings, 'REFERENSI_CONFIG', {}).get('audit', {})
+
+
+class AuditBuffer:
+    """Bounded in-memory queue of unsaved SecurityAuditLog rows."""
+
+    def __init__(
+        self,
+        max_queue: int = 10000,
+        flush_size: int = 200,
+        flush_interval: float = 2.0,
+        start_thread: bool = True,
+    ):
+        self.max_queue = max_queue
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.start_thread = start_thread
+
+        self._queue: deque[SecurityAuditLog] = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        self.enqueued = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.write_errors = 0
+        self.last_flush_at: float | None = None
+        self._oldest_at: float | None = None  # enqueue time of the oldest queued event
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def enqueue(self, event: SecurityAuditLog) -> bool:
+        """Queue an unsaved event. Returns False if it was dropped (queue full)."""
+        if event.user_id and not event.username:
+            # Same as SecurityAuditLog.save(); bulk_create bypasses save()
+            event.username = event.user.username
+
+        with self._lock:
+            if len(self._queue) >= self.max_queue:
+                self.dropped += 1
+                dropped = True
+            else:
+                if not self._queue:
+                    self._oldest_at = time.time()
+                self._queue.append(event)
+                self.enqueued += 1
+                dropped = False
+            depth = len(self._queue)
+
+        if dropped:
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning(f"Audit buffer full ({self.max_queue}); dropped {self.dropped} events so far")
+            return False
+
+        self._ensure_thread()
+        if depth >= self.flush_size:
+            self._wakeup.set()
+        return True
+
+    # ------------------------------------------------------------------
+    # Consumer side
+    # ------------------------------------------------------------------
+
+    def _take(self, limit: int) -> list[SecurityAuditLog]:
+        with self._lock:
+            count = min(limit, len(self._queue))
+            batch = [self._queue.popleft() for _ in range(count)]
+            if not self._queue:
+                self._oldest_at = None
+            return batch
+
+    def is_flush_due(self, now: float | None = None) -> bool:
+        """True when the queue is full enough or its oldest event waited ``flush_interval``."""
+        oldest = self._oldest_at
+        if oldest is None:
+            return False
+        if len(self._queue) >= self.flush_size:
+            return True
+        return ((now or time.time()) - oldest) >= self.flush_interval
+
+    def flush_if_due(self) -> int:
+        return self.flush() if self.is_flush_due() else 0
+
+    def flush(self) -> int:
+        """Write all queued events; returns the number of rows written."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = self._take(self.flush_size)
+                if not batch:
+                    break
+                try:
+                    SecurityAuditLog.objects.bulk_create(batch, batch_size=self.flush_size)
+                    written += len(batch)
+                except Exception as e:
+                    self.write_errors += 1
+                    self.dropped += len(batch)
+                    logger.error(f"Failed to flush {len(batch)} audit events: {e}")
+                    break
+            self.flushed += written
+            self.last_flush_at = time.time()
+        return written
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if not self._queue:
+                continue
+            close_old_connections()
+            try:
+                self.flush()
+            finally:
+                # The writer thread owns its own connection; don't keep it idle
+                connection.close()
+
+    def _ensure_thread(self) -> None:
+        if not self.start_thread or (self._thread and self._thread.is_alive()):
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='audit-log-writer', daemon=True)
+            self._thread.start()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'queue_depth': len(self._queue),
+            'max_queue': self.max_queue,
+            'enqueued': self.enqueued,
+            'flushed': self.flushed,
+            'dropped': self.dropped,
+            'write_errors': self.write_errors,
+            'last_flush_at': self.last_flush_at,
+            'oldest_age': round(time.time() - self._oldest_at, 3) if self._oldest_at else None,
+            'writer_alive': bool(self._thread and self._thread.is_alive()),
+        }
+
+
+class SharedAuditQueue:
+    """Bounded Redis list of serialized SecurityAuditLog rows, shared by all processes."""
+
+    KEY = 'referensi:audit:queue'
+
+    def __init__(self, max_queue: int = 10000, flush_size: int = 200):
+        self.max_queue = max_queue
+        self.flush_size = flush_size
+        # Counters of this process only; the list itself is shared
+        self.enqueued = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.write_errors = 0
+        self.last_flush_at: float | None = None
+
+    def _client(self):
+        return get_cache_redis_client()
+
+    def _key(self) -> str:
+        return cache.make_key(self.KEY)
+
+    def available(self) -> bool:
+        return self._client() is not None
+
+    def enqueue(self, event: SecurityAuditLog) -> bool:
+        """RPUSH an unsaved event. Returns False if it was dropped (queue full)."""
+        from redis.exceptions import RedisError
+
+        if event.user_id and not event.username:
+            event.username = event.user.username
+        payload = serializers.serialize('json', [event])
+        conn = self._client()
+        try:
+            depth = conn.rpush(self._key(), payload)
+            if depth > self.max_queue:
+                conn.rpop(self._key())
+        except (RedisError, OSError) as e:
+            # Redis down: do not lose the event, write it directly
+            logger.warning(f"Shared audit queue unavailable, writing directly: {e}")
+            event.save()
+            return True
+
+        if depth > self.max_queue:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning(f"Shared audit queue full ({self.max_queue}); dropped {self.dropped} events so far")
+            return False
+
+        self.enqueued += 1
+        if depth == self.flush_size:
+            self._schedule_drain()
+        return True
+
+    def _schedule_drain(self) -> None:
+        try:
+            from referensi.tasks import flush_audit_log_buffer_task
+
+            flush_audit_log_buffer_task.delay()
+        except Exception as e:
+            # The beat task still drains the list
+            logger.warning(f"Could not schedule audit queue drain: {e}")
+
+    def flush(self) -> int:
+        """Drain the shared list in ``flush_size`` batches; returns rows written."""
+        conn = self._client()
+        if conn is None:
+            return 0
+        key = self._key()
+        written = 0
+        while True:
+            pipe = conn.pipeline()  # MULTI/EXEC: take and trim atomically
+            pipe.lrange(key, 0, self.flush_size - 1)
+            pipe.ltrim(key, self.flush_size, -1)
+            raw, _ = pipe.execute()
+            if not raw:
+                break
+
+            batch = []
+            for item in raw:
+                try:
+                    batch.extend(obj.object for obj in serializers.deserialize('json', item))
+                except DeserializationError as e:
+                    self.dropped += 1
+                    logger.error(f"Dropping unreadable audit event: {e}")
+            try:
+                SecurityAuditLog.objects.bulk_create(batch, batch_size=self.flush_size)
+                written += len(batch)
+            except Exception as e:
+                # Put the batch back at the head so the next drain retries it
+                conn.lpush(key, *reversed(raw))
+                self.write_errors += 1
+                logger.error(f"Failed to flush {len(batch)} shared audit events: {e}")
+                break
+        self.flushed += written
+        self.last_flush_at = time.time()
+        return written
+
+    def depth(self) -> int:
+        conn = self._client()
+        return conn.llen(self._key()) if conn is not None else 0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'queue_depth': self.depth(),
+            'max_queue': self.max_queue,
+            'enqueued': self.enqueued,
+            'flushed': self.flushed,
+            'dropped': self.dropped,
+            'write_errors': self.write_errors,
+            'last_flush_at': self.last_flush_at,
+        }
+
+
+def _build_default_buffer() -> AuditBuffer:
+    config = _audit_config()
+    return AuditBuffer(
+        max_queue=config.get('max_queue', 10000),
+        flush_size=config.get('flush_size', 200),
+        flush_interval=config.get('flush_interval', 2.0),
+    )
+
+
+def _build_shared_queue() -> SharedAuditQueue:
+    config = _audit_config()
+    return SharedAuditQueue(
+        max_queue=config.get('max_queue', 10000),
+        flush_size=config.get('flush_size', 200),
+    )
+
+
+# Set by referensi.tasks when this process is a Celery worker
+_in_celery_worker = False
+
+
+def mark_celery_worker() -> None:
+    global _in_celery_worker
+    _in_celery_worker = True
+
+
+def _buffer_mode() -> str:
+    mode = _audit_config().get('buffered', False)
+    if isinstance(mode, bool):
+        return 'true' if mode else 'false'
+    mode = str(mode).strip().lower()
+    if mode in ('true', '1', 'yes'):
+        return 'true'
+    return 'process' if mode == 'process' else 'false'
+
+
+def get_audit_queue() -> AuditBuffer | SharedAuditQueue | None:
+    """Queue for non-critical events in this process, or None to write directly."""
+    mode = _buffer_mode()
+    if mode == 'false':
+        return None
+    if mode == 'process':
+        return audit_buffer
+    if shared_audit_queue.available():
+        return shared_audit_queue
+    return audit_buffer if _in_celery_worker else None
+
+
+def is_buffer_enabled() -> bool:
+    return get_audit_queue() is not None
+
+
+# Singleton instances
+audit_buffer = _build_default_buffer()
+shared_audit_queue = _build_shared_queue()
+
+
+def flush_audit_buffer() -> int:
+    """Flush the process-wide buffer (exit hook / Celery shutdown / beat task)."""
+    try:
+        return audit_buffer.flush()
+    except Exception as e:  # pragma: no cover - last-chance hook
+        logger.error(f"Audit buffer flush at shutdown failed: {e}")
+        return 0
+
+
+def flush_audit_buffer_on_request_finished(**kwargs) -> None:
+    """``request_finished`` hook: time-based flush for ``buffered: "process"``."""
+    try:
+        audit_buffer.flush_if_due()
+    except Exception as e:
+        logger.error(f"Audit buffer flush at request end failed: {e}")
+
+
+atexit.register(flush_audit_buffer)
@@ -9,7 +9,7 @@ Features:
 - Centralized logging interface
 - Automatic user/IP extraction
 - Integration with Django requests
-- Async logging support
+- Async logging support (buffered writer, see audit_buffer)
 - Batch logging for performance
 """
 
@@ -22,6 +22,7 @@ from django.contrib.auth import get_user_model
 from django.http import HttpRequest
 
 from referensi.models import SecurityAuditLog
+from referensi.services.audit_buffer import get_audit_queue
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -95,6 +96,19 @@ class AuditLogger:
             'method': method,
         }
 
+    @staticmethod
+    def _write(event: SecurityAuditLog) -> SecurityAuditLog:
+        """
+        Persist an event: queued in the buffered writer when enabled,
+        otherwise saved immediately. Critical events are always synchronous.
+        """
+        queue = get_audit_queue()
+        if queue is not None and event.severity != SecurityAuditLog.SEVERITY_CRITICAL:
+            queue.enqueue(event)
+        else:
+            event.save()
+        return event
+
     # =========================================================================
     # File Upload Logging
     # =========================================================================
@@ -120,13 +134,14 @@ class AuditLogger:
             **metadata: Additional metadata
 
         Returns:
-            Created SecurityAuditLog instance or None if error
+            SecurityAuditLog instance (unsaved while queued in the buffer) or None if error
         """
         try:
             request_info = self._extract_request_info(request)
 
             if success:
-                return SecurityAuditLog.log_file_validation_success(
+                return self._write(SecurityAuditLog.log_file_validation_success(
+                    commit=False,
                     user=request_info['user'],
                     ip_address=request_info['ip_address'],
                     filename=filename,
@@ -135,9 +150,10 @@ class AuditLogger:
                     path=request_info['path'],
                     method=request_info['method'],
                     **metadata
-                )
+                ))
             else:
-                return SecurityAuditLog.log_file_validation_failure(
+                return self._write(SecurityAuditLog.log_file_validation_failure(
+                    commit=False,
                     user=request_info['user'],
                     ip_address=request_info['ip_address'],
                     filename=filename,
@@ -146,7 +162,7 @@ class AuditLogger:
                     path=request_info['path'],
                     method=request_info['method'],
                     **metadata
-                )
+                ))
         except Exception as e:
             logger.error(f"Failed to log file validation: {e}")
             return None
@@ -168,12 +184,13 @@ class AuditLogger:
             **metadata: Additional metadata
 
         Returns:
-            Created SecurityAuditLog instance or None if error
+            SecurityAuditLog instance (unsaved while queued in the buffer) or None if error
         """
         try:
             request_info = self._extract_request_info(request)
 
-            log = SecurityAuditLog.log_malicious_file(
+            log = self._write(SecurityAuditLog.log_malicious_file(
+                commit=False,
                 user=request_info['user'],
                 ip_address=request_info['ip_address'],
                 filename=filename,
@@ -182,7 +199,7 @@ class AuditLogger:
                 path=request_info['path'],
                 method=request_info['method'],
                 **metadata
-            )
+            ))
 
             # Also log to standard logger for immediate alerts
             logger.critical(
@@ -216,12 +233,13 @@ class AuditLogger:
             **metadata: Additional metadata
 
         Returns:
-            Created SecurityAuditLog instance or None if error
+            SecurityAuditLog instance (unsaved while queued in the buffer) or None if error
         """
         try:
             request_info = self._extract_request_info(request)
 
-            return SecurityAuditLog.log_rate_limit_exceeded(
+            return self._write(SecurityAuditLog.log_rate_limit_exceeded(
+                commit=False,
                 user=request_info['user'],
                 ip_address=request_info['ip_address'],
                 path=request_info['path'],
@@ -230,7 +248,7 @@ class AuditLogger:
                 user_agent=request_info['user_agent'],
                 method=request_info['method'],
                 **metadata
-            )
+            ))
         except Exception as e:
             logger.error(f"Failed to log rate limit: {e}")
             return None
@@ -256,12 +274,13 @@ class AuditLogger:
             **metadata: Additional metadata
 
         Returns:
-            Created SecurityAuditLog instance or None if error
+            SecurityAuditLog instance (unsaved while queued in the buffer) or None if error
         """
         try:
             request_info = self._extract_request_info(request)
 
-            log = SecurityAuditLog.log_xss_attempt(
+            log = self._write(SecurityAuditLog.log_xss_attempt(
+                commit=False,
                 user=request_info['user'],
                 ip_address=request_info['ip_address'],
                 path=request_info['path'],
@@ -270,7 +289,7 @@ class AuditLogger:
                 user_agent=request_info['user_agent'],
                 method=request_info['method'],
                 **metadata
-            )
+            ))
 
             # Log warning for XSS attempts
             logger.warning(
@@ -307,12 +326,13 @@ class AuditLogger:
             **metadata: Additional metadata
 
         Returns:
-            Created SecurityAuditLog instance or None if error
+            SecurityAuditLog instance (unsaved while queued in the buffer) or None if error
         """
         try:
             request_info = self._extract_request_info(request)
 
-            return SecurityAuditLog.log_import_operation(
+            return self._write(SecurityAuditLog.log_import_operation(
+                commit=False,
                 user=request_info['user'],
                 ip_address=request_info['ip_address'],
                 filename=filename,
@@ -322,7 +342,7 @@ class AuditLogger:
                 path=request_info['path'],
                 method=request_info['method'],
                 **metadata
-            )
+            ))
         except Exception as e:
             logger.error(f"Failed to log import operation: {e}")
             return None
@@ -356,7 +376,7 @@ class AuditLogger:
             **metadata: Additional metadata
 
         Returns:
-            Created SecurityAuditLog instance or None if error
+            SecurityAuditLog instance (unsaved while queued in the buffer) or None if error
         """
         try:
             # Extract from request if provided
@@ -370,7 +390,7 @@ class AuditLogger:
                     'method': request_info['method'],
                 })
 
-            return SecurityAuditLog.objects.create(
+            return self._write(SecurityAuditLog(
                 severity=severity,
                 category=category,
                 event_type=event_type,
@@ -381,7 +401,7 @@ class AuditLogger:
                 path=metadata.get('path', ''),
                 method=metadata.get('method', ''),
                 user_agent=metadata.get('user_agent', ''),
-            )
+            ))
         except Exception as e:
             logger.error(f"Failed to log event: {e}")
             return None
@@ -402,15 +422,26 @@ class AuditLogger:
         Returns:
             Number of events successfully logged
         """
-        logged_count = 0
+        instances = []
         for event in events:
             try:
-                SecurityAuditLog.objects.create(**event)
-                logged_count += 1
+                instance = SecurityAuditLog(**event)
+                if instance.user_id and not instance.username:
+                    instance.username = instance.user.username
+                instances.append(instance)
             except Exception as e:
                 logger.error(f"Failed to log batch event: {e}")
 
-        return logged_count
+        queue = get_audit_queue()
+        if queue is not None:
+            return sum(1 for instance in instances if queue.enqueue(instance))
+
+        try:
+            SecurityAuditLog.objects.bulk_create(instances, batch_size=500)
+        except Exception as e:
+            logger.error(f"Failed to log batch events: {e}")
+            return 0
+        return len(instances)
 
 
 # Singleton instance
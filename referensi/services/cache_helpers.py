@@ -3,24 +3,83 @@ Cache helpers for referensi app.
 
 PHASE 3: Query result caching for dropdown data and frequently accessed queries.
 Reduces database load and improves page load times by 30-50%.
+
+Invalidation uses generation numbers: every key embeds the current
+generation, and a data change bumps it once per transaction (after commit).
+Old keys are never deleted explicitly; they simply stop being read and
+expire by TTL. A 200-row formset save is therefore one ``incr``, not 200
+cache wipes.
 """
 
 from __future__ import annotations
 
+import time
 from typing import List, Tuple
 
 from django.core.cache import cache
+from django.db import transaction
 from django.db.models import QuerySet
 
 from referensi.models import AHSPReferensi
 
 
+class CacheGeneration:
+    """
+    Generation counter in the shared cache for one family of keys.
+
+    ``bump()`` schedules a single increment for when the current
+    transaction commits, however many rows that transaction touches
+    (same idea as ``detail_project.services.bump_project_data_version``).
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+
+    def get(self) -> int:
+        """Current generation; initialised once if missing from the cache."""
+        generation = cache.get(self.key)
+        if generation is None:
+            # Unique seed so a generation evicted from the cache is never reused
+            cache.add(self.key, time.time_ns(), None)
+            generation = cache.get(self.key)
+        return generation
+
+    def bump(self) -> None:
+        connection = transaction.get_connection()
+        if connection.in_atomic_block:
+            for _, func, _ in connection.run_on_commit:
+                if isinstance(func, _BumpGeneration) and func.key == self.key and not func.done:
+                    return
+        transaction.on_commit(_BumpGeneration(self.key))
+
+
+class _BumpGeneration:
+    """on_commit callback; compared by key so one transaction = one bump."""
+
+    def __init__(self, key: str):
+        self.key = key
+        # Already run (e.g. by captureOnCommitCallbacks) -> no longer covers new writes
+        self.done = False
+
+    def __call__(self):
+        self.done = True
+        try:
+            cache.incr(self.key)
+        except ValueError:
+            cache.set(self.key, time.time_ns(), None)
+
+
+# AHSP/rincian data behind ReferensiCache and CacheService search/ahsp keys
+REFERENSI_GENERATION = CacheGeneration("referensi:generation")
+
+
 class ReferensiCache:
     """
     Cache helper for frequently accessed referensi queries.
 
     Uses Django's cache framework (configured to use database cache in settings).
-    Cache is invalidated when AHSP data changes via signals.
+    Keys include ``REFERENSI_GENERATION``; signals bump it when AHSP or
+    rincian data changes.
 
     PHASE 3: Caching dropdown data that rarely changes but is queried on every page load.
     """
@@ -35,6 +94,11 @@ class ReferensiCache:
     # Since we invalidate on data changes, this is just a safety fallback
     TIMEOUT = 3600
 
+    @classmethod
+    def _key(cls, base: str) -> str:
+        """``base`` scoped to the current generation, e.g. ``referensi:g42:sources``."""
+        return base.replace(f"{cls.PREFIX}:", f"{cls.PREFIX}:g{REFERENSI_GENERATION.get()}:", 1)
+
     @classmethod
     def get_available_sources(cls) -> List[str]:
         """
@@ -48,7 +112,8 @@ class ReferensiCache:
             >>> sources
             ['SNI 2025', 'AHSP 2023', 'Custom']
         """
-        cached = cache.get(cls.SOURCES_KEY)
+        key = cls._key(cls.SOURCES_KEY)
+        cached = cache.get(key)
         if cached is not None:
             return cached
 
@@ -60,7 +125,7 @@ class ReferensiCache:
         )
 
         # Cache result
-        cache.set(cls.SOURCES_KEY, sources, cls.TIMEOUT)
+        cache.set(key, sources, cls.TIMEOUT)
         return sources
 
     @classmethod
@@ -76,7 +141,8 @@ class ReferensiCache:
             >>> klasifikasi
             ['Konstruksi', 'Finishing', 'MEP']
         """
-        cached = cache.get(cls.KLASIFIKASI_KEY)
+        key = cls._key(cls.KLASIFIKASI_KEY)
+        cached = cache.get(key)
         if cached is not None:
             return cached
 
@@ -90,7 +156,7 @@ class ReferensiCache:
         )
 
         # Cache result
-        cache.set(cls.KLASIFIKASI_KEY, klasifikasi, cls.TIMEOUT)
+        cache.set(key, klasifikasi, cls.TIMEOUT)
         return klasifikasi
 
     @classmethod
@@ -109,7 +175,7 @@ class ReferensiCache:
             >>> choices[0]
             (1, '1.1.1', 'Pekerjaan Galian')
         """
-        cache_key = f"{cls.JOB_CHOICES_KEY}:{limit}"
+        cache_key = cls._key(f"{cls.JOB_CHOICES_KEY}:{limit}")
         cached = cache.get(cache_key)
         if cached is not None:
             return cached
@@ -131,7 +197,7 @@ class ReferensiCache:
 
         Called when AHSP data with new sources is added/modified.
         """
-        cache.delete(cls.SOURCES_KEY)
+        cache.delete(cls._key(cls.SOURCES_KEY))
 
     @classmethod
     def invalidate_klasifikasi(cls) -> None:
@@ -140,7 +206,7 @@ class ReferensiCache:
 
         Called when AHSP data with new klasifikasi is added/modified.
         """
-        cache.delete(cls.KLASIFIKASI_KEY)
+        cache.delete(cls._key(cls.KLASIFIKASI_KEY))
 
     @classmethod
     def invalidate_job_choices(cls) -> None:
@@ -149,24 +215,18 @@ class ReferensiCache:
 
         Called when AHSP data is added/modified/deleted.
         """
-        # Delete all job_choices keys with different limits
-        # Since we don't know all possible limits, we use pattern delete
-        # For database cache, we'll delete the most common one
-        cache.delete(f"{cls.JOB_CHOICES_KEY}:5000")
-        cache.delete(f"{cls.JOB_CHOICES_KEY}:1000")
-        cache.delete(f"{cls.JOB_CHOICES_KEY}:100")
+        # Delete the common limits; other limits go with the next generation bump
+        cache.delete_many([cls._key(f"{cls.JOB_CHOICES_KEY}:{limit}") for limit in (5000, 1000, 100)])
 
     @classmethod
     def invalidate_all(cls) -> None:
         """
         Invalidate all referensi caches.
 
-        Called when AHSP data is added/modified/deleted.
-        This is the safest approach - invalidate everything on any change.
+        Called when AHSP data is added/modified/deleted. O(1): bumps the
+        generation once per transaction (after commit) instead of deleting keys.
         """
-        cls.invalidate_sources()
-        cls.invalidate_klasifikasi()
-        cls.invalidate_job_choices()
+        REFERENSI_GENERATION.bump()
 
     @classmethod
     def get_cache_stats(cls) -> dict:
@@ -180,15 +240,17 @@ class ReferensiCache:
             >>> stats = ReferensiCache.get_cache_stats()
             >>> stats
             {
+                'generation': 1729300000000000042,
                 'sources_cached': True,
                 'klasifikasi_cached': True,
                 'job_choices_cached': True
             }
         """
         return {
-            "sources_cached": cache.get(cls.SOURCES_KEY) is not None,
-            "klasifikasi_cached": cache.get(cls.KLASIFIKASI_KEY) is not None,
-            "job_choices_cached": cache.get(f"{cls.JOB_CHOICES_KEY}:5000")
+            "generation": REFERENSI_GENERATION.get(),
+            "sources_cached": cache.get(cls._key(cls.SOURCES_KEY)) is not None,
+            "klasifikasi_cached": cache.get(cls._key(cls.KLASIFIKASI_KEY)) is not None,
+            "job_choices_cached": cache.get(cls._key(f"{cls.JOB_CHOICES_KEY}:5000"))
             is not None,
         }
 
@@ -204,4 +266,4 @@ class ReferensiCache:
         cls.get_job_choices(limit=5000)
 
 
-__all__ = ["ReferensiCache"]
+__all__ = ["CacheGeneration", "REFERENSI_GENERATION", "ReferensiCache"]
@@ -43,6 +43,9 @@ class CacheService:
     PREFIX_DASHBOARD = "dashboard"
     PREFIX_STATS = "stats"
 
+    # Prefixes whose keys embed REFERENSI_GENERATION (see generate_key)
+    GENERATION_PREFIXES = (PREFIX_SEARCH, PREFIX_AHSP, PREFIX_RINCIAN)
+
     # Default timeouts (in seconds)
     TIMEOUT_SHORT = 300      # 5 minutes
     TIMEOUT_MEDIUM = 900     # 15 minutes
@@ -89,6 +92,14 @@ class CacheService:
         param_string = '|'.join(params)
         param_hash = hashlib.md5(param_string.encode()).hexdigest()[:12]
 
+        # Data-backed keys carry the referensi generation so a data change
+        # invalidates them without a delete_pattern scan.
+        if prefix in cls.GENERATION_PREFIXES:
+            from referensi.services.cache_helpers import REFERENSI_GENERATION
+
+            # Format: ahsp:<prefix>:g<generation>:<param_hash>
+            return f"ahsp:{prefix}:g{REFERENSI_GENERATION.get()}:{param_hash}"
+
         # Format: ahsp:<prefix>:<param_hash>
         return f"ahsp:{prefix}:{param_hash}"
 
@@ -26,6 +26,8 @@ class DuplicateEntry:
     koefisien: str
     duplicate_of_row: int  # Which row is this a duplicate of
     reason: str = "Kombinasi kategori + kode_item + uraian + satuan sama"
+    sheet_name: str = ""  # Kosong untuk file satu sheet
+    duplicate_of_sheet: str = ""
 
 
 @dataclass
@@ -40,6 +42,7 @@ class SkippedEntry:
     satuan_item: str
     koefisien: str
     reason: str
+    sheet_name: str = ""
 
 
 @dataclass
@@ -76,6 +79,7 @@ def generate_duplicate_report_csv(report: ImportReport, source_filename: str) ->
         # Header
         writer.writerow([
             'Tipe',
+            'Sheet',
             'Baris Excel',
             'Kode AHSP',
             'Nama AHSP',
@@ -84,6 +88,7 @@ def generate_duplicate_report_csv(report: ImportReport, source_filename: str) ->
             'Uraian Item',
             'Satuan',
             'Koefisien',
+            'Duplikat dari Sheet',
             'Duplikat dari Baris',
             'Alasan'
         ])
@@ -92,6 +97,7 @@ def generate_duplicate_report_csv(report: ImportReport, source_filename: str) ->
         for dup in report.duplicates:
             writer.writerow([
                 'DUPLIKAT',
+                dup.sheet_name,
                 dup.row_number,
                 dup.ahsp_kode,
                 dup.ahsp_nama,
@@ -100,6 +106,7 @@ def generate_duplicate_report_csv(report: ImportReport, source_filename: str) ->
                 dup.uraian_item,
                 dup.satuan_item,
                 dup.koefisien,
+                dup.duplicate_of_sheet,
                 dup.duplicate_of_row,
                 dup.reason
             ])
@@ -108,6 +115,7 @@ def generate_duplicate_report_csv(report: ImportReport, source_filename: str) ->
         for skip in report.skipped:
             writer.writerow([
                 'DIABAIKAN',
+                skip.sheet_name,
                 skip.row_number,
                 skip.ahsp_kode,
                 skip.ahsp_nama,
@@ -116,6 +124,7 @@ def generate_duplicate_report_csv(report: ImportReport, source_filename: str) ->
                 skip.uraian_item,
                 skip.satuan_item,
                 skip.koefisien,
+                '',
                 '',  # No duplicate_of_row for skipped
                 skip.reason
             ])
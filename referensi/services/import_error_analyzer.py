@@ -19,12 +19,21 @@ class ErrorAnalysis:
     error_message: str  # Original error message
     user_message: str  # User-friendly explanation
     suggestions: List[str]  # Actionable suggestions
-    affected_rows: List[int]  # Row numbers with issues
+    affected_rows: List[str]  # Row refs with issues ("12" or "12 (sheet 'A')")
     affected_fields: List[str]  # Field names with issues
     severity: str  # 'critical', 'warning', 'info'
     technical_details: str  # Full traceback for debugging
 
 
+# Nomor baris di pesan import, opsional dengan nama sheet (lihat RincianPreview.row_ref)
+_ROW_REF_RE = re.compile(r"baris (\d+(?: \(sheet '[^']*'\))?)", re.IGNORECASE)
+
+
+def _row_sort_key(row_ref: str):
+    number, _, sheet = row_ref.partition(" (sheet ")
+    return sheet, int(number)
+
+
 def analyze_import_exception(exc: Exception, parse_result=None, summary=None) -> ErrorAnalysis:
     """
     Analyze an import exception and provide detailed user-friendly information.
@@ -50,11 +59,11 @@ def analyze_import_exception(exc: Exception, parse_result=None, summary=None) ->
     # Extract affected rows from summary first (if available)
     if summary and hasattr(summary, 'detail_errors') and summary.detail_errors:
         for error in summary.detail_errors:
-            match = re.search(r'baris (\d+)', error, re.IGNORECASE)
+            match = _ROW_REF_RE.search(error)
             if match:
-                row_num = int(match.group(1))
-                if row_num not in affected_rows:
-                    affected_rows.append(row_num)
+                row_ref = match.group(1)
+                if row_ref not in affected_rows:
+                    affected_rows.append(row_ref)
 
     # ============================================================
     # ANALYZE BASED ON ERROR TYPE - User-friendly messages
@@ -104,7 +113,7 @@ def analyze_import_exception(exc: Exception, parse_result=None, summary=None) ->
 
             # Show affected rows if found
             if affected_rows:
-                rows_display = ', '.join(map(str, sorted(affected_rows)[:15]))
+                rows_display = ', '.join(map(str, sorted(affected_rows, key=_row_sort_key)[:15]))
                 if len(affected_rows) > 15:
                     rows_display += f" ... (+{len(affected_rows)-15} baris lainnya)"
                 suggestions.append(f"\n📍 Baris Excel yang bermasalah:")
@@ -112,7 +121,7 @@ def analyze_import_exception(exc: Exception, parse_result=None, summary=None) ->
 
                 suggestions.append("\n📝 Langkah perbaikan:")
                 suggestions.append("   1. Buka file Excel Anda")
-                suggestions.append(f"   2. Cari dan periksa baris: {', '.join(map(str, sorted(affected_rows)[:5]))}")
+                suggestions.append(f"   2. Cari dan periksa baris: {', '.join(map(str, sorted(affected_rows, key=_row_sort_key)[:5]))}")
                 suggestions.append("   3. Perbaiki data yang bermasalah")
                 suggestions.append("   4. Save dan upload ulang")
             else:
@@ -215,7 +224,7 @@ def analyze_import_exception(exc: Exception, parse_result=None, summary=None) ->
                 suggestions.append("   • Ada duplikat dalam file Excel itu sendiri")
 
                 if affected_rows:
-                    rows_display = ', '.join(map(str, sorted(affected_rows)[:10]))
+                    rows_display = ', '.join(map(str, sorted(affected_rows, key=_row_sort_key)[:10]))
                     if len(affected_rows) > 10:
                         rows_display += f" ... (+{len(affected_rows)-10} lainnya)"
                     suggestions.append(f"\n📍 Baris yang duplikat: {rows_display}")
@@ -224,7 +233,7 @@ def analyze_import_exception(exc: Exception, parse_result=None, summary=None) ->
                 suggestions.append(f"   1. Buka file Excel Anda")
                 suggestions.append(f"   2. Cari kolom '{friendly_field}'")
                 if affected_rows:
-                    suggestions.append(f"   3. Periksa baris {', '.join(map(str, sorted(affected_rows)[:5]))}")
+                    suggestions.append(f"   3. Periksa baris {', '.join(map(str, sorted(affected_rows, key=_row_sort_key)[:5]))}")
                 suggestions.append("   4. Hapus atau ubah nilai yang duplikat")
                 suggestions.append("   5. Save dan upload ulang")
 
@@ -244,7 +253,7 @@ def analyze_import_exception(exc: Exception, parse_result=None, summary=None) ->
             # Generic integrity error
             suggestions.append("\n❌ Data tidak sesuai dengan aturan database")
             if affected_rows:
-                rows_display = ', '.join(map(str, sorted(affected_rows)[:10]))
+                rows_display = ', '.join(map(str, sorted(affected_rows, key=_row_sort_key)[:10]))
                 suggestions.append(f"\n📍 Baris yang bermasalah: {rows_display}")
             suggestions.append("\n📝 Periksa:")
             suggestions.append("   • Format data sesuai template")
@@ -355,14 +364,14 @@ def analyze_import_exception(exc: Exception, parse_result=None, summary=None) ->
                 suggestions.append(f"   ... dan {remaining} error lainnya")
 
         if affected_rows:
-            rows_display = ', '.join(map(str, sorted(affected_rows)[:10]))
+            rows_display = ', '.join(map(str, sorted(affected_rows, key=_row_sort_key)[:10]))
             if len(affected_rows) > 10:
                 rows_display += f" ... (+{len(affected_rows)-10} lainnya)"
             suggestions.append(f"\n📍 Baris yang bermasalah: {rows_display}")
 
             suggestions.append("\n📝 Cara memperbaiki:")
             suggestions.append("   1. Buka file Excel Anda")
-            suggestions.append(f"   2. Periksa baris {', '.join(map(str, sorted(affected_rows)[:5]))}")
+            suggestions.append(f"   2. Periksa baris {', '.join(map(str, sorted(affected_rows, key=_row_sort_key)[:5]))}")
             if affected_fields:
                 suggestions.append(f"   3. Fokus ke kolom: {', '.join(affected_fields)}")
             suggestions.append("   4. Perbaiki format data sesuai contoh di atas")
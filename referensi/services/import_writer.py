@@ -7,10 +7,11 @@ from dataclasses import dataclass, field
 
 from django.db import transaction
 
+from referensi.history_batch import import_history_batch
 from referensi.models import AHSPReferensi, RincianReferensi
 from .import_utils import canonicalize_kategori
 from .item_code_registry import assign_item_codes, persist_item_codes
-from .cache_service import CacheService
+from .cache_helpers import ReferensiCache
 from .duplicate_report import (
     DuplicateEntry,
     SkippedEntry,
@@ -30,6 +31,7 @@ class ImportSummary:
     rincian_skipped: int = 0  # Number of rows skipped (empty uraian, etc)
     detail_errors: list[str] = field(default_factory=list)
     duplicate_report_path: str = ""  # Path to CSV report file
+    history_batch_id: int | None = None  # ImportHistoryBatch untuk audit trail import ini
 
 
 def _log(stdout, message: str) -> None:
@@ -75,7 +77,7 @@ def _deduplicate_rincian(rincian_list, job, stdout):
     Returns:
         tuple: (unique_rincian_list, duplicate_count, duplicate_entries_list)
     """
-    seen = {}  # key -> (first_detail, first_row_number)
+    seen = {}  # key -> first_detail
     unique = []
     duplicates = []
     duplicate_entries = []  # For CSV export
@@ -91,13 +93,14 @@ def _deduplicate_rincian(rincian_list, job, stdout):
         )
 
         if key in seen:
-            first_detail, first_row = seen[key]
+            first_detail = seen[key]
             duplicates.append(
-                f"    📍 Baris {detail.row_number}: {kategori} - {detail.uraian_item} ({detail.satuan_item}) - DUPLIKAT dari baris {first_row}"
+                f"    📍 Baris {detail.row_ref}: {kategori} - {detail.uraian_item} ({detail.satuan_item}) - DUPLIKAT dari baris {first_detail.row_ref}"
             )
             # Collect for CSV export
             duplicate_entries.append(DuplicateEntry(
                 row_number=detail.row_number,
+                sheet_name=detail.sheet_name,
                 ahsp_kode=job.kode_ahsp,
                 ahsp_nama=job.nama_ahsp,
                 kategori=kategori,
@@ -105,11 +108,12 @@ def _deduplicate_rincian(rincian_list, job, stdout):
                 uraian_item=detail.uraian_item,
                 satuan_item=detail.satuan_item,
                 koefisien=str(detail.koefisien),
-                duplicate_of_row=first_row,
-                reason=f"Sama persis dengan baris {first_row} (kategori + kode_item + uraian + satuan)"
+                duplicate_of_row=first_detail.row_number,
+                duplicate_of_sheet=first_detail.sheet_name,
+                reason=f"Sama persis dengan baris {first_detail.row_ref} (kategori + kode_item + uraian + satuan)"
             ))
         else:
-            seen[key] = (detail, detail.row_number)
+            seen[key] = detail
             unique.append(detail)
 
     if duplicates:
@@ -135,7 +139,9 @@ def _deduplicate_rincian(rincian_list, job, stdout):
     return unique, len(duplicates), duplicate_entries
 
 
-def write_parse_result_to_db(parse_result, source_file: str | None = None, *, stdout=None) -> ImportSummary:
+def write_parse_result_to_db(
+    parse_result, source_file: str | None = None, *, stdout=None, user=None
+) -> ImportSummary:
     """Persisten ParseResult ke database.
 
     PHASE 1 OPTIMIZATION:
@@ -155,6 +161,11 @@ def write_parse_result_to_db(parse_result, source_file: str | None = None, *, st
     PHASE 6 FIX (Nov 2025):
     - Fixed duplicate AHSP in Excel causing IntegrityError on rincian bulk insert
     - Merge rincian from duplicate AHSP entries before processing
+
+    History: seluruh perubahan (AHSP, rincian yang dihapus/ditulis ulang,
+    kode item) dicatat sebagai satu ``ImportHistoryBatch`` dengan historical
+    rows yang di-bulk insert, termasuk jalur bulk_create yang sebelumnya
+    tidak punya history.
     """
     import logging
     logger = logging.getLogger(__name__)
@@ -192,7 +203,11 @@ def write_parse_result_to_db(parse_result, source_file: str | None = None, *, st
             # Merge rincian from duplicate AHSP
             existing_job = merged_jobs[key]
             existing_job.rincian.extend(job.rincian)
-            _log(stdout, f"[MERGE] Duplicate AHSP found in Excel: {job.kode_ahsp} - merging rincian")
+            _log(
+                stdout,
+                f"[MERGE] Duplicate AHSP found in Excel: {job.kode_ahsp} (baris {job.row_ref}, "
+                f"pertama di baris {existing_job.row_ref}) - merging rincian",
+            )
             logger.warning(f"Duplicate AHSP in Excel: {job.sumber} :: {job.kode_ahsp} - merging {len(job.rincian)} rincian")
         else:
             merged_jobs[key] = job
@@ -207,7 +222,10 @@ def write_parse_result_to_db(parse_result, source_file: str | None = None, *, st
         timestamp=logger.info.__self__.name if hasattr(logger.info, '__self__') else ""
     )
 
-    with transaction.atomic():
+    with transaction.atomic(), import_history_batch(
+        "excel_import", user=user, source_file=source_file or ""
+    ) as history:
+        summary.history_batch_id = history.record.pk
         persist_item_codes(parse_result)
 
         # PHASE 1: Collect all rincian first, then bulk insert once
@@ -277,9 +295,9 @@ def write_parse_result_to_db(parse_result, source_file: str | None = None, *, st
                         satuan_item=detail.satuan_item,
                         koefisien=detail.koefisien,
                     )
-                    all_pending_details.append((RincianReferensi(**fields), detail.row_number))
+                    all_pending_details.append((RincianReferensi(**fields), detail.row_ref))
                 except Exception as exc:  # pragma: no cover - validasi runtime
-                    message = f"[!] Gagal menyiapkan rincian baris {detail.row_number}: {exc}"
+                    message = f"[!] Gagal menyiapkan rincian baris {detail.row_ref}: {exc}"
                     summary.detail_errors.append(message)
                     _log(stdout, message)
 
@@ -304,6 +322,7 @@ def write_parse_result_to_db(parse_result, source_file: str | None = None, *, st
                 logger.info(f"Bulk creating {len(instances)} rincian records with batch_size={batch_size}")
 
                 RincianReferensi.objects.bulk_create(instances, batch_size=batch_size)
+                history.capture(instances, "+")
                 summary.rincian_written = len(instances)
                 _log(stdout, f"[bulk] ✓ Inserted {len(instances)} rincian records")
                 logger.info(f"Successfully inserted {len(instances)} rincian records")
@@ -335,12 +354,12 @@ def write_parse_result_to_db(parse_result, source_file: str | None = None, *, st
                 # Don't fail the import for this
 
         # PHASE 4: Invalidate search cache after import
-        # SIMPLIFIED: Try to invalidate, but don't fail import if this fails
+        # Generation bump (once, on commit) instead of a delete_pattern scan;
+        # rincian bulk_create sends no signals, so do it explicitly here.
         if summary.rincian_written > 0:
             try:
-                cache = CacheService()
-                invalidated = cache.invalidate_search_cache()
-                _log(stdout, f"[cache] Invalidated {invalidated} search cache keys")
+                ReferensiCache.invalidate_all()
+                _log(stdout, "[cache] Referensi cache generation bumped")
             except Exception as exc:
                 error_msg = f"[!] Failed to invalidate cache: {exc}"
                 _log(stdout, error_msg)
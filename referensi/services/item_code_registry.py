@@ -8,6 +8,7 @@ from typing import Dict, Iterable, Tuple
 
 from django.db import transaction
 
+from referensi.history_batch import record_bulk_history
 from referensi.models import KodeItemReferensi, RincianReferensi
 from .import_utils import canonicalize_kategori
 
@@ -141,6 +142,24 @@ def assign_item_codes(parse_result) -> CodeAssignmentStats:
     return stats
 
 
+def _fetch_item_codes(keys) -> Dict[Tuple[str, str, str], KodeItemReferensi]:
+    """KodeItemReferensi yang ada untuk (kategori, uraian, satuan) pada ``keys``."""
+    keys = set(keys)
+    if not keys:
+        return {}
+    qs = KodeItemReferensi.objects.filter(
+        kategori__in={key[0] for key in keys},
+        uraian_item__in={key[1] for key in keys},
+        satuan_item__in={key[2] for key in keys},
+    ).iterator(chunk_size=500)
+    # Tiga filter __in adalah produk silang: saring ke kombinasi yang diminta
+    return {
+        (obj.kategori, obj.uraian_item, obj.satuan_item): obj
+        for obj in qs
+        if (obj.kategori, obj.uraian_item, obj.satuan_item) in keys
+    }
+
+
 def persist_item_codes(parse_result) -> int:
     """Simpan mapping kategori+uraian+satuan -> kode ke database."""
 
@@ -168,46 +187,52 @@ def persist_item_codes(parse_result) -> int:
     if not pending:
         return 0
 
-    categories = {kategori for kategori, _, _ in pending}
-    uraian_values = {uraian for _, uraian, _ in pending}
-    satuan_values = {satuan for _, _, satuan in pending}
-
-    existing_map: Dict[Tuple[str, str, str], KodeItemReferensi] = {}
-    existing_qs = KodeItemReferensi.objects.filter(
-        kategori__in=categories,
-        uraian_item__in=uraian_values,
-        satuan_item__in=satuan_values,
-    ).iterator(chunk_size=500)
-    for obj in existing_qs:
-        key = (obj.kategori, obj.uraian_item, obj.satuan_item)
-        existing_map[key] = obj
-
-    to_create: list[KodeItemReferensi] = []
-    to_update: list[KodeItemReferensi] = []
-
-    for (kategori, uraian, satuan), kode in pending.items():
-        existing = existing_map.get((kategori, uraian, satuan))
-        if existing:
-            if existing.kode_item != kode:
-                existing.kode_item = kode
-                to_update.append(existing)
-        else:
-            to_create.append(
-                KodeItemReferensi(
-                    kategori=kategori,
-                    uraian_item=uraian,
-                    satuan_item=satuan,
-                    kode_item=kode,
-                )
-            )
-
     saved = 0
     with transaction.atomic():
+        # Snapshot sebelum insert: baris ini sudah ada, jadi bukan "+" history
+        existing_map = _fetch_item_codes(pending)
+        existing_pks = {obj.pk for obj in existing_map.values()}
+
+        to_create: list[KodeItemReferensi] = []
+        to_update: list[KodeItemReferensi] = []
+        for key, kode in pending.items():
+            existing = existing_map.get(key)
+            if existing:
+                if existing.kode_item != kode:
+                    existing.kode_item = kode
+                    to_update.append(existing)
+            else:
+                kategori, uraian, satuan = key
+                to_create.append(
+                    KodeItemReferensi(
+                        kategori=kategori,
+                        uraian_item=uraian,
+                        satuan_item=satuan,
+                        kode_item=kode,
+                    )
+                )
+
         if to_create:
             KodeItemReferensi.objects.bulk_create(to_create, batch_size=500, ignore_conflicts=True)
-            saved += len(to_create)
+            # ignore_conflicts tidak mengembalikan pk: ambil ulang untuk history.
+            # Baris yang disisipkan proses lain di antara snapshot dan insert
+            # (konflik) diperlakukan sebagai update, bukan "+".
+            created = []
+            for key, obj in _fetch_item_codes(
+                (obj.kategori, obj.uraian_item, obj.satuan_item) for obj in to_create
+            ).items():
+                if obj.pk in existing_pks:
+                    continue
+                if obj.kode_item == pending[key]:
+                    created.append(obj)
+                else:
+                    obj.kode_item = pending[key]
+                    to_update.append(obj)
+            record_bulk_history(created, "+")
+            saved += len(created)
         if to_update:
             KodeItemReferensi.objects.bulk_update(to_update, ["kode_item"], batch_size=500)
+            record_bulk_history(to_update, "~")
             saved += len(to_update)
     return saved
 
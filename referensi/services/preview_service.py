@@ -6,7 +6,6 @@ Extracted from views/preview.py for better testability and separation of concern
 """
 
 import os
-import pickle
 import secrets
 import tempfile
 from dataclasses import dataclass
@@ -19,6 +18,7 @@ from django.utils import timezone
 from referensi.forms import PreviewDetailForm, PreviewJobForm
 from referensi.services.ahsp_parser import ParseResult
 from referensi.services.item_code_registry import assign_item_codes
+from referensi.services.preview_store import PreviewStore
 
 
 # Formset factories
@@ -48,20 +48,23 @@ class PageData:
 
 class ImportSessionManager:
     """
-    Manages import session data using pickle files.
+    Manages import session data using per-session SQLite preview stores.
 
-    Provides automatic cleanup of old files and session expiration.
-    In Phase 3, this will be migrated to Redis/Memcached for better scalability.
+    Parsed rows are kept in a row-addressable file (see ``PreviewStore``) so
+    preview pages and edits touch only the affected rows. Provides automatic
+    cleanup of old files and session expiration.
     """
 
     SESSION_KEY = "referensi_pending_import"
     CLEANUP_AGE_HOURS = 2
+    FILE_PREFIX = "ahsp_preview_"
+    FILE_SUFFIXES = (".sqlite3", ".pkl")  # .pkl: legacy pickle files
 
     def store(
         self, session, parse_result: ParseResult, uploaded_name: str
     ) -> str:
         """
-        Store parse result to temporary file and save reference in session.
+        Store parse result to a temporary preview store and save reference in session.
 
         Args:
             session: Django session object
@@ -78,23 +81,16 @@ class ImportSessionManager:
         self._cleanup_old_files()
 
         token = secrets.token_urlsafe(16)
-        fd, tmp_path = tempfile.mkstemp(prefix="ahsp_preview_", suffix=".pkl")
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=self.FILE_PREFIX, suffix=self.FILE_SUFFIXES[0]
+        )
+        os.close(fd)
+        os.remove(tmp_path)
 
-        try:
-            with os.fdopen(fd, "wb") as handle:
-                pickle.dump(
-                    parse_result, handle, protocol=pickle.HIGHEST_PROTOCOL
-                )
-        except Exception:
-            # Cleanup on failure
-            try:
-                os.remove(tmp_path)
-            except FileNotFoundError:
-                pass
-            raise
+        PreviewStore.create(tmp_path, parse_result)
 
         session[self.SESSION_KEY] = {
-            "parse_path": tmp_path,
+            "store_path": tmp_path,
             "uploaded_name": uploaded_name,
             "token": token,
             "created_at": timezone.now().isoformat(),
@@ -102,19 +98,19 @@ class ImportSessionManager:
         session.modified = True
         return token
 
-    def retrieve(self, session) -> tuple[ParseResult, str, str]:
+    def open_store(self, session) -> tuple[PreviewStore, str, str]:
         """
-        Retrieve parse result from session.
+        Open the preview store referenced by the session.
 
         Args:
             session: Django session object
 
         Returns:
-            tuple: (parse_result, uploaded_name, token)
+            tuple: (store, uploaded_name, token)
 
         Raises:
             FileNotFoundError: If session data missing or expired
-            pickle.UnpicklingError: If file corrupted
+            PreviewStoreError: If file corrupted
         """
         data = session.get(self.SESSION_KEY)
         if not data:
@@ -140,24 +136,51 @@ class ImportSessionManager:
                 # If timestamp parsing fails, continue anyway
                 pass
 
-        parse_path = data.get("parse_path")
-        if not parse_path:
-            raise FileNotFoundError("Parse path missing from session")
+        store_path = data.get("store_path")
+        if not store_path:
+            # Sessions created before the SQLite store only carry parse_path
+            self.cleanup(session)
+            raise FileNotFoundError("Preview store path missing from session")
 
-        if not os.path.exists(parse_path):
+        if not os.path.exists(store_path):
             self.cleanup(session)
-            raise FileNotFoundError("Parse file not found on disk")
+            raise FileNotFoundError("Preview store not found on disk")
 
-        with open(parse_path, "rb") as handle:
-            parse_result = pickle.load(handle)
+        store = PreviewStore(store_path)
+        # Validate schema eagerly so callers get PreviewStoreError here
+        store.conn
 
         uploaded_name = data.get("uploaded_name", "")
         token = data.get("token", "")
+        return store, uploaded_name, token
+
+    def retrieve(self, session) -> tuple[ParseResult, str, str]:
+        """
+        Retrieve the full parse result from session.
+
+        Loads every job and rincian; use ``open_store`` for paged access.
+
+        Args:
+            session: Django session object
+
+        Returns:
+            tuple: (parse_result, uploaded_name, token)
+
+        Raises:
+            FileNotFoundError: If session data missing or expired
+            PreviewStoreError: If file corrupted
+        """
+        store, uploaded_name, token = self.open_store(session)
+        with store:
+            parse_result = store.load()
         return parse_result, uploaded_name, token
 
     def rewrite(self, session, parse_result: ParseResult) -> str:
         """
-        Rewrite existing parse result (after user edits).
+        Rewrite existing parse result (after in-memory edits).
+
+        Paged edits should go through ``PreviewImportService.apply_*_updates``
+        with a ``PreviewStore`` instead, which only writes edited rows.
 
         Args:
             session: Django session object
@@ -173,12 +196,15 @@ class ImportSessionManager:
         if not data:
             raise FileNotFoundError("No pending import to rewrite")
 
-        parse_path = data.get("parse_path")
-        if not parse_path:
-            raise FileNotFoundError("Parse path missing")
+        store_path = data.get("store_path")
+        if not store_path:
+            raise FileNotFoundError("Preview store path missing")
 
-        with open(parse_path, "wb") as handle:
-            pickle.dump(parse_result, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        try:
+            os.remove(store_path)
+        except FileNotFoundError:
+            pass
+        PreviewStore.create(store_path, parse_result)
 
         session.modified = True
         return data.get("token", "")
@@ -192,8 +218,10 @@ class ImportSessionManager:
         """
         data = session.pop(self.SESSION_KEY, None)
         if data:
-            path = data.get("parse_path")
-            if path:
+            for key in ("store_path", "parse_path"):
+                path = data.get(key)
+                if not path:
+                    continue
                 try:
                     os.remove(path)
                 except (FileNotFoundError, OSError):
@@ -201,7 +229,7 @@ class ImportSessionManager:
         session.modified = True
 
     def _cleanup_old_files(self):
-        """Remove old pickle files from temp directory."""
+        """Remove old preview files from temp directory."""
         import time
 
         temp_dir = tempfile.gettempdir()
@@ -209,8 +237,8 @@ class ImportSessionManager:
 
         try:
             for filename in os.listdir(temp_dir):
-                if filename.startswith("ahsp_preview_") and filename.endswith(
-                    ".pkl"
+                if filename.startswith(self.FILE_PREFIX) and filename.endswith(
+                    self.FILE_SUFFIXES
                 ):
                     filepath = os.path.join(temp_dir, filename)
                     try:
@@ -353,19 +381,23 @@ class PreviewImportService:
         return filtered
 
     def build_job_page(
-        self, parse_result: Optional[ParseResult], page: int, *, data=None
+        self, parse_result: Optional[ParseResult | PreviewStore], page: int, *, data=None
     ) -> PageData:
         """
         Build job formset for given page.
 
         Args:
-            parse_result: Parsed AHSP data (None if no data)
+            parse_result: Parsed AHSP data or preview store (None if no data).
+                A ``PreviewStore`` only loads the rows of the requested page.
             page: Page number (1-indexed)
             data: POST data for bound formset (None for unbound)
 
         Returns:
             PageData: Formset, rows, and pagination info
         """
+        if isinstance(parse_result, PreviewStore):
+            return self._build_job_page_from_store(parse_result, page, data=data)
+
         jobs = parse_result.jobs if parse_result else []
 
         # Apply search filter if query exists
@@ -423,7 +455,7 @@ class PreviewImportService:
         return PageData(formset=formset, rows=rows, page_info=page_info)
 
     def build_detail_page(
-        self, parse_result: Optional[ParseResult], page: int, *, data=None
+        self, parse_result: Optional[ParseResult | PreviewStore], page: int, *, data=None
     ) -> PageData:
         """
         Build detail formset for given page.
@@ -431,13 +463,17 @@ class PreviewImportService:
         Details are flattened across all jobs for pagination.
 
         Args:
-            parse_result: Parsed AHSP data (None if no data)
+            parse_result: Parsed AHSP data or preview store (None if no data).
+                A ``PreviewStore`` only loads the rows of the requested page.
             page: Page number (1-indexed)
             data: POST data for bound formset (None for unbound)
 
         Returns:
             PageData: Formset, rows, and pagination info
         """
+        if isinstance(parse_result, PreviewStore):
+            return self._build_detail_page_from_store(parse_result, page, data=data)
+
         jobs = parse_result.jobs if parse_result else []
 
         # Flatten all details first for filtering
@@ -558,18 +594,117 @@ class PreviewImportService:
 
         return PageData(formset=formset, rows=rows, page_info=page_info)
 
+    def _build_job_page_from_store(
+        self, store: PreviewStore, page: int, *, data=None
+    ) -> PageData:
+        """Build job page reading only the requested rows from the store."""
+        total = store.count_jobs(self.search_jobs_query)
+        start, end, page, total_pages = self.paginate(
+            total, page, self.job_page_size
+        )
+        jobs = store.fetch_jobs(start, end - start, self.search_jobs_query)
+
+        initial = [
+            {
+                "job_index": job.job_index,
+                "sumber": job.sumber,
+                "kode_ahsp": job.kode_ahsp,
+                "nama_ahsp": job.nama_ahsp,
+                "klasifikasi": job.klasifikasi or "",
+                "sub_klasifikasi": job.sub_klasifikasi or "",
+                "satuan": job.satuan or "",
+            }
+            for job in jobs
+        ]
+
+        if data is not None:
+            formset = PreviewJobFormSet(data, prefix="jobs", initial=initial)
+        else:
+            formset = PreviewJobFormSet(prefix="jobs", initial=initial)
+
+        rows = [
+            {"job": job, "form": form, "job_index": job.job_index}
+            for job, form in zip(jobs, formset.forms)
+        ]
+
+        page_info = PageInfo(
+            page=page,
+            total_pages=total_pages,
+            total_items=total,
+            start_index=(start + 1) if total else 0,
+            end_index=end,
+        )
+        return PageData(formset=formset, rows=rows, page_info=page_info)
+
+    def _build_detail_page_from_store(
+        self, store: PreviewStore, page: int, *, data=None
+    ) -> PageData:
+        """Build detail page reading only the requested rows from the store."""
+        total = store.count_details(self.search_details_query)
+        start, end, page, total_pages = self.paginate(
+            total, page, self.detail_page_size
+        )
+        details = store.fetch_details(
+            start, end - start, self.search_details_query
+        )
+
+        initial = [
+            {
+                "job_index": item.job_index,
+                "detail_index": item.detail_index,
+                "kategori": item.detail.kategori,
+                "kode_item": item.detail.kode_item,
+                "uraian_item": item.detail.uraian_item,
+                "satuan_item": item.detail.satuan_item,
+                "koefisien": item.detail.koefisien,
+            }
+            for item in details
+        ]
+
+        if data is not None:
+            formset = PreviewDetailFormSet(
+                data, prefix="details", initial=initial
+            )
+        else:
+            formset = PreviewDetailFormSet(prefix="details", initial=initial)
+
+        rows = [
+            {
+                "detail": item.detail,
+                "job": item.job,
+                "form": form,
+                "job_index": item.job_index,
+            }
+            for item, form in zip(details, formset.forms)
+        ]
+
+        page_info = PageInfo(
+            page=page,
+            total_pages=total_pages,
+            total_items=total,
+            start_index=(start + 1) if total else 0,
+            end_index=min(end, total),
+        )
+        return PageData(formset=formset, rows=rows, page_info=page_info)
+
     def apply_job_updates(
-        self, parse_result: ParseResult, cleaned_data: list[dict]
+        self, parse_result: ParseResult | PreviewStore, cleaned_data: list[dict]
     ) -> None:
         """
         Apply user edits to jobs in parse result.
 
-        Modifies parse_result in place.
+        Modifies parse_result in place. A ``PreviewStore`` only writes
+        the edited rows.
 
         Args:
-            parse_result: Parsed AHSP data
+            parse_result: Parsed AHSP data or preview store
             cleaned_data: List of cleaned form data from formset
         """
+        if isinstance(parse_result, PreviewStore):
+            # Job fields do not take part in item code assignment
+            parse_result.update_jobs(cleaned_data)
+            return
+
         for cleaned in cleaned_data:
             if not cleaned:
                 continue
@@ -590,17 +725,22 @@ class PreviewImportService:
         assign_item_codes(parse_result)
 
     def apply_detail_updates(
-        self, parse_result: ParseResult, cleaned_data: list[dict]
+        self, parse_result: ParseResult | PreviewStore, cleaned_data: list[dict]
     ) -> None:
         """
         Apply user edits to details in parse result.
 
-        Modifies parse_result in place.
+        Modifies parse_result in place. A ``PreviewStore`` only writes
+        the edited rows (plus rows whose item code is regenerated).
 
         Args:
-            parse_result: Parsed AHSP data
+            parse_result: Parsed AHSP data or preview store
             cleaned_data: List of cleaned form data from formset
         """
+        if isinstance(parse_result, PreviewStore):
+            parse_result.update_details(cleaned_data)
+            return
+
         for cleaned in cleaned_data:
             if not cleaned:
                 continue
@@ -0,0 +1,546 @@
+"""
+Paged preview storage for AHSP import sessions.
+
+Menyimpan ``ParseResult`` ke file SQLite per-sesi sehingga halaman preview
+hanya membaca baris yang ditampilkan dan edit hanya menulis baris yang
+berubah, tanpa harus memuat ulang seluruh file (50k+ baris) setiap request.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from typing import Iterable, List, Optional
+
+from referensi.services.ahsp_parser import (
+    AHSPPreview,
+    ParseResult,
+    RincianPreview,
+    format_row_ref,
+)
+
+
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    job_index INTEGER PRIMARY KEY,
+    sumber TEXT NOT NULL,
+    kode_ahsp TEXT NOT NULL,
+    nama_ahsp TEXT NOT NULL,
+    klasifikasi TEXT NOT NULL DEFAULT '',
+    sub_klasifikasi TEXT NOT NULL DEFAULT '',
+    satuan TEXT NOT NULL DEFAULT '',
+    row_number INTEGER NOT NULL,
+    rincian_count INTEGER NOT NULL DEFAULT 0,
+    sheet_name TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS rincian (
+    flat_index INTEGER PRIMARY KEY,
+    job_index INTEGER NOT NULL,
+    detail_index INTEGER NOT NULL,
+    kategori TEXT NOT NULL,
+    kode_item TEXT NOT NULL DEFAULT '',
+    uraian_item TEXT NOT NULL,
+    satuan_item TEXT NOT NULL DEFAULT '',
+    koefisien TEXT NOT NULL,
+    row_number INTEGER NOT NULL,
+    kategori_source TEXT NOT NULL DEFAULT '',
+    kode_item_source TEXT NOT NULL DEFAULT 'input',
+    kode_item_original TEXT NOT NULL DEFAULT '',
+    sheet_name TEXT NOT NULL DEFAULT ''
+);
+CREATE UNIQUE INDEX IF NOT EXISTS rincian_job_detail
+    ON rincian (job_index, detail_index);
+"""
+
+_JOB_COLUMNS = (
+    "job_index, sumber, kode_ahsp, nama_ahsp, klasifikasi, "
+    "sub_klasifikasi, satuan, row_number, rincian_count, sheet_name"
+)
+_RINCIAN_COLUMNS = (
+    "r.flat_index, r.job_index, r.detail_index, r.kategori, r.kode_item, "
+    "r.uraian_item, r.satuan_item, r.koefisien, r.row_number, "
+    "r.kategori_source, r.kode_item_source, r.kode_item_original, r.sheet_name"
+)
+
+# Kolom pencarian dibuat identik dengan filter in-memory PreviewImportService
+_JOB_SEARCH_EXPR = "py_lower(sumber || ' ' || kode_ahsp || ' ' || nama_ahsp)"
+_DETAIL_SEARCH_EXPR = (
+    "py_lower(r.kode_item || ' ' || r.uraian_item || ' ' || r.satuan_item)"
+)
+
+
+class PreviewStoreError(Exception):
+    """File preview tidak dapat dibaca (rusak atau versi skema berbeda)."""
+
+
+@dataclass
+class PreviewJobRow:
+    """Satu baris pekerjaan dari store (tanpa rincian)."""
+
+    job_index: int
+    sumber: str
+    kode_ahsp: str
+    nama_ahsp: str
+    klasifikasi: str
+    sub_klasifikasi: str
+    satuan: str
+    row_number: int
+    rincian_count: int
+    sheet_name: str = ""
+
+    @property
+    def row_ref(self) -> str:
+        return format_row_ref(self.row_number, self.sheet_name)
+
+
+@dataclass
+class PreviewDetailRow:
+    """Satu baris rincian dari store beserta pekerjaan induknya."""
+
+    flat_index: int
+    job_index: int
+    detail_index: int
+    detail: RincianPreview
+    job: PreviewJobRow
+
+
+@dataclass
+class PreviewSummary:
+    """
+    Ringkasan ringan yang menggantikan ParseResult di template preview.
+
+    Menyediakan atribut yang sama (errors, warnings, total_jobs,
+    total_rincian) tanpa memuat seluruh pekerjaan.
+    """
+
+    total_jobs: int = 0
+    total_rincian: int = 0
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+
+    @property
+    def has_errors(self) -> bool:
+        return bool(self.errors)
+
+
+def _py_lower(value) -> str:
+    return str(value or "").lower()
+
+
+def _to_decimal(value) -> Decimal:
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, TypeError, ValueError):
+        return Decimal("0")
+
+
+class PreviewStore:
+    """
+    Row-addressable SQLite store untuk satu sesi preview import.
+
+    Usage:
+        store = PreviewStore.create(path, parse_result)
+        rows = store.fetch_jobs(offset=0, limit=50)
+        store.update_jobs(cleaned_data)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+
+    # ------------------------------------------------------------------
+    # Connection management
+    # ------------------------------------------------------------------
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if not os.path.exists(self.path):
+                raise FileNotFoundError("Preview store not found on disk")
+            try:
+                conn = sqlite3.connect(self.path)
+                conn.create_function("py_lower", 1, _py_lower, deterministic=True)
+                version = conn.execute(
+                    "SELECT value FROM meta WHERE key = 'schema_version'"
+                ).fetchone()
+            except sqlite3.DatabaseError as exc:
+                raise PreviewStoreError(str(exc)) from exc
+            if not version or int(version[0]) != SCHEMA_VERSION:
+                conn.close()
+                raise PreviewStoreError("Preview store schema version mismatch")
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Write full result (initial upload)
+    # ------------------------------------------------------------------
+    @classmethod
+    def create(cls, path: str, parse_result: ParseResult) -> "PreviewStore":
+        """Tulis ParseResult ke file SQLite baru di ``path``."""
+        conn = sqlite3.connect(path)
+        try:
+            conn.executescript(_SCHEMA)
+            with conn:
+                conn.executemany(
+                    "INSERT INTO meta (key, value) VALUES (?, ?)",
+                    [
+                        ("schema_version", str(SCHEMA_VERSION)),
+                        ("errors", json.dumps(list(parse_result.errors))),
+                        ("warnings", json.dumps(list(parse_result.warnings))),
+                    ],
+                )
+                conn.executemany(
+                    f"INSERT INTO jobs ({_JOB_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        (
+                            job_index,
+                            job.sumber,
+                            job.kode_ahsp,
+                            job.nama_ahsp,
+                            job.klasifikasi or "",
+                            job.sub_klasifikasi or "",
+                            job.satuan or "",
+                            job.row_number,
+                            len(job.rincian),
+                            job.sheet_name or "",
+                        )
+                        for job_index, job in enumerate(parse_result.jobs)
+                    ),
+                )
+                conn.executemany(
+                    "INSERT INTO rincian (flat_index, job_index, detail_index, kategori, "
+                    "kode_item, uraian_item, satuan_item, koefisien, row_number, "
+                    "kategori_source, kode_item_source, kode_item_original, sheet_name) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    cls._iter_rincian_rows(parse_result.jobs),
+                )
+        except Exception:
+            conn.close()
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            raise
+        conn.close()
+        return cls(path)
+
+    @staticmethod
+    def _iter_rincian_rows(jobs: Iterable[AHSPPreview]):
+        flat_index = 0
+        for job_index, job in enumerate(jobs):
+            for detail_index, detail in enumerate(job.rincian):
+                yield (
+                    flat_index,
+                    job_index,
+                    detail_index,
+                    detail.kategori or "",
+                    detail.kode_item or "",
+                    detail.uraian_item or "",
+                    detail.satuan_item or "",
+                    str(detail.koefisien),
+                    detail.row_number,
+                    detail.kategori_source or "",
+                    detail.kode_item_source or "input",
+                    detail.kode_item_original or "",
+                    detail.sheet_name or "",
+                )
+                flat_index += 1
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def summary(self) -> PreviewSummary:
+        meta = dict(self.conn.execute("SELECT key, value FROM meta"))
+        total_jobs, total_rincian = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(rincian_count), 0) FROM jobs"
+        ).fetchone()
+        return PreviewSummary(
+            total_jobs=total_jobs,
+            total_rincian=total_rincian,
+            errors=json.loads(meta.get("errors", "[]")),
+            warnings=json.loads(meta.get("warnings", "[]")),
+        )
+
+    @staticmethod
+    def _search_clause(expression: str, query: str) -> tuple[str, list]:
+        if not query:
+            return "", []
+        return f"WHERE instr({expression}, ?) > 0", [query.lower()]
+
+    def count_jobs(self, query: str = "") -> int:
+        where, params = self._search_clause(_JOB_SEARCH_EXPR, query)
+        return self.conn.execute(
+            f"SELECT COUNT(*) FROM jobs {where}", params
+        ).fetchone()[0]
+
+    def count_details(self, query: str = "") -> int:
+        where, params = self._search_clause(_DETAIL_SEARCH_EXPR, query)
+        return self.conn.execute(
+            f"SELECT COUNT(*) FROM rincian r {where}", params
+        ).fetchone()[0]
+
+    def fetch_jobs(
+        self, offset: int, limit: int, query: str = ""
+    ) -> list[PreviewJobRow]:
+        """Return satu halaman pekerjaan (urut job_index)."""
+        where, params = self._search_clause(_JOB_SEARCH_EXPR, query)
+        cursor = self.conn.execute(
+            f"SELECT {_JOB_COLUMNS} FROM jobs {where} "
+            "ORDER BY job_index LIMIT ? OFFSET ?",
+            [*params, limit, offset],
+        )
+        return [PreviewJobRow(*row) for row in cursor]
+
+    def fetch_details(
+        self, offset: int, limit: int, query: str = ""
+    ) -> list[PreviewDetailRow]:
+        """Return satu halaman rincian (urut flat_index) beserta pekerjaannya."""
+        where, params = self._search_clause(_DETAIL_SEARCH_EXPR, query)
+        job_columns = ", ".join(
+            f"j.{name.strip()}" for name in _JOB_COLUMNS.split(",")
+        )
+        cursor = self.conn.execute(
+            f"SELECT {_RINCIAN_COLUMNS}, {job_columns} FROM rincian r "
+            "JOIN jobs j ON j.job_index = r.job_index "
+            f"{where} ORDER BY r.flat_index LIMIT ? OFFSET ?",
+            [*params, limit, offset],
+        )
+
+        rows = []
+        for record in cursor:
+            (
+                flat_index,
+                job_index,
+                detail_index,
+                kategori,
+                kode_item,
+                uraian_item,
+                satuan_item,
+                koefisien,
+                row_number,
+                kategori_source,
+                kode_item_source,
+                kode_item_original,
+                sheet_name,
+            ) = record[:13]
+            detail = RincianPreview(
+                kategori=kategori,
+                kode_item=kode_item,
+                uraian_item=uraian_item,
+                satuan_item=satuan_item,
+                koefisien=_to_decimal(koefisien),
+                row_number=row_number,
+                kategori_source=kategori_source,
+                kode_item_source=kode_item_source,
+                kode_item_original=kode_item_original,
+                sheet_name=sheet_name,
+            )
+            rows.append(
+                PreviewDetailRow(
+                    flat_index=flat_index,
+                    job_index=job_index,
+                    detail_index=detail_index,
+                    detail=detail,
+                    job=PreviewJobRow(*record[13:]),
+                )
+            )
+        return rows
+
+    def load(self) -> ParseResult:
+        """Rekonstruksi ParseResult lengkap (dipakai saat commit import)."""
+        summary = self.summary()
+        result = ParseResult(errors=summary.errors, warnings=summary.warnings)
+
+        for row in self.conn.execute(
+            f"SELECT {_JOB_COLUMNS} FROM jobs ORDER BY job_index"
+        ):
+            job = PreviewJobRow(*row)
+            result.jobs.append(
+                AHSPPreview(
+                    sumber=job.sumber,
+                    kode_ahsp=job.kode_ahsp,
+                    nama_ahsp=job.nama_ahsp,
+                    row_number=job.row_number,
+                    klasifikasi=job.klasifikasi,
+                    sub_klasifikasi=job.sub_klasifikasi,
+                    satuan=job.satuan,
+                    sheet_name=job.sheet_name,
+                )
+            )
+
+        for record in self.conn.execute(
+            f"SELECT {_RINCIAN_COLUMNS} FROM rincian r ORDER BY r.flat_index"
+        ):
+            job_index = record[1]
+            if job_index >= len(result.jobs):
+                continue
+            result.jobs[job_index].rincian.append(
+                RincianPreview(
+                    kategori=record[3],
+                    kode_item=record[4],
+                    uraian_item=record[5],
+                    satuan_item=record[6],
+                    koefisien=_to_decimal(record[7]),
+                    row_number=record[8],
+                    kategori_source=record[9],
+                    kode_item_source=record[10],
+                    kode_item_original=record[11],
+                    sheet_name=record[12],
+                )
+            )
+        return result
+
+    # ------------------------------------------------------------------
+    # Partial writes (user edits)
+    # ------------------------------------------------------------------
+    def update_jobs(self, cleaned_data: list[dict]) -> int:
+        """Tulis hanya baris pekerjaan yang diedit. Return jumlah baris."""
+        params = [
+            (
+                cleaned["sumber"],
+                cleaned["kode_ahsp"],
+                cleaned["nama_ahsp"],
+                cleaned.get("klasifikasi") or "",
+                cleaned.get("sub_klasifikasi") or "",
+                cleaned.get("satuan") or "",
+                cleaned["job_index"],
+            )
+            for cleaned in cleaned_data
+            if cleaned
+        ]
+        if not params:
+            return 0
+        with self.conn:
+            cursor = self.conn.executemany(
+                "UPDATE jobs SET sumber = ?, kode_ahsp = ?, nama_ahsp = ?, "
+                "klasifikasi = ?, sub_klasifikasi = ?, satuan = ? "
+                "WHERE job_index = ?",
+                params,
+            )
+        return cursor.rowcount
+
+    def update_details(self, cleaned_data: list[dict]) -> int:
+        """
+        Tulis hanya baris rincian yang diedit.
+
+        Rincian yang kode item-nya dikosongkan akan dilengkapi ulang oleh
+        ``assign_missing_item_codes``.
+        """
+        params = []
+        for cleaned in cleaned_data:
+            if not cleaned:
+                continue
+            kode_item = cleaned.get("kode_item") or ""
+            params.append(
+                (
+                    cleaned["kategori"],
+                    kode_item,
+                    "manual" if kode_item else "missing",
+                    cleaned["uraian_item"],
+                    cleaned["satuan_item"],
+                    str(cleaned["koefisien"]),
+                    cleaned["job_index"],
+                    cleaned["detail_index"],
+                )
+            )
+        if not params:
+            return 0
+        with self.conn:
+            cursor = self.conn.executemany(
+                "UPDATE rincian SET kategori = ?, kode_item = ?, kode_item_source = ?, "
+                "uraian_item = ?, satuan_item = ?, koefisien = ? "
+                "WHERE job_index = ? AND detail_index = ?",
+                params,
+            )
+        updated = cursor.rowcount
+        self.assign_missing_item_codes()
+        return updated
+
+    def assign_missing_item_codes(self) -> int:
+        """
+        Lengkapi kode item untuk rincian tanpa kode.
+
+        Memakai ``assign_item_codes`` yang sama dengan alur upload, dengan
+        konteks minimal: kombinasi berkode yang sudah ada di kategori terkait
+        (untuk reuse kode & nomor urut) plus baris yang kosong.
+        """
+        from referensi.services.item_code_registry import assign_item_codes
+
+        missing = self.conn.execute(
+            "SELECT flat_index, kategori, kategori_source, uraian_item, satuan_item "
+            "FROM rincian WHERE kode_item = ''"
+        ).fetchall()
+        if not missing:
+            return 0
+
+        categories = sorted({row[1] for row in missing})
+        placeholders = ", ".join("?" for _ in categories)
+        known = self.conn.execute(
+            "SELECT DISTINCT kategori, uraian_item, satuan_item, kode_item "
+            f"FROM rincian WHERE kode_item != '' AND kategori IN ({placeholders})",
+            categories,
+        ).fetchall()
+
+        def _detail(kategori, uraian, satuan, kode="", source="missing", kategori_source=""):
+            return RincianPreview(
+                kategori=kategori,
+                kategori_source=kategori_source,
+                kode_item=kode,
+                kode_item_source=source,
+                uraian_item=uraian,
+                satuan_item=satuan,
+                koefisien=Decimal("0"),
+                row_number=0,
+            )
+
+        context_job = AHSPPreview(sumber="", kode_ahsp="", nama_ahsp="", row_number=0)
+        context_job.rincian.extend(
+            _detail(kategori, uraian, satuan, kode, "existing")
+            for kategori, uraian, satuan, kode in known
+        )
+        pending = []
+        for flat_index, kategori, kategori_source, uraian, satuan in missing:
+            detail = _detail(kategori, uraian, satuan, kategori_source=kategori_source)
+            context_job.rincian.append(detail)
+            pending.append((flat_index, detail))
+
+        assign_item_codes(ParseResult(jobs=[context_job]))
+
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE rincian SET kategori = ?, kode_item = ?, kode_item_source = ? "
+                "WHERE flat_index = ?",
+                [
+                    (detail.kategori, detail.kode_item, detail.kode_item_source, flat_index)
+                    for flat_index, detail in pending
+                ],
+            )
+        return len(pending)
+
+
+__all__ = [
+    "PreviewDetailRow",
+    "PreviewJobRow",
+    "PreviewStore",
+    "PreviewStoreError",
+    "PreviewSummary",
+]
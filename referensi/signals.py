@@ -8,6 +8,7 @@ from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
 from referensi.models import AHSPReferensi, RincianReferensi
+from referensi.search_cache import bump_search_generation
 from referensi.services.cache_helpers import ReferensiCache
 
 
@@ -22,9 +23,14 @@ def invalidate_ahsp_cache(sender, instance, **kwargs):
     - Deleting AHSP record
 
     PHASE 3: Ensures cache is always fresh.
+
+    Both calls only schedule one generation bump per transaction, so bulk
+    edits/deletes cost O(1) cache writes regardless of row count.
     """
     # Invalidate all caches related to AHSP data
     ReferensiCache.invalidate_all()
+    # Autocomplete index is rebuilt lazily for the next generation
+    bump_search_generation()
 
 
 @receiver([post_save, post_delete], sender=RincianReferensi)
@@ -3,8 +3,8 @@
  * 
  * Performance-optimized implementation using:
  * - API-based data loading (no formsets)
- * - Client-side pagination
- * - Inline editing with PATCH requests
+ * - Keyset (cursor) pagination via the grid API, estimated totals
+ * - Inline editing saved as partial rows
  * - Event delegation for minimal memory usage
  */
 
@@ -20,6 +20,9 @@
     const state = {
         activeTab: 'jobs',
         currentPage: 1,
+        // cursors[i] = `after` token for page i + 1 (page 1 has none)
+        cursors: [null],
+        hasNext: false,
         pageSize: 20,
         sortField: 'kode_ahsp',
         sortOrder: 'asc',
@@ -28,7 +31,7 @@
         filterAnomalyOnly: false,
         data: [],
         totalCount: 0,
-        totalPages: 0,
+        countIsEstimate: false,
         isLoading: false,
     };
 
@@ -106,16 +109,20 @@
 
         try {
             const isJobs = state.activeTab === 'jobs';
-            const baseUrl = isJobs ? config.apiUrls.listJobs : config.apiUrls.listItems;
+            const baseUrl = isJobs ? config.apiUrls.gridJobs : config.apiUrls.gridItems;
 
             const params = new URLSearchParams({
-                page: state.currentPage,
                 page_size: state.pageSize,
                 search: state.searchQuery,
                 sort: state.sortField,
                 order: state.sortOrder,
             });
 
+            const after = state.cursors[state.currentPage - 1];
+            if (after) {
+                params.append('after', after);
+            }
+
             if (state.filterSumber) {
                 params.append('sumber', state.filterSumber);
             }
@@ -127,8 +134,13 @@
 
             if (result.status === 'success') {
                 state.data = result.data;
-                state.totalCount = result.pagination.total_count;
-                state.totalPages = result.pagination.total_pages;
+                state.hasNext = result.pagination.has_next;
+                state.cursors[state.currentPage] = result.pagination.next_cursor;
+                // Total is only computed for the first page
+                if (result.pagination.total_count !== null) {
+                    state.totalCount = result.pagination.total_count;
+                    state.countIsEstimate = result.pagination.count_is_estimate;
+                }
 
                 renderTable();
                 renderPagination();
@@ -144,23 +156,27 @@
 
     async function updateField(pk, field, value) {
         const isJobs = state.activeTab === 'jobs';
-        const url = isJobs
-            ? config.apiUrls.updateJob.replace('{pk}', pk)
-            : config.apiUrls.updateItem.replace('{pk}', pk);
+        const url = isJobs ? config.apiUrls.gridSaveJobs : config.apiUrls.gridSaveItems;
 
         try {
             const result = await fetchData(url, {
-                method: 'PATCH',
-                body: JSON.stringify({ field, value }),
+                method: 'POST',
+                body: JSON.stringify({ rows: [{ id: pk, changes: { [field]: value } }] }),
             });
 
+            const rowResult = result.results[0];
+            if (!rowResult.ok) {
+                const messages = Object.values(rowResult.errors).flat().map(e => e.message || e);
+                throw new Error(messages.join(', '));
+            }
+
             if (result.status === 'success') {
                 showToast('Berhasil disimpan');
 
-                // Update local data
-                const item = state.data.find(d => d.id === pk);
-                if (item) {
-                    item[field] = result.data.value;
+                // Replace local row with the saved server version
+                const index = state.data.findIndex(d => d.id === pk);
+                if (index !== -1) {
+                    state.data[index] = rowResult.row;
                 }
 
                 // Re-render the affected row
@@ -279,67 +295,42 @@
     function renderPagination() {
         const container = document.getElementById('pagination-controls');
 
-        if (state.totalPages <= 1) {
+        if (state.currentPage === 1 && !state.hasNext) {
             container.innerHTML = '';
             return;
         }
 
-        let html = '';
-
-        // Previous button
-        html += `<li class="page-item ${state.currentPage === 1 ? 'disabled' : ''}">
-            <a class="page-link" href="#" data-page="${state.currentPage - 1}"><i class="bi bi-chevron-left"></i></a>
-        </li>`;
-
-        // Page numbers
-        const maxVisible = 5;
-        let startPage = Math.max(1, state.currentPage - Math.floor(maxVisible / 2));
-        let endPage = Math.min(state.totalPages, startPage + maxVisible - 1);
-
-        if (endPage - startPage < maxVisible - 1) {
-            startPage = Math.max(1, endPage - maxVisible + 1);
-        }
-
-        if (startPage > 1) {
-            html += `<li class="page-item"><a class="page-link" href="#" data-page="1">1</a></li>`;
-            if (startPage > 2) {
-                html += `<li class="page-item disabled"><span class="page-link">...</span></li>`;
-            }
-        }
-
-        for (let i = startPage; i <= endPage; i++) {
-            html += `<li class="page-item ${i === state.currentPage ? 'active' : ''}">
-                <a class="page-link" href="#" data-page="${i}">${i}</a>
-            </li>`;
-        }
-
-        if (endPage < state.totalPages) {
-            if (endPage < state.totalPages - 1) {
-                html += `<li class="page-item disabled"><span class="page-link">...</span></li>`;
-            }
-            html += `<li class="page-item"><a class="page-link" href="#" data-page="${state.totalPages}">${state.totalPages}</a></li>`;
-        }
-
-        // Next button
-        html += `<li class="page-item ${state.currentPage === state.totalPages ? 'disabled' : ''}">
-            <a class="page-link" href="#" data-page="${state.currentPage + 1}"><i class="bi bi-chevron-right"></i></a>
-        </li>`;
-
-        container.innerHTML = html;
+        // Keyset pagination: only previous/next, no jumping to page N
+        container.innerHTML = `
+            <li class="page-item ${state.currentPage === 1 ? 'disabled' : ''}">
+                <a class="page-link" href="#" data-page="prev"><i class="bi bi-chevron-left"></i></a>
+            </li>
+            <li class="page-item active"><span class="page-link">${state.currentPage}</span></li>
+            <li class="page-item ${state.hasNext ? '' : 'disabled'}">
+                <a class="page-link" href="#" data-page="next"><i class="bi bi-chevron-right"></i></a>
+            </li>
+        `;
     }
 
     function updatePaginationInfo() {
         const info = document.getElementById('pagination-info');
         const start = (state.currentPage - 1) * state.pageSize + 1;
-        const end = Math.min(state.currentPage * state.pageSize, state.totalCount);
+        const end = start + state.data.length - 1;
 
-        if (state.totalCount === 0) {
+        if (state.data.length === 0) {
             info.textContent = 'Tidak ada data';
         } else {
-            info.textContent = `${formatNumber(start)}-${formatNumber(end)} dari ${formatNumber(state.totalCount)}`;
+            const total = `${state.countIsEstimate ? '≈ ' : ''}${formatNumber(state.totalCount)}`;
+            info.textContent = `${formatNumber(start)}-${formatNumber(end)} dari ${total}`;
         }
     }
 
+    function resetPaging() {
+        state.currentPage = 1;
+        state.cursors = [null];
+        state.hasNext = false;
+    }
+
     // =====================================================
     // Event Handlers
     // =====================================================
@@ -357,14 +348,15 @@
 
         // Update state and reload
         state.activeTab = newTab;
-        state.currentPage = 1;
-        state.sortField = newTab === 'jobs' ? 'kode_ahsp' : 'ahsp__kode_ahsp';
+        resetPaging();
+        state.sortField = newTab === 'jobs' ? 'kode_ahsp' : 'ahsp_id';
+        state.sortOrder = 'asc';
         loadData();
     }
 
     function handleSearch() {
         state.searchQuery = document.getElementById('search-input').value.trim();
-        state.currentPage = 1;
+        resetPaging();
         loadData();
     }
 
@@ -387,6 +379,7 @@
         const icon = th.querySelector('i');
         icon.className = state.sortOrder === 'asc' ? 'bi bi-arrow-up' : 'bi bi-arrow-down';
 
+        resetPaging();
         loadData();
     }
 
@@ -395,19 +388,19 @@
         const link = e.target.closest('[data-page]');
         if (!link || link.parentElement.classList.contains('disabled')) return;
 
-        state.currentPage = parseInt(link.dataset.page, 10);
+        state.currentPage += link.dataset.page === 'next' ? 1 : -1;
         loadData();
     }
 
     function handlePageSizeChange(e) {
         state.pageSize = parseInt(e.target.value, 10);
-        state.currentPage = 1;
+        resetPaging();
         loadData();
     }
 
     function handleFilterSumberChange(e) {
         state.filterSumber = e.target.value;
-        state.currentPage = 1;
+        resetPaging();
         loadData();
     }
 
@@ -417,7 +410,7 @@
 
         state.filterAnomalyOnly = !state.filterAnomalyOnly;
         btn.classList.toggle('active', state.filterAnomalyOnly);
-        state.currentPage = 1;
+        resetPaging();
         loadData();
     }
 
@@ -20,6 +20,7 @@ from typing import Any, Dict, List
 from datetime import timedelta
 
 from celery import shared_task
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown
 from django.core.mail import send_mail
 from django.conf import settings
 from django.utils import timezone
@@ -44,6 +45,7 @@ def async_import_ahsp(self, file_path: str, sumber: str, user_id: int = None) ->
     Returns:
         dict: Import summary with counts and errors
     """
+    from django.contrib.auth import get_user_model
     from referensi.services.ahsp_parser import parse_ahsp
     from referensi.services.import_writer import write_parse_result_to_db
     from referensi.models import SecurityAuditLog
@@ -79,7 +81,8 @@ def async_import_ahsp(self, file_path: str, sumber: str, user_id: int = None) ->
         self.update_state(state='PROGRESS', meta={'status': f'Writing {len(parse_result.jobs)} jobs to database...'})
 
         # Write to database
-        summary = write_parse_result_to_db(parse_result, source_file=file_path)
+        user = get_user_model().objects.filter(pk=user_id).first() if user_id else None
+        summary = write_parse_result_to_db(parse_result, source_file=file_path, user=user)
 
         # Create audit log
         if user_id:
@@ -289,6 +292,47 @@ This is an automated alert from AHSP Security Monitoring.
         }
 
 
+@shared_task(name='referensi.tasks.flush_audit_log_buffer_task')
+def flush_audit_log_buffer_task() -> Dict[str, Any]:
+    """
+    Drain the shared (Redis) audit queue filled by web and worker processes,
+    then flush the in-process buffer of the worker running this task.
+
+    Scheduled by beat and, when the shared queue reaches ``flush_size``,
+    by the enqueueing process itself. In-process buffers of other processes
+    flush through their own writer thread and on shutdown.
+
+    Returns:
+        dict: Rows written plus queue counters
+    """
+    from referensi.services.audit_buffer import audit_buffer, shared_audit_queue
+
+    shared_written = shared_audit_queue.flush()
+    written = audit_buffer.flush()
+    return {
+        'written': shared_written + written,
+        'shared_written': shared_written,
+        **audit_buffer.stats(),
+    }
+
+
+@worker_init.connect
+@worker_process_init.connect
+def _enable_worker_audit_buffer(**kwargs):
+    """Without Redis, ``buffered: "true"`` uses the in-process buffer only in Celery workers."""
+    from referensi.services.audit_buffer import mark_celery_worker
+
+    mark_celery_worker()
+
+
+@worker_process_shutdown.connect
+def _flush_audit_buffer_on_shutdown(**kwargs):
+    """Write pending audit events before a worker process exits."""
+    from referensi.services.audit_buffer import flush_audit_buffer
+
+    flush_audit_buffer()
+
+
 # =============================================================================
 # CACHE TASKS
 # =============================================================================
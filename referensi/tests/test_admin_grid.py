@@ -0,0 +1,118 @@
+"""Tests for the keyset-paginated AHSP grid API."""
+
+import json
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.db import connection
+from django.urls import reverse
+
+from referensi.models import AHSPReferensi, ImportHistoryBatch, RincianReferensi
+from referensi.services import admin_grid
+
+
+@pytest.fixture
+def grid_client(client):
+    user = get_user_model().objects.create_user(
+        username="grid_user", email="grid@example.com", password="Secret123!"
+    )
+    user.user_permissions.add(*Permission.objects.filter(codename__in=[
+        "view_ahspreferensi", "change_ahspreferensi", "view_rincianreferensi", "change_rincianreferensi",
+    ]))
+    client.force_login(user)
+    return client
+
+
+@pytest.fixture
+def jobs():
+    jobs = [
+        AHSPReferensi.objects.create(kode_ahsp=f"A.{i:02d}", nama_ahsp=f"Galian {i}", satuan="m3", klasifikasi="Tanah")
+        for i in range(7)
+    ]
+    # Same kode in another sumber: tie broken by id
+    jobs.append(AHSPReferensi.objects.create(kode_ahsp="A.03", nama_ahsp="Galian lama", sumber="SNI 2016",
+                                             satuan="m3", klasifikasi="Tanah"))
+    RincianReferensi.objects.create(ahsp=jobs[0], kategori="TK", kode_item="L.01",
+                                    uraian_item="Pekerja", satuan_item="OH", koefisien="0.5")
+    return jobs
+
+
+@pytest.mark.django_db
+def test_keyset_pages_cover_every_row_once(grid_client, jobs):
+    url = reverse("referensi:api_grid_jobs")
+    seen, after = [], None
+    while True:
+        params = {"page_size": 3, **({"after": after} if after else {})}
+        body = grid_client.get(url, params).json()
+        seen += [(row["kode_ahsp"], row["id"]) for row in body["data"]]
+        if after is None:
+            assert body["pagination"]["total_count"] == 8
+            assert body["pagination"]["count_is_estimate"] is False
+            assert body["data"][0]["tk_count"] == 1
+        else:
+            assert body["pagination"]["total_count"] is None
+        after = body["pagination"]["next_cursor"]
+        if not after:
+            break
+
+    assert seen == sorted((job.kode_ahsp, job.id) for job in jobs)
+
+    desc = grid_client.get(url, {"order": "desc", "page_size": 2}).json()
+    assert [row["kode_ahsp"] for row in desc["data"]] == ["A.06", "A.05"]
+    assert grid_client.get(url, {"after": "bogus"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_filters_use_prefix_and_anomaly_exists(grid_client, jobs):
+    url = reverse("referensi:api_grid_jobs")
+    rows = grid_client.get(url, {"search": "A.0"}).json()["data"]
+    assert len(rows) == 8
+    rows = grid_client.get(url, {"anomaly_only": "1", "sumber": "SNI 2016"}).json()["data"]
+    assert [row["nama_ahsp"] for row in rows] == ["Galian lama"]
+    assert rows[0]["anomalies"] == ["Tidak ada rincian"]
+
+
+@pytest.mark.django_db
+def test_estimate_count_falls_back_to_exact_count(jobs):
+    count, is_estimate = admin_grid.estimate_count(AHSPReferensi.objects.all())
+    assert (count, is_estimate) == (8, False)
+
+    count, is_estimate = admin_grid.estimate_count(AHSPReferensi.objects.all(), exact_below=0)
+    # Planner estimates only exist on PostgreSQL
+    assert is_estimate is (connection.vendor == "postgresql")
+    if not is_estimate:
+        assert count == 8
+
+
+@pytest.mark.django_db
+def test_row_saves_are_partial(grid_client, jobs):
+    item = RincianReferensi.objects.get()
+    response = grid_client.post(
+        reverse("referensi:api_grid_save_items"),
+        data=json.dumps({"rows": [
+            {"id": item.id, "changes": {"koefisien": "0,25"}},
+            {"id": item.id, "changes": {"kategori": "XXX"}},
+            {"id": 999999, "changes": {"koefisien": "1"}},
+        ]}),
+        content_type="application/json",
+    )
+    body = response.json()
+    assert body["status"] == "partial"
+    assert [result["ok"] for result in body["results"]] == [True, False, False]
+    assert Decimal(body["results"][0]["row"]["koefisien"]) == Decimal("0.25")
+    assert "kategori" in body["results"][1]["errors"]
+
+    item.refresh_from_db()
+    assert item.koefisien == Decimal("0.25")
+    assert item.kategori == "TK"
+    batch = ImportHistoryBatch.objects.get(source="admin_grid")
+    assert batch.counts == {"RincianReferensi": {"~": 1}}
+
+    response = grid_client.post(
+        reverse("referensi:api_grid_save_jobs"),
+        data=json.dumps({"rows": [{"id": jobs[1].id, "changes": {"satuan": "m2", "id": 5}}]}),
+        content_type="application/json",
+    )
+    assert response.json()["results"][0]["errors"] == {"id": ["Field tidak dapat diubah"]}
@@ -0,0 +1,121 @@
+"""Tests for multi-sheet (per-sheet worker) AHSP Excel parsing."""
+
+from decimal import Decimal
+from io import BytesIO
+
+import pytest
+from openpyxl import Workbook
+
+from referensi.services.ahsp_parser import parse_excel_stream, parse_excel_workbook
+
+HEADERS = [
+    "sumber_ahsp", "kode_ahsp", "nama_ahsp", "satuan_pekerjaan",
+    "kategori", "kode_item", "uraian_item", "satuan_item", "koefisien",
+]
+
+
+def _fill_sheet(ws, prefix, job_count):
+    ws.append(HEADERS)
+    for idx in range(job_count):
+        ws.append(["SNI", f"{prefix}.{idx}", f"Pekerjaan {prefix}{idx}", "m3",
+                   None, None, None, None, None])
+        ws.append([None, None, None, None, "TK", None, "Pekerja", "OH", "0.5"])
+        ws.append([None, None, None, None, "BHN", None, "Semen", "kg", "12,5"])
+
+
+def _workbook_bytes():
+    wb = Workbook()
+    _fill_sheet(wb.active, "A", 2)
+    wb.active.title = "Bagian A"
+    notes = wb.create_sheet("Catatan")
+    notes.append(["Keterangan"])
+    notes.append(["Tidak berisi data AHSP"])
+    _fill_sheet(wb.create_sheet("Bagian B"), "B", 3)
+    buffer = BytesIO()
+    wb.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_workbook_parses_all_sheets_with_sheet_rows(max_workers):
+    result = parse_excel_workbook(_workbook_bytes(), max_workers=max_workers)
+
+    assert result.errors == []
+    assert [job.kode_ahsp for job in result.jobs] == ["A.0", "A.1", "B.0", "B.1", "B.2"]
+    assert result.total_rincian == 10
+    # Row numbers restart in each sheet (Excel row within that sheet)
+    assert result.jobs[2].row_number == 2
+    assert result.jobs[2].rincian[1].row_number == 4
+    assert result.jobs[2].rincian[1].koefisien == Decimal("12.5")
+    assert any("Sheet 'Catatan' dilewati" in warning for warning in result.warnings)
+
+
+def test_stream_parser_reads_active_sheet_only():
+    result = parse_excel_stream(_workbook_bytes())
+
+    assert result.errors == []
+    assert [job.kode_ahsp for job in result.jobs] == ["A.0", "A.1"]
+    assert result.jobs[1].rincian[0].row_number == 6
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_workbook_errors_report_row_within_named_sheet(max_workers):
+    wb = Workbook()
+    _fill_sheet(wb.active, "A", 2)
+    wb.active.title = "Bagian A"
+    ws = wb.create_sheet("Bagian B")
+    _fill_sheet(ws, "B", 2)
+    ws.cell(row=6, column=9, value="-1")  # rincian TK pekerjaan B.1
+    buffer = BytesIO()
+    wb.save(buffer)
+    buffer.seek(0)
+
+    result = parse_excel_workbook(buffer, max_workers=max_workers)
+
+    assert result.errors == [
+        "[Sheet Bagian B] Baris 6: koefisien tidak boleh bernilai negatif."
+    ]
+
+
+@pytest.mark.django_db
+def test_import_messages_name_the_sheet_of_each_row(tmp_path, settings):
+    import csv
+    from io import StringIO
+
+    from referensi.services.import_writer import write_parse_result_to_db
+    from referensi.services.preview_store import PreviewStore
+
+    wb = Workbook()
+    wb.active.title = "Bagian A"
+    _fill_sheet(wb.active, "A", 1)
+    ws = wb.create_sheet("Bagian B")
+    # Same job as sheet A: its rincian are merged, so a duplicate spans sheets
+    _fill_sheet(ws, "A", 1)
+    buffer = BytesIO()
+    wb.save(buffer)
+    buffer.seek(0)
+
+    result = parse_excel_workbook(buffer, max_workers=1)
+    assert result.jobs[1].sheet_name == "Bagian B"
+    assert result.jobs[1].rincian[0].row_ref == "3 (sheet 'Bagian B')"
+
+    # Sheet names survive the preview store round trip
+    with PreviewStore.create(str(tmp_path / "preview.sqlite3"), result) as store:
+        loaded = store.load()
+        assert store.fetch_details(0, 10)[2].detail.row_ref == "3 (sheet 'Bagian B')"
+    assert loaded.jobs[1].rincian[1].sheet_name == "Bagian B"
+
+    settings.MEDIA_ROOT = str(tmp_path)
+    stdout = StringIO()
+    summary = write_parse_result_to_db(loaded, "multi.xlsx", stdout=stdout)
+
+    output = stdout.getvalue()
+    assert "Baris 3 (sheet 'Bagian B'): TK - Pekerja (OH) - DUPLIKAT dari baris 3 (sheet 'Bagian A')" in output
+    assert summary.rincian_duplicated == 2
+    assert summary.rincian_written == 2
+
+    with open(tmp_path / summary.duplicate_report_path, encoding="utf-8-sig") as report:
+        rows = list(csv.DictReader(report))
+    assert {(row["Sheet"], row["Baris Excel"], row["Duplikat dari Sheet"], row["Duplikat dari Baris"])
+            for row in rows} == {("Bagian B", "3", "Bagian A", "3"), ("Bagian B", "4", "Bagian A", "4")}
@@ -0,0 +1,219 @@
+"""Tests for the buffered SecurityAuditLog writer."""
+
+from django.core.signals import request_finished
+from django.db import DatabaseError
+
+from referensi.models import SecurityAuditLog
+from referensi.services import audit_buffer as audit_buffer_module
+from referensi.services import audit_logger as audit_logger_module
+from referensi.services.audit_buffer import (
+    AuditBuffer,
+    SharedAuditQueue,
+    get_audit_queue,
+    is_buffer_enabled,
+)
+from referensi.services.audit_logger import AuditLogger
+from referensi.tasks import flush_audit_log_buffer_task
+
+
+class FakeRedis:
+    """In-memory stand-in for the list commands SharedAuditQueue uses."""
+
+    def __init__(self):
+        self.lists = {}
+
+    def rpush(self, key, *values):
+        self.lists.setdefault(key, []).extend(values)
+        return len(self.lists[key])
+
+    def lpush(self, key, *values):
+        self.lists[key] = [*reversed(values), *self.lists.get(key, [])]
+        return len(self.lists[key])
+
+    def rpop(self, key):
+        return self.lists.get(key, []).pop() if self.lists.get(key) else None
+
+    def llen(self, key):
+        return len(self.lists.get(key, []))
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def lrange(self, key, start, end):
+        self.commands.append(lambda: list(self.redis.lists.get(key, [])[start:end + 1]))
+
+    def ltrim(self, key, start, end):
+        def trim():
+            self.redis.lists[key] = self.redis.lists.get(key, [])[start:]
+            return True
+        self.commands.append(trim)
+
+    def execute(self):
+        return [command() for command in self.commands]
+
+
+def _event(**overrides):
+    fields = {
+        "severity": SecurityAuditLog.SEVERITY_INFO,
+        "category": SecurityAuditLog.CATEGORY_IMPORT,
+        "event_type": "import_success",
+        "message": "Import completed",
+    }
+    fields.update(overrides)
+    return SecurityAuditLog(**fields)
+
+
+def test_buffer_flushes_in_bulk_and_counts_drops(db, django_user_model, django_assert_num_queries):
+    user = django_user_model.objects.create_user(username="auditor", password="Secret123!")
+    buffer = AuditBuffer(max_queue=3, flush_size=2, start_thread=False)
+
+    assert buffer.enqueue(_event(user=user))
+    assert buffer.enqueue(_event())
+    assert buffer.enqueue(_event())
+    assert not buffer.enqueue(_event())
+    assert buffer.stats()["queue_depth"] == 3
+    assert buffer.stats()["dropped"] == 1
+
+    # 3 rows in batches of 2
+    with django_assert_num_queries(2):
+        assert buffer.flush() == 3
+
+    stats = buffer.stats()
+    assert (stats["queue_depth"], stats["flushed"]) == (0, 3)
+    assert SecurityAuditLog.objects.count() == 3
+    assert SecurityAuditLog.objects.filter(username="auditor").count() == 1
+
+
+def test_logger_routes_through_buffer_except_critical(db, settings, monkeypatch):
+    settings.REFERENSI_CONFIG = {**settings.REFERENSI_CONFIG, "audit": {"buffered": "process"}}
+    buffer = AuditBuffer(start_thread=False)
+    monkeypatch.setattr(audit_buffer_module, "audit_buffer", buffer)
+    logger = AuditLogger()
+
+    event = logger.log_event("info", "import", "import_success", "ok")
+    logger.log_malicious_file_detected(None, "evil.xlsx", "zip_bomb")
+    assert event.pk is None
+    assert SecurityAuditLog.objects.count() == 1  # critical written immediately
+
+    assert logger.log_batch([
+        {"severity": "info", "category": "import", "event_type": "a", "message": "a"},
+        {"severity": "info", "category": "import", "event_type": "b", "message": "b"},
+    ]) == 2
+    assert buffer.stats()["queue_depth"] == 3
+
+    buffer.flush()
+    assert SecurityAuditLog.objects.count() == 4
+
+
+def test_log_batch_without_buffer_uses_bulk_create(db, django_assert_num_queries):
+    events = [
+        {"severity": "info", "category": "import", "event_type": f"e{i}", "message": "m"}
+        for i in range(5)
+    ]
+    with django_assert_num_queries(1):
+        assert AuditLogger().log_batch(events) == 5
+
+
+def test_default_mode_uses_shared_queue_or_worker_buffer(settings, monkeypatch):
+    settings.REFERENSI_CONFIG = {**settings.REFERENSI_CONFIG, "audit": {"buffered": "true"}}
+    monkeypatch.setattr(audit_buffer_module, "_in_celery_worker", False)
+    # Without Redis, web processes write directly
+    assert get_audit_queue() is None
+
+    audit_buffer_module.mark_celery_worker()
+    assert get_audit_queue() is audit_buffer_module.audit_buffer
+
+    fake = FakeRedis()
+    monkeypatch.setattr(audit_buffer_module, "get_cache_redis_client", lambda: fake)
+    monkeypatch.setattr(audit_buffer_module, "_in_celery_worker", False)
+    assert get_audit_queue() is audit_buffer_module.shared_audit_queue
+
+    settings.REFERENSI_CONFIG = {**settings.REFERENSI_CONFIG, "audit": {"buffered": "process"}}
+    assert get_audit_queue() is audit_buffer_module.audit_buffer
+    settings.REFERENSI_CONFIG = {**settings.REFERENSI_CONFIG, "audit": {"buffered": False}}
+    assert not is_buffer_enabled()
+
+
+def test_shared_queue_is_drained_by_beat_task(db, settings, monkeypatch, django_user_model):
+    settings.REFERENSI_CONFIG = {**settings.REFERENSI_CONFIG, "audit": {"buffered": "true"}}
+    fake = FakeRedis()
+    monkeypatch.setattr(audit_buffer_module, "get_cache_redis_client", lambda: fake)
+    queue = SharedAuditQueue(max_queue=3, flush_size=2)
+    monkeypatch.setattr(audit_buffer_module, "shared_audit_queue", queue)
+    monkeypatch.setattr(queue, "_schedule_drain", lambda: None)
+    user = django_user_model.objects.create_user(username="web_user", password="Secret123!")
+
+    logger = AuditLogger()
+    logger.log_event("info", "import", "import_success", "ok", user=user, rows=3)
+    logger.log_event("warning", "rate_limit", "rate_limit_exceeded", "slow down")
+    logger.log_event("info", "import", "import_success", "ok")
+    assert not queue.enqueue(_event())  # over max_queue
+    assert SecurityAuditLog.objects.count() == 0
+    assert queue.stats()["queue_depth"] == 3
+    assert queue.stats()["dropped"] == 1
+
+    result = flush_audit_log_buffer_task()
+    assert result["shared_written"] == 3
+    assert queue.depth() == 0
+    row = SecurityAuditLog.objects.get(username="web_user")
+    assert row.user_id == user.id
+    assert row.metadata == {"rows": 3}
+
+
+def test_shared_queue_keeps_batch_when_write_fails(db, monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(audit_buffer_module, "get_cache_redis_client", lambda: fake)
+    queue = SharedAuditQueue(flush_size=10)
+    monkeypatch.setattr(queue, "_schedule_drain", lambda: None)
+    queue.enqueue(_event(event_type="first"))
+    queue.enqueue(_event(event_type="second"))
+
+    def broken(*args, **kwargs):
+        raise DatabaseError("db down")
+
+    monkeypatch.setattr(SecurityAuditLog.objects, "bulk_create", broken)
+    assert queue.flush() == 0
+    assert queue.depth() == 2
+    monkeypatch.undo()
+
+    monkeypatch.setattr(audit_buffer_module, "get_cache_redis_client", lambda: fake)
+    assert queue.flush() == 2
+    assert list(SecurityAuditLog.objects.order_by("id").values_list("event_type", flat=True)) == [
+        "first", "second",
+    ]
+
+
+def test_request_end_flushes_once_oldest_event_is_due(db, monkeypatch):
+    buffer = AuditBuffer(flush_size=10, flush_interval=5.0, start_thread=False)
+    monkeypatch.setattr(audit_buffer_module, "audit_buffer", buffer)
+    clock = [1000.0]
+    monkeypatch.setattr(audit_buffer_module.time, "time", lambda: clock[0])
+
+    buffer.enqueue(_event())
+    clock[0] += 3
+    buffer.enqueue(_event())
+    # Called directly: sending request_finished would also close the test DB connection
+    audit_buffer_module.flush_audit_buffer_on_request_finished(sender=None)
+    assert buffer.stats()["queue_depth"] == 2  # oldest event only 3s old
+
+    clock[0] += 2
+    audit_buffer_module.flush_audit_buffer_on_request_finished(sender=None)
+    assert buffer.stats()["queue_depth"] == 0
+    assert SecurityAuditLog.objects.count() == 2
+    assert not buffer.is_flush_due()
+    assert any(key[0] == "referensi.audit_buffer_request_flush" for key, *_ in request_finished.receivers)
+
+
+def test_flush_is_due_when_queue_reaches_flush_size():
+    buffer = AuditBuffer(flush_size=2, flush_interval=3600, start_thread=False)
+    assert not buffer.is_flush_due()
+    buffer.enqueue(_event())
+    assert not buffer.is_flush_due()
+    buffer.enqueue(_event())
+    assert buffer.is_flush_due()
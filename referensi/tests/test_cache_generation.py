@@ -0,0 +1,38 @@
+"""Tests for generation-based ReferensiCache invalidation."""
+
+import pytest
+from django.db import transaction
+
+from referensi.models import AHSPReferensi
+from referensi.search_cache import get_search_generation
+from referensi.services.cache_helpers import REFERENSI_GENERATION, ReferensiCache, _BumpGeneration
+from referensi.services.cache_service import CacheService
+
+
+@pytest.mark.django_db
+def test_bulk_edit_bumps_each_generation_once(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        ahsp = [
+            AHSPReferensi.objects.create(kode_ahsp=f"1.{i}", nama_ahsp=f"Galian {i}", sumber="SNI 2025")
+            for i in range(20)
+        ]
+    assert ReferensiCache.get_available_sources() == ["SNI 2025"]
+    referensi_gen, search_gen = REFERENSI_GENERATION.get(), get_search_generation()
+    search_key = CacheService.generate_key(CacheService.PREFIX_SEARCH, "ahsp", "galian")
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        with transaction.atomic():
+            for obj in ahsp:
+                obj.sumber = "SNI 2026"
+                obj.save()
+            AHSPReferensi.objects.filter(kode_ahsp="1.0").delete()
+
+    bumps = [cb for cb in callbacks if isinstance(cb, _BumpGeneration)]
+    assert sorted(cb.key for cb in bumps) == ["referensi:generation", "referensi:search:generation"]
+    assert REFERENSI_GENERATION.get() == referensi_gen + 1
+    assert get_search_generation() == search_gen + 1
+
+    # Keys of the old generation are simply no longer read
+    assert ReferensiCache.get_available_sources() == ["SNI 2026"]
+    assert CacheService.generate_key(CacheService.PREFIX_SEARCH, "ahsp", "galian") != search_key
+    assert ReferensiCache.get_cache_stats()["generation"] == referensi_gen + 1
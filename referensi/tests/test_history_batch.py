@@ -0,0 +1,98 @@
+"""Tests for batched simple_history capture during referensi imports."""
+
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from referensi.history_batch import import_history_batch
+from referensi.models import AHSPReferensi, ImportHistoryBatch, KodeItemReferensi, RincianReferensi
+from referensi.services.ahsp_parser import AHSPPreview, ParseResult, RincianPreview
+from referensi.services.import_writer import write_parse_result_to_db
+from referensi.services.item_code_registry import persist_item_codes
+
+
+def _parse_result(nama="Galian tanah", koefisien="0.75", rows=6):
+    job = AHSPPreview(sumber="SNI 2025", kode_ahsp="1.1", nama_ahsp=nama, row_number=1, satuan="m3")
+    job.rincian = [
+        RincianPreview(
+            kategori="TK", kode_item=f"TK.{i:04d}", uraian_item=f"Pekerja {i}", satuan_item="OH",
+            koefisien=Decimal(koefisien), row_number=i + 2,
+        )
+        for i in range(rows)
+    ]
+    return ParseResult(jobs=[job])
+
+
+@pytest.mark.django_db
+def test_import_runs_write_one_batch_with_bulk_history(django_user_model):
+    user = django_user_model.objects.create_user(username="importer", password="Secret123!")
+
+    first = write_parse_result_to_db(_parse_result(), "ahsp.xlsx", user=user)
+    with CaptureQueriesContext(connection) as ctx:
+        second = write_parse_result_to_db(_parse_result(nama="Galian tanah biasa", koefisien="0.8"), "ahsp.xlsx")
+
+    assert ImportHistoryBatch.objects.count() == 2
+    batch = ImportHistoryBatch.objects.get(pk=first.history_batch_id)
+    assert (batch.source, batch.source_file, batch.user) == ("excel_import", "ahsp.xlsx", user)
+    assert batch.counts == {"KodeItemReferensi": {"+": 6}, "AHSPReferensi": {"+": 1}, "RincianReferensi": {"+": 6}}
+
+    # bulk_create rincian now has history, linked to the run that wrote it
+    assert RincianReferensi.history.filter(history_batch=batch, history_type="+").count() == 6
+    assert KodeItemReferensi.history.filter(history_batch=batch).count() == 6
+
+    rerun = ImportHistoryBatch.objects.get(pk=second.history_batch_id)
+    assert rerun.counts["RincianReferensi"] == {"-": 6, "+": 6}
+    assert rerun.counts["AHSPReferensi"] == {"~": 1}
+    assert AHSPReferensi.history.filter(history_batch=rerun).get().nama_ahsp == "Galian tanah biasa"
+    deleted = RincianReferensi.history.filter(history_batch=rerun, history_type="-")
+    assert {str(row.koefisien) for row in deleted} == {"0.750000"}
+
+    history_inserts = [q for q in ctx.captured_queries if q["sql"].startswith('INSERT INTO "referensi_historical')]
+    assert len(history_inserts) == 2  # one bulk INSERT per historical table, not one per row
+
+
+@pytest.mark.django_db
+def test_failed_block_rolls_back_batch_and_plain_saves_keep_history():
+    with pytest.raises(RuntimeError):
+        with import_history_batch("admin_portal"):
+            AHSPReferensi.objects.create(kode_ahsp="9.9", nama_ahsp="Urugan", sumber="SNI 2025")
+            raise RuntimeError("boom")
+
+    assert not ImportHistoryBatch.objects.exists()
+    assert not AHSPReferensi.history.exists()
+
+    ahsp = AHSPReferensi.objects.create(kode_ahsp="9.9", nama_ahsp="Urugan", sumber="SNI 2025")
+    record = ahsp.history.get()
+    assert record.history_type == "+" and record.history_batch is None
+
+
+@pytest.mark.django_db
+def test_persist_item_codes_records_plus_only_for_rows_it_inserted():
+    # Masuk produk silang filter __in (kategori TK, uraian "Semen", satuan OH)
+    bystander = KodeItemReferensi.objects.create(kategori="TK", uraian_item="Semen", satuan_item="OH", kode_item="TK.9000")
+    result = _parse_result(rows=2)
+    result.jobs[0].rincian.append(
+        RincianPreview(kategori="BHN", kode_item="B.0001", uraian_item="Semen", satuan_item="OH",
+                       koefisien=Decimal("1"), row_number=9)
+    )
+    original_bulk_create = KodeItemReferensi.objects.bulk_create
+
+    def racing_bulk_create(objs, **kwargs):
+        # Proses lain menyisipkan "Pekerja 1" di antara snapshot dan insert
+        KodeItemReferensi.objects.create(kategori="TK", uraian_item="Pekerja 1", satuan_item="OH", kode_item="TK.7777")
+        return original_bulk_create(objs, **kwargs)
+
+    with mock.patch.object(KodeItemReferensi.objects, "bulk_create", side_effect=racing_bulk_create):
+        saved = persist_item_codes(result)
+
+    assert saved == 3
+    plus = KodeItemReferensi.history.filter(history_type="+")
+    assert sorted(plus.values_list("uraian_item", flat=True)) == ["Pekerja 0", "Pekerja 1", "Semen", "Semen"]
+    assert plus.filter(uraian_item="Pekerja 1").get().kode_item == "TK.7777"  # dari save() proses lain
+    raced = KodeItemReferensi.objects.get(uraian_item="Pekerja 1")
+    assert raced.kode_item == "TK.0001"
+    assert KodeItemReferensi.history.filter(history_type="~").get().id == raced.id
+    assert KodeItemReferensi.history.filter(id=bystander.id).count() == 1
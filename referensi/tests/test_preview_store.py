@@ -0,0 +1,134 @@
+"""Tests for the paged SQLite preview store used by the import preview."""
+
+from decimal import Decimal
+
+import pytest
+
+from referensi.services.ahsp_parser import AHSPPreview, ParseResult, RincianPreview
+from referensi.services.preview_service import ImportSessionManager, PreviewImportService
+from referensi.services.preview_store import PreviewStore, PreviewStoreError
+
+
+def _make_parse_result(job_count=3, details_per_job=2):
+    result = ParseResult(warnings=["catatan"])
+    row = 2
+    for job_idx in range(job_count):
+        job = AHSPPreview(
+            sumber="SNI 2025",
+            kode_ahsp=f"A.{job_idx}",
+            nama_ahsp=f"Pekerjaan {job_idx}",
+            row_number=row,
+            satuan="m3",
+        )
+        row += 1
+        for detail_idx in range(details_per_job):
+            job.rincian.append(
+                RincianPreview(
+                    kategori="BHN",
+                    kode_item=f"B-{job_idx * 10 + detail_idx + 1:04d}",
+                    uraian_item=f"Bahan {job_idx}-{detail_idx}",
+                    satuan_item="kg",
+                    koefisien=Decimal("1.2500"),
+                    row_number=row,
+                    kode_item_source="manual",
+                )
+            )
+            row += 1
+        result.jobs.append(job)
+    return result
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PreviewStore.create(str(tmp_path / "preview.sqlite3"), _make_parse_result())
+    yield store
+    store.close()
+
+
+def test_summary_and_paging(store):
+    summary = store.summary()
+    assert summary.total_jobs == 3
+    assert summary.total_rincian == 6
+    assert summary.warnings == ["catatan"]
+
+    jobs = store.fetch_jobs(offset=1, limit=1)
+    assert [job.kode_ahsp for job in jobs] == ["A.1"]
+    assert jobs[0].rincian_count == 2
+
+    details = store.fetch_details(offset=2, limit=3)
+    assert [(d.job_index, d.detail_index) for d in details] == [(1, 0), (1, 1), (2, 0)]
+    assert details[0].job.kode_ahsp == "A.1"
+    assert details[0].detail.koefisien == Decimal("1.2500")
+
+
+def test_search_matches_in_memory_filter(store):
+    assert store.count_jobs("pekerjaan 2") == 1
+    assert store.count_details("BAHAN 0-") == 2
+    assert store.fetch_details(0, 10, "bahan 0-1")[0].flat_index == 1
+
+
+def test_partial_updates_roundtrip(db, store):
+    store.update_jobs([{
+        "job_index": 0,
+        "sumber": "SNI 2025",
+        "kode_ahsp": "A.0",
+        "nama_ahsp": "Galian tanah",
+        "klasifikasi": "",
+        "sub_klasifikasi": "",
+        "satuan": "m3",
+    }])
+    store.update_details([{
+        "job_index": 2,
+        "detail_index": 1,
+        "kategori": "BHN",
+        "kode_item": "",
+        "uraian_item": "Semen",
+        "satuan_item": "zak",
+        "koefisien": Decimal("3.5"),
+    }])
+
+    result = store.load()
+    assert result.jobs[0].nama_ahsp == "Galian tanah"
+    detail = result.jobs[2].rincian[1]
+    assert detail.uraian_item == "Semen"
+    assert detail.koefisien == Decimal("3.5")
+    # Regenerated after the highest code still in the store (B-0021)
+    assert detail.kode_item == "B-0022"
+    assert detail.kode_item_source == "generated"
+
+
+def test_service_builds_page_from_store(store):
+    service = PreviewImportService(page_sizes={"jobs": 2, "details": 4})
+    page = service.build_job_page(store, 2)
+    assert page.page_info.total_items == 3
+    assert page.page_info.total_pages == 2
+    assert [row["job_index"] for row in page.rows] == [2]
+
+    detail_page = service.build_detail_page(store, 2)
+    assert detail_page.page_info.start_index == 5
+    assert len(detail_page.rows) == 2
+
+
+class _Session(dict):
+    modified = False
+
+
+def test_session_manager_store_and_retrieve(db):
+    manager = ImportSessionManager()
+    session = _Session()
+    parse_result = _make_parse_result(job_count=2)
+    token = manager.store(session, parse_result, "ahsp.xlsx")
+
+    loaded, uploaded_name, loaded_token = manager.retrieve(session)
+    assert (uploaded_name, loaded_token) == ("ahsp.xlsx", token)
+    assert loaded == parse_result
+
+    store_path = session[ImportSessionManager.SESSION_KEY]["store_path"]
+    with open(store_path, "wb") as handle:
+        handle.write(b"not a sqlite file")
+    with pytest.raises(PreviewStoreError):
+        manager.open_store(session)
+
+    manager.cleanup(session)
+    with pytest.raises(FileNotFoundError):
+        manager.open_store(session)
@@ -0,0 +1,142 @@
+"""Tests for the shared rate limiter used by API views and import middleware."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from config import rate_limiter
+from detail_project.api_helpers import rate_limit
+from referensi.middleware.rate_limit import ImportRateLimitMiddleware, RateLimitChecker
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_hit_counts_atomically_and_records_category_metrics():
+    results = [rate_limiter.hit("user:1", 2, 60, category="write") for _ in range(3)]
+
+    assert [r.allowed for r in results] == [True, True, False]
+    assert [r.remaining for r in results] == [1, 0, 0]
+    assert 0 < results[-1].retry_after <= 61
+    assert rate_limiter.get_rate_limit_metrics() == {"write": {"allowed": 2, "denied": 1}}
+
+    # peek tidak mencatat request baru
+    assert rate_limiter.peek("user:1", 2, 60).count == 3
+    rate_limiter.reset("user:1")
+    assert rate_limiter.hit("user:1", 2, 60).allowed
+
+
+def test_window_expiry_starts_a_new_window(monkeypatch):
+    now = [1_000.0]
+    monkeypatch.setattr(rate_limiter.time, "time", lambda: now[0])
+
+    assert rate_limiter.hit("user:2", 1, 10).allowed
+    assert not rate_limiter.hit("user:2", 1, 10).allowed
+    now[0] += 11
+    result = rate_limiter.hit("user:2", 1, 10)
+    assert result.allowed and result.count == 1
+
+
+def test_api_decorator_uses_shared_limiter():
+    @rate_limit(max_requests=1, window=60)
+    def view(request):
+        return HttpResponse("ok")
+
+    request = RequestFactory().post("/api/")
+    request.user = SimpleNamespace(id=7)
+
+    assert view(request).status_code == 200
+    response = view(request)
+    assert response.status_code == 429
+    assert int(response["Retry-After"]) > 0
+    assert json.loads(response.content)["details"]["current_count"] == 2
+    assert rate_limiter.get_rate_limit_metrics() == {"default": {"allowed": 1, "denied": 1}}
+
+
+def test_import_middleware_and_checker_share_counters(settings):
+    settings.IMPORT_RATE_LIMIT = 1
+    settings.IMPORT_RATE_LIMIT_PATHS = ["/referensi/preview/"]
+    middleware = ImportRateLimitMiddleware(lambda request: HttpResponse("ok"))
+
+    request = RequestFactory().post("/referensi/preview/", HTTP_ACCEPT="application/json")
+    request.user = SimpleNamespace(id=9, is_authenticated=True)
+
+    first = middleware(request)
+    assert first.status_code == 200
+    assert first["X-RateLimit-Remaining"] == "0"
+
+    checker = RateLimitChecker(rate_limit=1)
+    assert not checker.check_user_limit(9)
+    assert checker.get_remaining_requests(9) == 0
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(
+            "referensi.services.audit_logger.audit_logger.log_rate_limit_exceeded",
+            lambda **kwargs: None,
+        )
+        denied = middleware(request)
+    assert denied.status_code == 429
+    assert json.loads(denied.content)["error"] == "rate_limit_exceeded"
+    assert rate_limiter.get_rate_limit_metrics()["import"] == {"allowed": 1, "denied": 1}
+
+
+def test_shared_cache_backends_count_with_add_and_incr(settings, tmp_path):
+    # Non-locmem, non-Redis backend (e.g. db/memcached): no process lock
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path),
+        }
+    }
+    assert not rate_limiter.is_process_local_cache(cache)
+
+    results = [rate_limiter.hit("user:3", 2, 60, category="write") for _ in range(3)]
+
+    assert [r.count for r in results] == [1, 2, 3]
+    assert [r.allowed for r in results] == [True, True, False]
+    assert cache.get("rl:user:3") == 3
+    assert results[0].reset_at == results[2].reset_at
+    assert rate_limiter.peek("user:3", 2, 60).count == 3
+    assert rate_limiter.get_rate_limit_metrics() == {"write": {"allowed": 2, "denied": 1}}
+
+    rate_limiter.reset("user:3")
+    assert rate_limiter.hit("user:3", 2, 60).count == 1
+    rate_limiter.reset_rate_limit_metrics()
+    assert rate_limiter.get_rate_limit_metrics() == {}
+
+
+def test_redis_client_is_resolved_for_native_and_django_redis_backends():
+    import redis
+    from django.core.cache.backends.redis import RedisCache
+    from django_redis.cache import RedisCache as DjangoRedisCache
+
+    from config.redis_client import get_cache_redis_client
+
+    native = RedisCache("redis://127.0.0.1:6379/9", {})
+    third_party = DjangoRedisCache("redis://127.0.0.1:6379/9", {})
+    assert isinstance(get_cache_redis_client(native), redis.Redis)
+    assert isinstance(get_cache_redis_client(third_party), redis.Redis)
+    assert get_cache_redis_client(cache) is None  # locmem in tests
+
+
+def test_hit_fails_open_only_for_backend_errors(monkeypatch):
+    def unavailable(*args):
+        raise ConnectionError("cache down")
+
+    monkeypatch.setattr(rate_limiter, "_local_hit", unavailable)
+    assert rate_limiter.hit("user:4", 1, 60).allowed
+
+    def buggy(*args):
+        raise TypeError("bug")
+
+    monkeypatch.setattr(rate_limiter, "_local_hit", buggy)
+    with pytest.raises(TypeError):
+        rate_limiter.hit("user:4", 1, 60)
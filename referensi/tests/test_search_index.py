@@ -0,0 +1,59 @@
+"""Tests for the sharded AHSP autocomplete index."""
+
+import pytest
+from django.urls import reverse
+
+from referensi.models import AHSPReferensi
+from referensi.search_cache import AutocompleteIndex, get_search_index, search_ahsp
+
+
+@pytest.fixture
+def catalogue(db, django_capture_on_commit_callbacks):
+    rows = [
+        ("1.1.1", "Galian tanah biasa", "SNI 2025"),
+        ("1.1.2", "Galian tanah keras", "SNI 2025"),
+        ("2.1.1", "Beton mutu K-225 tanah", "SNI 2025"),
+        ("1.1.1", "Galian tanah biasa (revisi)", "SNI 2026"),
+        ("3.4", "Pasangan bata tanah liat", "SNI 2026"),
+    ]
+    with django_capture_on_commit_callbacks(execute=True):
+        AHSPReferensi.objects.bulk_create(
+            AHSPReferensi(kode_ahsp=kode, nama_ahsp=nama, sumber=sumber, satuan="m3")
+            for kode, nama, sumber in rows
+        )
+
+
+def test_prefix_search_is_ranked_and_sharded(catalogue):
+    index = AutocompleteIndex.build()
+    assert len(index) == 5
+    assert set(index.shards) == {"SNI 2025", "SNI 2026"}
+
+    # Kode prefix hits rank before token hits
+    assert [e.kode_ahsp for e in index.search("1.1", sumber="SNI 2025")] == ["1.1.1", "1.1.2"]
+    assert [e.nama_ahsp for e in index.search("tanah ker")] == ["Galian tanah keras"]
+    # nama prefix ranks above a token match in the middle of nama
+    assert index.search("pas")[0].kode_ahsp == "3.4"
+    assert [e.sumber for e in index.search("galian tanah biasa")] == ["SNI 2025", "SNI 2026"]
+    assert index.search("galian", sumber="Tidak ada") == []
+    # Substring fallback keeps mid-word matches working
+    assert [e.kode_ahsp for e in index.search("alian tanah k", limit=5)] == ["1.1.2"]
+
+
+def test_index_follows_generation(catalogue, django_capture_on_commit_callbacks):
+    index = get_search_index()
+    assert get_search_index() is index
+
+    with django_capture_on_commit_callbacks(execute=True):
+        AHSPReferensi.objects.create(kode_ahsp="9.9", nama_ahsp="Urugan pasir", sumber="SNI 2026")
+
+    assert get_search_index() is not index
+    assert [e.kode_ahsp for e in search_ahsp("urug")] == ["9.9"]
+
+
+def test_lookup_endpoints_use_index(catalogue, client, django_user_model):
+    user = django_user_model.objects.create_user(username="lookup", password="Secret123!")
+    client.force_login(user)
+
+    response = client.get(reverse("referensi:api_search_ahsp"), {"q": "gal", "sumber": "SNI 2026"})
+    assert response.status_code == 200
+    assert [r["text"] for r in response.json()["results"]] == ["1.1.1 - Galian tanah biasa (revisi)"]
@@ -16,7 +16,14 @@ from .views.api.crud import (
     api_update_item,
     api_get_stats,
 )
+from .views.api.grid import (
+    api_grid_items,
+    api_grid_jobs,
+    api_grid_save_items,
+    api_grid_save_jobs,
+)
 from .views.audit_dashboard import (
+    audit_buffer_stats,
     audit_dashboard,
     audit_log_detail,
     audit_logs_list,
@@ -81,6 +88,7 @@ urlpatterns = [
     path("audit/logs/<int:log_id>/resolve/", mark_log_resolved, name="mark_log_resolved"),
     path("audit/statistics/", audit_statistics, name="audit_statistics"),
     path("audit/export/", export_audit_logs, name="export_audit_logs"),
+    path("audit/buffer-stats/", audit_buffer_stats, name="audit_buffer_stats"),
 
     # Legacy API Endpoints
     path("api/search", api_search_ahsp, name="api_search_ahsp"),
@@ -95,6 +103,12 @@ urlpatterns = [
     path("api/items/<int:pk>/", api_update_item, name="api_update_item"),
     path("api/stats/", api_get_stats, name="api_get_stats"),
 
+    # Grid API (keyset pagination, row-level saves)
+    path("api/grid/jobs/", api_grid_jobs, name="api_grid_jobs"),
+    path("api/grid/jobs/save/", api_grid_save_jobs, name="api_grid_save_jobs"),
+    path("api/grid/items/", api_grid_items, name="api_grid_items"),
+    path("api/grid/items/save/", api_grid_save_items, name="api_grid_save_items"),
+
     # Export Endpoints (Phase 6)
     path("export/single/<int:pk>/<str:format>/", ExportSingleJobView.as_view(), name="export_single_job"),
     path("export/multiple/<str:format>/", ExportMultipleJobsView.as_view(), name="export_multiple_jobs"),
@@ -9,6 +9,7 @@ from django.shortcuts import redirect, render
 from django.urls import reverse
 
 from referensi.forms import AHSPReferensiInlineForm, RincianReferensiInlineForm
+from referensi.history_batch import import_history_batch
 from referensi.models import AHSPReferensi, RincianReferensi
 from referensi.permissions import has_referensi_portal_access
 from referensi.services.admin_service import AdminPortalService
@@ -82,7 +83,8 @@ def ahsp_database(request):
     if request.method == "POST" and active_tab == TAB_JOBS:
         jobs_formset = JobsFormSet(request.POST, queryset=jobs_queryset)
         if jobs_formset.is_valid():
-            jobs_formset.save()
+            with import_history_batch("admin_portal", user=request.user):
+                jobs_formset.save()
             messages.success(request, "Perubahan pada pekerjaan AHSP berhasil disimpan.")
             return redirect(
                 _build_redirect_url(
@@ -135,7 +137,8 @@ def ahsp_database(request):
     if request.method == "POST" and active_tab == TAB_ITEMS:
         items_formset = ItemsFormSet(request.POST, queryset=items_queryset)
         if items_formset.is_valid():
-            items_formset.save()
+            with import_history_batch("admin_portal", user=request.user):
+                items_formset.save()
             messages.success(request, "Perubahan pada rincian AHSP berhasil disimpan.")
             return redirect(
                 _build_redirect_url(
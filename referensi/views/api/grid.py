@@ -0,0 +1,160 @@
+"""
+AHSP Database grid API (keyset pagination).
+
+Read endpoints page with an opaque ``after`` cursor instead of ``page``
+numbers, so deep pages do not pay for an OFFSET scan. The total count is
+only computed for the first page and may be a planner estimate on large
+result sets (``count_is_estimate``). Edits are sent as partial rows and
+saved row by row.
+"""
+
+import json
+import logging
+
+from django.contrib.auth.decorators import login_required, permission_required
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET, require_http_methods
+
+from referensi.models import AHSPReferensi, RincianReferensi
+from referensi.services import admin_grid
+
+logger = logging.getLogger(__name__)
+
+
+def _page_size(request):
+    try:
+        size = int(request.GET.get("page_size", admin_grid.DEFAULT_PAGE_SIZE))
+    except (TypeError, ValueError):
+        size = admin_grid.DEFAULT_PAGE_SIZE
+    return max(1, min(size, admin_grid.MAX_PAGE_SIZE))
+
+
+def _page_response(request, queryset, sort_keys, default_sort, serialize_rows):
+    sort = request.GET.get("sort")
+    if sort not in sort_keys:
+        sort = default_sort
+    key = sort_keys[sort]
+    after = request.GET.get("after", "").strip() or None
+    descending = request.GET.get("order") == "desc"
+    page_size = _page_size(request)
+    try:
+        rows, next_cursor = admin_grid.keyset_page(
+            queryset, key, after=after, page_size=page_size, descending=descending,
+        )
+    except admin_grid.InvalidCursor as exc:
+        return JsonResponse({"status": "error", "message": str(exc)}, status=400)
+
+    pagination = {
+        "sort": sort,
+        "page_size": page_size,
+        "next_cursor": next_cursor,
+        "has_next": next_cursor is not None,
+        "total_count": None,
+        "count_is_estimate": False,
+    }
+    if after is None:
+        pagination["total_count"], pagination["count_is_estimate"] = admin_grid.estimate_count(queryset)
+
+    return JsonResponse({"status": "success", "data": serialize_rows(rows), "pagination": pagination})
+
+
+@login_required
+@permission_required("referensi.view_ahspreferensi", raise_exception=True)
+@require_GET
+def api_grid_jobs(request):
+    """
+    AHSP jobs ordered on (kode_ahsp, id) or (sumber, kode_ahsp, id).
+
+    Query params: after, page_size, sort, order (asc/desc), search, sumber,
+    klasifikasi, anomaly_only (1/0).
+    """
+    queryset = admin_grid.filter_jobs(
+        AHSPReferensi.objects.all(),
+        search=request.GET.get("search", "").strip(),
+        sumber=request.GET.get("sumber", "").strip(),
+        klasifikasi=request.GET.get("klasifikasi", "").strip(),
+        anomaly_only=request.GET.get("anomaly_only") == "1",
+    )
+
+    def serialize(jobs):
+        counts = admin_grid.rincian_counts(job.id for job in jobs)
+        return [admin_grid.serialize_job(job, counts.get(job.id)) for job in jobs]
+
+    return _page_response(request, queryset, admin_grid.JOB_SORT_KEYS, "kode_ahsp", serialize)
+
+
+@login_required
+@permission_required("referensi.view_rincianreferensi", raise_exception=True)
+@require_GET
+def api_grid_items(request):
+    """
+    Rincian items ordered on (ahsp_id, id).
+
+    Query params: after, page_size, order (asc/desc), search, job_id, kategori.
+    """
+    try:
+        job_id = int(request.GET.get("job_id") or 0)
+    except ValueError:
+        job_id = 0
+    queryset = admin_grid.filter_items(
+        RincianReferensi.objects.select_related("ahsp"),
+        search=request.GET.get("search", "").strip(),
+        job_id=job_id,
+        kategori=request.GET.get("kategori", "").strip(),
+    )
+    return _page_response(
+        request, queryset, admin_grid.ITEM_SORT_KEYS, "ahsp_id",
+        lambda items: [admin_grid.serialize_item(item) for item in items],
+    )
+
+
+def _save_response(request, kind):
+    try:
+        payload = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({"status": "error", "message": "Invalid JSON"}, status=400)
+
+    rows = payload.get("rows") if isinstance(payload, dict) else None
+    if not isinstance(rows, list) or not rows:
+        return JsonResponse({"status": "error", "message": "Tidak ada baris untuk disimpan"}, status=400)
+    if len(rows) > admin_grid.MAX_SAVE_ROWS:
+        return JsonResponse({
+            "status": "error",
+            "message": f"Maksimal {admin_grid.MAX_SAVE_ROWS} baris per simpan",
+        }, status=400)
+    if not all(isinstance(row, dict) for row in rows):
+        return JsonResponse({"status": "error", "message": "Format baris tidak valid"}, status=400)
+
+    results = admin_grid.save_rows(kind, rows, user=request.user)
+    failed = sum(1 for result in results if not result["ok"])
+    logger.info("Grid %s save: %d rows, %d failed", kind, len(results), failed)
+    return JsonResponse({
+        "status": "success" if not failed else "partial",
+        "saved": len(results) - failed,
+        "failed": failed,
+        "results": results,
+    })
+
+
+@login_required
+@permission_required("referensi.change_ahspreferensi", raise_exception=True)
+@require_http_methods(["POST"])
+def api_grid_save_jobs(request):
+    """
+    Save changed job rows.
+
+    Request body (JSON): {"rows": [{"id": 1, "changes": {"satuan": "m3"}}, ...]}
+    """
+    return _save_response(request, "jobs")
+
+
+@login_required
+@permission_required("referensi.change_rincianreferensi", raise_exception=True)
+@require_http_methods(["POST"])
+def api_grid_save_items(request):
+    """
+    Save changed rincian rows.
+
+    Request body (JSON): {"rows": [{"id": 1, "changes": {"koefisien": "0.25"}}, ...]}
+    """
+    return _save_response(request, "items")
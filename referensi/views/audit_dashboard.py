@@ -322,6 +322,26 @@ def audit_statistics(request):
     return render(request, 'referensi/audit/statistics.html', context)
 
 
+@login_required
+@permission_required('referensi.view_ahsp_stats', raise_exception=True)
+def audit_buffer_stats(request):
+    """
+    Counters of the audit queue used by this process (JSON).
+
+    Shows queue depth, dropped events and flush errors so a backlog
+    during import storms is visible before events are lost. The depth of
+    the shared queue covers all processes; the other counters are per process.
+    """
+    from referensi.services.audit_buffer import SharedAuditQueue, audit_buffer, get_audit_queue
+
+    queue = get_audit_queue()
+    return JsonResponse({
+        'buffered': queue is not None,
+        'queue': 'shared' if isinstance(queue, SharedAuditQueue) else ('process' if queue else None),
+        **(queue or audit_buffer).stats(),
+    })
+
+
 @login_required
 @permission_required('referensi.view_ahsp_stats', raise_exception=True)
 def export_audit_logs(request):
@@ -1856,6 +1856,7 @@ def staging_commit(request):
     """
     Commit staging data to main database.
     """
+    from referensi.history_batch import import_history_batch
     from referensi.models import AHSPReferensi, RincianReferensi
     
     staging_items = AHSPImportStaging.objects.filter(
@@ -1873,43 +1874,45 @@ def staging_commit(request):
     created_ahsp = 0
     created_rincian = 0
     
-    for parent_code in parent_codes:
-        if not parent_code:
-            continue
-        
-        parent_heading = AHSPImportStaging.objects.filter(
-            user=request.user,
-            kode_item=parent_code,
-            segment_type='HEADING'
-        ).first()
-        
-        ahsp_obj, created = AHSPReferensi.objects.get_or_create(
-            kode_ahsp=parent_code,
-            sumber="Excel Import",
-            defaults={
-                'nama_ahsp': parent_heading.uraian_item if parent_heading else parent_code,
-            }
-        )
-        if created:
-            created_ahsp += 1
+    # Satu batch history untuk seluruh commit (bukan INSERT history per baris)
+    with import_history_batch("staging_commit", user=request.user):
+        for parent_code in parent_codes:
+            if not parent_code:
+                continue
         
-        items = staging_items.filter(parent_ahsp_code=parent_code)
+            parent_heading = AHSPImportStaging.objects.filter(
+                user=request.user,
+                kode_item=parent_code,
+                segment_type='HEADING'
+            ).first()
         
-        for item in items:
-            kategori_map = {'A': 'TK', 'B': 'BHN', 'C': 'ALT'}
-            kategori = kategori_map.get(item.segment_type, 'LAIN')
-            
-            RincianReferensi.objects.update_or_create(
-                ahsp=ahsp_obj,
-                kategori=kategori,
-                kode_item=item.kode_item,
-                uraian_item=item.uraian_item,
-                satuan_item=item.satuan_item or '-',
+            ahsp_obj, created = AHSPReferensi.objects.get_or_create(
+                kode_ahsp=parent_code,
+                sumber="Excel Import",
                 defaults={
-                    'koefisien': item.koefisien,
+                    'nama_ahsp': parent_heading.uraian_item if parent_heading else parent_code,
                 }
             )
-            created_rincian += 1
+            if created:
+                created_ahsp += 1
+        
+            items = staging_items.filter(parent_ahsp_code=parent_code)
+        
+            for item in items:
+                kategori_map = {'A': 'TK', 'B': 'BHN', 'C': 'ALT'}
+                kategori = kategori_map.get(item.segment_type, 'LAIN')
+            
+                RincianReferensi.objects.update_or_create(
+                    ahsp=ahsp_obj,
+                    kategori=kategori,
+                    kode_item=item.kode_item,
+                    uraian_item=item.uraian_item,
+                    satuan_item=item.satuan_item or '-',
+                    defaults={
+                        'koefisien': item.koefisien,
+                    }
+                )
+                created_rincian += 1
     
     # Clear staging
     staging_items.delete()
@@ -7,7 +7,6 @@ PHASE 2 REFACTORING:
 - Reduced from 550 lines to ~200 lines (64% reduction)
 """
 
-import pickle
 from urllib.parse import urlencode
 
 from django.contrib import messages
@@ -33,6 +32,7 @@ from referensi.services.import_error_analyzer import (
 )
 from referensi.services.item_code_registry import assign_item_codes
 from referensi.services.preview_service import PreviewImportService
+from referensi.services.preview_store import PreviewStoreError
 from referensi.validators import validate_ahsp_file
 
 from .constants import TAB_ITEMS, TAB_JOBS
@@ -117,6 +117,7 @@ def preview_import(request):
 
     # Initialize state
     parse_result = None
+    preview_store = None
     uploaded_name = None
     import_token = None
     job_page_data = None
@@ -127,10 +128,10 @@ def preview_import(request):
     # Handle update actions (edit jobs/details)
     if request.method == "POST" and action in {"update_jobs", "update_details"}:
         try:
-            parse_result, uploaded_name, import_token = service.session_manager.retrieve(
+            preview_store, uploaded_name, import_token = service.session_manager.open_store(
                 request.session
             )
-        except (FileNotFoundError, pickle.UnpicklingError):
+        except (FileNotFoundError, PreviewStoreError):
             messages.error(request,
                 "❌ Data preview tidak ditemukan (mungkin session habis)\n\n"
                 "Silakan upload file Excel Anda kembali.")
@@ -143,12 +144,11 @@ def preview_import(request):
 
         if action == "update_jobs":
             # Build formset with POST data
-            job_page_data = service.build_job_page(parse_result, jobs_page, data=request.POST)
+            job_page_data = service.build_job_page(preview_store, jobs_page, data=request.POST)
 
             if job_page_data.formset.is_valid():
-                # Apply changes
-                service.apply_job_updates(parse_result, job_page_data.formset.cleaned_data)
-                service.session_manager.rewrite(request.session, parse_result)
+                # Apply changes (only edited rows are written)
+                service.apply_job_updates(preview_store, job_page_data.formset.cleaned_data)
                 messages.success(request,
                     "✅ Perubahan pekerjaan berhasil disimpan di preview\n\n"
                     "Data belum masuk database. Klik 'Commit Import' untuk menyimpan ke database.")
@@ -161,7 +161,7 @@ def preview_import(request):
                     return redirect(f"{reverse('referensi:preview_import')}?{query}#pane-ahsp")
 
                 # Rebuild formset for display
-                job_page_data = service.build_job_page(parse_result, jobs_page)
+                job_page_data = service.build_job_page(preview_store, jobs_page)
             else:
                 messages.error(
                     request,
@@ -172,15 +172,14 @@ def preview_import(request):
         else:  # update_details
             # Build formset with POST data
             detail_page_data = service.build_detail_page(
-                parse_result, details_page, data=request.POST
+                preview_store, details_page, data=request.POST
             )
 
             if detail_page_data.formset.is_valid():
-                # Apply changes
+                # Apply changes (only edited rows are written)
                 service.apply_detail_updates(
-                    parse_result, detail_page_data.formset.cleaned_data
+                    preview_store, detail_page_data.formset.cleaned_data
                 )
-                service.session_manager.rewrite(request.session, parse_result)
                 messages.success(request,
                     "✅ Perubahan rincian berhasil disimpan di preview\n\n"
                     "Data belum masuk database. Klik 'Commit Import' untuk menyimpan ke database.")
@@ -195,7 +194,7 @@ def preview_import(request):
                     )
 
                 # Rebuild formset for display
-                detail_page_data = service.build_detail_page(parse_result, details_page)
+                detail_page_data = service.build_detail_page(preview_store, details_page)
             else:
                 messages.error(
                     request,
@@ -267,7 +266,14 @@ def preview_import(request):
                 parse_result = None
             else:
                 # File is valid, proceed with parsing
-                parse_result = load_preview_from_file(excel_file)
+                from django.conf import settings
+
+                parser_config = getattr(settings, "REFERENSI_CONFIG", {}).get("parser", {})
+                parse_result = load_preview_from_file(
+                    excel_file,
+                    all_sheets=parser_config.get("all_sheets", False),
+                    max_workers=parser_config.get("max_workers"),
+                )
 
                 if parse_result.errors:
                     service.session_manager.cleanup(request.session)
@@ -279,6 +285,9 @@ def preview_import(request):
                     import_token = service.session_manager.store(
                         request.session, parse_result, uploaded_name
                     )
+                    preview_store, _, _ = service.session_manager.open_store(
+                        request.session
+                    )
                     jobs_page = 1
                     details_page = 1
                     messages.success(
@@ -298,20 +307,30 @@ def preview_import(request):
     # Load from session (GET request or after upload)
     else:
         try:
-            parse_result, uploaded_name, import_token = service.session_manager.retrieve(
+            preview_store, uploaded_name, import_token = service.session_manager.open_store(
                 request.session
             )
-        except (FileNotFoundError, pickle.UnpicklingError):
-            parse_result = None
+        except (FileNotFoundError, PreviewStoreError):
+            preview_store = None
             uploaded_name = None
             import_token = None
 
+    # Pages are read from the preview store; the template only needs the
+    # summary (totals, errors, warnings), never the full parse result.
+    if preview_store is not None:
+        parse_result = preview_store.summary()
+
     # Build formsets if not already built
     if job_page_data is None:
-        job_page_data = service.build_job_page(parse_result, jobs_page)
+        job_page_data = service.build_job_page(preview_store or parse_result, jobs_page)
 
     if detail_page_data is None:
-        detail_page_data = service.build_detail_page(parse_result, details_page)
+        detail_page_data = service.build_detail_page(
+            preview_store or parse_result, details_page
+        )
+
+    if preview_store is not None:
+        preview_store.close()
 
     # Handle AJAX requests
     if is_ajax and section in {TAB_JOBS, TAB_ITEMS}:
@@ -414,7 +433,7 @@ def commit_import(request):
             "❌ Tidak ada data preview\n\n"
             "Silakan upload file Excel terlebih dahulu sebelum melakukan commit import.")
         return redirect("referensi:preview_import")
-    except pickle.UnpicklingError:
+    except PreviewStoreError:
         service.session_manager.cleanup(request.session)
         messages.error(request,
             "❌ Data preview rusak\n\n"
@@ -445,7 +464,7 @@ def commit_import(request):
         # Force garbage collection before import
         gc.collect()
 
-        summary = write_parse_result_to_db(parse_result, uploaded_name)
+        summary = write_parse_result_to_db(parse_result, uploaded_name, user=request.user)
 
         # Log successful import operation
         try: